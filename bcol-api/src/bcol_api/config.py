@@ -21,6 +21,7 @@ rather than reading environment variables directly or by accessing this configur
 
 import os
 import sys
+import tempfile
 
 from dotenv import find_dotenv, load_dotenv
 
@@ -94,6 +95,21 @@ class _Config:  # pylint: disable=too-few-public-methods
     BCOL_PAYMENTS_WSDL_URL = _get_config("BCOL_PAYMENTS_WSDL_URL")
     BCOL_APPLIED_CHARGE_WSDL_URL = _get_config("BCOL_APPLIED_CHARGE_WSDL_URL")
 
+    # BCOL SOAP transport, WSDL cache is sqlite (on disk), memory or none. Timeouts are in seconds.
+    # The default sqlite path is in the temp dir, so the cache lasts as long as the instance, not across restarts;
+    # point BCOL_WSDL_CACHE_PATH at a mounted volume to keep it.
+    BCOL_WSDL_CACHE = _get_config("BCOL_WSDL_CACHE", default="sqlite").lower()
+    BCOL_WSDL_CACHE_PATH = _get_config(
+        "BCOL_WSDL_CACHE_PATH", default=os.path.join(tempfile.gettempdir(), "bcol-wsdl-cache.db")
+    )
+    BCOL_WSDL_CACHE_TIMEOUT = int(_get_config("BCOL_WSDL_CACHE_TIMEOUT", default=86400))
+    BCOL_SOAP_POOL_SIZE = int(_get_config("BCOL_SOAP_POOL_SIZE", default=10))
+    BCOL_SOAP_TIMEOUT = int(_get_config("BCOL_SOAP_TIMEOUT", default=30))
+    # No operation timeout unless set, SOAP calls wait on BCOL as they always have.
+    BCOL_SOAP_OPERATION_TIMEOUT = (
+        int(os.getenv("BCOL_SOAP_OPERATION_TIMEOUT")) if os.getenv("BCOL_SOAP_OPERATION_TIMEOUT") else None
+    )
+
     TESTING = False
     DEBUG = True
 
@@ -111,6 +127,7 @@ class TestConfig(_Config):  # pylint: disable=too-few-public-methods
     DEBUG = True
     TESTING = True
     USE_TEST_KEYCLOAK_DOCKER = "YES"
+    BCOL_WSDL_CACHE = "memory"
 
     JWT_OIDC_TEST_MODE = True
     JWT_OIDC_TEST_AUDIENCE = os.getenv("JWT_OIDC_AUDIENCE")
@@ -11,10 +11,20 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-"""Holder for SOAP from BCOL."""
+"""Holder for SOAP from BCOL.
 
+The clients are created on first use, share one transport with a sized keep-alive connection pool and timeouts,
+and cache the WSDL documents (on disk or in memory) so restarts don't wait on fetching them.
+"""
+
+import threading
+
+import requests
 import zeep
 from flask import current_app
+from requests.adapters import HTTPAdapter
+from zeep.cache import InMemoryCache, SqliteCache
+from zeep.transports import Transport
 
 
 class Singleton(type):
@@ -32,26 +42,56 @@ class Singleton(type):
 class BcolSoap(metaclass=Singleton):  # pylint: disable=too-few-public-methods
     """Singleton wrapper for BCOL SOAP."""
 
-    __profile_client = None
-    __payment_client = None
-    __applied_chg_client = None
-
     def get_profile_client(self):
         """Retrieve singleton Query Profile Client."""
-        return self.__profile_client
+        return self._get_client("BCOL_QUERY_PROFILE_WSDL_URL")
 
     def get_payment_client(self):
         """Retrieve singleton Payment Create Client."""
-        return self.__payment_client
+        return self._get_client("BCOL_PAYMENTS_WSDL_URL")
 
     def get_applied_chg_client(self):
         """Retrieve singleton Applied Charge Client."""
-        return self.__applied_chg_client
+        return self._get_client("BCOL_APPLIED_CHARGE_WSDL_URL")
 
     def __init__(self):
-        """Private constructor."""
-        self.__profile_client = zeep.Client(current_app.config.get("BCOL_QUERY_PROFILE_WSDL_URL"))
+        """Private constructor, clients are created on first use."""
+        self._clients = {}
+        self._transport = None
+        self._lock = threading.Lock()
+
+    def _get_client(self, wsdl_url_key: str) -> zeep.Client:
+        """Return the client for a WSDL url config key, loading the WSDL on the first call."""
+        if (client := self._clients.get(wsdl_url_key)) is None:
+            with self._lock:
+                if (client := self._clients.get(wsdl_url_key)) is None:
+                    if self._transport is None:
+                        self._transport = self._create_transport()
+                    client = zeep.Client(current_app.config.get(wsdl_url_key), transport=self._transport)
+                    self._clients[wsdl_url_key] = client
+        return client
+
+    @staticmethod
+    def _create_transport() -> Transport:
+        """Return a transport with a WSDL cache and a keep-alive pool shared by all the clients."""
+        config = current_app.config
+        pool_size = config.get("BCOL_SOAP_POOL_SIZE")
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
 
-        self.__payment_client = zeep.Client(current_app.config.get("BCOL_PAYMENTS_WSDL_URL"))
+        cache = None
+        cache_timeout = config.get("BCOL_WSDL_CACHE_TIMEOUT")
+        match config.get("BCOL_WSDL_CACHE"):
+            case "sqlite":
+                cache = SqliteCache(path=config.get("BCOL_WSDL_CACHE_PATH"), timeout=cache_timeout)
+            case "memory":
+                cache = InMemoryCache(timeout=cache_timeout)
 
-        self.__applied_chg_client = zeep.Client(current_app.config.get("BCOL_APPLIED_CHARGE_WSDL_URL"))
+        return Transport(
+            cache=cache,
+            session=session,
+            timeout=config.get("BCOL_SOAP_TIMEOUT"),
+            operation_timeout=config.get("BCOL_SOAP_OPERATION_TIMEOUT"),
+        )
@@ -17,7 +17,88 @@
 Test-Suite to ensure that the BCOL Service layer is working as expected.
 """
 
-from bcol_api.services.bcol_soap import BcolSoap
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from bcol_api.services.bcol_soap import BcolSoap, Singleton
+
+STUB_WSDL = """<?xml version="1.0" encoding="UTF-8"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/" xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+    xmlns:tns="http://stub.bcol/" xmlns:xsd="http://www.w3.org/2001/XMLSchema" targetNamespace="http://stub.bcol/">
+  <types>
+    <xsd:schema targetNamespace="http://stub.bcol/" elementFormDefault="qualified">
+      <xsd:element name="echo">
+        <xsd:complexType><xsd:sequence><xsd:element name="req" type="xsd:string"/></xsd:sequence></xsd:complexType>
+      </xsd:element>
+      <xsd:element name="echoResponse">
+        <xsd:complexType><xsd:sequence><xsd:element name="resp" type="xsd:string"/></xsd:sequence></xsd:complexType>
+      </xsd:element>
+    </xsd:schema>
+  </types>
+  <message name="echoRequest"><part name="parameters" element="tns:echo"/></message>
+  <message name="echoResponse"><part name="parameters" element="tns:echoResponse"/></message>
+  <portType name="StubPort">
+    <operation name="echo"><input message="tns:echoRequest"/><output message="tns:echoResponse"/></operation>
+  </portType>
+  <binding name="StubBinding" type="tns:StubPort">
+    <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+    <operation name="echo">
+      <soap:operation soapAction="echo"/>
+      <input><soap:body use="literal"/></input>
+      <output><soap:body use="literal"/></output>
+    </operation>
+  </binding>
+  <service name="StubService">
+    <port name="StubPort" binding="tns:StubBinding"><soap:address location="{address}"/></port>
+  </service>
+</definitions>"""
+
+STUB_RESPONSE = """<?xml version="1.0" encoding="UTF-8"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
+  <soap:Body><tns:echoResponse xmlns:tns="http://stub.bcol/"><tns:resp>pong</tns:resp></tns:echoResponse></soap:Body>
+</soap:Envelope>"""
+
+
+@pytest.fixture()
+def stub_soap_server():
+    """Run a local SOAP server serving a stub WSDL, recording the requests it receives."""
+    requests_seen = []
+
+    class StubHandler(BaseHTTPRequestHandler):
+        """Stub SOAP handler."""
+
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, body: str):
+            content = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/xml; charset=utf-8")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def do_GET(self):  # pylint: disable=invalid-name
+            """Serve the WSDL."""
+            requests_seen.append(("GET", self.client_address))
+            self._reply(STUB_WSDL.format(address=f"http://127.0.0.1:{self.server.server_port}/soap"))
+
+        def do_POST(self):  # pylint: disable=invalid-name
+            """Answer a SOAP call."""
+            self.rfile.read(int(self.headers["Content-Length"]))
+            requests_seen.append(("POST", self.client_address))
+            self._reply(STUB_RESPONSE)
+
+        def log_message(self, *args):  # pylint: disable=arguments-differ
+            """Keep the test output quiet."""
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/wsdl", requests_seen
+    server.shutdown()
+    server.server_close()
 
 
 def test_bcol_soap(app):
@@ -35,3 +116,26 @@ def test_bcol_soap_multiple_instances(app):
         bcol_soap = BcolSoap()
         bcol_soap2 = BcolSoap()
         assert bcol_soap == bcol_soap2
+
+
+def test_bcol_soap_lazy_cached_pooled_clients(app, monkeypatch, stub_soap_server):
+    """Test clients load lazily, share the cached WSDL and reuse the pooled connection."""
+    wsdl_url, requests_seen = stub_soap_server
+    monkeypatch.delitem(Singleton._instances, BcolSoap, raising=False)  # pylint: disable=protected-access
+    for key in ("BCOL_QUERY_PROFILE_WSDL_URL", "BCOL_PAYMENTS_WSDL_URL", "BCOL_APPLIED_CHARGE_WSDL_URL"):
+        monkeypatch.setitem(app.config, key, wsdl_url)
+    monkeypatch.setitem(app.config, "BCOL_WSDL_CACHE", "memory")
+    with app.app_context():
+        bcol_soap = BcolSoap()
+        assert not requests_seen
+
+        client = bcol_soap.get_payment_client()
+        assert bcol_soap.get_payment_client() is client
+        bcol_soap.get_profile_client()
+        assert [method for method, _ in requests_seen] == ["GET"]
+
+        assert client.service.echo(req="ping") == "pong"
+        assert client.service.echo(req="ping") == "pong"
+        post_clients = [address for method, address in requests_seen if method == "POST"]
+        assert len(post_clients) == 2
+        assert post_clients[0] == post_clients[1]
@@ -134,6 +134,12 @@ class _Config(object):  # pylint: disable=too-few-public-methods
     FTP_POLLER_TOPIC = os.getenv("FTP_POLLER_TOPIC", "ftp-poller-payment-reconciliation-dev")
     PUB_ENABLE_MESSAGE_ORDERING = os.getenv("PUB_ENABLE_MESSAGE_ORDERING", "True")
 
+    # Queue publishing: sync (publish in the caller) or async (batched per topic by the PubSub publisher client).
+    QUEUE_PUBLISH_MODE = os.getenv("QUEUE_PUBLISH_MODE", "sync").lower()
+    QUEUE_PUBLISH_BATCH_SIZE = int(os.getenv("QUEUE_PUBLISH_BATCH_SIZE", "100"))
+    QUEUE_PUBLISH_BATCH_LATENCY_SECONDS = float(os.getenv("QUEUE_PUBLISH_BATCH_LATENCY_SECONDS", "0.05"))
+    QUEUE_PUBLISH_FLUSH_TIMEOUT_SECONDS = float(os.getenv("QUEUE_PUBLISH_FLUSH_TIMEOUT_SECONDS", "30"))
+
     # Google Cloud Storage settings
     GOOGLE_BUCKET_NAME = os.getenv("FTP_POLLER_BUCKET_NAME")
     GOOGLE_BUCKET_FOLDER_CGI_PROCESSING = os.getenv("GOOGLE_BUCKET_FOLDER_CGI_PROCESSING", "cgi_processing")
@@ -142,6 +148,12 @@ class _Config(object):  # pylint: disable=too-few-public-methods
     GOOGLE_BUCKET_FOLDER_AR = os.getenv("GOOGLE_BUCKET_FOLDER_AR", "ar")
     GOOGLE_BUCKET_FOLDER_EFT = os.getenv("GOOGLE_BUCKET_FOLDER_EFT", "eft")
 
+    # SFTP <-> bucket transfers: files transferred at once (one SFTP connection each), upload chunk size (a multiple
+    # of 256 KiB) and the largest file whose SFTP reads are prefetched, which buffers the whole file.
+    FTP_TRANSFER_WORKERS = int(os.getenv("FTP_TRANSFER_WORKERS", "4"))
+    FTP_TRANSFER_CHUNK_SIZE = int(os.getenv("FTP_TRANSFER_CHUNK_SIZE", str(8 * 1024 * 1024)))
+    FTP_TRANSFER_PREFETCH_MAX_BYTES = int(os.getenv("FTP_TRANSFER_PREFETCH_MAX_BYTES", str(16 * 1024 * 1024)))
+
     TESTING = False
     DEBUG = True
 
@@ -19,6 +19,7 @@ import os
 import sys
 
 from flask import Flask
+from pay_api.services import gcp_queue_publisher
 from pay_api.services.gcp_queue import queue
 
 import config
@@ -63,21 +64,25 @@ def run(job_name):
     application = create_app()
 
     application.app_context().push()
-    match job_name:
-        case "CAS_FTP_POLLER":
-            CASPollerFtpTask.poll_ftp()
-            application.logger.info("<<<< Completed Polling CAS FTP >>>>")
-        case "CGI_FTP_POLLER":
-            CGIFeederPollerTask.poll_ftp()
-            application.logger.info("<<<< Completed Polling CGI FTP >>>>")
-        case "EFT_FTP_POLLER":
-            EFTPollerFtpTask.poll_ftp()
-            application.logger.info("<<<< Completed Polling EFT FTP >>>>")
-        case "GOOGLE_BUCKET_POLLER":
-            GoogleBucketPollerTask.poll_google_bucket_for_ejv_files()
-            application.logger.info("<<<< Completed Polling Google Buckets >>>>")
-        case _:
-            application.logger.debug("No valid args passed.Exiting job without running any ***************")
+    try:
+        match job_name:
+            case "CAS_FTP_POLLER":
+                CASPollerFtpTask.poll_ftp()
+                application.logger.info("<<<< Completed Polling CAS FTP >>>>")
+            case "CGI_FTP_POLLER":
+                CGIFeederPollerTask.poll_ftp()
+                application.logger.info("<<<< Completed Polling CGI FTP >>>>")
+            case "EFT_FTP_POLLER":
+                EFTPollerFtpTask.poll_ftp()
+                application.logger.info("<<<< Completed Polling EFT FTP >>>>")
+            case "GOOGLE_BUCKET_POLLER":
+                GoogleBucketPollerTask.poll_google_bucket_for_ejv_files()
+                application.logger.info("<<<< Completed Polling Google Buckets >>>>")
+            case _:
+                application.logger.debug("No valid args passed.Exiting job without running any ***************")
+    finally:
+        # Wait for messages queued in async publish mode before the job exits, even when it failed.
+        gcp_queue_publisher.flush()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,246 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Streaming, concurrent file transfers between SFTP servers and the Google bucket.
+
+Files are streamed in chunks rather than read fully into memory, several files are transferred at once over a
+small pool of SFTP connections and every transfer is verified with a checksum.
+"""
+import base64
+import hashlib
+import os
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, List
+
+from flask import current_app
+from paramiko.sftp_attr import SFTPAttributes
+from pysftp import Connection
+
+from services.sftp import SFTPService
+
+
+@dataclass
+class TransferResult:
+    """Outcome of a single file transfer."""
+
+    file_name: str
+    bytes: int = 0
+    seconds: float = 0
+    error: Exception | None = None
+
+
+class _HashingReader:  # pylint: disable=too-few-public-methods
+    """File reader wrapper computing the md5 of what has been read."""
+
+    def __init__(self, reader):
+        self._reader = reader
+        self._md5 = hashlib.md5(usedforsecurity=False)
+
+    def read(self, size: int = -1) -> bytes:
+        """Read from the wrapped reader."""
+        data = self._reader.read(size)
+        self._md5.update(data)
+        return data
+
+    def md5_base64(self) -> str:
+        """Return the md5 in the base64 form GCS reports."""
+        return base64.b64encode(self._md5.digest()).decode("utf-8")
+
+
+class SFTPConnectionPool:
+    """Lazily opened SFTP connections to one server, shared by the transfer workers."""
+
+    def __init__(self, server_name: str, size: int):
+        """Initialize the pool, connections are opened on demand up to size."""
+        self.server_name = server_name
+        self.size = max(size, 1)
+        self._idle: queue.Queue = queue.Queue()
+        self._opened: List[Connection] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection, a connection that raised is closed instead of returned to the pool."""
+        sftp_client = self._acquire()
+        try:
+            yield sftp_client
+        except Exception:
+            self._discard(sftp_client)
+            raise
+        self._idle.put(sftp_client)
+
+    def _acquire(self) -> Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            open_new = len(self._opened) < self.size
+            if open_new:
+                # Reserve the slot before connecting, so concurrent callers don't overshoot the size.
+                self._opened.append(None)
+        if not open_new:
+            return self._idle.get()
+        try:
+            sftp_client = SFTPService.get_connection(self.server_name)
+        except Exception:
+            with self._lock:
+                self._opened.remove(None)
+            raise
+        with self._lock:
+            self._opened[self._opened.index(None)] = sftp_client
+        return sftp_client
+
+    def _discard(self, sftp_client: Connection):
+        with self._lock:
+            self._opened.remove(sftp_client)
+        sftp_client.close()
+
+    def close(self):
+        """Close every connection the pool opened."""
+        with self._lock:
+            opened, self._opened = [c for c in self._opened if c is not None], []
+        for sftp_client in opened:
+            sftp_client.close()
+
+    def __enter__(self):
+        """Return the pool."""
+        return self
+
+    def __exit__(self, *args):
+        """Close the pool."""
+        self.close()
+
+
+class TransferService:
+    """Transfer files between SFTP and the Google bucket."""
+
+    @classmethod
+    def sftp_to_bucket(
+        cls, server_name: str, ftp_dir: str, files: List[SFTPAttributes], bucket, folder_name: str
+    ) -> List[TransferResult]:
+        """Stream SFTP files into resumable bucket uploads, returning a result per file in the given order."""
+        config = current_app.config
+        chunk_size = config.get("FTP_TRANSFER_CHUNK_SIZE")
+        prefetch_max_bytes = config.get("FTP_TRANSFER_PREFETCH_MAX_BYTES")
+
+        def _transfer(pool: SFTPConnectionPool, file: SFTPAttributes):
+            blob = bucket.blob(f"{folder_name}/{file.filename}")
+            # Setting a chunk size makes the upload resumable, only a chunk is held in memory at a time.
+            blob.chunk_size = chunk_size
+            with pool.connection() as sftp_client, sftp_client.open(f"{ftp_dir}/{file.filename}", "rb") as sftp_file:
+                # Prefetching pipelines the reads but buffers the whole file, only do it for small files.
+                if file.st_size <= prefetch_max_bytes:
+                    sftp_file.prefetch(file.st_size)
+                # The client computes a crc32c while uploading and fails the upload if GCS doesn't agree.
+                blob.upload_from_file(
+                    sftp_file, size=file.st_size, content_type="application/octet-stream", checksum="crc32c"
+                )
+            return file.st_size
+
+        return cls._transfer_all(
+            server_name, f"SFTP {server_name} to bucket", files, lambda file: file.filename, _transfer
+        )
+
+    @classmethod
+    def bucket_to_sftp(cls, server_name: str, blobs: list, ftp_dir: str) -> List[TransferResult]:
+        """Stream bucket blobs to the SFTP directory, returning a result per blob in the given order."""
+        chunk_size = current_app.config.get("FTP_TRANSFER_CHUNK_SIZE")
+
+        def _transfer(pool: SFTPConnectionPool, blob):
+            file_name = os.path.basename(blob.name)
+            remote_path = f"{ftp_dir}/{file_name}"
+            # Written under a temporary name and renamed once verified, so a partial file is never picked up.
+            temp_path = f"{ftp_dir}/.{file_name}.{uuid.uuid4().hex}.part"
+            with pool.connection() as sftp_client:
+                try:
+                    with blob.open("rb", chunk_size=chunk_size) as reader:
+                        reader = _HashingReader(reader)
+                        # confirm stats the remote file and fails when its size doesn't match what was sent.
+                        sftp_client.putfo(reader, temp_path, file_size=blob.size, confirm=True)
+                    # Composite objects have no md5, the size check above still applies.
+                    if blob.md5_hash and reader.md5_base64() != blob.md5_hash:
+                        raise ValueError(f"Checksum mismatch uploading {blob.name} to {remote_path}")
+                    # SFTP rename doesn't overwrite, a file left by an earlier upload is replaced.
+                    if sftp_client.exists(remote_path):
+                        sftp_client.remove(remote_path)
+                    sftp_client.rename(temp_path, remote_path)
+                except Exception:
+                    cls._remove_quietly(sftp_client, temp_path)
+                    raise
+            return blob.size
+
+        return cls._transfer_all(
+            server_name, f"bucket to SFTP {server_name}", blobs, lambda blob: os.path.basename(blob.name), _transfer
+        )
+
+    @classmethod
+    def _transfer_all(
+        cls, server_name: str, direction: str, items: list, name_of: Callable, transfer: Callable
+    ) -> List[TransferResult]:
+        """Run transfer for each item over a pool of SFTP connections, inline when one worker is configured."""
+        if not items:
+            return []
+        app = current_app._get_current_object()  # pylint: disable=protected-access
+        workers = min(current_app.config.get("FTP_TRANSFER_WORKERS", 1), len(items))
+        started = time.monotonic()
+
+        def _run(pool: SFTPConnectionPool, item) -> TransferResult:
+            with app.app_context():
+                result = TransferResult(file_name=name_of(item))
+                item_started = time.monotonic()
+                try:
+                    result.bytes = transfer(pool, item)
+                    result.seconds = time.monotonic() - item_started
+                    current_app.logger.info(
+                        f"Transferred {result.file_name} {direction}: {result.bytes} bytes in {result.seconds:.2f}s"
+                    )
+                except Exception as e:  # NOQA # pylint: disable=broad-except
+                    result.seconds = time.monotonic() - item_started
+                    current_app.logger.error(f"Transfer {direction} failed for {result.file_name}: {e}")
+                    result.error = e
+                return result
+
+        with SFTPConnectionPool(server_name, workers) as pool:
+            if workers <= 1:
+                results = [_run(pool, item) for item in items]
+            else:
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ftp-transfer") as executor:
+                    results = list(executor.map(lambda item: _run(pool, item), items))
+        cls._log_summary(direction, results, time.monotonic() - started)
+        return results
+
+    @staticmethod
+    def _remove_quietly(sftp_client: Connection, path: str):
+        """Remove a temporary upload, the connection may be the reason the upload failed."""
+        try:
+            if sftp_client.exists(path):
+                sftp_client.remove(path)
+        except Exception as e:  # NOQA # pylint: disable=broad-except
+            current_app.logger.warning(f"Could not remove temporary upload {path}: {e}")
+
+    @staticmethod
+    def _log_summary(direction: str, results: List[TransferResult], seconds: float):
+        total_bytes = sum(result.bytes for result in results if result.error is None)
+        failed = sum(1 for result in results if result.error is not None)
+        bytes_per_second = int(total_bytes / seconds) if seconds > 0 else total_bytes
+        current_app.logger.info(
+            f"Transfer {direction} files={len(results)} failed={failed} bytes={total_bytes} "
+            f"duration_ms={int(seconds * 1000)} bytes_per_second={bytes_per_second}"
+        )
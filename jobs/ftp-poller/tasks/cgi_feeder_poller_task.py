@@ -21,6 +21,7 @@ from pay_api.services.google_bucket_service import GoogleBucketService
 from sbc_common_components.utils.enums import QueueMessageTypes
 
 from services.sftp import SFTPService
+from services.transfer import TransferService
 from utils import utils
 
 
@@ -62,10 +63,12 @@ class CGIFeederPollerTask:  # pylint:disable=too-few-public-methods
                         )
                         cls._move_file_to_backup(sftp_client, [file_name])
                     elif cls._is_feedback_file(file_name):
-                        file_bytes = utils.read_sftp_file(sftp_client, file_full_name)
-                        GoogleBucketService.upload_file_bytes_to_bucket_folder(
-                            bucket, cgi_feedback_folder_name, file.filename, file_bytes
+                        # A file that fails to transfer stays on the SFTP server and is picked up by the next poll.
+                        [result] = TransferService.sftp_to_bucket(
+                            "CGI", ftp_dir, [file], bucket, cgi_feedback_folder_name
                         )
+                        if result.error is not None:
+                            continue
                         utils.publish_to_queue(
                             [file_name],
                             QueueMessageTypes.CGI_FEEDBACK_MESSAGE_TYPE.value,
@@ -21,7 +21,7 @@ from pay_api.services.google_bucket_service import GoogleBucketService
 from sbc_common_components.utils.enums import QueueMessageTypes
 
 from services.sftp import SFTPService
-from utils import utils
+from services.transfer import TransferService
 from utils.utils import publish_to_queue
 
 
@@ -35,7 +35,7 @@ class EFTPollerFtpTask:  # pylint:disable=too-few-public-methods
         Steps:
         1. List Files.
         2. If file exists ,
-                copy to google bucket
+                stream to google bucket, several files at a time
                 archive to back up folder
                 send jms message
         """
@@ -51,16 +51,15 @@ class EFTPollerFtpTask:  # pylint:disable=too-few-public-methods
                 bucket = GoogleBucketService.get_bucket(google_storage_client, bucket_name)
                 bucket_folder_name = current_app.config.get("GOOGLE_BUCKET_FOLDER_EFT")
 
+                payment_files: List[SFTPAttributes] = []
                 for file in file_list:
-                    file_name = file.filename
-                    file_full_name = ftp_dir + "/" + file_name
-                    current_app.logger.info(f"Processing file  {file_full_name} started-----.")
+                    file_full_name = ftp_dir + "/" + file.filename
                     if EFTPollerFtpTask._is_valid_payment_file(sftp_client, file_full_name):
-                        file_bytes = utils.read_sftp_file(sftp_client, file_full_name)
-                        GoogleBucketService.upload_file_bytes_to_bucket_folder(
-                            bucket, bucket_folder_name, file.filename, file_bytes
-                        )
-                        payment_file_list.append(file_name)
+                        payment_files.append(file)
+
+                # Files that fail to transfer stay on the SFTP server and are picked up by the next poll.
+                results = TransferService.sftp_to_bucket("EFT", ftp_dir, payment_files, bucket, bucket_folder_name)
+                payment_file_list = [result.file_name for result in results if result.error is None]
 
                 if len(payment_file_list) > 0:
                     EFTPollerFtpTask._post_process(sftp_client, payment_file_list, bucket_folder_name)
@@ -1,12 +1,11 @@
 """Google Bucket Poller."""
 
-import os
 import traceback
 
 from flask import current_app
 from pay_api.services.google_bucket_service import GoogleBucketService
 
-from services.sftp import SFTPService
+from services.transfer import TransferService
 
 
 class GoogleBucketPollerTask:
@@ -19,19 +18,18 @@ class GoogleBucketPollerTask:
             current_app.logger.info("Polling Google bucket for EJV files.")
             google_storage_client = GoogleBucketService.get_client()
             bucket = GoogleBucketService.get_bucket(google_storage_client, current_app.config.get("GOOGLE_BUCKET_NAME"))
-            file_paths = GoogleBucketService.get_files_from_bucket_folder(
+            blobs = GoogleBucketService.get_blobs_from_bucket_folder(
                 bucket, current_app.config.get("GOOGLE_BUCKET_FOLDER_CGI_PROCESSING")
             )
-            GoogleBucketPollerTask._upload_to_sftp(file_paths)
-            GoogleBucketPollerTask._move_to_processed_folder(bucket, file_paths)
+            uploaded_file_names = GoogleBucketPollerTask._upload_to_sftp(blobs)
+            GoogleBucketPollerTask._move_to_processed_folder(bucket, uploaded_file_names)
         except Exception as e:  # NOQA # pylint: disable=broad-except
             current_app.logger.error(f"{{error: {str(e)}, stack_trace: {traceback.format_exc()}}}")
 
     @staticmethod
-    def _move_to_processed_folder(bucket, file_paths):
+    def _move_to_processed_folder(bucket, file_names):
         """Move files from processing to processed folder."""
-        for file_path in file_paths:
-            file_name = os.path.basename(file_path)
+        for file_name in file_names:
             GoogleBucketService.move_file_in_bucket(
                 bucket,
                 current_app.config.get("GOOGLE_BUCKET_FOLDER_CGI_PROCESSING"),
@@ -40,18 +38,15 @@ class GoogleBucketPollerTask:
             )
 
     @staticmethod
-    def _upload_to_sftp(file_paths):
-        """Handle SFTP upload for these files."""
-        if not file_paths:
-            return
+    def _upload_to_sftp(blobs) -> list[str]:
+        """Stream these blobs to SFTP, returning the names of the files uploaded.
+
+        Files that fail stay in the processing folder and are picked up by the next poll.
+        """
+        if not blobs:
+            return []
         current_app.logger.info("Uploading files via SFTP to CAS.")
-        with SFTPService.get_connection("CGI") as sftp_client:
-            for file_path in file_paths:
-                current_app.logger.info(f"Uploading file: {file_path}")
-                ftp_dir: str = current_app.config.get("CGI_SFTP_DIRECTORY")
-                target_file = os.path.basename(file_path)
-                sftp_client.chdir(ftp_dir)
-                sftp_client.put(file_path, target_file)
-                current_app.logger.info(f"Uploaded file from: {file_path} to {ftp_dir}/{target_file}")
-                os.remove(file_path)
+        ftp_dir: str = current_app.config.get("CGI_SFTP_DIRECTORY")
+        results = TransferService.bucket_to_sftp("CGI", blobs, ftp_dir)
         current_app.logger.info("Uploading files via SFTP done.")
+        return [result.file_name for result in results if result.error is None]
@@ -0,0 +1,114 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to assure the TransferService.
+
+Test-Suite to ensure that streaming transfers between SFTP and the bucket are working as expected.
+"""
+import base64
+import hashlib
+import io
+from unittest.mock import MagicMock
+
+from flask import current_app
+
+from services.sftp import SFTPService
+from services.transfer import SFTPConnectionPool, TransferService
+
+
+def test_sftp_to_bucket():
+    """Test SFTP files are streamed to resumable, checksummed bucket uploads."""
+    ftp_dir: str = current_app.config.get("CAS_SFTP_DIRECTORY")
+    with SFTPService.get_connection() as sftp_client:
+        files = sftp_client.listdir_attr(ftp_dir)
+
+    uploaded = {}
+
+    def _upload_from_file(file_obj, size, **kwargs):
+        uploaded[size] = (len(file_obj.read()), kwargs)
+
+    bucket = MagicMock()
+    bucket.blob.return_value.upload_from_file.side_effect = _upload_from_file
+    results = TransferService.sftp_to_bucket("CAS", ftp_dir, files, bucket, "ar")
+
+    assert [result.file_name for result in results] == [file.filename for file in files]
+    assert all(result.error is None for result in results)
+    for file, result in zip(files, results):
+        assert result.bytes == file.st_size
+        read_bytes, kwargs = uploaded[file.st_size]
+        assert read_bytes == file.st_size
+        assert kwargs["checksum"] == "crc32c"
+    assert bucket.blob.return_value.chunk_size == current_app.config.get("FTP_TRANSFER_CHUNK_SIZE")
+
+
+def test_sftp_to_bucket_failure():
+    """Test a failed upload is reported without stopping the other files."""
+    ftp_dir: str = current_app.config.get("CAS_SFTP_DIRECTORY")
+    with SFTPService.get_connection() as sftp_client:
+        files = sftp_client.listdir_attr(ftp_dir)
+
+    bucket = MagicMock()
+    bucket.blob.return_value.upload_from_file.side_effect = ValueError("checksum mismatch")
+    results = TransferService.sftp_to_bucket("CAS", ftp_dir, files, bucket, "ar")
+
+    assert len(results) == len(files)
+    assert all(isinstance(result.error, ValueError) for result in results)
+
+
+def test_sftp_connection_pool_reuses_connections():
+    """Test the pool hands back an idle connection instead of opening another."""
+    with SFTPConnectionPool("CAS", 2) as pool:
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            assert second is first
+
+
+def _blob(name: str, content: bytes, md5_hash: str):
+    blob = MagicMock()
+    blob.name = f"cgi/processing/{name}"
+    blob.size = len(content)
+    blob.md5_hash = md5_hash
+    blob.open.side_effect = lambda *args, **kwargs: io.BytesIO(content)
+    return blob
+
+
+def test_bucket_to_sftp():
+    """Test blobs are uploaded under a temporary name and renamed once verified."""
+    ftp_dir: str = current_app.config.get("CGI_SFTP_DIRECTORY")
+    content = b"ejv file content"
+    md5_hash = base64.b64encode(hashlib.md5(content, usedforsecurity=False).digest()).decode("utf-8")
+
+    [result] = TransferService.bucket_to_sftp("CGI", [_blob("test_transfer.txt", content, md5_hash)], ftp_dir)
+
+    assert result.error is None
+    assert result.bytes == len(content)
+    with SFTPService.get_connection("CGI") as sftp_client:
+        assert [name for name in sftp_client.listdir(ftp_dir) if name.endswith(".part")] == []
+        with sftp_client.open(f"{ftp_dir}/test_transfer.txt", "rb") as sftp_file:
+            assert sftp_file.read() == content
+        sftp_client.remove(f"{ftp_dir}/test_transfer.txt")
+
+
+def test_bucket_to_sftp_checksum_mismatch():
+    """Test a blob failing the md5 check leaves neither the file nor its temporary upload behind."""
+    ftp_dir: str = current_app.config.get("CGI_SFTP_DIRECTORY")
+    blob = _blob("test_transfer_mismatch.txt", b"ejv file content", "bm90LXRoZS1tZDU=")
+
+    [result] = TransferService.bucket_to_sftp("CGI", [blob], ftp_dir)
+
+    assert isinstance(result.error, ValueError)
+    with SFTPService.get_connection("CGI") as sftp_client:
+        names = sftp_client.listdir(ftp_dir)
+    assert "test_transfer_mismatch.txt" not in names
+    assert [name for name in names if name.endswith(".part")] == []
@@ -27,11 +27,12 @@ def publish_to_queue(
 ):
     """Publish message to the Queue, saying file has been uploaded. Using the event spec."""
     queue_data = {"fileSource": "GOOGLE_BUCKET", "location": location or current_app.config["GOOGLE_BUCKET_FOLDER_AR"]}
+    futures = {}
     for file_name in payment_file_list:
         queue_data["fileName"] = file_name
 
         try:
-            gcp_queue_publisher.publish_to_queue(
+            future = gcp_queue_publisher.publish_to_queue(
                 QueueMessage(
                     source=QueueSources.FTP_POLLER.value,
                     message_type=message_type,
@@ -43,11 +44,13 @@ def publish_to_queue(
         except Exception as e:  # NOQA # pylint: disable=broad-except
             current_app.logger.warning(f"Notification to Queue failed for the file {file_name}", e)
             raise
+        if future:
+            futures[file_name] = future
 
-
-def read_sftp_file(sftp_client, file_full_name):
-    """Read the contents of a file from an SFTP server."""
-    with sftp_client.open(file_full_name, "rb") as f:
-        f.prefetch()
-        value_as_bytes = f.read()
-        return value_as_bytes
+    # In async publish mode the files are published in the background, wait for them all before returning.
+    for file_name, future in futures.items():
+        try:
+            future.result()
+        except Exception as e:  # NOQA # pylint: disable=broad-except
+            current_app.logger.warning(f"Notification to Queue failed for the file {file_name}", e)
+            raise
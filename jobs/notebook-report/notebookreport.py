@@ -22,6 +22,7 @@ from util.helpers import (
     get_first_last_week_dates_in_utc,
 )
 from util.logging import setup_logging
+from util.reconciliation import ReconciliationReportEngine
 
 setup_logging(os.path.join(os.path.abspath(os.path.dirname(__file__)), "logging.conf"))  # important to do this first
 
@@ -151,24 +152,46 @@ def process_partner_notebooks(data_dir: str):
     logging.info(f"Weekly running report dates: {Config.WEEKLY_REPORT_DATES}")
     if today.isoweekday() in Config.WEEKLY_REPORT_DATES:
         from_date, to_date = get_first_last_week_dates_in_utc(Config.OVERRIDE_CURRENT_DATE)
-        for partner_code in Config.WEEKLY_RECONCILIATION_PARTNERS.replace('"', "").split(","):
-            if len(partner_code) < 2:
-                continue
-            logging.info(
-                "Processing weekly notebooks for partner: %s using dates: %s to %s ", partner_code, from_date, to_date
-            )
-            execute_notebook(ReportFiles.RECONCILIATION_SUMMARY.value, data_dir, from_date, to_date, partner_code)
+        partner_codes = get_partner_codes(Config.WEEKLY_RECONCILIATION_PARTNERS)
+        logging.info(
+            "Processing weekly reports for partners: %s using dates: %s to %s", partner_codes, from_date, to_date
+        )
+        execute_reconciliation_reports(data_dir, from_date, to_date, partner_codes)
 
     logging.info(f"Monthly running report dates: {Config.MONTHLY_REPORT_DATES}")
     if today.day in Config.MONTHLY_REPORT_DATES:
         from_date, to_date = get_first_last_month_dates_in_utc(Config.OVERRIDE_CURRENT_DATE)
-        for partner_code in Config.MONTHLY_RECONCILIATION_PARTNERS.replace('"', "").split(","):
-            if len(partner_code) < 2:
-                continue
-            logging.info(
-                "Processing monthly notebooks for partner: %s using dates: %s to %s", partner_code, from_date, to_date
-            )
-            execute_notebook(ReportFiles.RECONCILIATION_SUMMARY.value, data_dir, from_date, to_date, partner_code)
+        partner_codes = get_partner_codes(Config.MONTHLY_RECONCILIATION_PARTNERS)
+        logging.info(
+            "Processing monthly reports for partners: %s using dates: %s to %s", partner_codes, from_date, to_date
+        )
+        execute_reconciliation_reports(data_dir, from_date, to_date, partner_codes)
+
+
+def get_partner_codes(partners: str) -> list[str]:
+    """Return the partner codes from a comma separated config value."""
+    return [partner_code for partner_code in partners.replace('"', "").split(",") if len(partner_code) >= 2]
+
+
+def execute_reconciliation_reports(data_dir: str, from_date: str, to_date: str, partner_codes: list[str]):
+    """Generate the reconciliation reports for all partners from one scan of the window, then email each partner."""
+    if not partner_codes:
+        return
+    file = ReportFiles.RECONCILIATION_SUMMARY.value
+    try:
+        results = ReconciliationReportEngine(from_date, to_date, partner_codes, data_dir).run()
+    except Exception:  # noqa: B902
+        logging.exception("Error: %s.", file)
+        build_and_send_email(ReportData(file, traceback.format_exc()))
+        return
+    for partner_code, result in results.items():
+        try:
+            if result.error_message:
+                build_and_send_email(ReportData(file, result.error_message))
+            else:
+                build_and_send_email(ReportData(file, None, from_date, to_date, partner_code))
+        except Exception:  # noqa: B902
+            logging.exception("Error sending reconciliation report for %s.", partner_code)
 
 
 def execute_notebook(file: str, data_dir: str, from_date=None, to_date=None, partner_code=None):
@@ -0,0 +1,69 @@
+"""Tests for the reconciliation report engine."""
+
+from datetime import date, datetime
+
+import pandas as pd
+
+from util.reconciliation import ReconciliationReportEngine
+
+
+def _engine(tmp_path, partner_codes):
+    return ReconciliationReportEngine(
+        "2024-01-01 08:00:00", "2024-02-01 08:00:00", partner_codes, str(tmp_path), engine=object()
+    )
+
+
+def test_partition_and_write_csv(tmp_path, monkeypatch):
+    """Rows from one scan are split per partner, partners without rows still get a CSV."""
+    monkeypatch.setattr("util.reconciliation.Config.PARTNER_CODES_DISBURSEMENT", "VS")
+    engine = _engine(tmp_path, ["VS", "CSO"])
+    summary = pd.DataFrame(
+        [
+            {
+                "transaction_id": 1,
+                "corp_type_code": "VS",
+                "invoice_status_code": "PAID",
+                "payment_date": datetime(2024, 1, 10),
+                "total": 50.0,
+            },
+            {
+                "transaction_id": 2,
+                "corp_type_code": "VS",
+                "invoice_status_code": "REFUNDED",
+                "payment_date": datetime(2024, 1, 11),
+                "total": 25.0,
+            },
+        ]
+    )
+    disbursed = pd.DataFrame(
+        [
+            {
+                "transaction_id": 1,
+                "corp_type_code": "VS",
+                "disbursement_status_code": "COMPLETED",
+                "disbursement_date_pacific": date(2024, 1, 12),
+                "disbursement_reversal_date_pacific": None,
+                "disbursement_in_reporting_period": 45.0,
+                "stat_fee_gst": 2.0,
+            }
+        ]
+    )
+
+    results = engine.partition(summary, disbursed)
+    assert list(results["VS"].summary["transaction_id"]) == [1, 2]
+    assert results["CSO"].summary.empty
+    assert results["CSO"].disbursed is None
+
+    for result in results.values():
+        engine.write_csv(result)
+    assert (tmp_path / "VS_reconciliation_summary_2024-01-01_2024-01-31.csv").exists()
+    assert (tmp_path / "VS_reconciliation_disbursed_2024-01-01_2024-01-31.csv").exists()
+    cso_summary = tmp_path / "CSO_reconciliation_summary_2024-01-01_2024-01-31.csv"
+    assert cso_summary.read_text().endswith("No Data Retrieved")
+    assert not (tmp_path / "CSO_reconciliation_disbursed_2024-01-01_2024-01-31.csv").exists()
+
+    table_rows, disbursed_gst_amount = engine.build_table_rows(results["VS"])
+    assert table_rows[0]["totalPayment"] == "$ 50.00"
+    assert table_rows[0]["transactionCounts"] == "1"
+    assert table_rows[0]["totalDisbursement"] == "$ 45.00"
+    assert disbursed_gst_amount == 2.0
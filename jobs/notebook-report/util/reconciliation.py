@@ -0,0 +1,491 @@
+"""Reconciliation report engine, generates every partner's reconciliation reports from one scan of the window.
+
+The reconciliation queries, CSV layout and revenue letter live here only, the reconciliation_summary notebook runs
+this engine for a single partner. The window is queried once for all partners and the rows are partitioned by
+partner in memory.
+"""
+
+import logging
+import os
+import time
+import traceback
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+
+import pandas as pd
+import requests
+from sqlalchemy import bindparam, create_engine, text
+
+from config import Config, get_conn
+from util.helpers import convert_utc_date_to_inclusion_dates, get_auth_token
+
+logger = logging.getLogger(__name__)
+
+PARTNER_DETAILS = {
+    "CSO": {
+        "companyName": "Ministry of Justice",
+        "addressLine1": "PO Box 9249, Stn Prov Govt",
+        "addressLine2": "6th Floor, 850 Burdett Avenue",
+        "city": "VICTORIA",
+        "province": "BC",
+        "areaCode": "V8W 9J2",
+    },
+    "VS": {
+        "companyName": "Vital Statistics Agency",
+        "addressLine1": "PO Box 9657, Stn Prov Govt",
+        "addressLine2": "",
+        "city": "VICTORIA",
+        "province": "BC",
+        "areaCode": "V8W 9P3",
+    },
+    "RPT": {
+        "companyName": "Property Taxation Branch",
+        "addressLine1": "Ministry of Provincial Revenue",
+        "addressLine2": "4th Floor, 1802 Douglas Street",
+        "city": "VICTORIA",
+        "province": "BC",
+        "areaCode": "V8T 4K6",
+    },
+    "ESRA": {
+        "companyName": "Site Remediation Program, Authorizations and Remediation Branch",
+        "addressLine1": "Ministry of Environment and Parks",
+        "addressLine2": "525 Superior Street, 3rd floor",
+        "city": "VICTORIA",
+        "province": "BC",
+        "areaCode": "V8V 0C5",
+    },
+    "STRR": {
+        "companyName": "Ministry of Housing and Municipal Affairs",
+        "addressLine1": "PO BOX 9844, STN PROV GOVT",
+        "addressLine2": "4th Floor, 614 Humboldt Street",
+        "city": "VICTORIA",
+        "province": "BC",
+        "areaCode": "V8W 1A4",
+    },
+    "BCA": {
+        "companyName": "British Columbia Assessment Authority",
+        "addressLine1": "400-3450 Uptown Blvd",
+        "addressLine2": "",
+        "city": "VICTORIA",
+        "province": "BC",
+        "areaCode": "V8Z 0B9",
+    },
+}
+
+PAYMENT_LINE_ITEMS = """
+    (select string_agg(quantity || 'x - ' || filing_type_code || ' - ' || description || ' - $' || pli.total, ',')
+     from payment_line_items pli join fee_schedules fs on fs.fee_schedule_id = pli.fee_schedule_id
+     where invoice_id = i.id) as payment_line_items
+"""
+
+SUMMARY_QUERY = f"""
+SELECT
+    i.id as transaction_id,
+    (created_on AT TIME ZONE 'UTC' AT TIME ZONE 'America/Vancouver')::date AS created_date_pacific,
+    created_name,
+    pa.auth_account_id as account_number,
+    pa.name as account_name,
+    total - service_fees - coalesce(gst, 0.00) as stat_fee,
+    pli_summary.statutory_fees_gst as stat_fee_gst,
+    service_fees,
+    pli_summary.service_fees_gst as service_fee_gst,
+    total - refund as subtotal,
+    coalesce(gst, 0.00) as gst_total,
+    total,
+    refund,
+    payment_method_code,
+    corp_type_code,
+    payment_date,
+    refund_date,
+    invoice_status_code,
+    folio_number,
+    {PAYMENT_LINE_ITEMS}
+FROM
+    invoices i
+LEFT JOIN
+    payment_accounts pa ON i.payment_account_id = pa.id
+LEFT JOIN (
+        SELECT
+            pli.invoice_id,
+            SUM(pli.statutory_fees_gst) statutory_fees_gst,
+            SUM(pli.service_fees_gst) service_fees_gst
+        FROM payment_line_items pli
+        GROUP BY pli.invoice_id
+    ) pli_summary on pli_summary.invoice_id = i.id
+WHERE
+    corp_type_code IN :partner_codes
+    AND total > 0
+    AND invoice_status_code in ('PAID', 'CREDITED', 'REFUNDED', 'REFUND_REQUESTED')
+    AND payment_method_code in ('PAD', 'EJV', 'EFT', 'DIRECT_PAY', 'ONLINE_BANKING')
+    AND ((payment_date >= :from_date and payment_date <= :to_date)
+         OR (refund_date >= :from_date and refund_date <= :to_date))
+ORDER BY
+    CASE
+        WHEN refund_date IS NOT NULL AND invoice_status_code = 'PAID' THEN 1
+        ELSE 0
+    END,
+    i.id;
+"""
+
+DISBURSEMENT_QUERY = f"""
+SELECT
+    i.id as transaction_id,
+    (created_on AT TIME ZONE 'UTC' AT TIME ZONE 'America/Vancouver')::date AS created_date_pacific,
+    created_name,
+    pa.auth_account_id as account_number,
+    pa.name as account_name,
+    total - service_fees - coalesce(gst, 0.00) as stat_fee,
+    pli_summary.statutory_fees_gst as stat_fee_gst,
+    service_fees,
+    pli_summary.service_fees_gst as service_fee_gst,
+    total - refund as subtotal,
+    coalesce(gst, 0.00) as gst_total,
+    total,
+    refund,
+    disbursement_summary.disbursed_amount,
+    disbursement_summary.reversed_amount,
+    nd.disbursement_in_reporting_period,
+    payment_method_code,
+    corp_type_code,
+    payment_date,
+    refund_date,
+    invoice_status_code,
+    folio_number,
+    disbursement_date::date as disbursement_date_pacific,
+    disbursement_reversal_date::date disbursement_reversal_date_pacific,
+    disbursement_status_code,
+    feedback_on::date as partial_refund_disbursement_reversal_date_pacific,
+    {PAYMENT_LINE_ITEMS}
+FROM
+    invoices i
+LEFT JOIN
+    payment_accounts pa ON i.payment_account_id = pa.id
+LEFT JOIN (
+    SELECT
+        rp.invoice_id,
+        SUM(rp.refund_amount) AS total_refund,
+        max(pd.feedback_on) as feedback_on
+    FROM refunds_partial rp
+    JOIN partner_disbursements pd
+        ON pd.target_id = rp.id
+        AND pd.target_type = 'partial_refund'
+    WHERE pd.feedback_on BETWEEN :from_date_disbursement AND :to_date_disbursement
+    GROUP BY rp.invoice_id
+) rp ON rp.invoice_id = i.id
+LEFT JOIN (
+    SELECT
+        pli.invoice_id,
+        SUM(pli.statutory_fees_gst) statutory_fees_gst,
+        SUM(pli.service_fees_gst) service_fees_gst
+    FROM payment_line_items pli
+    GROUP BY pli.invoice_id
+) pli_summary on pli_summary.invoice_id = i.id
+LEFT JOIN LATERAL(
+    SELECT
+        total - service_fees - coalesce(gst, 0.00) + pli_summary.statutory_fees_gst as disbursed_amount,
+        CASE
+            WHEN refund - service_fees - pli_summary.service_fees_gst < 0 THEN 0
+            ELSE refund - service_fees - pli_summary.service_fees_gst
+        END AS reversed_amount
+) disbursement_summary ON TRUE
+LEFT JOIN LATERAL (
+    SELECT
+        CASE
+            WHEN disbursement_status_code = 'COMPLETED' THEN
+                CASE
+                    WHEN disbursement_date BETWEEN :from_date_disbursement AND :to_date_disbursement
+                         AND rp.feedback_on BETWEEN :from_date_disbursement AND :to_date_disbursement
+                        THEN disbursement_summary.disbursed_amount - disbursement_summary.reversed_amount
+                    WHEN rp.feedback_on BETWEEN :from_date_disbursement AND :to_date_disbursement
+                        THEN -disbursement_summary.reversed_amount
+                    WHEN disbursement_date BETWEEN :from_date_disbursement AND :to_date_disbursement
+                        THEN disbursement_summary.disbursed_amount
+                    ELSE 0
+                END
+            WHEN disbursement_status_code = 'REVERSED' THEN
+                CASE
+                    WHEN disbursement_date BETWEEN :from_date_disbursement AND :to_date_disbursement
+                         AND disbursement_reversal_date BETWEEN :from_date_disbursement AND :to_date_disbursement
+                        THEN disbursement_summary.disbursed_amount - disbursement_summary.reversed_amount
+                    WHEN disbursement_reversal_date BETWEEN :from_date_disbursement AND :to_date_disbursement
+                        THEN -disbursement_summary.reversed_amount
+                    WHEN disbursement_date BETWEEN :from_date_disbursement AND :to_date_disbursement
+                        THEN disbursement_summary.disbursed_amount
+                    ELSE 0
+                END
+            ELSE 0
+        END AS disbursement_in_reporting_period
+) nd ON TRUE
+WHERE corp_type_code IN :partner_codes
+AND invoice_status_code in ('PAID', 'CREDITED', 'REFUNDED')
+AND payment_method_code in ('PAD','EJV', 'EFT', 'DIRECT_PAY', 'ONLINE_BANKING')
+AND ((disbursement_date >= :from_date_disbursement AND disbursement_date <= :to_date_disbursement)
+    OR (disbursement_reversal_date >= :from_date_disbursement AND disbursement_reversal_date <= :to_date_disbursement)
+    OR (feedback_on >= :from_date_disbursement AND feedback_on <= :to_date_disbursement))
+ORDER BY feedback_on ASC NULLS FIRST, i.id;
+"""
+
+STAT_FEE_GST_GL_QUERY = """
+SELECT DISTINCT ON (fs.corp_type_code)
+    fs.corp_type_code,
+    dc.client
+        || '.' || dc.responsibility_centre
+        || '.' || dc.service_line
+        || '.' || dc.stob
+        || '.' || dc.project_code AS distribution_string
+FROM fee_schedules fs
+JOIN distribution_code_links dcl on dcl.fee_schedule_id = fs.fee_schedule_id
+JOIN distribution_codes dc on dc.distribution_code_id = dcl.distribution_code_id
+WHERE fs.corp_type_code IN :partner_codes
+  AND dc.statutory_fees_gst_distribution_code_id is not null
+ORDER BY fs.corp_type_code
+"""
+
+
+@dataclass
+class PartnerReconciliation:
+    """Reconciliation output for one partner."""
+
+    partner_code: str
+    summary: pd.DataFrame
+    disbursed: pd.DataFrame | None = None
+    files: list[str] = field(default_factory=list)
+    error_message: str | None = None
+
+
+def get_engine():
+    """Return a database engine for the pay database."""
+    if Config.CLOUDSQL_INSTANCE_CONNECTION_NAME and Config.DB_NAME and Config.DB_USER:
+        return create_engine("postgresql+pg8000://", creator=get_conn)
+    return create_engine(Config.SQLALCHEMY_DATABASE_URI)
+
+
+class ReconciliationReportEngine:
+    """Generate reconciliation CSVs and revenue letters for many partners from one query per dataset."""
+
+    def __init__(self, from_date: str, to_date: str, partner_codes: list[str], data_dir: str, engine=None):
+        """Initialize the engine for a UTC window, dates are in the %Y-%m-%d %H:%M:%S format."""
+        self.from_date = from_date
+        self.to_date = to_date
+        self.partner_codes = partner_codes
+        self.data_dir = data_dir
+        self.engine = engine
+        # Disbursement dates are date only and come straight from the feedback files.
+        self.from_date_disbursement = datetime.strptime(from_date.split(" ")[0], "%Y-%m-%d").date()
+        self.to_date_disbursement = datetime.strptime(to_date.split(" ")[0], "%Y-%m-%d").date()
+        self.disbursement_partner_codes = [
+            partner_code
+            for partner_code in Config.PARTNER_CODES_DISBURSEMENT.split(",")
+            if partner_code in partner_codes
+        ]
+        self.date_string, _ = convert_utc_date_to_inclusion_dates(from_date, to_date)
+        self.timings: dict[str, float] = {}
+
+    @contextmanager
+    def _stage(self, name: str):
+        """Time a stage of the report."""
+        start = time.monotonic()
+        yield
+        self.timings[name] = round(time.monotonic() - start, 3)
+        logger.info("Reconciliation stage %s completed in %ss", name, self.timings[name])
+
+    def run(self) -> dict[str, PartnerReconciliation]:
+        """Generate the reports for every partner, a failed revenue letter only fails that partner."""
+        engine = self.engine or get_engine()
+        with engine.connect() as connection:
+            connection.execute(text("set time zone 'UTC'"))
+            with self._stage("summary_query"):
+                summary = self._query(connection, SUMMARY_QUERY, self.partner_codes)
+            with self._stage("disbursement_query"):
+                disbursed = (
+                    self._query(connection, DISBURSEMENT_QUERY, self.disbursement_partner_codes)
+                    if self.disbursement_partner_codes
+                    else None
+                )
+            with self._stage("stat_fee_gst_gl_query"):
+                gst_gls = self._query(connection, STAT_FEE_GST_GL_QUERY, self.partner_codes)
+                gst_gls = dict(zip(gst_gls["corp_type_code"], gst_gls["distribution_string"], strict=True))
+
+        with self._stage("partition"):
+            results = self.partition(summary, disbursed)
+
+        with self._stage("write_csv"):
+            for result in results.values():
+                self.write_csv(result)
+
+        with self._stage("revenue_letters"):
+            token = get_auth_token()
+            for result in results.values():
+                try:
+                    if pdf_filename := self.generate_revenue_letter(result, gst_gls.get(result.partner_code), token):
+                        result.files.append(pdf_filename)
+                except Exception:  # noqa: B902
+                    logger.exception("Error generating revenue letter for %s.", result.partner_code)
+                    result.error_message = traceback.format_exc()
+
+        logger.info("Reconciliation reports for %s completed, stage timings: %s", self.partner_codes, self.timings)
+        return results
+
+    def _query(self, connection, query: str, partner_codes: list[str]) -> pd.DataFrame:
+        """Run a query for the window and partners."""
+        statement = text(query).bindparams(bindparam("partner_codes", expanding=True))
+        return pd.read_sql(
+            statement,
+            connection,
+            params={
+                "partner_codes": partner_codes,
+                "from_date": self.from_date,
+                "to_date": self.to_date,
+                "from_date_disbursement": self.from_date_disbursement,
+                "to_date_disbursement": self.to_date_disbursement,
+            },
+        )
+
+    def partition(self, summary: pd.DataFrame, disbursed: pd.DataFrame | None) -> dict[str, PartnerReconciliation]:
+        """Split the window's rows by partner, partners without rows get an empty frame."""
+        summary_by_partner = dict(tuple(summary.groupby("corp_type_code", sort=False)))
+        disbursed_by_partner = {}
+        if disbursed is not None:
+            disbursed_by_partner = dict(tuple(disbursed.groupby("corp_type_code", sort=False)))
+        results = {}
+        for partner_code in self.partner_codes:
+            partner_disbursed = None
+            if partner_code in self.disbursement_partner_codes:
+                partner_disbursed = disbursed_by_partner.get(partner_code, disbursed.iloc[0:0])
+            results[partner_code] = PartnerReconciliation(
+                partner_code=partner_code,
+                summary=summary_by_partner.get(partner_code, summary.iloc[0:0]),
+                disbursed=partner_disbursed,
+            )
+        return results
+
+    def write_csv(self, result: PartnerReconciliation):
+        """Write the summary and disbursement CSVs for a partner."""
+        date_suffix = self.date_string.replace(" to ", "_")
+        summary_file = os.path.join(self.data_dir, f"{result.partner_code}_reconciliation_summary_{date_suffix}.csv")
+        self._write_frame(
+            summary_file,
+            f"Reconciliation Summary: {self.date_string} - Note: this includes more payment statuses than just PAID. "
+            "This is based off of payment_date and refund_date.\n\n",
+            result.summary,
+        )
+        result.files.append(summary_file)
+        if result.disbursed is not None:
+            disbursed_file = os.path.join(
+                self.data_dir, f"{result.partner_code}_reconciliation_disbursed_{date_suffix}.csv"
+            )
+            self._write_frame(
+                disbursed_file,
+                f"Reconciliation Disbursed: {self.date_string} - Note: this includes disbursement reversals as well. "
+                "This is based off of the disbursement_date and disbursement_reversal_date.\n\n",
+                result.disbursed,
+            )
+            result.files.append(disbursed_file)
+
+    @staticmethod
+    def _write_frame(file_name: str, header: str, frame: pd.DataFrame):
+        with open(file_name, "w") as f:
+            f.write(header)
+            if frame is None or frame.empty:
+                f.write("No Data Retrieved")
+            else:
+                frame.to_csv(f, sep=",", encoding="utf-8", index=False)
+
+    def build_table_rows(self, result: PartnerReconciliation) -> tuple[list[dict], float]:
+        """Return the revenue letter table rows and the disbursed statutory fee GST."""
+        if result.summary.empty:
+            table_rows = [
+                {
+                    "registry": result.partner_code,
+                    "transactionCounts": 0,
+                    "totalPayment": 0,
+                    "totalDisbursement": 0,
+                    "totalStatFeeGst": 0,
+                }
+            ]
+            return table_rows, 0
+
+        summary = result.summary
+        from_date, to_date = pd.Timestamp(self.from_date), pd.Timestamp(self.to_date)
+        paid_only = summary[
+            (summary["invoice_status_code"] == "PAID")
+            & (summary["payment_date"] >= from_date)
+            & (summary["payment_date"] <= to_date)
+        ]["total"]
+        disbursed_total_amount = 0
+        disbursed_gst_amount = 0
+        reversed_gst_amount = 0
+        disbursed = result.disbursed
+        if disbursed is not None and not disbursed.empty:
+            disbursed_rows = disbursed[
+                (disbursed["disbursement_status_code"] == "COMPLETED")
+                & (disbursed["disbursement_date_pacific"] >= self.from_date_disbursement)
+                & (disbursed["disbursement_date_pacific"] <= self.to_date_disbursement)
+            ]
+            reversal_rows = disbursed[
+                (disbursed["disbursement_status_code"] == "REVERSED")
+                & (disbursed["disbursement_reversal_date_pacific"] >= self.from_date_disbursement)
+                & (disbursed["disbursement_reversal_date_pacific"] <= self.to_date_disbursement)
+            ]
+            disbursed_total_amount = disbursed["disbursement_in_reporting_period"].sum()
+            disbursed_gst_amount = disbursed_rows["stat_fee_gst"].sum()
+            reversed_gst_amount = reversal_rows["stat_fee_gst"].sum()
+
+        table_rows = [
+            {
+                "registry": result.partner_code,
+                "totalPayment": f"$ {paid_only.sum():,.2f}",
+                "transactionCounts": f"{paid_only.count():,.0f}",
+                "totalDisbursement": f"$ {disbursed_total_amount:,.2f}",
+                "totalDisbursementGst": f"$ {disbursed_gst_amount - reversed_gst_amount:,.2f}",
+            }
+        ]
+        return table_rows, disbursed_gst_amount
+
+    def generate_revenue_letter(self, result: PartnerReconciliation, gst_gl: str | None, token: str) -> str | None:
+        """Render the revenue letter PDF for a partner through the report api, returns the file name."""
+        if not Config.REPORT_API_URL:
+            raise ValueError("The REPORT_API_URL environment variable is not set or is empty")
+        details = PARTNER_DETAILS.get(result.partner_code)
+        if not details:
+            raise ValueError(f"No details found for partner code: {result.partner_code}")
+
+        table_rows, disbursed_gst_amount = self.build_table_rows(result)
+        date_range, _ = convert_utc_date_to_inclusion_dates(self.from_date, self.to_date, "full")
+        data = {
+            "templateVars": {
+                "date": datetime.now(tz=UTC).strftime("%B %d, %Y"),
+                "companyName": details["companyName"],
+                "addressLine1": details["addressLine1"],
+                "addressLine2": details["addressLine2"],
+                "city": details["city"],
+                "province": details["province"],
+                "areaCode": details["areaCode"],
+                "firstName": result.partner_code,
+                "dateRange": date_range,
+                "tableRows": table_rows,
+                "hasGst": disbursed_gst_amount > 0,
+                "gstGL": gst_gl,
+            },
+            "templateName": "revenue_letter",
+            "reportName": "revenue_letter",
+        }
+        response = requests.post(
+            Config.REPORT_API_URL + "/reports",
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+                "Accept": "application/pdf",
+            },
+            json=data,
+        )
+        if response.status_code != 200:
+            logger.error("Failed to get the revenue letter for %s: %s", result.partner_code, response.text)
+            return None
+        pdf_filename = os.path.join(
+            self.data_dir, f"{result.partner_code}_revenue_letter_{self.date_string.replace(' to ', '_')}.pdf"
+        )
+        with open(pdf_filename, "wb") as pdf_file:
+            pdf_file.write(response.content)
+        return pdf_filename
@@ -142,6 +142,16 @@ class _Config:  # pylint: disable=too-few-public-methods
     STRR_PAY_TOPIC = os.getenv("STRR_PAY_TOPIC", BUSINESS_PAY_TOPIC)
     ASSETS_PAY_TOPIC = os.getenv("ASSETS_PAY_TOPIC", "assets-pay-notification-dev")
 
+    # Queue publishing: sync (publish in the caller), async (batched per topic by the PubSub publisher client) or
+    # outbox (written to the queue outbox table, published by the QUEUE_OUTBOX_RELAY job).
+    QUEUE_PUBLISH_MODE = os.getenv("QUEUE_PUBLISH_MODE", "sync").lower()
+    QUEUE_PUBLISH_BATCH_SIZE = int(os.getenv("QUEUE_PUBLISH_BATCH_SIZE", "100"))
+    QUEUE_PUBLISH_BATCH_LATENCY_SECONDS = float(os.getenv("QUEUE_PUBLISH_BATCH_LATENCY_SECONDS", "0.05"))
+    QUEUE_PUBLISH_FLUSH_TIMEOUT_SECONDS = float(os.getenv("QUEUE_PUBLISH_FLUSH_TIMEOUT_SECONDS", "30"))
+    QUEUE_OUTBOX_BATCH_SIZE = int(os.getenv("QUEUE_OUTBOX_BATCH_SIZE", "500"))
+    QUEUE_OUTBOX_MAX_ATTEMPTS = int(os.getenv("QUEUE_OUTBOX_MAX_ATTEMPTS", "10"))
+    QUEUE_OUTBOX_CLAIM_SECONDS = int(os.getenv("QUEUE_OUTBOX_CLAIM_SECONDS", "300"))
+
     CFS_ACCOUNT_DESCRIPTION = os.getenv("CFS_ACCOUNT_DESCRIPTION", "BCR")
     CFS_INVOICE_PREFIX = os.getenv("CFS_INVOICE_PREFIX", "REG")
     CFS_STOP_PAD_ACCOUNT_CREATION = os.getenv("CFS_STOP_PAD_ACCOUNT_CREATION", "false").lower() == "true"
@@ -171,6 +181,20 @@ class _Config:  # pylint: disable=too-few-public-methods
     DISABLE_AP_ERROR_EMAIL = os.getenv("DISABLE_AP_ERROR_EMAIL", "true").lower() == "true"
     DISABLE_RS_ADJUSTMENT_ERROR_EMAIL = os.getenv("DISABLE_RS_ADJUSTMENT_ERROR_EMAIL", "true").lower() == "true"
 
+    # Generate all statement frequencies for a day with set based INSERT ... SELECT statements.
+    STATEMENT_SET_BASED_GENERATION = os.getenv("STATEMENT_SET_BASED_GENERATION", "false").lower() == "true"
+
+    # Stale payment verification, workers verifying created invoices and the PAYBC calls per second per host.
+    STALE_PAYMENT_VERIFY_WORKERS = int(os.getenv("STALE_PAYMENT_VERIFY_WORKERS", "8"))
+    STALE_PAYMENT_CALLS_PER_SECOND = float(os.getenv("STALE_PAYMENT_CALLS_PER_SECOND", "10"))
+    # Seconds a payment request key stays live in pay-api, keep in step with pay-api. Older keys are purged.
+    PAYMENT_REQUEST_KEY_TTL = int(os.getenv("PAYMENT_REQUEST_KEY_TTL", "600"))
+
+    # Daily revenue fact table maintenance.
+    DAILY_REVENUE_CHUNK_DAYS = int(os.getenv("DAILY_REVENUE_CHUNK_DAYS", "31"))
+    DAILY_REVENUE_LOOKBACK_DAYS = int(os.getenv("DAILY_REVENUE_LOOKBACK_DAYS", "3"))
+    DAILY_REVENUE_OVERLAP_MINUTES = int(os.getenv("DAILY_REVENUE_OVERLAP_MINUTES", "60"))
+
     # the day on which mail to get.put 1 to get mail next day of creation.put 2 to get mails day after tomorrow.
     NOTIFY_AFTER_DAYS = int(os.getenv("NOTIFY_AFTER_DAYS", 8))  # to get full 7 days tp pass, u need to put 8.
 
@@ -208,6 +232,16 @@ class _Config:  # pylint: disable=too-few-public-methods
     # EFT variables
     EFT_TRANSFER_DESC = os.getenv("EFT_TRANSFER_DESC", "BCREGISTRIES {} {} EFT TRANSFER")
     EFT_OVERDUE_NOTIFY_EMAILS = os.getenv("EFT_OVERDUE_NOTIFY_EMAILS", "")
+    # Prefetch rows for the credit invoice link batch and issue CFS calls an account at a time through a pool.
+    EFT_PREFETCH_LINK_PROCESSING = os.getenv("EFT_PREFETCH_LINK_PROCESSING", "false").lower() == "true"
+    EFT_CFS_WORKERS = int(os.getenv("EFT_CFS_WORKERS", "4"))
+
+    # Routing slips processed in parallel, each routing slip's CFS receipts are still handled in order.
+    ROUTING_SLIP_CFS_WORKERS = int(os.getenv("ROUTING_SLIP_CFS_WORKERS", "4"))
+
+    # GL revenue updates, workers calling PAYBC and the number of invoice status updates committed together.
+    DISTRIBUTION_PAYBC_WORKERS = int(os.getenv("DISTRIBUTION_PAYBC_WORKERS", "4"))
+    DISTRIBUTION_STATUS_BATCH_SIZE = int(os.getenv("DISTRIBUTION_STATUS_BATCH_SIZE", "500"))
 
     # Google Cloud Storage settings
     GOOGLE_STORAGE_SA = os.getenv("GOOGLE_STORAGE_SA", "")
@@ -258,6 +292,12 @@ class TestConfig(_Config):  # pylint: disable=too-few-public-methods
     PAYBC_DIRECT_PAY_CLIENT_SECRET = "123"  # noqa: S105 - test configuration
     PAYBC_DIRECT_PAY_BASE_URL = "http://localhost:8080/paybc-api"
     PAYBC_DIRECT_PAY_REF_NUMBER = "123"
+    # Tests run inside a single uncommitted transaction, verify invoices on the test session.
+    STALE_PAYMENT_VERIFY_WORKERS = 1
+    STALE_PAYMENT_CALLS_PER_SECOND = 0
+    EFT_CFS_WORKERS = 1
+    ROUTING_SLIP_CFS_WORKERS = 1
+    DISTRIBUTION_PAYBC_WORKERS = 1
 
     DISABLE_AP_ERROR_EMAIL = False
     DISABLE_EJV_ERROR_EMAIL = False
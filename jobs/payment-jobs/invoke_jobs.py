@@ -24,7 +24,7 @@ from flask import Flask
 
 import config
 from pay_api import build_cache
-from pay_api.services import Flags
+from pay_api.services import Flags, gcp_queue_publisher
 from pay_api.services.email_service import JobFailureNotification
 from pay_api.services.gcp_queue import queue
 from pay_api.utils.logging import setup_logging
@@ -87,10 +87,13 @@ def run(job_name, argument=None):
     from tasks.bcol_refund_confirmation_task import BcolRefundConfirmationTask
     from tasks.cfs_create_account_task import CreateAccountTask
     from tasks.cfs_create_invoice_task import CreateInvoiceTask
+    from tasks.daily_revenue_task import DailyRevenueTask
     from tasks.direct_sale_automated_refund_task import DirectSaleAutomatedRefundTask
     from tasks.distribution_task import DistributionTask
     from tasks.ejv_partner_distribution_task import EjvPartnerDistributionTask
     from tasks.ejv_payment_task import EjvPaymentTask
+    from tasks.payment_request_key_purge_task import PaymentRequestKeyPurgeTask
+    from tasks.queue_outbox_relay_task import QueueOutboxRelayTask
     from tasks.stale_payment_task import StalePaymentTask
     from tasks.statement_notification_task import StatementNotificationTask
     from tasks.statement_task import StatementTask
@@ -115,6 +118,8 @@ def run(job_name, argument=None):
                 StalePaymentTask.update_stale_payments()
             case "UPDATE_STALE_PAYMENTS_DAILY":
                 StalePaymentTask.update_stale_payments(daily_run=True)
+            case "PURGE_PAYMENT_REQUEST_KEYS":
+                PaymentRequestKeyPurgeTask.purge_expired_keys()
             case "CREATE_CFS_ACCOUNTS":
                 CreateAccountTask.create_accounts()
             case "CREATE_INVOICES":
@@ -157,10 +162,14 @@ def run(job_name, argument=None):
                 DirectSaleAutomatedRefundTask.process_cc_refunds()
             case "BCOL_REFUND_CONFIRMATION":
                 BcolRefundConfirmationTask.update_bcol_refund_invoices()
+            case "DAILY_REVENUE_FACTS":
+                DailyRevenueTask.update_daily_revenue_facts(argument)
             case "ADHOC_INVOICE_STATUS_CHECK":
                 AdhocInvoiceStatusCheckTask.check_invoice_statuses()
             case "PERMISSION_CHECK":
                 PayJobPermissionCheckTask.check()
+            case "QUEUE_OUTBOX_RELAY":
+                QueueOutboxRelayTask.relay_messages()
             case _:
                 application.logger.warning(f"job_name={job_name} status=unknown_job")
                 return
@@ -172,6 +181,9 @@ def run(job_name, argument=None):
         application.logger.error(f"job_name={job_name} status=failed duration_ms={duration_ms} error={e}")
         send_notification(str(e), job_name)
         raise
+    finally:
+        # Wait for messages queued in async publish mode before the job exits, even when it failed.
+        gcp_queue_publisher.flush()
 
 
 def send_notification(error_message: str, job_name: str):
@@ -0,0 +1,3 @@
+#! /bin/sh
+echo 'run invoke_jobs.py DAILY_REVENUE_FACTS'
+python3 invoke_jobs.py DAILY_REVENUE_FACTS
@@ -0,0 +1,3 @@
+#! /bin/sh
+echo 'run invoke_jobs.py PURGE_PAYMENT_REQUEST_KEYS'
+python3 invoke_jobs.py PURGE_PAYMENT_REQUEST_KEYS
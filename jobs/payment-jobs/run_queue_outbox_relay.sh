@@ -0,0 +1,3 @@
+#! /bin/sh
+echo 'run invoke_jobs.py QUEUE_OUTBOX_RELAY'
+python3 invoke_jobs.py QUEUE_OUTBOX_RELAY
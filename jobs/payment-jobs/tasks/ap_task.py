@@ -410,16 +410,18 @@ class ApTask(CgiAP):
                 batch_trailer: str = cls.get_batch_trailer(batch_number, batch_total, control_total=control_total)
                 content = f"{content}{batch_trailer}"
 
-                for inv in invoices:
-                    db.session.add(
-                        EjvLinkModel(
-                            link_id=inv.id,
-                            link_type=EJVLinkType.INVOICE.value,
-                            ejv_header_id=ejv_header_model.id,
-                            disbursement_status_code=DisbursementStatus.UPLOADED.value,
-                        )
-                    )
-                    inv.disbursement_status_code = DisbursementStatus.UPLOADED.value
+                EjvLinkModel.bulk_insert_links(
+                    [
+                        {
+                            "link_id": inv.id,
+                            "link_type": EJVLinkType.INVOICE.value,
+                            "ejv_header_id": ejv_header_model.id,
+                            "disbursement_status_code": DisbursementStatus.UPLOADED.value,
+                        }
+                        for inv in invoices
+                    ]
+                )
+                InvoiceModel.update_disbursement_status([inv.id for inv in invoices], DisbursementStatus.UPLOADED.value)
                 db.session.flush()
 
                 cls._create_file_and_upload(content, file_name)
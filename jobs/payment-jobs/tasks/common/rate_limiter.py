@@ -0,0 +1,40 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Rate limiter shared by the worker threads of a job."""
+
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class HostRateLimiter:
+    """Space out calls to each host so concurrent workers don't exceed a rate per host."""
+
+    def __init__(self, calls_per_second: float):
+        """Initialize the limiter, a rate of 0 or less disables limiting."""
+        self.interval = 1 / calls_per_second if calls_per_second > 0 else 0
+        self._next_slot: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str):
+        """Block until a call to the url's host is allowed."""
+        if not self.interval:
+            return
+        host = urlparse(url).netloc or url
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if (wait := slot - now) > 0:
+            time.sleep(wait)
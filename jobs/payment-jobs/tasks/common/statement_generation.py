@@ -0,0 +1,446 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Set based statement generation.
+
+All statement windows (daily, weekly or gap, monthly) for a target date are planned up front and generated with
+INSERT ... SELECT statements, so the database does the per account work instead of the job building ORM objects.
+"""
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from flask import current_app
+from sqlalchemy import (
+    Boolean,
+    Date,
+    DateTime,
+    String,
+    and_,
+    case,
+    cast,
+    column,
+    delete,
+    distinct,
+    exists,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, INTEGER, aggregate_order_by
+
+from pay_api.models import Invoice as InvoiceModel
+from pay_api.models import PaymentAccount as PaymentAccountModel
+from pay_api.models import Statement as StatementModel
+from pay_api.models import StatementInvoices as StatementInvoicesModel
+from pay_api.models import StatementSettings as StatementSettingsModel
+from pay_api.models import db
+from pay_api.services.invoice import Invoice as InvoiceService
+from pay_api.utils.enums import NotificationStatus, PaymentMethod, StatementFrequency
+from pay_api.utils.util import (
+    get_first_and_last_dates_of_month,
+    get_local_time,
+    get_previous_day,
+    get_previous_month_and_year,
+    get_week_start_and_end_date,
+)
+
+
+@dataclass
+class StatementWindow:
+    """A statement period to generate for every account with a matching statement setting."""
+
+    frequency: str
+    from_date: datetime
+    to_date: datetime
+    # Gap statements close out a weekly period early, only for settings ending on the window's to date.
+    is_gap: bool = False
+
+
+@dataclass(frozen=True)
+class StatementShard:
+    """A deterministic slice of payment accounts, so statement generation can be split across processes or jobs."""
+
+    index: int
+    count: int
+
+    @classmethod
+    def parse(cls, value: str) -> "StatementShard":
+        """Parse a shard argument in the form i/N."""
+        try:
+            index, count = (int(part) for part in value.split("/"))
+        except ValueError as e:
+            raise ValueError(f"Invalid statement shard {value}, expected i/N.") from e
+        if count < 1 or not 0 <= index < count:
+            raise ValueError(f"Invalid statement shard {value}, expected 0 <= i < N.")
+        return cls(index, count)
+
+    def includes(self, payment_account_id: int) -> bool:
+        """Return True if the payment account belongs to this shard."""
+        return payment_account_id % self.count == self.index
+
+    def clause(self, payment_account_id_column):
+        """Return the SQL predicate for payment accounts in this shard."""
+        return payment_account_id_column % self.count == self.index
+
+    def __str__(self):
+        """Return the shard as i/N."""
+        return f"{self.index}/{self.count}"
+
+
+class StatementGenerationEngine:
+    """Generate all statements for a target date in one plan using set based SQL."""
+
+    def __init__(
+        self,
+        target_time: datetime,
+        has_date_override: bool = False,
+        auth_account_override: str = None,
+        shard: StatementShard = None,
+    ):
+        """Initialize the engine for the statements due at target_time."""
+        self.target_time = target_time
+        self.has_date_override = has_date_override
+        self.auth_account_override = auth_account_override
+        self.shard = shard
+        self.timings: dict[str, int] = {}
+
+    @staticmethod
+    def plan(target_time: datetime) -> list[StatementWindow]:
+        """Return the statement windows to generate for the target time, mirrors StatementTask."""
+        previous_day = get_previous_day(target_time)
+        windows = [StatementWindow(StatementFrequency.DAILY.value, previous_day, previous_day)]
+        # Sunday generates last week's weekly statements, any other day closes out weekly settings that ended early.
+        if target_time.weekday() == 6:
+            week_from, week_to = get_week_start_and_end_date(previous_day, index=1)
+            windows.append(StatementWindow(StatementFrequency.WEEKLY.value, week_from, week_to))
+        else:
+            gap_from, _ = get_week_start_and_end_date(previous_day, index=0)
+            if gap_from.date() != previous_day.date():
+                windows.append(StatementWindow(StatementFrequency.WEEKLY.value, gap_from, previous_day, is_gap=True))
+        if target_time.day == 1:
+            month_from, month_to = get_first_and_last_dates_of_month(*get_previous_month_and_year(target_time))
+            windows.append(StatementWindow(StatementFrequency.MONTHLY.value, month_from, month_to))
+        return windows
+
+    @contextmanager
+    def _phase(self, name: str):
+        """Time a generation phase."""
+        start = time.monotonic()
+        yield
+        self.timings[name] = int((time.monotonic() - start) * 1000)
+        current_app.logger.info(f"statement_generation phase={name} duration_ms={self.timings[name]}")
+
+    def generate(self) -> list[int]:
+        """Generate statements and statement invoices for every planned window, returns the statement ids."""
+        with self._phase("plan"):
+            windows = self.plan(self.target_time)
+            for window in windows:
+                current_app.logger.debug(
+                    f"Planned {window.frequency}{' GAP' if window.is_gap else ''} statements for "
+                    f"{window.from_date.date()} to {window.to_date.date()}"
+                )
+            windows_table = self._windows_table(windows)
+            targets = self._targets(windows_table, get_previous_day(self.target_time).date())
+            invoice_summary = self._invoice_summary(targets)
+
+        reused_ids = []
+        if self.has_date_override:
+            with self._phase("reuse_statements"):
+                reused_ids = self._reuse_existing_statements(targets, invoice_summary)
+
+        with self._phase("insert_statements"):
+            inserted_ids = self._insert_statements(targets, invoice_summary)
+
+        statement_ids = reused_ids + inserted_ids
+        with self._phase("insert_statement_invoices"):
+            self._insert_statement_invoices(windows_table, statement_ids)
+        db.session.flush()
+        current_app.logger.info(
+            f"statement_generation shard={self.shard or 'all'} statements={len(statement_ids)} "
+            f"reused={len(reused_ids)} timings={self.timings}"
+        )
+        return statement_ids
+
+    @staticmethod
+    def _windows_table(windows: list[StatementWindow]):
+        """Return the planned windows as a VALUES table, with the UTC invoice range for each window."""
+        rows = []
+        for window in windows:
+            invoice_from, invoice_to = InvoiceService.get_utc_range_for_local_dates(window.from_date, window.to_date)
+            rows.append(
+                (
+                    window.frequency,
+                    window.from_date.date(),
+                    window.to_date.date(),
+                    window.is_gap,
+                    invoice_from,
+                    invoice_to,
+                )
+            )
+        return (
+            values(
+                column("frequency", String),
+                column("from_date", Date),
+                column("to_date", Date),
+                column("is_gap", Boolean),
+                column("invoice_from", DateTime(timezone=True)),
+                column("invoice_to", DateTime(timezone=True)),
+                name="statement_windows",
+            )
+            .data(rows)
+            .alias("statement_windows")
+        )
+
+    def _targets(self, windows_table, valid_date):
+        """Return a CTE of (statement setting, payment account, window) rows to generate statements for."""
+        interim_statement_exists = (
+            exists()
+            .where(StatementModel.from_date <= windows_table.c.from_date)
+            .where(StatementModel.to_date >= windows_table.c.to_date)
+            .where(StatementModel.is_interim_statement.is_(True))
+            .where(StatementModel.payment_account_id == StatementSettingsModel.payment_account_id)
+        )
+        query = (
+            select(
+                StatementSettingsModel.id.label("statement_settings_id"),
+                PaymentAccountModel.id.label("payment_account_id"),
+                PaymentAccountModel.payment_method.label("account_payment_method"),
+                PaymentAccountModel.statement_notification_enabled,
+                windows_table.c.frequency,
+                windows_table.c.from_date,
+                windows_table.c.to_date,
+                windows_table.c.invoice_from,
+                windows_table.c.invoice_to,
+            )
+            .select_from(StatementSettingsModel)
+            .join(PaymentAccountModel, PaymentAccountModel.id == StatementSettingsModel.payment_account_id)
+            .join(windows_table, windows_table.c.frequency == StatementSettingsModel.frequency)
+            .where(StatementSettingsModel.from_date <= valid_date)
+            .where(or_(StatementSettingsModel.to_date.is_(None), StatementSettingsModel.to_date >= valid_date))
+            .where(
+                or_(
+                    windows_table.c.is_gap.is_(False),
+                    and_(StatementSettingsModel.to_date == windows_table.c.to_date, ~interim_statement_exists),
+                )
+            )
+        )
+        if self.auth_account_override:
+            query = query.where(PaymentAccountModel.auth_account_id == self.auth_account_override)
+        if self.shard:
+            query = query.where(self.shard.clause(PaymentAccountModel.id))
+        return query.cte("statement_targets")
+
+    @staticmethod
+    def _invoice_match(payment_account, invoice_from, invoice_to):
+        """Return the invoice join condition for an account and window.
+
+        EFT accounts only get EFT invoices and other accounts never get EFT invoices, this keeps invoices off both
+        statements when an account transitions payment methods.
+        """
+        return and_(
+            InvoiceModel.payment_account_id == payment_account.id,
+            InvoiceModel.created_on >= invoice_from,
+            InvoiceModel.created_on < invoice_to,
+            or_(
+                and_(
+                    payment_account.payment_method == PaymentMethod.EFT.value,
+                    InvoiceModel.payment_method_code == payment_account.payment_method,
+                ),
+                and_(
+                    payment_account.payment_method != PaymentMethod.EFT.value,
+                    InvoiceModel.payment_method_code != PaymentMethod.EFT.value,
+                ),
+            ),
+        )
+
+    def _invoice_summary(self, targets):
+        """Return a CTE with the invoice count and payment methods per account and window."""
+        payment_methods = func.string_agg(
+            distinct(InvoiceModel.payment_method_code),
+            aggregate_order_by(literal_column("','"), InvoiceModel.payment_method_code),
+        )
+        return (
+            select(
+                targets.c.payment_account_id,
+                targets.c.frequency,
+                targets.c.from_date,
+                targets.c.to_date,
+                payment_methods.label("payment_methods"),
+                func.count(InvoiceModel.id).label("invoice_count"),
+            )
+            .select_from(targets)
+            .join(PaymentAccountModel, PaymentAccountModel.id == targets.c.payment_account_id)
+            .join(
+                InvoiceModel,
+                self._invoice_match(PaymentAccountModel, targets.c.invoice_from, targets.c.invoice_to),
+            )
+            .group_by(targets.c.payment_account_id, targets.c.frequency, targets.c.from_date, targets.c.to_date)
+            .cte("statement_invoice_summary")
+        )
+
+    def _notification_status(self, targets):
+        """Return the notification status expression, date overrides never notify."""
+        if self.has_date_override:
+            return literal(NotificationStatus.SKIP.value)
+        return case(
+            (targets.c.statement_notification_enabled.is_(True), NotificationStatus.PENDING.value),
+            else_=NotificationStatus.SKIP.value,
+        )
+
+    @staticmethod
+    def _summary_join(targets, invoice_summary):
+        return and_(
+            invoice_summary.c.payment_account_id == targets.c.payment_account_id,
+            invoice_summary.c.frequency == targets.c.frequency,
+            invoice_summary.c.from_date == targets.c.from_date,
+            invoice_summary.c.to_date == targets.c.to_date,
+        )
+
+    @staticmethod
+    def _existing_statement_match(targets):
+        return and_(
+            StatementModel.payment_account_id == targets.c.payment_account_id,
+            StatementModel.frequency == targets.c.frequency,
+            StatementModel.from_date == targets.c.from_date,
+            StatementModel.to_date == targets.c.to_date,
+            StatementModel.is_interim_statement.is_(False),
+        )
+
+    def _reuse_existing_statements(self, targets, invoice_summary) -> list[int]:
+        """Clear and refresh statements being regenerated, ids are reused as EFT short name history references them."""
+        existing = (
+            select(
+                func.min(StatementModel.id).label("id"),
+                targets.c.payment_account_id,
+                targets.c.frequency,
+                targets.c.from_date,
+                targets.c.to_date,
+                func.bool_or(targets.c.statement_notification_enabled).label("statement_notification_enabled"),
+            )
+            .select_from(targets)
+            .join(StatementModel, self._existing_statement_match(targets))
+            .group_by(targets.c.payment_account_id, targets.c.frequency, targets.c.from_date, targets.c.to_date)
+            .cte("existing_statements")
+        )
+        all_existing_ids = (
+            select(StatementModel.id).select_from(targets).join(StatementModel, self._existing_statement_match(targets))
+        )
+        db.session.execute(
+            delete(StatementInvoicesModel).where(StatementInvoicesModel.statement_id.in_(all_existing_ids))
+        )
+        summary = (
+            select(
+                existing.c.id,
+                self._notification_status(existing).label("notification_status_code"),
+                invoice_summary.c.payment_methods,
+                func.coalesce(invoice_summary.c.invoice_count, 0).label("invoice_count"),
+            )
+            .select_from(existing)
+            .outerjoin(invoice_summary, self._summary_join(existing, invoice_summary))
+            .subquery()
+        )
+        result = db.session.execute(
+            update(StatementModel)
+            .where(StatementModel.id == summary.c.id)
+            .values(
+                notification_status_code=summary.c.notification_status_code,
+                payment_methods=func.coalesce(summary.c.payment_methods, StatementModel.payment_methods),
+                created_on=get_local_time(datetime.now(tz=UTC)).date(),
+                is_empty=summary.c.invoice_count == 0,
+            )
+            .returning(StatementModel.id)
+        )
+        return [row.id for row in result]
+
+    def _insert_statements(self, targets, invoice_summary) -> list[int]:
+        """Insert the new statements in one statement, returns the new statement ids."""
+        query = (
+            select(
+                targets.c.frequency,
+                targets.c.statement_settings_id,
+                targets.c.payment_account_id,
+                literal(get_local_time(datetime.now(tz=UTC)).date(), Date).label("created_on"),
+                targets.c.from_date,
+                targets.c.to_date,
+                self._notification_status(targets).label("notification_status_code"),
+                func.coalesce(
+                    invoice_summary.c.payment_methods, func.coalesce(targets.c.account_payment_method, "")
+                ).label("payment_methods"),
+                (func.coalesce(invoice_summary.c.invoice_count, 0) == 0).label("is_empty"),
+                literal(False).label("is_interim_statement"),
+            )
+            .select_from(targets)
+            .outerjoin(invoice_summary, self._summary_join(targets, invoice_summary))
+        )
+        if self.has_date_override or self.shard:
+            # Regenerated statements were refreshed in place, only add statements for accounts missing one.
+            # Shards commit independently, so re-running a shard only fills in accounts that were not committed.
+            query = query.where(~exists().where(self._existing_statement_match(targets)))
+        result = db.session.execute(
+            insert(StatementModel)
+            .from_select(
+                [
+                    "frequency",
+                    "statement_settings_id",
+                    "payment_account_id",
+                    "created_on",
+                    "from_date",
+                    "to_date",
+                    "notification_status_code",
+                    "payment_methods",
+                    "is_empty",
+                    "is_interim_statement",
+                ],
+                query,
+            )
+            .returning(StatementModel.id)
+        )
+        return [row.id for row in result]
+
+    def _insert_statement_invoices(self, windows_table, statement_ids: list[int]):
+        """Link every invoice in a statement's window to the statement with one INSERT ... SELECT."""
+        if not statement_ids:
+            return
+        statement_id_values = select(func.unnest(cast(statement_ids, ARRAY(INTEGER))))
+        query = (
+            select(StatementModel.id, InvoiceModel.id)
+            .distinct()
+            .select_from(StatementModel)
+            .join(
+                windows_table,
+                and_(
+                    windows_table.c.frequency == StatementModel.frequency,
+                    windows_table.c.from_date == StatementModel.from_date,
+                    windows_table.c.to_date == StatementModel.to_date,
+                ),
+            )
+            .join(PaymentAccountModel, PaymentAccountModel.id == StatementModel.payment_account_id)
+            .join(
+                InvoiceModel,
+                self._invoice_match(PaymentAccountModel, windows_table.c.invoice_from, windows_table.c.invoice_to),
+            )
+            .where(StatementModel.id.in_(statement_id_values))
+        )
+        db.session.execute(
+            insert(StatementInvoicesModel).from_select(
+                [StatementInvoicesModel.statement_id.key, StatementInvoicesModel.invoice_id.key], query
+            )
+        )
@@ -0,0 +1,151 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Task to maintain the daily revenue fact table used by the notebook reports."""
+
+from datetime import UTC, date, datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import Date, cast, delete, func, insert, literal, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from pay_api.models import DailyRevenueFact as DailyRevenueFactModel
+from pay_api.models import Invoice as InvoiceModel
+from pay_api.models import db
+from pay_api.utils.util import get_local_time
+
+
+class DailyRevenueTask:  # pylint:disable=too-few-public-methods
+    """Task to maintain invoice totals per day, corp type, payment method and status."""
+
+    @classmethod
+    def update_daily_revenue_facts(cls, arguments=None):
+        """Recompute the fact rows for every day touched by invoice changes since the last run.
+
+        Steps:
+        1. Find the Pacific created dates of invoices created or updated since the last refresh, an argument of
+           YYYY-MM-DD recomputes every day from that date instead.
+        2. For each chunk of days, delete the fact rows and insert them again from a grouped invoice query.
+        3. Commit each chunk, so a rerun picks up where a failed run stopped.
+        """
+        # Stored like the invoice timestamps, naive UTC.
+        refreshed_on = datetime.now(tz=UTC).replace(tzinfo=None)
+        from_date_override = arguments[0] if arguments and len(arguments) > 0 else None
+        if from_date_override:
+            fact_dates = cls._find_fact_dates_from(datetime.strptime(from_date_override, "%Y-%m-%d").date())
+        else:
+            fact_dates = cls._find_stale_fact_dates()
+        current_app.logger.info(f"Refreshing daily revenue facts for {len(fact_dates)} days.")
+
+        chunk_size = current_app.config.get("DAILY_REVENUE_CHUNK_DAYS", 31)
+        for index in range(0, len(fact_dates), chunk_size):
+            chunk = fact_dates[index : index + chunk_size]
+            cls._refresh_fact_dates(chunk, refreshed_on)
+            db.session.commit()
+            current_app.logger.info(f"Refreshed daily revenue facts for {chunk[0]} to {chunk[-1]}.")
+
+    @staticmethod
+    def _local_created_date():
+        """Return the Pacific created date of an invoice, created_on is stored in UTC."""
+        return cast(
+            func.timezone(current_app.config["LEGISLATIVE_TIMEZONE"], func.timezone("UTC", InvoiceModel.created_on)),
+            Date,
+        )
+
+    @classmethod
+    def _find_fact_dates_from(cls, from_date: date = None) -> list[date]:
+        """Return every day with invoices from the from date onwards, or every day when from date is None."""
+        query = select(cls._local_created_date().label("fact_date")).distinct()
+        if from_date:
+            # Pad by a day so the UTC bound covers the start of the Pacific day.
+            query = query.where(InvoiceModel.created_on >= from_date - timedelta(days=1))
+        fact_dates = db.session.scalars(query)
+        return sorted(fact_date for fact_date in fact_dates if from_date is None or fact_date >= from_date)
+
+    @classmethod
+    def _find_stale_fact_dates(cls) -> list[date]:
+        """Return the days with invoices created or updated since the last refresh, plus a few trailing days."""
+        last_refreshed_on = db.session.scalar(select(func.max(DailyRevenueFactModel.refreshed_on)))
+        if last_refreshed_on is None:
+            current_app.logger.info("No daily revenue facts found, building facts for all invoices.")
+            return cls._find_fact_dates_from()
+
+        # Overlap with the last run so invoices committed while it ran aren't missed.
+        since = last_refreshed_on - timedelta(minutes=current_app.config.get("DAILY_REVENUE_OVERLAP_MINUTES", 60))
+        query = (
+            select(cls._local_created_date().label("fact_date"))
+            .where(or_(InvoiceModel.created_on >= since, InvoiceModel.updated_on >= since))
+            .distinct()
+        )
+        fact_dates = set(db.session.scalars(query))
+        # Not every status change goes through the ORM and stamps updated_on, always refresh the last few days.
+        today = get_local_time(datetime.now(tz=UTC)).date()
+        lookback_days = current_app.config.get("DAILY_REVENUE_LOOKBACK_DAYS", 3)
+        fact_dates.update(today - timedelta(days=days) for days in range(lookback_days + 1))
+        return sorted(fact_dates)
+
+    @classmethod
+    def _refresh_fact_dates(cls, fact_dates: list[date], refreshed_on: datetime):
+        """Replace the fact rows for the given days."""
+        local_created_date = cls._local_created_date()
+        fact_dates_array = cast(fact_dates, ARRAY(Date))
+        db.session.execute(
+            delete(DailyRevenueFactModel).where(DailyRevenueFactModel.fact_date == func.any(fact_dates_array))
+        )
+        service_fees = func.coalesce(InvoiceModel.service_fees, 0)
+        gst = func.coalesce(InvoiceModel.gst, 0)
+        query = (
+            select(
+                local_created_date,
+                InvoiceModel.corp_type_code,
+                InvoiceModel.payment_method_code,
+                InvoiceModel.invoice_status_code,
+                func.count(InvoiceModel.id),
+                func.coalesce(func.sum(InvoiceModel.total), 0),
+                func.coalesce(func.sum(service_fees), 0),
+                func.coalesce(func.sum(InvoiceModel.total - service_fees - gst), 0),
+                func.coalesce(func.sum(gst), 0),
+                func.coalesce(func.sum(func.coalesce(InvoiceModel.refund, 0)), 0),
+                func.coalesce(func.sum(func.coalesce(InvoiceModel.paid, 0)), 0),
+                literal(refreshed_on),
+            )
+            # UTC bounds padded by a day keep the created_on index usable, the local date filter is exact.
+            .where(InvoiceModel.created_on >= min(fact_dates) - timedelta(days=1))
+            .where(InvoiceModel.created_on < max(fact_dates) + timedelta(days=2))
+            .where(local_created_date == func.any(fact_dates_array))
+            .group_by(
+                local_created_date,
+                InvoiceModel.corp_type_code,
+                InvoiceModel.payment_method_code,
+                InvoiceModel.invoice_status_code,
+            )
+        )
+        db.session.execute(
+            insert(DailyRevenueFactModel).from_select(
+                [
+                    DailyRevenueFactModel.fact_date,
+                    DailyRevenueFactModel.corp_type_code,
+                    DailyRevenueFactModel.payment_method_code,
+                    DailyRevenueFactModel.invoice_status_code,
+                    DailyRevenueFactModel.invoice_count,
+                    DailyRevenueFactModel.total,
+                    DailyRevenueFactModel.service_fees,
+                    DailyRevenueFactModel.statutory_fees,
+                    DailyRevenueFactModel.gst,
+                    DailyRevenueFactModel.refund,
+                    DailyRevenueFactModel.paid,
+                    DailyRevenueFactModel.refreshed_on,
+                ],
+                query,
+            )
+        )
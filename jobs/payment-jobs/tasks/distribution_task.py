@@ -13,10 +13,16 @@
 # limitations under the License.
 """Service to manage PAYBC services."""
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import UTC, datetime
 
+import requests
 from flask import current_app
+from more_itertools import batched
+from requests.adapters import HTTPAdapter
 
+from pay_api.models import db
 from pay_api.models.distribution_code import DistributionCode as DistributionCodeModel
 from pay_api.models.invoice import Invoice as InvoiceModel
 from pay_api.models.payment import Payment as PaymentModel
@@ -31,19 +37,30 @@ STATUS_NOT_PROCESSED = ("PAID", "RJCT")
 DECIMAL_PRECISION = ".2f"
 
 
+@dataclass
+class RevenueUpdate:
+    """Everything the PAYBC calls for an invoice need, so workers don't touch the database."""
+
+    invoice_id: int
+    invoice_status_code: str
+    payment_url: str
+    post_revenue_payload: dict
+
+
 class DistributionTask:
     """Task to update distribution details on paybc transactions."""
 
     @classmethod
-    def update_failed_distributions(cls):  # pylint:disable=too-many-locals
+    def update_failed_distributions(cls):
         """Update failed distributions.
 
         Steps:
         1. Get all invoices with status UPDATE_REVENUE_ACCOUNT or UPDATE_REVENUE_ACCOUNT_REFUND.
-        2. Find the completed invoice reference for the invoice.
-        3. Call the paybc GET service and check if there is any revenue not processed.
+        2. Find the completed invoice reference and build the revenue payload for the invoice.
+        3. Call the paybc GET service and check if there is any revenue not processed, through a bounded pool of
+           workers sharing one token and one pooled session.
         4. If yes, update the revenue details.
-        5. Update the invoice status as PAID or REFUNDED and save.
+        5. Update the invoice status as PAID or REFUNDED and save, in batches.
         """
         invoice_statuses = [
             InvoiceStatus.UPDATE_REVENUE_ACCOUNT.value,
@@ -55,40 +72,86 @@ class DistributionTask:
         if len(gl_update_invoices) == 0:
             return
 
-        access_token: str = DirectSaleService().get_token().json().get("access_token")
         paybc_ref_number: str = current_app.config.get("PAYBC_DIRECT_PAY_REF_NUMBER")
         paybc_svc_base_url = current_app.config.get("PAYBC_DIRECT_PAY_BASE_URL")
+        invoices_by_id = {invoice.id: invoice for invoice in gl_update_invoices}
+        completed_invoice_ids, revenue_updates = [], []
         for gl_update_invoice in gl_update_invoices:
             payment: PaymentModel = PaymentModel.find_payment_for_invoice(gl_update_invoice.id)
             # For now handle only GL updates for Direct Pay, more to come in future
             if payment.payment_method_code != PaymentMethod.DIRECT_PAY.value:
-                cls.update_invoice_to_refunded_or_paid(gl_update_invoice)
+                completed_invoice_ids.append(gl_update_invoice.id)
                 continue
 
             active_reference = list(
                 filter(
-                    lambda reference: (reference.status_code == InvoiceReferenceStatus.COMPLETED.value),
+                    lambda reference: reference.status_code == InvoiceReferenceStatus.COMPLETED.value,
                     gl_update_invoice.references,
                 )
             )[0]
-            payment_url: str = (
-                f"{paybc_svc_base_url}/paybc/payment/{paybc_ref_number}/{active_reference.invoice_number}"
+            revenue_updates.append(
+                RevenueUpdate(
+                    invoice_id=gl_update_invoice.id,
+                    invoice_status_code=gl_update_invoice.invoice_status_code,
+                    payment_url=f"{paybc_svc_base_url}/paybc/payment/{paybc_ref_number}/"
+                    f"{active_reference.invoice_number}",
+                    post_revenue_payload=cls.generate_post_revenue_payload(gl_update_invoice),
+                )
             )
 
-            payment_details: dict = cls.get_payment_details(payment_url, access_token)
+        if revenue_updates:
+            access_token: str = DirectSaleService().get_token().json().get("access_token")
+            completed_invoice_ids.extend(cls._sync_revenue_updates(revenue_updates, access_token))
+        cls.update_invoices_to_refunded_or_paid([invoices_by_id[invoice_id] for invoice_id in completed_invoice_ids])
+
+    @classmethod
+    def _sync_revenue_updates(cls, revenue_updates: list[RevenueUpdate], access_token: str) -> list[int]:
+        """Check and update the revenue of the invoices with PAYBC, return the ids of the completed invoices."""
+        workers = current_app.config.get("DISTRIBUTION_PAYBC_WORKERS", 1)
+        with requests.Session() as session:
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(workers, 1))
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            if workers <= 1 or len(revenue_updates) <= 1:
+                completed = [cls._sync_revenue(update, access_token, session) for update in revenue_updates]
+            else:
+                app = current_app._get_current_object()  # pylint: disable=protected-access
+
+                def _sync_in_app_context(revenue_update: RevenueUpdate):
+                    with app.app_context():
+                        return cls._sync_revenue(revenue_update, access_token, session)
+
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gl-revenue") as executor:
+                    completed = list(executor.map(_sync_in_app_context, revenue_updates))
+        return [
+            update.invoice_id for update, is_completed in zip(revenue_updates, completed, strict=True) if is_completed
+        ]
+
+    @classmethod
+    def _sync_revenue(cls, revenue_update: RevenueUpdate, access_token: str, session: requests.Session) -> bool:
+        """Post the revenue lines if PAYBC hasn't processed them, errors are isolated to the invoice."""
+        try:
+            payment_details: dict = cls.get_payment_details(revenue_update.payment_url, access_token, session)
             if not payment_details:
-                current_app.logger.error("No payment details found for invoice.")
-                continue
+                current_app.logger.error(f"No payment details found for invoice {revenue_update.invoice_id}.")
+                return False
 
-            target_status, target_gl_status = cls.get_status_fields(gl_update_invoice.invoice_status_code)
-            if target_status is None or payment_details.get(target_status) == STATUS_PAID:
-                has_gl_completed: bool = True
-                for revenue in payment_details.get("revenue"):
-                    if revenue.get(target_gl_status) in STATUS_NOT_PROCESSED:
-                        has_gl_completed = False
-                if not has_gl_completed:
-                    cls.update_revenue_lines(gl_update_invoice, payment_url, access_token)
-                cls.update_invoice_to_refunded_or_paid(gl_update_invoice)
+            target_status, target_gl_status = cls.get_status_fields(revenue_update.invoice_status_code)
+            if target_status is not None and payment_details.get(target_status) != STATUS_PAID:
+                return False
+            has_gl_completed = all(
+                revenue.get(target_gl_status) not in STATUS_NOT_PROCESSED for revenue in payment_details.get("revenue")
+            )
+            if not has_gl_completed:
+                cls.update_revenue_lines(
+                    revenue_update.post_revenue_payload, revenue_update.payment_url, access_token, session
+                )
+            return True
+        except Exception as err:  # NOQA # pylint: disable=broad-except
+            current_app.logger.error(
+                f"Error updating revenue for invoice {revenue_update.invoice_id}: {err}", exc_info=True
+            )
+            return False
 
     @classmethod
     def get_status_fields(cls, invoice_status_code: str) -> tuple:
@@ -99,9 +162,10 @@ class DistributionTask:
         return "paymentstatus", "glstatus"
 
     @classmethod
-    def update_revenue_lines(cls, invoice: InvoiceModel, payment_url: str, access_token: str):
+    def update_revenue_lines(
+        cls, post_revenue_payload: dict, payment_url: str, access_token: str, session: requests.Session = None
+    ):
         """Update revenue lines for the invoice."""
-        post_revenue_payload = cls.generate_post_revenue_payload(invoice)
         OAuthService.post(
             payment_url,
             access_token,
@@ -109,6 +173,7 @@ class DistributionTask:
             ContentType.JSON,
             post_revenue_payload,
             additional_headers={"Pay-Connector": current_app.config.get("PAY_CONNECTOR_AUTH")},
+            session=session,
         )
 
     @classmethod
@@ -145,7 +210,7 @@ class DistributionTask:
         return post_revenue_payload
 
     @classmethod
-    def get_payment_details(cls, payment_url: str, access_token: str):
+    def get_payment_details(cls, payment_url: str, access_token: str, session: requests.Session = None):
         """Get the receipt details by calling PayBC web service."""
         payment_response = OAuthService.get(
             payment_url,
@@ -153,6 +218,7 @@ class DistributionTask:
             AuthHeaderType.BEARER,
             ContentType.JSON,
             additional_headers={"Pay-Connector": current_app.config.get("PAY_CONNECTOR_AUTH")},
+            session=session,
         ).json()
         return payment_response
 
@@ -172,15 +238,26 @@ class DistributionTask:
         }
 
     @classmethod
-    def update_invoice_to_refunded_or_paid(cls, invoice: InvoiceModel):
-        """Update the invoice status."""
-        if invoice.invoice_status_code == InvoiceStatus.UPDATE_REVENUE_ACCOUNT_REFUND.value:
-            # No more work is needed to ensure it was posted to gl.
-            refund = RefundModel.find_latest_by_invoice_id(invoice.id)
-            refund.gl_posted = datetime.now(tz=UTC)
-            refund.save()
-            invoice.invoice_status_code = InvoiceStatus.REFUNDED.value
-        else:
-            invoice.invoice_status_code = InvoiceStatus.PAID.value
-        invoice.save()
-        current_app.logger.info(f"Updated invoice : {invoice.id}")
+    def update_invoices_to_refunded_or_paid(cls, invoices: list[InvoiceModel]):
+        """Update the invoice statuses, committing a batch at a time."""
+        batch_size = current_app.config.get("DISTRIBUTION_STATUS_BATCH_SIZE", 500)
+        for invoice_batch in batched(invoices, batch_size):
+            refunds = RefundModel.find_latest_by_invoice_ids(
+                [
+                    invoice.id
+                    for invoice in invoice_batch
+                    if invoice.invoice_status_code == InvoiceStatus.UPDATE_REVENUE_ACCOUNT_REFUND.value
+                ]
+            )
+            for invoice in invoice_batch:
+                if invoice.invoice_status_code == InvoiceStatus.UPDATE_REVENUE_ACCOUNT_REFUND.value:
+                    # No more work is needed to ensure it was posted to gl.
+                    if refund := refunds.get(invoice.id):
+                        refund.gl_posted = datetime.now(tz=UTC)
+                    else:
+                        current_app.logger.warning(f"No approved refund found for invoice : {invoice.id}")
+                    invoice.invoice_status_code = InvoiceStatus.REFUNDED.value
+                else:
+                    invoice.invoice_status_code = InvoiceStatus.PAID.value
+            db.session.commit()
+            current_app.logger.info(f"Updated invoices : {[invoice.id for invoice in invoice_batch]}")
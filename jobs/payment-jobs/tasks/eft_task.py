@@ -13,12 +13,16 @@
 # limitations under the License.
 """Task for linking electronic funds transfers."""
 
-from dataclasses import dataclass
+from collections import defaultdict
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from decimal import Decimal
+from itertools import groupby
 
 from flask import current_app
-from sqlalchemy import func
+from sqlalchemy import func, select
 from sqlalchemy.orm import lazyload, registry
 
 from pay_api.models import CfsAccount as CfsAccountModel
@@ -46,6 +50,60 @@ from pay_api.utils.enums import (
 )
 
 
+@dataclass
+class EFTLinkPrefetch:
+    """Rows needed to process a batch of credit invoice link rollups, loaded up front."""
+
+    invoice_references: dict[int, list[InvoiceReferenceModel]] = field(default_factory=dict)
+    cancelled_consolidated_numbers: set[str] = field(default_factory=set)
+    links: dict[int, EFTCreditInvoiceLinkModel] = field(default_factory=dict)
+    histories: dict[int, EFTShortnameHistoryModel] = field(default_factory=dict)
+
+    def find_reference(self, invoice_id: int, status_code: str, exclude_consolidated=False):
+        """Return the invoice reference like InvoiceReferenceModel.find_by_invoice_id_and_status."""
+        references = [
+            reference
+            for reference in self.invoice_references.get(invoice_id, [])
+            if reference.status_code == status_code and not (exclude_consolidated and reference.is_consolidated)
+        ]
+        return max(references, key=lambda reference: reference.id) if references else None
+
+
+@dataclass(frozen=True)
+class EFTCfsAccount:
+    """The CFS identifiers of a CFS account, passed to CFSService calls in place of the ORM row."""
+
+    cfs_party: str
+    cfs_account: str
+    cfs_site: str
+
+
+@dataclass(frozen=True)
+class EFTLinkCfsCall:
+    """Plain values for a rollup's CFS calls, workers never touch the ORM rows of the main session."""
+
+    cfs_account: EFTCfsAccount
+    receipt_number: str
+    invoice_number: str
+    invoice_total: Decimal
+    rollup_amount: Decimal
+    consolidated_invoice_number: str = None
+
+
+@dataclass
+class EFTLinkPlan:
+    """CFS calls and database changes for one credit invoice link rollup."""
+
+    invoice: InvoiceModel
+    cfs_account: CfsAccountModel
+    cil_rollup: object
+    receipt_number: str
+    invoice_reference: InvoiceReferenceModel
+    consolidated_reference: InvoiceReferenceModel = None
+    cfs_call: EFTLinkCfsCall = None
+    error: Exception = None
+
+
 class EFTTask:  # pylint:disable=too-few-public-methods
     """Task to link electronic funds transfers."""
 
@@ -156,6 +214,10 @@ class EFTTask:  # pylint:disable=too-few-public-methods
         """Replicate linked EFT's as receipts inside of CFS and mark invoices as paid."""
         credit_invoice_links = cls.get_eft_credit_invoice_links_by_status(EFTCreditInvoiceStatus.PENDING.value)
         cls.history_group_ids = set()
+        if current_app.config.get("EFT_PREFETCH_LINK_PROCESSING"):
+            cls._link_electronic_funds_transfers_prefetched(credit_invoice_links)
+            cls.unlock_overdue_accounts()
+            return
         for invoice, cfs_account, cil_rollup in credit_invoice_links:
             try:
                 current_app.logger.info(
@@ -177,6 +239,269 @@ class EFTTask:  # pylint:disable=too-few-public-methods
                 continue
         cls.unlock_overdue_accounts()
 
+    @classmethod
+    def _link_electronic_funds_transfers_prefetched(cls, credit_invoice_links):
+        """Link the rollups an account at a time, with the rows for the whole batch prefetched.
+
+        CFS calls for an account are issued through a bounded pool, the database changes for a rollup are applied and
+        committed as soon as its receipt is created in CFS. A failed rollup is skipped without affecting the rest of
+        its account.
+        """
+        if not credit_invoice_links:
+            return
+        prefetch = cls._prefetch_link_batch(credit_invoice_links)
+        session = db.session()
+        expire_on_commit = session.expire_on_commit
+        # Prefetched rows are reused after each account commit, don't expire them.
+        session.expire_on_commit = False
+        try:
+            for payment_account_id, account_links in groupby(
+                credit_invoice_links, key=lambda row: row[0].payment_account_id
+            ):
+                cls._link_account_prefetched(payment_account_id, list(account_links), prefetch)
+        finally:
+            session.expire_on_commit = expire_on_commit
+
+    @classmethod
+    def _prefetch_link_batch(cls, credit_invoice_links) -> EFTLinkPrefetch:
+        """Load invoice references, links and short name history for every rollup in a few queries."""
+        prefetch = EFTLinkPrefetch()
+        invoice_ids = {invoice.id for invoice, _, _ in credit_invoice_links}
+        invoice_references = defaultdict(list)
+        for reference in db.session.query(InvoiceReferenceModel).filter(
+            InvoiceReferenceModel.invoice_id.in_(invoice_ids)
+        ):
+            invoice_references[reference.invoice_id].append(reference)
+        prefetch.invoice_references = invoice_references
+
+        if consolidated_numbers := {
+            reference.invoice_number
+            for references in invoice_references.values()
+            for reference in references
+            if reference.is_consolidated and reference.status_code == InvoiceReferenceStatus.ACTIVE.value
+        }:
+            prefetch.cancelled_consolidated_numbers = set(
+                db.session.scalars(
+                    select(InvoiceReferenceModel.invoice_number)
+                    .where(InvoiceReferenceModel.invoice_number.in_(consolidated_numbers))
+                    .where(InvoiceReferenceModel.is_consolidated.is_(True))
+                    .where(InvoiceReferenceModel.status_code == InvoiceReferenceStatus.CANCELLED.value)
+                    .distinct()
+                )
+            )
+
+        link_ids = {link_id for _, _, cil_rollup in credit_invoice_links for link_id in cil_rollup.link_ids}
+        prefetch.links = {
+            link.id: link
+            for link in db.session.query(EFTCreditInvoiceLinkModel).filter(EFTCreditInvoiceLinkModel.id.in_(link_ids))
+        }
+        if group_ids := {link.link_group_id for link in prefetch.links.values() if link.link_group_id is not None}:
+            prefetch.histories = {
+                history.related_group_link_id: history
+                for history in db.session.query(EFTShortnameHistoryModel).filter(
+                    EFTShortnameHistoryModel.related_group_link_id.in_(group_ids)
+                )
+            }
+        return prefetch
+
+    @classmethod
+    def _plan_link(cls, invoice, cfs_account, cil_rollup, prefetch: EFTLinkPrefetch) -> EFTLinkPlan:
+        """Resolve the invoice references for a rollup, see _create_receipt_and_invoice."""
+        if not (invoice_reference := prefetch.find_reference(invoice.id, InvoiceReferenceStatus.ACTIVE.value)):
+            raise LookupError(f"Active Invoice reference not found for invoice id: {invoice.id}")
+        plan = EFTLinkPlan(invoice, cfs_account, cil_rollup, f"EFTCIL{cil_rollup.id}", invoice_reference)
+        if invoice_reference.is_consolidated:
+            if not (
+                original_invoice_reference := prefetch.find_reference(
+                    invoice.id, InvoiceReferenceStatus.CANCELLED.value, exclude_consolidated=True
+                )
+            ):
+                raise LookupError(
+                    f"Non consolidated cancelled invoice reference not found for invoice id: {invoice.id}"
+                )
+            plan.consolidated_reference = invoice_reference
+            plan.invoice_reference = original_invoice_reference
+        plan.cfs_call = EFTLinkCfsCall(
+            cfs_account=EFTCfsAccount(cfs_account.cfs_party, cfs_account.cfs_account, cfs_account.cfs_site),
+            receipt_number=plan.receipt_number,
+            invoice_number=plan.invoice_reference.invoice_number,
+            invoice_total=invoice.total,
+            rollup_amount=cil_rollup.rollup_amount,
+            consolidated_invoice_number=(
+                plan.consolidated_reference.invoice_number if plan.consolidated_reference else None
+            ),
+        )
+        return plan
+
+    @classmethod
+    def _run_cfs_calls(cls, func, plans: list[EFTLinkPlan]) -> Iterator[EFTLinkPlan]:
+        """Run a CFS call for each plan through a bounded pool, yielding each plan as soon as its call finishes.
+
+        func is given the plan's EFTLinkCfsCall, failures are recorded on the plan.
+        """
+
+        def _run(plan: EFTLinkPlan, cfs_call: EFTLinkCfsCall):
+            try:
+                func(cfs_call)
+            except Exception as e:  # NOQA # pylint: disable=broad-except
+                plan.error = e
+            return plan
+
+        workers = current_app.config.get("EFT_CFS_WORKERS", 1)
+        if workers <= 1 or len(plans) <= 1:
+            for plan in plans:
+                yield _run(plan, plan.cfs_call)
+            return
+        app = current_app._get_current_object()  # pylint: disable=protected-access
+
+        def _run_in_app_context(plan: EFTLinkPlan, cfs_call: EFTLinkCfsCall):
+            with app.app_context():
+                return _run(plan, cfs_call)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="eft-cfs") as executor:
+            futures = [executor.submit(_run_in_app_context, plan, plan.cfs_call) for plan in plans]
+            for future in as_completed(futures):
+                yield future.result()
+
+    @classmethod
+    def _link_account_prefetched(cls, payment_account_id: int, account_links, prefetch):
+        """Issue the CFS calls for an account's rollups, committing each rollup once its receipt is created."""
+        plans = []
+        for invoice, cfs_account, cil_rollup in account_links:
+            current_app.logger.info(
+                f"PayAccount: {payment_account_id} Id: {cil_rollup.id} -"
+                f" Invoice Id: {invoice.id} - Amount: {cil_rollup.rollup_amount}"
+            )
+            try:
+                plans.append(cls._plan_link(invoice, cfs_account, cil_rollup, prefetch))
+            except Exception:  # NOQA # pylint: disable=broad-except
+                current_app.logger.error(
+                    f"Error Account id={payment_account_id} - EFT Credit invoice Link : {cil_rollup.id}",
+                    exc_info=True,
+                )
+        if not plans:
+            return
+
+        def _check_cfs_total(cfs_call: EFTLinkCfsCall):
+            invoice_response = CFSService.get_invoice(
+                cfs_account=cfs_call.cfs_account, inv_number=cfs_call.invoice_number
+            )
+            if (cfs_total := Decimal(invoice_response.get("total", "0"))) != cfs_call.invoice_total:
+                raise ValueError(f"SBC-PAY Invoice total {cfs_call.invoice_total} does not match CFS total {cfs_total}")
+
+        list(cls._run_cfs_calls(_check_cfs_total, [plan for plan in plans if plan.consolidated_reference]))
+
+        # Reverse each consolidated invoice once, invoices can share a consolidated invoice reference.
+        reversals = {}
+        for plan in plans:
+            if plan.error is None and plan.consolidated_reference:
+                invoice_number = plan.cfs_call.consolidated_invoice_number
+                if invoice_number not in prefetch.cancelled_consolidated_numbers:
+                    reversals.setdefault(invoice_number, plan)
+        for invoice_number in reversals:
+            current_app.logger.info(f"Consolidated invoice found, reversing consolidated invoice {invoice_number}.")
+        list(
+            cls._run_cfs_calls(
+                lambda cfs_call: CFSService.reverse_invoice(cfs_call.consolidated_invoice_number),
+                list(reversals.values()),
+            )
+        )
+        for plan in plans:
+            if plan.consolidated_reference and plan.error is None:
+                if (reversal := reversals.get(plan.cfs_call.consolidated_invoice_number)) and reversal.error:
+                    plan.error = reversal.error
+        for invoice_number, plan in reversals.items():
+            if plan.error is None:
+                prefetch.cancelled_consolidated_numbers.add(invoice_number)
+
+        def _create_and_apply_receipt(cfs_call: EFTLinkCfsCall):
+            CFSService.create_cfs_receipt(
+                cfs_account=cfs_call.cfs_account,
+                rcpt_number=cfs_call.receipt_number,
+                rcpt_date=datetime.now(tz=UTC).strftime("%Y-%m-%d"),
+                amount=cfs_call.rollup_amount,
+                payment_method=PaymentMethod.EFT.value,
+                # get_token caches the FAS token until it expires.
+                access_token=CFSService.get_token(PaymentSystem.FAS).json().get("access_token"),
+            )
+            CFSService.apply_receipt(cfs_call.cfs_account, cfs_call.receipt_number, cfs_call.invoice_number)
+
+        for plan in plans:
+            if plan.error is not None:
+                cls._log_link_error(payment_account_id, plan)
+        # Commit each rollup as its receipt completes, so a crash leaves at most the in flight receipts uncommitted.
+        for plan in cls._run_cfs_calls(_create_and_apply_receipt, [plan for plan in plans if plan.error is None]):
+            if plan.error is not None:
+                cls._log_link_error(payment_account_id, plan)
+                continue
+            try:
+                cls._apply_link_plans([plan], prefetch)
+                db.session.commit()
+            except Exception:  # NOQA # pylint: disable=broad-except
+                current_app.logger.error(
+                    f"Error committing EFT Credit invoice Link : {plan.cil_rollup.id} for "
+                    f"Account id={payment_account_id}",
+                    exc_info=True,
+                )
+                db.session.rollback()
+
+    @staticmethod
+    def _log_link_error(payment_account_id: int, plan: EFTLinkPlan):
+        """Log a rollup that failed its CFS calls."""
+        current_app.logger.error(
+            f"Error Account id={payment_account_id} - EFT Credit invoice Link : {plan.cil_rollup.id}",
+            exc_info=plan.error,
+        )
+
+    @classmethod
+    def _apply_link_plans(cls, plans: list[EFTLinkPlan], prefetch: EFTLinkPrefetch):
+        """Apply the database changes for linked rollups, see _create_receipt_and_invoice."""
+        now = datetime.now(tz=UTC)
+        new_rows = []
+        for plan in plans:
+            invoice, cil_rollup = plan.invoice, plan.cil_rollup
+            if invoice.invoice_status_code == InvoiceStatus.OVERDUE.value:
+                cls.overdue_account_ids[invoice.payment_account_id] = plan.cfs_account.payment_account
+            if plan.consolidated_reference:
+                plan.consolidated_reference.status_code = InvoiceReferenceStatus.CANCELLED.value
+            plan.invoice_reference.status_code = InvoiceReferenceStatus.COMPLETED.value
+            new_rows.append(
+                ReceiptModel(
+                    receipt_number=plan.receipt_number,
+                    receipt_amount=cil_rollup.rollup_amount,
+                    invoice_id=plan.invoice_reference.invoice_id,
+                    receipt_date=now,
+                )
+            )
+            new_rows.append(
+                PaymentModel(
+                    payment_method_code=PaymentMethod.EFT.value,
+                    payment_status_code=PaymentStatus.COMPLETED.value,
+                    payment_system_code=PaymentSystem.PAYBC.value,
+                    invoice_number=invoice.id,
+                    invoice_amount=invoice.total,
+                    payment_account_id=plan.cfs_account.account_id,
+                    payment_date=now,
+                    paid_amount=cil_rollup.rollup_amount,
+                    receipt_number=plan.receipt_number,
+                )
+            )
+            invoice.invoice_status_code = InvoiceStatus.PAID.value
+            invoice.paid = cil_rollup.rollup_amount
+            invoice.payment_date = now
+            for link_id in cil_rollup.link_ids:
+                cil = prefetch.links[link_id]
+                if cil.status_code != EFTCreditInvoiceStatus.CANCELLED.value:
+                    cil.status_code = EFTCreditInvoiceStatus.COMPLETED.value
+                    cil.receipt_number = plan.receipt_number
+                if cil.link_group_id is not None and cil.link_group_id not in cls.history_group_ids:
+                    cls.history_group_ids.add(cil.link_group_id)
+                    if history := prefetch.histories.get(cil.link_group_id):
+                        history.hidden = False
+                        history.is_processing = False
+        db.session.add_all(new_rows)
+        db.session.flush()
+
     @classmethod
     def reverse_electronic_funds_transfers_cfs(cls):
         """Reverse electronic funds transfers receipts in CFS and reset invoices."""
@@ -184,6 +509,10 @@ class EFTTask:  # pylint:disable=too-few-public-methods
             EFTCreditInvoiceStatus.PENDING_REFUND.value
         ) + cls.get_eft_credit_invoice_links_by_status(EFTCreditInvoiceStatus.CANCELLED.value)
         cls.history_group_ids = set()
+        # CFS reversals stay a rollup at a time, the links and short name history are still loaded up front.
+        prefetch = None
+        if cils and current_app.config.get("EFT_PREFETCH_LINK_PROCESSING"):
+            prefetch = cls._prefetch_link_batch(cils)
         for invoice, cfs_account, cil_rollup in cils:
             try:
                 current_app.logger.info(
@@ -194,7 +523,7 @@ class EFTTask:  # pylint:disable=too-few-public-methods
                 refund_invoice = cls._rollback_receipt_and_invoice(
                     cfs_account, invoice, receipt_number, cil_rollup.status_code
                 )
-                cls._update_cil_and_shortname_history(cil_rollup)
+                cls._update_cil_and_shortname_history(cil_rollup, prefetch=prefetch)
                 db.session.commit()
                 if refund_invoice:
                     EftService().release_payment_or_reversal(refund_invoice, TransactionStatus.REVERSED.value)
@@ -275,25 +604,34 @@ class EFTTask:  # pylint:disable=too-few-public-methods
         ).one_or_none()
 
     @classmethod
-    def _finalize_shortname_history(cls, group_set: set, invoice_link: EFTCreditInvoiceLinkModel):
+    def _finalize_shortname_history(
+        cls, group_set: set, invoice_link: EFTCreditInvoiceLinkModel, prefetch: EFTLinkPrefetch = None
+    ):
         """Finalize EFT short name historical record state."""
         if invoice_link.link_group_id is None or invoice_link.link_group_id in group_set:
             return
 
         group_set.add(invoice_link.link_group_id)
-        if history_model := cls._get_eft_history_by_group_id(invoice_link.link_group_id):
+        if prefetch:
+            history_model = prefetch.histories.get(invoice_link.link_group_id)
+        else:
+            history_model = cls._get_eft_history_by_group_id(invoice_link.link_group_id)
+        if history_model:
             history_model.hidden = False
             history_model.is_processing = False
             history_model.flush()
 
     @classmethod
-    def _update_cil_and_shortname_history(cls, cil_rollup, receipt_number=None):
+    def _update_cil_and_shortname_history(cls, cil_rollup, receipt_number=None, prefetch: EFTLinkPrefetch = None):
         """Update electronic invoice links."""
-        cils = (
-            db.session.query(EFTCreditInvoiceLinkModel)
-            .filter(EFTCreditInvoiceLinkModel.id.in_(cil_rollup.link_ids))
-            .all()
-        )
+        if prefetch:
+            cils = [prefetch.links[link_id] for link_id in cil_rollup.link_ids]
+        else:
+            cils = (
+                db.session.query(EFTCreditInvoiceLinkModel)
+                .filter(EFTCreditInvoiceLinkModel.id.in_(cil_rollup.link_ids))
+                .all()
+            )
         for cil in cils:
             if cil.status_code != EFTCreditInvoiceStatus.CANCELLED.value:
                 cil.status_code = (
@@ -301,7 +639,7 @@ class EFTTask:  # pylint:disable=too-few-public-methods
                 )
                 cil.receipt_number = receipt_number or cil.receipt_number
                 cil.flush()
-            cls._finalize_shortname_history(cls.history_group_ids, cil)
+            cls._finalize_shortname_history(cls.history_group_ids, cil, prefetch)
 
     @classmethod
     def _create_receipt_and_invoice(
@@ -19,7 +19,7 @@ from datetime import UTC, datetime, timedelta
 from decimal import Decimal
 
 from flask import current_app
-from sqlalchemy import Date, and_, cast, or_
+from sqlalchemy import and_, case, or_
 
 from pay_api.models import CorpType as CorpTypeModel
 from pay_api.models import DistributionCode as DistributionCodeModel
@@ -96,6 +96,18 @@ class EjvPartnerDistributionTask(CgiEjv):
     @staticmethod
     def get_disbursement_by_distribution_for_partner(partner):
         """Return disbursements dataclass for partners."""
+        return EjvPartnerDistributionTask.get_disbursements_by_partner([partner]).get(partner.code, ([], {}))
+
+    @staticmethod
+    def get_disbursements_by_partner(partners) -> dict[str, tuple[list[Disbursement], dict[int, Decimal]]]:
+        """Return disbursements and distribution code totals for each partner, keyed by partner code.
+
+        The eligible rows for all of the partners are selected together and partitioned by corp type, so the number
+        of queries doesn't grow with the number of partners.
+        """
+        partner_codes = [partner.code for partner in partners]
+        if not partner_codes:
+            return {}
         # Internal invoices aren't disbursed to partners, DRAWDOWN is handled by the mainframe.
         # EFT is handled by the PartnerDisbursements table.
         # ##################################################### Original (Legacy way) - invoice.disbursement_status_code
@@ -109,7 +121,19 @@ class EjvPartnerDistributionTask(CgiEjv):
         disbursement_date = datetime.now(tz=UTC).replace(tzinfo=None) - timedelta(
             days=current_app.config.get("DISBURSEMENT_DELAY_IN_DAYS")
         )
-        base_query = (
+        # Receipts from the start of the disbursement day on are too recent. Compared against the raw receipt date
+        # instead of a cast to date, so the predicate stays sargable.
+        receipt_cutoff = datetime.combine(disbursement_date.date(), datetime.min.time())
+        # REFUND_REQUESTED for credit card payments, CREDITED for AR, REFUNDED for other payments,
+        # MANUALLY_REFUNDED when Finance issued cheque (no credit memo, but still claw back partner revenue).
+        reversal_statuses = [
+            InvoiceStatus.REFUNDED.value,
+            InvoiceStatus.REFUND_REQUESTED.value,
+            InvoiceStatus.CREDITED.value,
+            InvoiceStatus.MANUALLY_REFUNDED.value,
+        ]
+        is_reversal = InvoiceModel.invoice_status_code.in_(reversal_statuses)
+        transactions_and_reversals = (
             db.session.query(InvoiceModel, PaymentLineItemModel, DistributionCodeModel)
             .join(PaymentLineItemModel, PaymentLineItemModel.invoice_id == InvoiceModel.id)
             .join(
@@ -117,47 +141,37 @@ class EjvPartnerDistributionTask(CgiEjv):
                 DistributionCodeModel.distribution_code_id == PaymentLineItemModel.fee_distribution_id,
             )
             .filter(InvoiceModel.payment_method_code.notin_(skip_payment_methods))
-            .filter(InvoiceModel.corp_type_code == partner.code)
+            .filter(InvoiceModel.corp_type_code.in_(partner_codes))
             .filter(PaymentLineItemModel.total > 0)
             .filter(DistributionCodeModel.stop_ejv.is_(False) | DistributionCodeModel.stop_ejv.is_(None))
-            .order_by(DistributionCodeModel.distribution_code_id, PaymentLineItemModel.id)
-        )
-
-        transactions = (
-            base_query.filter(
-                (InvoiceModel.disbursement_status_code.is_(None))
-                | (InvoiceModel.disbursement_status_code == DisbursementStatus.ERRORED.value)
-            )
-            .filter(~InvoiceModel.receipts.any(cast(ReceiptModel.receipt_date, Date) >= disbursement_date.date()))
-            .filter(InvoiceModel.invoice_status_code == InvoiceStatus.PAID.value)
-            .all()
-        )
-
-        # REFUND_REQUESTED for credit card payments, CREDITED for AR, REFUNDED for other payments,
-        # MANUALLY_REFUNDED when Finance issued cheque (no credit memo, but still claw back partner revenue).
-        reversals = (
-            base_query.filter(
-                InvoiceModel.invoice_status_code.in_(
-                    [
-                        InvoiceStatus.REFUNDED.value,
-                        InvoiceStatus.REFUND_REQUESTED.value,
-                        InvoiceStatus.CREDITED.value,
-                        InvoiceStatus.MANUALLY_REFUNDED.value,
-                    ]
+            .filter(
+                or_(
+                    and_(
+                        (InvoiceModel.disbursement_status_code.is_(None))
+                        | (InvoiceModel.disbursement_status_code == DisbursementStatus.ERRORED.value),
+                        ~InvoiceModel.receipts.any(ReceiptModel.receipt_date >= receipt_cutoff),
+                        InvoiceModel.invoice_status_code == InvoiceStatus.PAID.value,
+                    ),
+                    and_(is_reversal, InvoiceModel.disbursement_status_code == DisbursementStatus.COMPLETED.value),
                 )
             )
-            .filter(InvoiceModel.disbursement_status_code == DisbursementStatus.COMPLETED.value)
+            # Transactions before reversals within a distribution code, as when they were two queries.
+            .order_by(
+                DistributionCodeModel.distribution_code_id,
+                case((is_reversal, 1), else_=0),
+                PaymentLineItemModel.id,
+            )
             .all()
         )
 
-        disbursement_rows = []
-        distribution_code_totals = {}
-        for invoice, payment_line_item, dc in transactions + reversals:
+        results = {partner_code: ([], {}) for partner_code in partner_codes}
+        for invoice, payment_line_item, dc in transactions_and_reversals:
             if dc.statutory_fees_gst_distribution_code_id and not EjvPartnerDistributionTask.distribution_codes_match(
                 dc, dc.statutory_fees_gst_distribution_code
             ):
                 current_app.logger.error("Stat Fee GST GL not pointing to Distribution Code GL")
                 continue
+            disbursement_rows, distribution_code_totals = results[invoice.corp_type_code]
             distribution_code_totals.setdefault(dc.distribution_code_id, 0)
             distribution_code_totals[dc.distribution_code_id] += (
                 payment_line_item.total + payment_line_item.statutory_fees_gst
@@ -171,13 +185,7 @@ class EjvPartnerDistributionTask(CgiEjv):
                         amount=payment_line_item.total + payment_line_item.statutory_fees_gst,
                         flow_through=f"{invoice.id:<110}",
                         description_identifier=f"#{invoice.id}",
-                        is_reversal=invoice.invoice_status_code
-                        in [
-                            InvoiceStatus.REFUNDED.value,
-                            InvoiceStatus.REFUND_REQUESTED.value,
-                            InvoiceStatus.CREDITED.value,
-                            InvoiceStatus.MANUALLY_REFUNDED.value,
-                        ],
+                        is_reversal=invoice.invoice_status_code in reversal_statuses,
                         target_type=EJVLinkType.INVOICE.value,
                         identifier=invoice.id,
                     ),
@@ -186,20 +194,17 @@ class EjvPartnerDistributionTask(CgiEjv):
         # ################################################################# END OF Legacy way of handling disbursements.
         # Partner disbursements - New
         # NRO (NRO is internal, meaning no disbursement needed.)
-        disbursement_rows, distribution_code_totals = EjvPartnerDistributionTask._add_partner_disbursements(
-            partner, disbursement_date, disbursement_rows, distribution_code_totals
-        )
-
-        return disbursement_rows, distribution_code_totals
+        EjvPartnerDistributionTask._add_partner_disbursements(partner_codes, receipt_cutoff, results)
+        return results
 
     @staticmethod
-    def _add_partner_disbursements(partner, disbursement_date, disbursement_rows, distribution_code_totals):
+    def _add_partner_disbursements(partner_codes, receipt_cutoff, results):
         """Add partner disbursements to the results."""
         partner_disbursements = EjvPartnerDistributionTask.get_partner_disbursements(
-            partner, disbursement_date, EJVLinkType.INVOICE.value, is_reversal=None
+            partner_codes, receipt_cutoff, EJVLinkType.INVOICE.value, is_reversal=None
         )
         partial_refund_disbursements = EjvPartnerDistributionTask.get_partner_disbursements(
-            partner, disbursement_date, EJVLinkType.PARTIAL_REFUND.value, is_reversal=True
+            partner_codes, receipt_cutoff, EJVLinkType.PARTIAL_REFUND.value, is_reversal=True
         )
         partner_disbursements.extend(partial_refund_disbursements)
 
@@ -217,6 +222,7 @@ class EjvPartnerDistributionTask(CgiEjv):
             ):
                 current_app.logger.error("Stat Fee GST GL not pointing to Distribution Code GL")
                 continue
+            disbursement_rows, distribution_code_totals = results[partner_disbursement.partner_code]
             distribution_code_totals.setdefault(dc.distribution_code_id, 0)
             distribution_code_totals[dc.distribution_code_id] += partner_disbursement.amount
             disbursement_rows.append(
@@ -235,8 +241,8 @@ class EjvPartnerDistributionTask(CgiEjv):
                 )
             )
 
-        disbursement_rows.sort(key=lambda x: x.bcreg_distribution_code.distribution_code_id)
-        return disbursement_rows, distribution_code_totals
+        for disbursement_rows, _ in results.values():
+            disbursement_rows.sort(key=lambda x: x.bcreg_distribution_code.distribution_code_id)
 
     @classmethod
     def _create_ejv_file_for_partner(cls, batch_type: str):  # pylint:disable=too-many-locals, too-many-statements
@@ -261,10 +267,12 @@ class EjvPartnerDistributionTask(CgiEjv):
         effective_date = cls.get_effective_date()
 
         try:
+            partners = cls._get_partners_by_batch_type(batch_type)
+            disbursements_by_partner = cls.get_disbursements_by_partner(partners)
             # Each of the partner will go as a JV Header and transactions as JV Details.
-            for partner in cls._get_partners_by_batch_type(batch_type):
+            for partner in partners:
                 current_app.logger.info(partner)
-                disbursements, distribution_code_totals = cls.get_disbursement_by_distribution_for_partner(partner)
+                disbursements, distribution_code_totals = disbursements_by_partner[partner.code]
                 if not disbursements:
                     continue
 
@@ -274,7 +282,6 @@ class EjvPartnerDistributionTask(CgiEjv):
                     ejv_file_id=ejv_file_model.id,
                 ).flush()
                 journal_name = cls.get_journal_name(ejv_header_model.id)
-                sequence = 1
 
                 last_distribution_code = None
                 line_number = 1
@@ -327,9 +334,7 @@ class EjvPartnerDistributionTask(CgiEjv):
                         line_number += 1
                         control_total += 1
 
-                    cls._update_disbursement_status_and_ejv_link(disbursement, ejv_header_model, sequence)
-                    sequence += 1
-
+                cls._update_disbursement_status_and_ejv_link(disbursements, ejv_header_model)
                 db.session.flush()
 
             if not ejv_content:
@@ -358,43 +363,40 @@ class EjvPartnerDistributionTask(CgiEjv):
 
     @classmethod
     def _update_disbursement_status_and_ejv_link(
-        cls, disbursement: Disbursement, ejv_header_model: EjvHeaderModel, sequence: int
+        cls, disbursements: list[Disbursement], ejv_header_model: EjvHeaderModel
     ):
-        """Update disbursement status and create EJV Link."""
-        if isinstance(disbursement.target, InvoiceModel):
-            disbursement.target.disbursement_status_code = DisbursementStatus.UPLOADED.value
-        elif isinstance(disbursement.target, PartnerDisbursementsModel):
-            # Only EFT and Partial_Refunds are using partner disbursements table for now,
-            # eventually we want to move our disbursement.
-            # process over to something similar: Where we have an entire table setup that
-            # is used to track disbursements, instead of just the three column approach that
-            # doesn't work when there are multiple reversals etc.
-            disbursement.target.status_code = DisbursementStatus.UPLOADED.value
-            disbursement.target.processed_on = datetime.now(tz=UTC)
-        else:
-            raise NotImplementedError("Unknown disbursement type")
-
-        # Possible this could already be created, eg two PLI.
-        if (
-            db.session.query(EjvLinkModel)
-            .filter(
-                EjvLinkModel.link_id == disbursement.line_item.identifier,
-                EjvLinkModel.link_type == disbursement.line_item.target_type,
-                EjvLinkModel.ejv_header_id == ejv_header_model.id,
+        """Update disbursement statuses and create EJV Links for a header, in bulk."""
+        invoice_ids, partner_disbursement_ids, links = [], [], {}
+        for sequence, disbursement in enumerate(disbursements, start=1):
+            if isinstance(disbursement.target, InvoiceModel):
+                invoice_ids.append(disbursement.target.id)
+            elif isinstance(disbursement.target, PartnerDisbursementsModel):
+                # Only EFT and Partial_Refunds are using partner disbursements table for now,
+                # eventually we want to move our disbursement.
+                # process over to something similar: Where we have an entire table setup that
+                # is used to track disbursements, instead of just the three column approach that
+                # doesn't work when there are multiple reversals etc.
+                partner_disbursement_ids.append(disbursement.target.id)
+            else:
+                raise NotImplementedError("Unknown disbursement type")
+
+            # The header is new, so a link can only already exist from this batch, eg two PLI.
+            links.setdefault(
+                (disbursement.line_item.identifier, disbursement.line_item.target_type),
+                {
+                    "link_id": disbursement.line_item.identifier,
+                    "link_type": disbursement.line_item.target_type,
+                    "ejv_header_id": ejv_header_model.id,
+                    "disbursement_status_code": DisbursementStatus.UPLOADED.value,
+                    "sequence": sequence,
+                },
             )
-            .first()
-        ):
-            return
 
-        db.session.add(
-            EjvLinkModel(
-                link_id=disbursement.line_item.identifier,
-                link_type=disbursement.line_item.target_type,
-                ejv_header_id=ejv_header_model.id,
-                disbursement_status_code=DisbursementStatus.UPLOADED.value,
-                sequence=sequence,
-            )
+        InvoiceModel.update_disbursement_status(invoice_ids, DisbursementStatus.UPLOADED.value)
+        PartnerDisbursementsModel.update_status(
+            partner_disbursement_ids, DisbursementStatus.UPLOADED.value, processed_on=datetime.now(tz=UTC)
         )
+        EjvLinkModel.bulk_insert_links(list(links.values()))
 
     @classmethod
     def _get_partners_by_batch_type(cls, batch_type) -> list[CorpTypeModel]:
@@ -436,8 +438,8 @@ class EjvPartnerDistributionTask(CgiEjv):
         return result
 
     @classmethod
-    def get_partner_disbursements(cls, partner, disbursement_date, target_type, is_reversal):
-        """Get partner disbursements."""
+    def get_partner_disbursements(cls, partner_codes, receipt_cutoff, target_type, is_reversal):
+        """Get partner disbursements for the partners, ordered by distribution code."""
         query = db.session.query(PartnerDisbursementsModel, PaymentLineItemModel, DistributionCodeModel)
 
         if target_type == EJVLinkType.INVOICE.value:
@@ -456,7 +458,7 @@ class EjvPartnerDistributionTask(CgiEjv):
                 )
                 .filter(
                     PartnerDisbursementsModel.status_code == DisbursementStatus.WAITING_FOR_JOB.value,
-                    PartnerDisbursementsModel.partner_code == partner.code,
+                    PartnerDisbursementsModel.partner_code.in_(partner_codes),
                     or_(
                         and_(
                             PartnerDisbursementsModel.is_reversal.is_(False),
@@ -464,7 +466,7 @@ class EjvPartnerDistributionTask(CgiEjv):
                         ),
                         PartnerDisbursementsModel.is_reversal.is_(True),
                     ),
-                    ~InvoiceModel.receipts.any(cast(ReceiptModel.receipt_date, Date) >= disbursement_date.date()),
+                    ~InvoiceModel.receipts.any(ReceiptModel.receipt_date >= receipt_cutoff),
                     DistributionCodeModel.stop_ejv.is_(False) | DistributionCodeModel.stop_ejv.is_(None),
                 )
             )
@@ -495,10 +497,10 @@ class EjvPartnerDistributionTask(CgiEjv):
                 )
                 .filter(
                     PartnerDisbursementsModel.status_code == DisbursementStatus.WAITING_FOR_JOB.value,
-                    PartnerDisbursementsModel.partner_code == partner.code,
+                    PartnerDisbursementsModel.partner_code.in_(partner_codes),
                     PartnerDisbursementsModel.is_reversal.is_(is_reversal),
                     InvoiceModel.invoice_status_code == InvoiceStatus.PAID.value,
-                    ~InvoiceModel.receipts.any(cast(ReceiptModel.receipt_date, Date) >= disbursement_date.date()),
+                    ~InvoiceModel.receipts.any(ReceiptModel.receipt_date >= receipt_cutoff),
                     DistributionCodeModel.stop_ejv.is_(False) | DistributionCodeModel.stop_ejv.is_(None),
                 )
             )
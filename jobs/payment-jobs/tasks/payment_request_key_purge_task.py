@@ -0,0 +1,33 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Task to purge expired payment request keys."""
+
+from datetime import UTC, datetime, timedelta
+
+from flask import current_app
+
+from pay_api.models import PaymentRequestKey as PaymentRequestKeyModel
+
+
+class PaymentRequestKeyPurgeTask:  # pylint: disable=too-few-public-methods
+    """Task to delete payment request keys past their TTL."""
+
+    @classmethod
+    def purge_expired_keys(cls):
+        """Delete payment request keys past their TTL, they no longer match a retry."""
+        created_before = datetime.now(tz=UTC) - timedelta(
+            seconds=current_app.config.get("PAYMENT_REQUEST_KEY_TTL", 600)
+        )
+        deleted = PaymentRequestKeyModel.delete_expired(created_before)
+        current_app.logger.info(f"Purged {deleted} expired payment request keys.")
@@ -0,0 +1,60 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Task to relay queue outbox messages to the queue."""
+
+import time
+
+from flask import current_app
+
+from pay_api.services import gcp_queue_publisher
+from pay_api.services.email_service import JobFailureNotification
+
+
+class QueueOutboxRelayTask:  # pylint:disable=too-few-public-methods
+    """Task to publish messages written to the queue outbox."""
+
+    @classmethod
+    def relay_messages(cls, publish=None):
+        """Publish outbox messages in batches until a batch comes back short.
+
+        Steps:
+        1. Claim the oldest publishable messages and commit the claim, skipping ones another relay holds.
+        2. Publish them and mark them published, failures are retried on later runs up to the max attempts.
+        3. Dead letter messages that ran out of attempts and send a notification for them.
+        """
+        start = time.monotonic()
+        batch_size = current_app.config.get("QUEUE_OUTBOX_BATCH_SIZE", 500)
+        total_published = total_failed = 0
+        dead_lettered = []
+        while True:
+            result = gcp_queue_publisher.relay_outbox(batch_size, publish)
+            total_published += result.published
+            total_failed += result.failed
+            dead_lettered.extend(result.dead_lettered)
+            # A failure means the rest is retried next run, stop rather than spin on it.
+            if result.failed or result.published < batch_size:
+                break
+        if dead_lettered:
+            JobFailureNotification(
+                subject="Queue Outbox Relay Job Failure",
+                file_name="queue_outbox_relay",
+                error_messages=dead_lettered,
+                table_name="queue_outbox",
+                job_name="Queue Outbox Relay Job",
+            ).send_notification()
+        duration_ms = int((time.monotonic() - start) * 1000)
+        current_app.logger.info(
+            f"job_name=QUEUE_OUTBOX_RELAY published={total_published} failed={total_failed} "
+            f"dead_lettered={len(dead_lettered)} duration_ms={duration_ms}"
+        )
@@ -13,11 +13,16 @@
 # limitations under the License.
 """Task to for linking routing slips."""
 
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from decimal import Decimal
 
 from flask import current_app
-from sqlalchemy import func
+from sqlalchemy.orm.exc import MultipleResultsFound
 
 from pay_api.models import CfsAccount as CfsAccountModel
 from pay_api.models import DistributionCode as DistributionCodeModel
@@ -29,7 +34,7 @@ from pay_api.models import PaymentAccount as PaymentAccountModel
 from pay_api.models import PaymentLineItem as PaymentLineItemModel
 from pay_api.models import Receipt as ReceiptModel
 from pay_api.models import RoutingSlip as RoutingSlipModel
-from pay_api.models import db
+from pay_api.models import RoutingSlipTree, db
 from pay_api.services.cfs_service import CFSService
 from pay_api.services.email_service import JobFailureNotification
 from pay_api.utils.enums import (
@@ -46,6 +51,73 @@ from pay_api.utils.enums import (
 )
 
 
+@dataclass(frozen=True)
+class RoutingSlipCfsAccount:
+    """The CFS identifiers of a CFS account, passed to CFSService calls in place of the ORM row."""
+
+    cfs_party: str
+    cfs_account: str
+    cfs_site: str
+
+
+@dataclass(frozen=True)
+class RoutingSlipLinkCall:
+    """Plain values for the CFS calls linking a routing slip, workers never touch the job's ORM rows."""
+
+    routing_slip_id: int
+    number: str
+    cfs_account: RoutingSlipCfsAccount
+    parent_cfs_account: RoutingSlipCfsAccount
+    receipt_number: str
+    receipt_date: str
+    total: Decimal
+    payment_method: str
+
+
+@dataclass(frozen=True)
+class RoutingSlipReceiptCall:
+    """Plain values for the CFS calls on the receipts of a routing slip and its children."""
+
+    routing_slip_id: int
+    number: str
+    status: str
+    cfs_account: RoutingSlipCfsAccount
+    # (receipt number, total) of the routing slip followed by its children.
+    receipts: tuple[tuple[str, Decimal], ...]
+
+
+@dataclass
+class RoutingSlipRun:
+    """State for one pass over routing slips: bulk loaded rows and the run report."""
+
+    operation: str
+    payment_accounts: dict[int, PaymentAccountModel] = field(default_factory=dict)
+    cfs_accounts: dict[int, CfsAccountModel] = field(default_factory=dict)
+    # Payment accounts with more than one effective internal CFS account.
+    duplicate_cfs_account_ids: set[int] = field(default_factory=set)
+    children: dict[str, list[RoutingSlipModel]] = field(default_factory=dict)
+    report: Counter = field(default_factory=Counter)
+    started: float = field(default_factory=time.monotonic)
+
+    def cfs_account(self, payment_account_id: int) -> CfsAccountModel:
+        """Return the effective internal CFS account, raising like one_or_none when there is more than one."""
+        if payment_account_id in self.duplicate_cfs_account_ids:
+            raise MultipleResultsFound(
+                f"Multiple effective internal CFS accounts found for payment account {payment_account_id}"
+            )
+        return self.cfs_accounts.get(payment_account_id)
+
+    def family(self, routing_slip: RoutingSlipModel) -> tuple[RoutingSlipModel, ...]:
+        """Return the routing slip followed by its children, in the order their receipts are processed."""
+        return (routing_slip, *self.children.get(routing_slip.number, []))
+
+    def log_report(self):
+        """Log what the run did and how long it took."""
+        counts = " ".join(f"{outcome}={count}" for outcome, count in sorted(self.report.items()))
+        duration_ms = round((time.monotonic() - self.started) * 1000)
+        current_app.logger.info(f"job_name=routing_slip_{self.operation} {counts} duration_ms={duration_ms}")
+
+
 class RoutingSlipTask:  # pylint:disable=too-few-public-methods
     """Task to link routing slips."""
 
@@ -58,43 +130,60 @@ class RoutingSlipTask:  # pylint:disable=too-few-public-methods
         2. Notify mailer
         """
         routing_slips = cls._get_routing_slip_by_status(RoutingSlipStatus.LINKED.value)
-        for routing_slip in routing_slips:
+        parents = {
+            parent_rs.number: parent_rs
+            for parent_rs in db.session.query(RoutingSlipModel).filter(
+                RoutingSlipModel.number.in_({routing_slip.parent_number for routing_slip in routing_slips})
+            )
+        }
+        run = cls._start_run(
+            "link",
+            routing_slips,
+            {parent_rs.payment_account_id for parent_rs in parents.values()},
+            with_children=False,
+        )
+
+        def _link_in_cfs(link: RoutingSlipLinkCall):
             # 1. Reverse the child routing slip.
             # 2. Create receipt to the parent.
+            current_app.logger.debug(f"Linking Routing Slip: {link.number}")
+            # reverse routing slip receipt
+            if CFSService.get_receipt(link.cfs_account, link.number).get("status") != CfsReceiptStatus.REV.value:
+                CFSService.reverse_rs_receipt_in_cfs(link.cfs_account, link.number, ReverseOperation.LINK.value)
+            # apply receipt to parent cfs account, get_token caches the FAS token until it expires
+            CFSService.create_cfs_receipt(
+                cfs_account=link.parent_cfs_account,
+                rcpt_number=link.receipt_number,
+                rcpt_date=link.receipt_date,
+                amount=link.total,
+                payment_method=link.payment_method,
+                access_token=CFSService.get_token(PaymentSystem.FAS).json().get("access_token"),
+            )
+
+        links, by_id = [], {}
+        for routing_slip in routing_slips:
+            try:
+                links.append(cls._build_link_call(run, routing_slip, parents[routing_slip.parent_number]))
+                by_id[routing_slip.id] = routing_slip
+            except Exception as e:  # NOQA # pylint: disable=broad-except
+                current_app.logger.error(
+                    f"Error on Linking Routing Slip number:={routing_slip.number}, "
+                    f"routing slip : {routing_slip.id}, ERROR : {str(e)}",
+                    exc_info=True,
+                )
+                run.report["failed"] += 1
+        # Each routing slip is saved as soon as its CFS calls finish.
+        for link, error in cls._iter_cfs_calls(_link_in_cfs, links):
+            routing_slip = by_id[link.routing_slip_id]
             # 3. Change the payment account of child to parent.
             # 4. Change the status.
             try:
-                current_app.logger.debug(f"Linking Routing Slip: {routing_slip.number}")
-                payment_account: PaymentAccountModel = PaymentAccountModel.find_by_id(routing_slip.payment_account_id)
-                cfs_account = CfsAccountModel.find_effective_by_payment_method(
-                    payment_account.id, PaymentMethod.INTERNAL.value
-                )
-
-                # reverse routing slip receipt
-                if CFSService.get_receipt(cfs_account, routing_slip.number).get("status") != CfsReceiptStatus.REV.value:
-                    CFSService.reverse_rs_receipt_in_cfs(cfs_account, routing_slip.number, ReverseOperation.LINK.value)
-                cfs_account.status = CfsAccountStatus.INACTIVE.value
-
-                # apply receipt to parent cfs account
-                parent_rs: RoutingSlipModel = RoutingSlipModel.find_by_number(routing_slip.parent_number)
-                parent_payment_account: PaymentAccountModel = PaymentAccountModel.find_by_id(
-                    parent_rs.payment_account_id
-                )
-                parent_cfs_account = CfsAccountModel.find_effective_by_payment_method(
-                    parent_payment_account.id, PaymentMethod.INTERNAL.value
-                )
-                # For linked routing slip receipts, append 'L' to the number to avoid duplicate error
-                receipt_number = routing_slip.generate_cas_receipt_number()
-                CFSService.create_cfs_receipt(
-                    cfs_account=parent_cfs_account,
-                    rcpt_number=receipt_number,
-                    rcpt_date=routing_slip.routing_slip_date.strftime("%Y-%m-%d"),
-                    amount=routing_slip.total,
-                    payment_method=parent_payment_account.payment_method,
-                    access_token=CFSService.get_token(PaymentSystem.FAS).json().get("access_token"),
-                )
+                if error:
+                    raise error
+                run.cfs_account(routing_slip.payment_account_id).status = CfsAccountStatus.INACTIVE.value
 
                 # Add to the list if parent is NSF, to apply the receipts.
+                parent_rs = parents[routing_slip.parent_number]
                 if parent_rs.status == RoutingSlipStatus.NSF.value:
                     total_invoice_amount = cls._apply_routing_slips_to_pending_invoices(parent_rs)
                     current_app.logger.debug(f"Total Invoice Amount : {total_invoice_amount}")
@@ -104,14 +193,16 @@ class RoutingSlipTask:  # pylint:disable=too-few-public-methods
                     parent_rs.remaining_amount = routing_slip.total - total_invoice_amount
 
                 routing_slip.save()
-
+                run.report["processed"] += 1
             except Exception as e:  # NOQA # pylint: disable=broad-except
                 current_app.logger.error(
                     f"Error on Linking Routing Slip number:={routing_slip.number}, "
                     f"routing slip : {routing_slip.id}, ERROR : {str(e)}",
                     exc_info=True,
                 )
+                run.report["failed"] += 1
                 continue
+        run.log_report()
 
     @classmethod
     def process_correction(cls):
@@ -185,37 +276,43 @@ class RoutingSlipTask:  # pylint:disable=too-few-public-methods
         """
         routing_slips = cls._get_routing_slip_by_status(RoutingSlipStatus.VOID.value)
         current_app.logger.info(f"Found {len(routing_slips)} to process VOID.")
+        run = cls._start_run("void", routing_slips)
+        # FUTURE: If this is hit, and needs to change, we can do something similar to NSF.
+        # EX. Reset the invoices to created, invoice reference to active.
+        with_invoices = {routing_slip.id for routing_slip in routing_slips if routing_slip.invoices}
+
+        def _reverse_in_cfs(call: RoutingSlipReceiptCall):
+            current_app.logger.debug(f"Reverse receipt {call.number}")
+            # Reverse all child routing slips, as all linked routing slips are also considered as VOID.
+            for receipt_number, _ in call.receipts:
+                CFSService.reverse_rs_receipt_in_cfs(call.cfs_account, receipt_number, ReverseOperation.VOID.value)
+
+        calls, errors = cls._build_receipt_calls(
+            run, [routing_slip for routing_slip in routing_slips if routing_slip.id not in with_invoices]
+        )
+        errors.update(cls._run_cfs_calls(_reverse_in_cfs, calls))
         for routing_slip in routing_slips:
             try:
-                current_app.logger.debug(f"Reverse receipt {routing_slip.number}")
-                if routing_slip.invoices:
-                    # FUTURE: If this is hit, and needs to change, we can do something similar to NSF.
-                    # EX. Reset the invoices to created, invoice reference to active.
+                if routing_slip.id in with_invoices:
                     raise Exception("VOID - has transactions/invoices.")  # pylint: disable=broad-exception-raised
-
-                payment_account: PaymentAccountModel = PaymentAccountModel.find_by_id(routing_slip.payment_account_id)
-                cfs_account = CfsAccountModel.find_effective_by_payment_method(
-                    payment_account.id, PaymentMethod.INTERNAL.value
-                )
-
-                # Reverse all child routing slips, as all linked routing slips are also considered as VOID.
-                child_routing_slips: list[RoutingSlipModel] = RoutingSlipModel.find_children(routing_slip.number)
-                for rs in (routing_slip, *child_routing_slips):
-                    receipt_number = rs.generate_cas_receipt_number()
-                    CFSService.reverse_rs_receipt_in_cfs(cfs_account, receipt_number, ReverseOperation.VOID.value)
+                if error := errors.get(routing_slip.id):
+                    raise error
                 # Void routing slips aren't supposed to have pending transactions, so no need to look at invoices.
-                cfs_account.status = CfsAccountStatus.INACTIVE.value
+                run.cfs_account(routing_slip.payment_account_id).status = CfsAccountStatus.INACTIVE.value
                 routing_slip.remaining_amount = 0
                 # Increasing the version, incase we need to reuse the routing slip number in CAS.
                 routing_slip.cas_version_suffix += 1
                 routing_slip.save()
+                run.report["processed"] += 1
             except Exception as e:  # NOQA # pylint: disable=broad-except
                 current_app.logger.error(
                     f"Error on Processing VOID for :={routing_slip.number}, "
                     f"routing slip : {routing_slip.id}, ERROR : {str(e)}",
                     exc_info=True,
                 )
+                run.report["failed"] += 1
                 continue
+        run.log_report()
 
     @classmethod
     def process_nsf(cls):
@@ -228,36 +325,41 @@ class RoutingSlipTask:  # pylint:disable=too-few-public-methods
         """
         routing_slips = cls._get_routing_slip_by_status(RoutingSlipStatus.NSF.value)
         current_app.logger.info(f"Found {len(routing_slips)} to process NSF.")
-        for routing_slip in routing_slips:
+        run = cls._start_run("nsf", routing_slips)
+
+        def _reverse_in_cfs(call: RoutingSlipReceiptCall):
             # 1. Reverse the routing slip receipt.
             # 2. Reverse all the child receipts.
+            current_app.logger.debug(f"Reverse receipt {call.number}")
+            # Find all child routing slip and reverse it, as all linked routing slips are also considered as NSF.
+            for receipt_number, _ in call.receipts:
+                CFSService.reverse_rs_receipt_in_cfs(call.cfs_account, receipt_number, ReverseOperation.NSF.value)
+
+        calls, errors = cls._build_receipt_calls(run, routing_slips)
+        errors.update(cls._run_cfs_calls(_reverse_in_cfs, calls))
+        for routing_slip in routing_slips:
             # 3. Change the CFS Account status to FREEZE.
             try:
-                current_app.logger.debug(f"Reverse receipt {routing_slip.number}")
-                payment_account: PaymentAccountModel = PaymentAccountModel.find_by_id(routing_slip.payment_account_id)
-                cfs_account = CfsAccountModel.find_effective_by_payment_method(
-                    payment_account.id, PaymentMethod.INTERNAL.value
-                )
-
-                # Find all child routing slip and reverse it, as all linked routing slips are also considered as NSF.
-                child_routing_slips: list[RoutingSlipModel] = RoutingSlipModel.find_children(routing_slip.number)
-                for rs in (routing_slip, *child_routing_slips):
-                    receipt_number = rs.generate_cas_receipt_number()
-                    CFSService.reverse_rs_receipt_in_cfs(cfs_account, receipt_number, ReverseOperation.NSF.value)
-
-                    for payment in (
-                        db.session.query(PaymentModel).filter(PaymentModel.receipt_number == receipt_number).all()
-                    ):
-                        payment.payment_status_code = PaymentStatus.FAILED.value
-
+                if error := errors.get(routing_slip.id):
+                    raise error
+                receipt_numbers = [rs.generate_cas_receipt_number() for rs in run.family(routing_slip)]
+                for payment in (
+                    db.session.query(PaymentModel).filter(PaymentModel.receipt_number.in_(receipt_numbers)).all()
+                ):
+                    payment.payment_status_code = PaymentStatus.FAILED.value
+
+                cfs_account = run.cfs_account(routing_slip.payment_account_id)
                 cfs_account.status = CfsAccountStatus.FREEZE.value
 
                 cls._reset_invoices_and_references_to_created(routing_slip)
 
-                inv = cls._create_nsf_invoice(cfs_account, routing_slip.number, payment_account)
+                inv = cls._create_nsf_invoice(
+                    cfs_account, routing_slip.number, run.payment_accounts[routing_slip.payment_account_id]
+                )
                 # Reduce the NSF fee from remaining amount.
                 routing_slip.remaining_amount = routing_slip.remaining_amount - inv.total
                 routing_slip.save()
+                run.report["processed"] += 1
 
             except Exception as e:  # NOQA # pylint: disable=broad-except
                 current_app.logger.error(
@@ -265,7 +367,9 @@ class RoutingSlipTask:  # pylint:disable=too-few-public-methods
                     f"routing slip : {routing_slip.id}, ERROR : {str(e)}",
                     exc_info=True,
                 )
+                run.report["failed"] += 1
                 continue
+        run.log_report()
 
     @classmethod
     def adjust_routing_slips(cls):
@@ -292,43 +396,59 @@ class RoutingSlipTask:  # pylint:disable=too-few-public-methods
             .all()
         )
         current_app.logger.info(f"Found {len(routing_slips)} to write off or refund authorized.")
+        run = cls._start_run("adjust", routing_slips, with_children=False)
+
+        to_adjust, sbc_pay_applied = [], {}
+        trees = RoutingSlipModel.find_trees([routing_slip.number for routing_slip in routing_slips])
         for routing_slip in routing_slips:
             try:
-                child_routing_slips: list[RoutingSlipModel] = RoutingSlipModel.find_children(routing_slip.number)
-
-                has_pending, pending_count = cls._has_pending_invoices(routing_slip, child_routing_slips)
+                tree = trees[routing_slip.number]
+                run.children[routing_slip.number] = tree.children
+                has_pending, pending_count = cls._has_pending_invoices(tree)
                 if has_pending:
                     current_app.logger.warning(
                         f"Skipping routing slip {routing_slip.number} - has {pending_count} pending invoices "
                         f"that need to be processed first"
                     )
+                    run.report["skipped"] += 1
                     continue
-
-                # 1.Adjust the routing slip and it's child routing slips for the remaining balance.
-                current_app.logger.debug(f"Adjusting routing slip {routing_slip.number}")
-                payment_account: PaymentAccountModel = PaymentAccountModel.find_by_id(routing_slip.payment_account_id)
-                cfs_account = CfsAccountModel.find_effective_by_payment_method(
-                    payment_account.id, PaymentMethod.INTERNAL.value
+                sbc_pay_applied[routing_slip.id] = cls._get_applied_invoices_amount(tree)
+                to_adjust.append(routing_slip)
+            except Exception as e:  # NOQA # pylint: disable=broad-except
+                current_app.logger.error(
+                    f"Error on Adjusting Routing Slip for :={routing_slip.number}, "
+                    f"routing slip : {routing_slip.id}, ERROR : {str(e)}",
+                    exc_info=True,
                 )
-
-                # may raise ValueError
-                cls._validate_and_calculate_adjustment_amount(routing_slip, cfs_account, child_routing_slips)
-
-                # reverse routing slip receipt
-                for rs in (routing_slip, *child_routing_slips):
-                    is_refund = routing_slip.status == RoutingSlipStatus.REFUND_AUTHORIZED.value
-                    receipt_number = rs.generate_cas_receipt_number()
-                    # Adjust the receipt to zero in CFS
-                    CFSService.adjust_receipt_to_zero(cfs_account, receipt_number, is_refund)
-
+                run.report["failed"] += 1
+
+        def _adjust_in_cfs(call: RoutingSlipReceiptCall):
+            # 1.Adjust the routing slip and it's child routing slips for the remaining balance.
+            current_app.logger.debug(f"Adjusting routing slip {call.number}")
+            # may raise ValueError
+            cls._validate_and_calculate_adjustment_amount(call, sbc_pay_applied[call.routing_slip_id])
+            # reverse routing slip receipt
+            is_refund = call.status == RoutingSlipStatus.REFUND_AUTHORIZED.value
+            for receipt_number, _ in call.receipts:
+                # Adjust the receipt to zero in CFS
+                CFSService.adjust_receipt_to_zero(call.cfs_account, receipt_number, is_refund)
+
+        calls, errors = cls._build_receipt_calls(run, to_adjust)
+        errors.update(cls._run_cfs_calls(_adjust_in_cfs, calls))
+        for routing_slip in to_adjust:
+            try:
+                if error := errors.get(routing_slip.id):
+                    raise error
                 routing_slip.refund_amount = routing_slip.remaining_amount
                 routing_slip.remaining_amount = 0
                 routing_slip.save()
+                run.report["processed"] += 1
 
             except ValueError as e:
                 routing_slip.cas_mismatch = True
                 routing_slip.save()
                 current_app.logger.error(f"Skipping adjustment for routing slip {routing_slip.number}: {str(e)}")
+                run.report["cas_mismatch"] += 1
                 continue
 
             except Exception as e:  # NOQA # pylint: disable=broad-except
@@ -337,25 +457,126 @@ class RoutingSlipTask:  # pylint:disable=too-few-public-methods
                     f"routing slip : {routing_slip.id}, ERROR : {str(e)}",
                     exc_info=True,
                 )
+                run.report["failed"] += 1
                 continue
+        run.log_report()
 
     @classmethod
-    def _has_pending_invoices(
-        cls, routing_slip: RoutingSlipModel, child_routing_slips: list[RoutingSlipModel]
-    ) -> tuple[bool, int]:
-        """Check if routing slip or its children have pending invoices."""
-        all_routing_slips = [routing_slip] + child_routing_slips
-        all_routing_slip_numbers = [rs.number for rs in all_routing_slips]
-
-        pending_invoice_count = (
-            db.session.query(InvoiceModel)
-            .filter(
-                InvoiceModel.routing_slip.in_(all_routing_slip_numbers),
-                InvoiceModel.invoice_status_code.in_([InvoiceStatus.APPROVED.value, InvoiceStatus.CREATED.value]),
-            )
-            .count()
+    def _start_run(
+        cls, operation: str, routing_slips: list[RoutingSlipModel], payment_account_ids=(), with_children=True
+    ) -> RoutingSlipRun:
+        """Bulk load the payment accounts, effective CFS accounts and child routing slips for a run."""
+        run = RoutingSlipRun(operation)
+        if not routing_slips:
+            return run
+        account_ids = {routing_slip.payment_account_id for routing_slip in routing_slips} | set(payment_account_ids)
+        run.payment_accounts = {
+            payment_account.id: payment_account
+            for payment_account in db.session.query(PaymentAccountModel).filter(PaymentAccountModel.id.in_(account_ids))
+        }
+        for cfs_account in db.session.query(CfsAccountModel).filter(
+            CfsAccountModel.account_id.in_(account_ids),
+            CfsAccountModel.payment_method == PaymentMethod.INTERNAL.value,
+            CfsAccountModel.status != CfsAccountStatus.INACTIVE.value,
+        ):
+            if cfs_account.account_id in run.cfs_accounts:
+                run.duplicate_cfs_account_ids.add(cfs_account.account_id)
+            run.cfs_accounts[cfs_account.account_id] = cfs_account
+        if with_children:
+            children = defaultdict(list)
+            for child in (
+                db.session.query(RoutingSlipModel)
+                .filter(RoutingSlipModel.parent_number.in_({routing_slip.number for routing_slip in routing_slips}))
+                .order_by(RoutingSlipModel.id)
+            ):
+                children[child.parent_number].append(child)
+            run.children = children
+        return run
+
+    @staticmethod
+    def _build_link_call(
+        run: RoutingSlipRun, routing_slip: RoutingSlipModel, parent_rs: RoutingSlipModel
+    ) -> RoutingSlipLinkCall:
+        """Capture the values the CFS calls linking a routing slip need."""
+        cfs_account = run.cfs_account(routing_slip.payment_account_id)
+        parent_cfs_account = run.cfs_account(parent_rs.payment_account_id)
+        return RoutingSlipLinkCall(
+            routing_slip_id=routing_slip.id,
+            number=routing_slip.number,
+            cfs_account=RoutingSlipCfsAccount(cfs_account.cfs_party, cfs_account.cfs_account, cfs_account.cfs_site),
+            parent_cfs_account=RoutingSlipCfsAccount(
+                parent_cfs_account.cfs_party, parent_cfs_account.cfs_account, parent_cfs_account.cfs_site
+            ),
+            # For linked routing slip receipts, append 'L' to the number to avoid duplicate error
+            receipt_number=routing_slip.generate_cas_receipt_number(),
+            receipt_date=routing_slip.routing_slip_date.strftime("%Y-%m-%d"),
+            total=routing_slip.total,
+            payment_method=run.payment_accounts[parent_rs.payment_account_id].payment_method,
         )
 
+    @staticmethod
+    def _build_receipt_calls(
+        run: RoutingSlipRun, routing_slips: list[RoutingSlipModel]
+    ) -> tuple[list[RoutingSlipReceiptCall], dict[int, Exception]]:
+        """Capture the values the CFS calls on each routing slip's receipts need, returning the errors by id."""
+        calls, errors = [], {}
+        for routing_slip in routing_slips:
+            try:
+                cfs_account = run.cfs_account(routing_slip.payment_account_id)
+                calls.append(
+                    RoutingSlipReceiptCall(
+                        routing_slip_id=routing_slip.id,
+                        number=routing_slip.number,
+                        status=routing_slip.status,
+                        cfs_account=RoutingSlipCfsAccount(
+                            cfs_account.cfs_party, cfs_account.cfs_account, cfs_account.cfs_site
+                        ),
+                        receipts=tuple((rs.generate_cas_receipt_number(), rs.total) for rs in run.family(routing_slip)),
+                    )
+                )
+            except Exception as e:  # NOQA # pylint: disable=broad-except
+                errors[routing_slip.id] = e
+        return calls, errors
+
+    @classmethod
+    def _iter_cfs_calls(cls, func: Callable, items: list) -> Iterator[tuple[object, Exception | None]]:
+        """Run the CFS calls for each item, yielding the item and its error as soon as its calls finish.
+
+        Independent items run in parallel, the calls for one routing slip and its children run in order.
+        Only the CFS calls run on the pool, database changes are applied on the job's session by the caller.
+        """
+
+        def _run(item):
+            try:
+                func(item)
+            except Exception as e:  # NOQA # pylint: disable=broad-except
+                return item, e
+            return item, None
+
+        workers = current_app.config.get("ROUTING_SLIP_CFS_WORKERS", 1)
+        if workers <= 1 or len(items) <= 1:
+            for item in items:
+                yield _run(item)
+            return
+        app = current_app._get_current_object()  # pylint: disable=protected-access
+
+        def _run_in_app_context(item):
+            with app.app_context():
+                return _run(item)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="routing-slip") as executor:
+            for future in as_completed([executor.submit(_run_in_app_context, item) for item in items]):
+                yield future.result()
+
+    @classmethod
+    def _run_cfs_calls(cls, func: Callable, calls: list) -> dict[int, Exception]:
+        """Run the CFS calls for every routing slip before any database change, returning the errors by id."""
+        return {call.routing_slip_id: error for call, error in cls._iter_cfs_calls(func, calls) if error is not None}
+
+    @classmethod
+    def _has_pending_invoices(cls, tree: RoutingSlipTree) -> tuple[bool, int]:
+        """Check if routing slip or its children have pending invoices."""
+        pending_invoice_count = len(tree.find_invoices([InvoiceStatus.APPROVED.value, InvoiceStatus.CREATED.value]))
         return (pending_invoice_count > 0, pending_invoice_count)
 
     @classmethod
@@ -375,22 +596,17 @@ class RoutingSlipTask:  # pylint:disable=too-few-public-methods
         )
 
     @classmethod
-    def _get_applied_invoices_amount(cls, routing_slips: list[RoutingSlipModel]) -> Decimal:
-        """Get total amount of applied invoices in SBC-PAY for routing slips."""
-        routing_slip_numbers = [rs.number for rs in routing_slips]
-        total_applied = (
-            db.session.query(func.sum(InvoiceModel.paid - func.coalesce(InvoiceModel.refund, 0)))
-            .filter(
-                InvoiceModel.routing_slip.in_(routing_slip_numbers),
-                InvoiceModel.invoice_status_code == InvoiceStatus.PAID.value,
-            )
-            .scalar()
+    def _get_applied_invoices_amount(cls, tree: RoutingSlipTree) -> Decimal:
+        """Get total amount of applied invoices in SBC-PAY for the routing slip and its children."""
+        paid_invoices = tree.find_invoices([InvoiceStatus.PAID.value])
+        return sum(
+            (Decimal(str(invoice.paid)) - Decimal(str(invoice.refund or 0)) for invoice in paid_invoices),
+            Decimal("0.0"),
         )
-        return total_applied or Decimal("0.0")
 
     @classmethod
     def _check_data_consistency(
-        cls, routing_slip: RoutingSlipModel, sbc_pay_applied_amount: Decimal, cfs_receipt_details: list[dict]
+        cls, routing_slip_number: str, sbc_pay_applied_amount: Decimal, cfs_receipt_details: list[dict]
     ) -> None:
         """Check data consistency between SBC-PAY and CFS."""
         sbc_pay_has_invoices = sbc_pay_applied_amount > 0
@@ -398,7 +614,7 @@ class RoutingSlipTask:  # pylint:disable=too-few-public-methods
 
         if sbc_pay_has_invoices != cfs_has_invoices:
             error_msg = (
-                f"Data mismatch for routing slip {routing_slip.number}: "
+                f"Data mismatch for routing slip {routing_slip_number}: "
                 f"SBC-PAY applied amount: ${sbc_pay_applied_amount:.2f}, "
                 f"CFS has applied invoices: {cfs_has_invoices}. "
                 f"Manual intervention required."
@@ -415,34 +631,27 @@ class RoutingSlipTask:  # pylint:disable=too-few-public-methods
             raise ValueError(error_msg)
 
     @classmethod
-    def _validate_and_calculate_adjustment_amount(
-        cls, routing_slip: RoutingSlipModel, cfs_account: CfsAccountModel, child_routing_slips: list[RoutingSlipModel]
-    ) -> None:
+    def _validate_and_calculate_adjustment_amount(cls, call: RoutingSlipReceiptCall, sbc_pay_applied: Decimal) -> None:
         """Validate adjustment amount for routing slip."""
-        all_routing_slips = [routing_slip] + child_routing_slips
-
-        sbc_pay_applied = cls._get_applied_invoices_amount(all_routing_slips)
-
         receipt_details = []
         cfs_unapplied_total = Decimal("0.0")
 
-        for rs in all_routing_slips:
-            receipt_number = rs.generate_cas_receipt_number()
-            receipt_data = CFSService.get_receipt(cfs_account, receipt_number)
+        for receipt_number, _ in call.receipts:
+            receipt_data = CFSService.get_receipt(call.cfs_account, receipt_number)
             unapplied_amount = Decimal(str(receipt_data.get("unapplied_amount", 0)))
             has_applied_invoices = len(receipt_data.get("invoices", [])) > 0
             receipt_details.append({"has_applied_invoices": has_applied_invoices})
             cfs_unapplied_total += unapplied_amount
 
         # may raise ValueError
-        cls._check_data_consistency(routing_slip, sbc_pay_applied, receipt_details)
-        all_rs_total = sum(rs.total for rs in all_routing_slips)
+        cls._check_data_consistency(call.number, sbc_pay_applied, receipt_details)
+        all_rs_total = sum(total for _, total in call.receipts)
         expected_adjustment = all_rs_total - sbc_pay_applied
 
         amount_diff = abs(cfs_unapplied_total - expected_adjustment)
         if amount_diff > 0:
             error_msg = (
-                f"Amount mismatch for routing slip {routing_slip.number}: "
+                f"Amount mismatch for routing slip {call.number}: "
                 f"Expected adjustment ${expected_adjustment:.2f}, "
                 f"but CFS unapplied amount is ${cfs_unapplied_total:.2f}. "
                 f"Difference: ${amount_diff:.2f}"
@@ -452,23 +661,25 @@ class RoutingSlipTask:  # pylint:disable=too-few-public-methods
     @classmethod
     def _reset_invoices_and_references_to_created(cls, routing_slip: RoutingSlipModel):
         """Reset Invoices, Invoice references and Receipts for routing slip."""
-        invoices: list[InvoiceModel] = (
-            db.session.query(InvoiceModel)
-            .filter(InvoiceModel.routing_slip == routing_slip.number)
-            .filter(InvoiceModel.invoice_status_code == InvoiceStatus.PAID.value)
-            .all()
-        )
-        for inv in invoices:
+        tree = RoutingSlipModel.find_tree(routing_slip.number)
+        for inv in tree.find_invoices([InvoiceStatus.PAID.value], number=routing_slip.number):
             # Reset the statuses
             inv.invoice_status_code = InvoiceStatus.CREATED.value
-            inv_ref = InvoiceReferenceModel.find_by_invoice_id_and_status(
-                inv.id, InvoiceReferenceStatus.COMPLETED.value
-            )
+            inv_ref = cls._find_reference(inv, InvoiceReferenceStatus.COMPLETED.value)
             inv_ref.status_code = InvoiceReferenceStatus.ACTIVE.value
             # Delete receipts as receipts are reversed in CFS.
-            for receipt in ReceiptModel.find_all_receipts_for_invoice(inv.id):
+            for receipt in list(inv.receipts):
                 db.session.delete(receipt)
 
+    @staticmethod
+    def _find_reference(invoice: InvoiceModel, status_code: str) -> InvoiceReferenceModel:
+        """Return the invoice's latest reference in the status, from the references loaded with the tree."""
+        return max(
+            (reference for reference in invoice.references if reference.status_code == status_code),
+            key=lambda reference: reference.id,
+            default=None,
+        )
+
     @classmethod
     def _create_nsf_invoice(
         cls,
@@ -545,26 +756,21 @@ class RoutingSlipTask:  # pylint:disable=too-few-public-methods
             routing_slip_payment_account.id, PaymentMethod.INTERNAL.value
         )
 
-        invoices: list[InvoiceModel] = (
-            db.session.query(InvoiceModel)
-            .filter(
-                InvoiceModel.routing_slip == routing_slip.number,
-                InvoiceModel.invoice_status_code.in_([InvoiceStatus.CREATED.value, InvoiceStatus.APPROVED.value]),
-            )
-            .all()
+        tree = RoutingSlipModel.find_tree(routing_slip.number)
+        invoices = tree.find_invoices(
+            [InvoiceStatus.CREATED.value, InvoiceStatus.APPROVED.value], number=routing_slip.number
         )
         current_app.logger.info(f"Found {len(invoices)} to apply receipt")
         applied_amount = 0
         for inv in invoices:
-            inv_ref: InvoiceReferenceModel = InvoiceReferenceModel.find_by_invoice_id_and_status(
-                inv.id, InvoiceReferenceStatus.ACTIVE.value
-            )
+            inv_ref = cls._find_reference(inv, InvoiceReferenceStatus.ACTIVE.value)
             cls.apply_routing_slips_to_invoice(
                 routing_slip_payment_account,
                 active_cfs_account,
                 routing_slip,
                 inv,
                 inv_ref.invoice_number,
+                tree.children,
             )
 
             # IF invoice balance is zero, then update records.
@@ -589,10 +795,12 @@ class RoutingSlipTask:  # pylint:disable=too-few-public-methods
         parent_routing_slip: RoutingSlipModel,
         invoice: InvoiceModel,
         invoice_number: str,
+        child_routing_slips: list[RoutingSlipModel] = None,
     ) -> bool:
         """Apply routing slips (receipts in CFS) to invoice."""
         has_errors = False
-        child_routing_slips: list[RoutingSlipModel] = RoutingSlipModel.find_children(parent_routing_slip.number)
+        if child_routing_slips is None:
+            child_routing_slips = RoutingSlipModel.find_children(parent_routing_slip.number)
         # an invoice has to be applied to multiple receipts (incl. all linked RS); apply till the balance is zero
         for routing_slip in (parent_routing_slip, *child_routing_slips):
             try:
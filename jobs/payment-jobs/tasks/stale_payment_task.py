@@ -14,22 +14,49 @@
 """This module is being invoked from a job and it cleans up the stale records."""
 
 import datetime
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
 
 from flask import current_app
 from requests import HTTPError
 
 from pay_api.exceptions import BusinessException, Error
 from pay_api.models import Invoice as InvoiceModel
+from pay_api.models import InvoiceReference as InvoiceReferenceModel
 from pay_api.models import Payment as PaymentModel
 from pay_api.models import PaymentTransaction as PaymentTransactionModel
 from pay_api.models import db
 from pay_api.services import InvoiceService, PaymentService, TransactionService
+from pay_api.services.direct_pay_service import DirectPayService
 from pay_api.services.direct_sale_service import DirectSaleService
 from pay_api.utils.enums import InvoiceReferenceStatus, PaymentMethod, PaymentStatus, TransactionStatus
+from tasks.common.rate_limiter import HostRateLimiter
 
 STATUS_PAID = ("PAID", "CMPLT")
 
 
+@dataclass
+class VerificationRun:
+    """State shared by the workers verifying created invoices."""
+
+    rate_limiter: HostRateLimiter
+    # PAID order statuses by invoice reference number, invoices in the same cart share a reference.
+    paid_orders: dict = field(default_factory=dict)
+    # CFS receipts for credit card invoices resolved in one batch, keyed by invoice id.
+    receipts: dict = field(default_factory=dict)
+    outcomes: Counter = field(default_factory=Counter)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def record(self, outcome: str):
+        """Count a verification outcome."""
+        with self._lock:
+            self.outcomes[outcome] += 1
+
+
 class StalePaymentTask:  # pylint: disable=too-few-public-methods
     """Task to sync stale payments."""
 
@@ -61,12 +88,15 @@ class StalePaymentTask:  # pylint: disable=too-few-public-methods
 
         if len(stale_transactions) == 0 and len(service_unavailable_transactions) == 0:
             current_app.logger.info(f"Ran at {datetime.datetime.now(tz=datetime.UTC)}.But No records found!")
+        receipts = cls._get_credit_card_receipts(
+            cls._find_credit_card_references([*stale_transactions, *service_unavailable_transactions])
+        )
         for transaction in [*stale_transactions, *service_unavailable_transactions]:
             try:
                 current_app.logger.info(
                     f"Found records.Payment Id: {transaction.payment_id}, Transaction Id : {transaction.id}"
                 )
-                TransactionService.update_transaction(transaction.id, pay_response_url=None)
+                TransactionService.update_transaction(transaction.id, pay_response_url=None, receipts=receipts)
                 current_app.logger.info(
                     f"Updated records.Payment Id: {transaction.payment_id}, Transaction Id : {transaction.id}"
                 )
@@ -81,6 +111,34 @@ class StalePaymentTask:  # pylint: disable=too-few-public-methods
                     current_app.logger.info("Stale Transaction Error on update_transaction")
                     current_app.logger.info(err)
 
+    @staticmethod
+    def _find_credit_card_references(transactions: list) -> list:
+        """Return the active invoice references of the credit card payments of the transactions."""
+        payment_ids = {transaction.payment_id for transaction in transactions if transaction.payment_id}
+        if not payment_ids:
+            return []
+        return (
+            db.session.query(InvoiceReferenceModel)
+            .join(PaymentModel, PaymentModel.invoice_number == InvoiceReferenceModel.invoice_number)
+            .filter(PaymentModel.id.in_(payment_ids))
+            .filter(PaymentModel.payment_method_code == PaymentMethod.CC.value)
+            .filter(InvoiceReferenceModel.status_code == InvoiceReferenceStatus.ACTIVE.value)
+            .all()
+        )
+
+    @staticmethod
+    def _get_credit_card_receipts(invoice_references: list, rate_limiter: HostRateLimiter = None) -> dict:
+        """Resolve the CFS receipts for credit card invoice references in one batch, keyed by invoice id."""
+        if not invoice_references:
+            return {}
+        throttle = partial(rate_limiter.acquire, current_app.config.get("CFS_BASE_URL")) if rate_limiter else None
+        try:
+            return DirectPayService.get_receipts(invoice_references, throttle)
+        except Exception as err:  # NOQA # pylint: disable=broad-except
+            # Transactions fall back to looking up their own receipt.
+            current_app.logger.error(f"Error resolving credit card receipts: {err}", exc_info=True)
+            return {}
+
     @classmethod
     def _delete_marked_payments(cls):
         """Update stale payment records.
@@ -104,26 +162,75 @@ class StalePaymentTask:  # pylint: disable=too-few-public-methods
 
     @classmethod
     def _verify_created_credit_card_invoices(cls, daily_run):
-        """Verify recent invoice with PAYBC."""
+        """Verify recent invoice with PAYBC.
+
+        Invoices are verified by a bounded pool of workers, calls are rate limited per PAYBC host and a PAID order
+        status is reused for invoices sharing an invoice reference.
+        """
         days = 30 if daily_run else 2
         invoices = InvoiceService.find_created_invoices(payment_method=PaymentMethod.DIRECT_PAY.value, days=days)
         if daily_run:
             invoices += InvoiceService.find_created_invoices(payment_method=PaymentMethod.CC.value, days=90)
         current_app.logger.info(f"Found {len(invoices)} created invoices to be verified.")
-        for invoice in invoices:
-            current_app.logger.info(f"Verifying invoice: {invoice.id}")
-            cls._handle_direct_sale_invoice(invoice)
-            cls._handle_direct_pay_invoice(invoice)
+        run = VerificationRun(HostRateLimiter(current_app.config.get("STALE_PAYMENT_CALLS_PER_SECOND", 0)))
+        # Receipts are prefetched for every credit card invoice, the workers decide which ones have a transaction
+        # to update.
+        if credit_card_invoice_ids := [
+            invoice.id for invoice in invoices if invoice.payment_method_code == PaymentMethod.CC.value
+        ]:
+            run.receipts = cls._get_credit_card_receipts(
+                InvoiceReferenceModel.query.filter(InvoiceReferenceModel.invoice_id.in_(credit_card_invoice_ids))
+                .filter(InvoiceReferenceModel.status_code == InvoiceReferenceStatus.ACTIVE.value)
+                .all(),
+                run.rate_limiter,
+            )
+        workers = current_app.config.get("STALE_PAYMENT_VERIFY_WORKERS", 1)
+        start = time.monotonic()
+        if workers <= 1 or len(invoices) <= 1:
+            for invoice in invoices:
+                cls._verify_invoice(invoice, run)
+        else:
+            app = current_app._get_current_object()  # pylint: disable=protected-access
+
+            def _verify_in_app_context(invoice_id: int):
+                # Each worker gets its own app context and database session.
+                with app.app_context():
+                    cls._verify_invoice(InvoiceModel.find_by_id(invoice_id), run)
+
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stale-payment") as executor:
+                list(executor.map(_verify_in_app_context, [invoice.id for invoice in invoices]))
+        cls._log_verification_summary(run, time.monotonic() - start)
+
+    @classmethod
+    def _verify_invoice(cls, invoice: InvoiceModel, run: VerificationRun):
+        """Verify a created invoice, errors are isolated to the invoice."""
+        current_app.logger.info(f"Verifying invoice: {invoice.id}")
+        run.record("checked")
+        try:
+            outcome = cls._handle_direct_sale_invoice(invoice, run) or cls._handle_direct_pay_invoice(invoice, run)
+        except Exception as err:  # NOQA # pylint: disable=broad-except
+            current_app.logger.error(f"Error verifying invoice {invoice.id}: {err}", exc_info=True)
+            outcome = "errored"
+        run.record(outcome or "skipped")
+
+    @staticmethod
+    def _log_verification_summary(run: VerificationRun, elapsed: float):
+        """Log what the verification run did and how fast."""
+        elapsed = max(elapsed, 0.001)
+        rates = ", ".join(
+            f"{outcome}={count} ({count / elapsed:.1f}/s)" for outcome, count in sorted(run.outcomes.items())
+        )
+        current_app.logger.info(f"Verified created invoices in {elapsed:.1f}s: {rates or 'no invoices'}")
 
     @classmethod
-    def _handle_direct_pay_invoice(cls, invoice: InvoiceModel):
+    def _handle_direct_pay_invoice(cls, invoice: InvoiceModel, run: VerificationRun = None):
         """Handle NSF or shopping cart credit card invoices.
 
         This handles the longer scenario up to 90 days.
         """
         # DIRECT_PAY are actually DirectSale invoices.
         if invoice.payment_method_code == PaymentMethod.DIRECT_PAY.value:
-            return
+            return None
         try:
             # Note: CREATED is handled by find_stale_records, might not need in job, doesn't handle FAILED though.
             if not (
@@ -131,35 +238,69 @@ class StalePaymentTask:  # pylint: disable=too-few-public-methods
                     invoice.id, [TransactionStatus.FAILED.value, TransactionStatus.CREATED.value]
                 )
             ):
-                return
-            TransactionService.update_transaction(transaction.id, pay_response_url=None)
+                return "skipped"
+            if run:
+                run.rate_limiter.acquire(current_app.config.get("CFS_BASE_URL"))
+            TransactionService.update_transaction(
+                transaction.id, pay_response_url=None, receipts=run.receipts if run else None
+            )
+            return "updated"
         except Exception as err:  # NOQA # pylint: disable=broad-except
             current_app.logger.error(f"Error verifying invoice {invoice.id}: {err}", exc_info=True)
+            return "errored"
+
+    @classmethod
+    def _query_order_status(cls, invoice: InvoiceModel, run: VerificationRun = None):
+        """Return the PAYBC order status for an invoice, reusing a PAID status already seen for its reference."""
+        invoice_number = next(
+            (
+                reference.invoice_number
+                for reference in invoice.references
+                if reference.status_code == InvoiceReferenceStatus.ACTIVE.value
+            ),
+            None,
+        )
+        if run is None:
+            return DirectSaleService.query_order_status(invoice, InvoiceReferenceStatus.ACTIVE.value)
+        if paybc_invoice := run.paid_orders.get(invoice_number):
+            run.record("cached")
+            return paybc_invoice
+        run.rate_limiter.acquire(current_app.config.get("PAYBC_DIRECT_PAY_BASE_URL"))
+        paybc_invoice = DirectSaleService.query_order_status(invoice, InvoiceReferenceStatus.ACTIVE.value)
+        if paybc_invoice.paymentstatus in STATUS_PAID:
+            run.paid_orders[invoice_number] = paybc_invoice
+        return paybc_invoice
 
     @classmethod
-    def _handle_direct_sale_invoice(cls, invoice: InvoiceModel):
+    def _handle_direct_sale_invoice(cls, invoice: InvoiceModel, run: VerificationRun = None):
         """Handle regular direct sale invoices, these are 99% of transactions."""
         # CC invoices are true DirectPay invoices.
         if invoice.payment_method_code == PaymentMethod.CC.value:
-            return
+            return None
         try:
-            paybc_invoice = DirectSaleService.query_order_status(invoice, InvoiceReferenceStatus.ACTIVE.value)
+            paybc_invoice = cls._query_order_status(invoice, run)
             if paybc_invoice.paymentstatus not in STATUS_PAID:
-                return
+                return "skipped"
             if not (
                 transaction := TransactionService.should_process_transaction(
                     invoice.id, [TransactionStatus.CREATED.value, TransactionStatus.FAILED.value]
                 )
             ):
-                return
+                return "skipped"
             # check existing payment status in PayBC and save receipt
+            if run:
+                run.rate_limiter.acquire(current_app.config.get("PAYBC_DIRECT_PAY_BASE_URL"))
             TransactionService.update_transaction(transaction.id, pay_response_url=None)
+            return "updated"
         except HTTPError as http_err:
             if http_err.response is None or http_err.response.status_code != 404:
                 current_app.logger.error(
                     f"HTTPError on verifying invoice {invoice.id}: {http_err}",
                     exc_info=True,
                 )
+                return "errored"
             current_app.logger.info(f"Invoice not found (404) at PAYBC. Skipping invoice id: {invoice.id}")
+            return "not_found"
         except Exception as err:  # NOQA # pylint: disable=broad-except
             current_app.logger.error(f"Error verifying invoice {invoice.id}: {err}", exc_info=True)
+            return "errored"
@@ -13,6 +13,9 @@
 # limitations under the License.
 """Service to manage PAYBC services."""
 
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import UTC, datetime, timedelta
 
 from dateutil.parser import parse
@@ -33,6 +36,17 @@ from pay_api.utils.util import (
     get_previous_month_and_year,
     get_week_start_and_end_date,
 )
+from tasks.common.statement_generation import StatementGenerationEngine, StatementShard
+
+
+def _generate_statement_shard(shard: str, arguments: list) -> str:
+    """Generate statements for one shard in a worker process with its own app and database connections."""
+    from invoke_jobs import create_app  # pylint: disable=import-outside-toplevel
+
+    app = create_app()
+    with app.app_context():
+        StatementTask.generate_statements([f"--shard={shard}", *arguments])
+    return shard
 
 
 class StatementTask:  # pylint:disable=too-few-public-methods
@@ -42,6 +56,7 @@ class StatementTask:  # pylint:disable=too-few-public-methods
     has_account_override: bool = False
     statement_from: datetime = None
     statement_to: datetime = None
+    shard: StatementShard = None
 
     @classmethod
     def generate_statements(cls, arguments=None):
@@ -49,7 +64,15 @@ class StatementTask:  # pylint:disable=too-few-public-methods
 
         Steps:
         1. Get all payment accounts and it's active statement settings.
+
+        --shard i/N only generates statements for the accounts in shard i, --shards N runs all N shards in a
+        process pool. Each shard is committed on its own and re-running a shard skips accounts already generated.
         """
+        arguments, shard, shard_count = cls._parse_shard_arguments(arguments)
+        if shard_count:
+            cls._generate_shards_in_parallel(shard_count, arguments)
+            return
+        cls.shard = shard
         date_override = arguments[0] if arguments and len(arguments) > 0 else None
         auth_account_override = arguments[1] if arguments and len(arguments) > 1 else None
 
@@ -64,12 +87,19 @@ class StatementTask:  # pylint:disable=too-few-public-methods
             current_app.logger.debug(f"Generating statements for: {date_override} using date override.")
         if auth_account_override:
             current_app.logger.debug(f"Generating statements for: {auth_account_override} using account override.")
+        if shard:
+            current_app.logger.info(f"Generating statements for shard {shard}.")
         # If today is sunday - generate all weekly statements for pervious week
         # If today is month beginning - generate all monthly statements for previous month
         # For every day generate all daily statements for previous day
         generate_weekly = target_time.weekday() == 6  # Sunday is 6
         generate_monthly = target_time.day == 1
 
+        if current_app.config.get("STATEMENT_SET_BASED_GENERATION"):
+            StatementGenerationEngine(target_time, cls.has_date_override, auth_account_override, shard).generate()
+            db.session.commit()
+            return
+
         cls._generate_daily_statements(target_time, auth_account_override)
         if not generate_weekly:
             cls._generate_gap_statements(target_time, auth_account_override)
@@ -81,6 +111,46 @@ class StatementTask:  # pylint:disable=too-few-public-methods
         # Commit transaction
         db.session.commit()
 
+    @staticmethod
+    def _parse_shard_arguments(arguments) -> tuple[list, StatementShard | None, int | None]:
+        """Split --shard i/N and --shards N out of the job arguments, returns the remaining positional arguments."""
+        positional, shard, shard_count = [], None, None
+        arguments = list(arguments or [])
+        while arguments:
+            argument = arguments.pop(0)
+            name, _, value = argument.partition("=")
+            if name not in ("--shard", "--shards"):
+                positional.append(argument)
+                continue
+            value = value or (arguments.pop(0) if arguments else "")
+            if name == "--shard":
+                shard = StatementShard.parse(value)
+            else:
+                shard_count = int(value)
+        return positional, shard, shard_count
+
+    @classmethod
+    def _generate_shards_in_parallel(cls, shard_count: int, arguments: list):
+        """Run every shard in its own process, a failed shard doesn't roll back the shards that completed."""
+        max_workers = min(shard_count, os.cpu_count() or 1)
+        current_app.logger.info(f"Generating statements in {shard_count} shards with {max_workers} processes.")
+        failed_shards = []
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = {
+                pool.submit(_generate_statement_shard, str(StatementShard(index, shard_count)), arguments): index
+                for index in range(shard_count)
+            }
+            for future in as_completed(futures):
+                shard = StatementShard(futures[future], shard_count)
+                try:
+                    future.result()
+                    current_app.logger.info(f"Statement shard {shard} completed.")
+                except Exception as e:  # NOQA # pylint: disable=broad-except
+                    current_app.logger.error(f"Statement shard {shard} failed: {e}")
+                    failed_shards.append(str(shard))
+        if failed_shards:
+            raise RuntimeError(f"Statement shards failed, re-run with --shard: {', '.join(sorted(failed_shards))}")
+
     @classmethod
     def _generate_gap_statements(cls, target_time, account_override):
         """Generate gap statements for weekly statements that wont run over Sunday."""
@@ -242,6 +312,9 @@ class StatementTask:  # pylint:disable=too-few-public-methods
                 search_filter.get("monthFilter").get("year"),
             )
             current_app.logger.debug(f"Statements for month: {cls.statement_from.date()} to {cls.statement_to.date()}")
+        if cls.shard:
+            statement_settings = cls._filter_settings_by_shard(statement_settings)
+            current_app.logger.debug(f"Shard {cls.shard} filtered to {len(statement_settings)} accounts.")
         if cls.has_account_override:
             auth_account_ids = [account_override]
             statement_settings = cls._filter_settings_by_override(statement_settings, account_override)
@@ -270,6 +343,29 @@ class StatementTask:  # pylint:disable=too-few-public-methods
             db.session.execute(StatementInvoicesModel.__table__.insert(), statement_invoices)
             db.session.flush()
 
+    @classmethod
+    def _filter_settings_by_shard(cls, statement_settings):
+        """Keep the settings for accounts in this shard, skipping accounts a previous run of the shard generated."""
+        statement_settings = [row for row in statement_settings if cls.shard.includes(row.PaymentAccount.id)]
+        if cls.has_date_override or not statement_settings:
+            return statement_settings
+        payment_account_ids = [row.PaymentAccount.id for row in statement_settings]
+        generated_account_ids = set(
+            db.session.scalars(
+                select(StatementModel.payment_account_id)
+                .where(
+                    StatementModel.payment_account_id.in_(
+                        select(func.unnest(cast(payment_account_ids, ARRAY(INTEGER))))
+                    )
+                )
+                .where(StatementModel.frequency == statement_settings[0].StatementSettings.frequency)
+                .where(StatementModel.from_date == cls.statement_from.date())
+                .where(StatementModel.to_date == cls.statement_to.date())
+                .where(StatementModel.is_interim_statement.is_(False))
+            )
+        )
+        return [row for row in statement_settings if row.PaymentAccount.id not in generated_account_ids]
+
     @staticmethod
     def _build_statement_invoice_records(statements, auth_account_ids, invoices_by_account) -> list[dict]:
         """Build statement invoice records for bulk insert."""
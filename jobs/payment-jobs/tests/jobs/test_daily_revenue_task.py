@@ -0,0 +1,91 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the Daily Revenue Fact Job."""
+
+from datetime import date, datetime
+from decimal import Decimal
+
+from pay_api.models import DailyRevenueFact
+from pay_api.utils.enums import InvoiceStatus, PaymentMethod
+from tasks.daily_revenue_task import DailyRevenueTask
+
+from .factory import factory_invoice, factory_premium_payment_account
+
+
+def _facts(fact_date: date, corp_type_code: str) -> list[DailyRevenueFact]:
+    return (
+        DailyRevenueFact.query.filter_by(fact_date=fact_date, corp_type_code=corp_type_code)
+        .order_by(DailyRevenueFact.invoice_status_code)
+        .all()
+    )
+
+
+def test_daily_revenue_facts(session):
+    """Test facts are grouped by Pacific created date and refreshed in place."""
+    account = factory_premium_payment_account()
+    paid_invoice = factory_invoice(
+        account,
+        status_code=InvoiceStatus.PAID.value,
+        corp_type_code="VS",
+        total=Decimal("31.50"),
+        service_fees=Decimal("1.50"),
+        payment_method_code=PaymentMethod.DRAWDOWN.value,
+        created_on=datetime(2020, 1, 15, 20),
+    )
+    # 9 PM Pacific on the 15th.
+    factory_invoice(
+        account,
+        status_code=InvoiceStatus.PAID.value,
+        corp_type_code="VS",
+        total=Decimal("10.00"),
+        payment_method_code=PaymentMethod.DRAWDOWN.value,
+        created_on=datetime(2020, 1, 16, 5),
+    )
+    factory_invoice(
+        account,
+        status_code=InvoiceStatus.CREATED.value,
+        corp_type_code="VS",
+        total=Decimal("5.00"),
+        payment_method_code=PaymentMethod.DRAWDOWN.value,
+        created_on=datetime(2020, 1, 15, 20),
+    )
+
+    DailyRevenueTask.update_daily_revenue_facts(["2020-01-15"])
+
+    facts = _facts(date(2020, 1, 15), "VS")
+    assert [(fact.invoice_status_code, fact.invoice_count) for fact in facts] == [
+        (InvoiceStatus.CREATED.value, 1),
+        (InvoiceStatus.PAID.value, 2),
+    ]
+    paid_fact = facts[1]
+    assert paid_fact.payment_method_code == PaymentMethod.DRAWDOWN.value
+    assert paid_fact.total == Decimal("41.50")
+    assert paid_fact.service_fees == Decimal("1.50")
+    assert paid_fact.statutory_fees == Decimal("40.00")
+    assert not _facts(date(2020, 1, 16), "VS")
+
+    paid_invoice.invoice_status_code = InvoiceStatus.REFUNDED.value
+    paid_invoice.refund = Decimal("31.50")
+    paid_invoice.save()
+
+    DailyRevenueTask.update_daily_revenue_facts()
+
+    facts = _facts(date(2020, 1, 15), "VS")
+    assert [(fact.invoice_status_code, fact.invoice_count) for fact in facts] == [
+        (InvoiceStatus.CREATED.value, 1),
+        (InvoiceStatus.PAID.value, 1),
+        (InvoiceStatus.REFUNDED.value, 1),
+    ]
+    assert facts[2].refund == Decimal("31.50")
@@ -17,6 +17,8 @@
 Test-Suite to ensure that the DistributionTask is working as expected.
 """
 
+from flask import current_app
+
 from pay_api.models import CorpType as CorpTypeModel
 from pay_api.models import FeeSchedule
 from pay_api.utils.enums import InvoiceReferenceStatus, InvoiceStatus
@@ -159,3 +161,32 @@ def test_no_response_pay_bc(session, monkeypatch):
     invoice = factory_invoice(factory_create_direct_pay_account(), status_code=InvoiceStatus.PAID.value)
     monkeypatch.setattr("pay_api.services.oauth_service.OAuthService.get", empty_refund_payload_response)
     assert invoice.invoice_status_code == InvoiceStatus.PAID.value
+
+
+def test_update_failed_distributions_isolates_errors(session, monkeypatch):
+    """Assert a PAYBC error for one invoice doesn't stop the other invoices from being updated."""
+    invoices = []
+    for _ in range(2):
+        invoice = factory_invoice(
+            factory_create_direct_pay_account(),
+            status_code=InvoiceStatus.UPDATE_REVENUE_ACCOUNT.value,
+        )
+        factory_invoice_reference(invoice.id, invoice.id, InvoiceReferenceStatus.COMPLETED.value)
+        factory_payment("PAYBC", "DIRECT_PAY", invoice_number=invoice.id)
+        invoices.append(invoice)
+    failing_url = f"/paybc/payment/{current_app.config.get('PAYBC_DIRECT_PAY_REF_NUMBER')}/{invoices[0].id}"
+
+    def get_payment_details(payment_url, *_args):
+        if payment_url.endswith(failing_url):
+            raise ConnectionError("PAYBC unavailable")
+        return {"paymentstatus": "PAID", "revenue": [{"glstatus": "CMPLT"}]}
+
+    monkeypatch.setattr(
+        "pay_api.services.direct_sale_service.DirectSaleService.get_token",
+        paybc_token_response,
+    )
+    monkeypatch.setattr(DistributionTask, "get_payment_details", get_payment_details)
+
+    DistributionTask.update_failed_distributions()
+    assert invoices[0].invoice_status_code == InvoiceStatus.UPDATE_REVENUE_ACCOUNT.value
+    assert invoices[1].invoice_status_code == InvoiceStatus.PAID.value
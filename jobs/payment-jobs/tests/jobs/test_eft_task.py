@@ -21,6 +21,7 @@ from datetime import UTC, datetime
 from unittest.mock import Mock, patch
 
 import pytest
+from flask import current_app
 
 from pay_api.models import CfsAccount as CfsAccountModel
 from pay_api.models import FeeSchedule as FeeScheduleModel
@@ -274,8 +275,10 @@ def test_eft_credit_invoice_links_by_status(
         "normal_invoice_missing",
     ),
 )
-def test_link_electronic_funds_transfers(session, test_name):
-    """Test link electronic funds transfers."""
+@pytest.mark.parametrize("prefetch", (False, True))
+def test_link_electronic_funds_transfers(session, test_name, prefetch, monkeypatch):
+    """Test link electronic funds transfers, row by row and with the batch prefetched."""
+    monkeypatch.setitem(current_app.config, "EFT_PREFETCH_LINK_PROCESSING", prefetch)
     auth_account_id, eft_file, short_name_id, eft_transaction_id = setup_eft_credit_invoice_links_test()
     payment_account = factory_create_eft_account(auth_account_id=auth_account_id, status=CfsAccountStatus.ACTIVE.value)
     invoice = factory_invoice(
@@ -369,6 +372,56 @@ def test_link_electronic_funds_transfers(session, test_name):
     assert not eft_historical.is_processing
 
 
+def test_link_electronic_funds_transfers_concurrent(session, monkeypatch):
+    """Test concurrent CFS calls commit each linked rollup and isolate a failed receipt."""
+    monkeypatch.setitem(current_app.config, "EFT_PREFETCH_LINK_PROCESSING", True)
+    monkeypatch.setitem(current_app.config, "EFT_CFS_WORKERS", 2)
+    auth_account_id, eft_file, short_name_id, eft_transaction_id = setup_eft_credit_invoice_links_test()
+    payment_account = factory_create_eft_account(auth_account_id=auth_account_id, status=CfsAccountStatus.ACTIVE.value)
+    eft_credit = factory_create_eft_credit(
+        amount=100,
+        remaining_amount=0,
+        eft_file_id=eft_file.id,
+        short_name_id=short_name_id,
+        eft_transaction_id=eft_transaction_id,
+    )
+    invoices, links = [], []
+    for _ in range(3):
+        invoice = factory_invoice(
+            payment_account=payment_account,
+            payment_method_code=PaymentMethod.EFT.value,
+            status_code=InvoiceStatus.APPROVED.value,
+            total=10,
+        )
+        factory_invoice_reference(invoice_id=invoice.id)
+        invoices.append(invoice)
+        links.append(
+            factory_create_eft_credit_invoice_link(invoice_id=invoice.id, eft_credit_id=eft_credit.id, amount=10)
+        )
+    failed_receipt_number = f"EFTCIL{links[1].id}"
+
+    def _create_cfs_receipt(**kwargs):
+        if kwargs["rcpt_number"] == failed_receipt_number:
+            raise ConnectionError("CFS unavailable")
+
+    with (
+        patch("pay_api.services.CFSService.create_cfs_receipt", side_effect=_create_cfs_receipt) as mock_receipt,
+        patch("pay_api.services.CFSService.apply_receipt") as mock_apply_receipt,
+    ):
+        EFTTask.link_electronic_funds_transfers_cfs()
+
+    assert mock_receipt.call_count == 3
+    assert mock_apply_receipt.call_count == 2
+    for invoice, link in zip(invoices, links, strict=True):
+        if f"EFTCIL{link.id}" == failed_receipt_number:
+            assert invoice.invoice_status_code == InvoiceStatus.APPROVED.value
+            assert link.status_code == EFTCilStatus.PENDING.value
+        else:
+            assert invoice.invoice_status_code == InvoiceStatus.PAID.value
+            assert link.status_code == EFTCilStatus.COMPLETED.value
+            assert ReceiptModel.find_all_receipts_for_invoice(invoice.id)
+
+
 @pytest.mark.parametrize(
     "test_name, cil_status, inv_status, inv_ref_status, result_cil_status, result_inv_status, result_inv_ref_status",
     [
@@ -498,3 +498,70 @@ def test_statutory_fees_gst_distribution_code_validation(session, monkeypatch, g
                 disbursement = disbursements[0]
                 expected_amount = payment_line_item.total + payment_line_item.statutory_fees_gst
                 assert disbursement.line_item.amount == expected_amount
+
+
+def test_disbursements_by_partner(session):
+    """Assert disbursements for several partners are selected together and partitioned by corp type."""
+    pad_account = factory_create_pad_account(auth_account_id="1234", status=CfsAccountStatus.ACTIVE.value)
+    disbursement_delay = current_app.config.get("DISBURSEMENT_DELAY_IN_DAYS")
+    disbursement_date = datetime.now(tz=UTC) + timedelta(days=disbursement_delay + 1)
+    partners, invoices = [], {}
+    for corp_type_code, filing_type_code in [("VS", "WILLNOTICE"), ("CP", "OTANN")]:
+        corp_type = CorpTypeModel.find_by_code(corp_type_code)
+        corp_type.has_partner_disbursements = True
+        corp_type.save()
+        partners.append(corp_type)
+        disbursement_distribution = factory_distribution(name=f"{corp_type_code} Disbursement", client="112")
+        fee_distribution = factory_distribution(
+            name=f"{corp_type_code} Fee distribution",
+            client="112",
+            disbursement_dist_id=disbursement_distribution.distribution_code_id,
+        )
+        fee_schedule = FeeSchedule.find_by_filing_type_and_corp_type(corp_type_code, filing_type_code)
+        factory_distribution_link(fee_distribution.distribution_code_id, fee_schedule.fee_schedule_id)
+        # The last invoice for each partner is received too recently to be disbursed.
+        for payment_method, receipt_date in [
+            (PaymentMethod.DIRECT_PAY.value, datetime.now(tz=UTC)),
+            (PaymentMethod.EFT.value, datetime.now(tz=UTC)),
+            (PaymentMethod.DIRECT_PAY.value, disbursement_date),
+        ]:
+            invoice = factory_invoice(
+                payment_account=pad_account,
+                corp_type_code=corp_type_code,
+                total=10,
+                status_code=InvoiceStatus.PAID.value,
+                payment_method_code=payment_method,
+            )
+            factory_payment_line_item(
+                invoice_id=invoice.id,
+                fee_schedule_id=fee_schedule.fee_schedule_id,
+                filing_fees=10,
+                total=10,
+                fee_dist_id=fee_distribution.distribution_code_id,
+            )
+            factory_receipt(invoice_id=invoice.id, receipt_date=receipt_date).save()
+            invoices.setdefault(corp_type_code, []).append(invoice)
+
+        PartnerDisbursementsModel(
+            amount=10,
+            is_reversal=False,
+            partner_code=corp_type_code,
+            status_code=DisbursementStatus.WAITING_FOR_JOB.value,
+            target_id=invoices[corp_type_code][1].id,
+            target_type=EJVLinkType.INVOICE.value,
+        ).save()
+
+    with freeze_time(disbursement_date):
+        results = EjvPartnerDistributionTask.get_disbursements_by_partner(partners)
+
+    for corp_type_code, partner_invoices in invoices.items():
+        disbursements, distribution_code_totals = results[corp_type_code]
+        assert [disbursement.line_item.target_type for disbursement in disbursements] == [
+            EJVLinkType.INVOICE.value,
+            EJVLinkType.INVOICE.value,
+        ]
+        assert isinstance(disbursements[0].target, Invoice)
+        assert disbursements[0].target.id == partner_invoices[0].id
+        assert isinstance(disbursements[1].target, PartnerDisbursementsModel)
+        assert disbursements[1].line_item.identifier == partner_invoices[1].id
+        assert sum(distribution_code_totals.values()) == 20
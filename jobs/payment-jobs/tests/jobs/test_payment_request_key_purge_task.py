@@ -0,0 +1,43 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the PaymentRequestKeyPurgeTask.
+
+Test-Suite to ensure that the PaymentRequestKeyPurgeTask is working as expected.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+from pay_api.models import PaymentRequestKey as PaymentRequestKeyModel
+from pay_api.utils.enums import PaymentMethod
+from tasks.payment_request_key_purge_task import PaymentRequestKeyPurgeTask
+
+from .factory import factory_create_pad_account, factory_invoice
+
+
+def test_purge_expired_keys(session, app):
+    """Assert only payment request keys past their TTL are purged."""
+    account = factory_create_pad_account(auth_account_id="1234", payment_method=PaymentMethod.DIRECT_PAY.value)
+    invoice = factory_invoice(payment_account=account, payment_method_code=PaymentMethod.DIRECT_PAY.value)
+    ttl = app.config.get("PAYMENT_REQUEST_KEY_TTL")
+    expired_key = PaymentRequestKeyModel(
+        key="expired-key", invoice_id=invoice.id, created_on=datetime.now(tz=UTC) - timedelta(seconds=ttl + 60)
+    ).save()
+    live_key = PaymentRequestKeyModel(key="live-key", invoice_id=invoice.id).save()
+    expired_key_id, live_key_id = expired_key.id, live_key.id
+
+    PaymentRequestKeyPurgeTask.purge_expired_keys()
+
+    assert PaymentRequestKeyModel.find_by_id(expired_key_id) is None
+    assert PaymentRequestKeyModel.find_by_id(live_key_id)
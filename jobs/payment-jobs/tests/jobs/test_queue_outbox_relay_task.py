@@ -0,0 +1,76 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the Queue Outbox Relay Job."""
+
+from unittest.mock import MagicMock, patch
+
+from pay_api.models import QueueOutbox as QueueOutboxModel
+from pay_api.services.gcp_queue_publisher import QueueMessage, publish_to_queue
+from tasks.queue_outbox_relay_task import QueueOutboxRelayTask
+
+TOPIC = "projects/project-id/topics/outbox-relay"
+
+
+def _publish_messages(count: int, ordering_key: str | None = None):
+    for index in range(count):
+        publish_to_queue(
+            QueueMessage(
+                source="test-source",
+                message_type="test-message-type",
+                payload={"key": index},
+                topic=TOPIC,
+                ordering_key=ordering_key,
+            )
+        )
+
+
+def test_relay_messages(session, app, monkeypatch):
+    """Assert the relay publishes every committed message across batches."""
+    monkeypatch.setitem(app.config, "QUEUE_PUBLISH_MODE", "outbox")
+    monkeypatch.setitem(app.config, "QUEUE_OUTBOX_BATCH_SIZE", 2)
+    _publish_messages(3)
+    publish = MagicMock()
+
+    with patch("tasks.queue_outbox_relay_task.JobFailureNotification") as mock_notification:
+        QueueOutboxRelayTask.relay_messages(publish=publish)
+
+    assert publish.call_count == 3
+    assert all(message.published_on for message in QueueOutboxModel.query.filter_by(topic=TOPIC).all())
+    mock_notification.assert_not_called()
+
+
+def test_relay_messages_dead_letter(session, app, monkeypatch):
+    """Assert a message out of attempts is dead lettered, blocks its ordering key and sends a notification."""
+    monkeypatch.setitem(app.config, "QUEUE_PUBLISH_MODE", "outbox")
+    monkeypatch.setitem(app.config, "QUEUE_OUTBOX_MAX_ATTEMPTS", 2)
+    _publish_messages(2, ordering_key="outbox-relay-test")
+    publish = MagicMock(side_effect=Exception("unavailable"))
+
+    with patch("tasks.queue_outbox_relay_task.JobFailureNotification") as mock_notification:
+        QueueOutboxRelayTask.relay_messages(publish=publish)
+        mock_notification.assert_not_called()
+        QueueOutboxRelayTask.relay_messages(publish=publish)
+        mock_notification.assert_called_once()
+        assert len(mock_notification.call_args.kwargs["error_messages"]) == 1
+
+        publish.side_effect = None
+        QueueOutboxRelayTask.relay_messages(publish=publish)
+
+    assert publish.call_count == 2
+    first, second = QueueOutboxModel.query.filter_by(topic=TOPIC).order_by(QueueOutboxModel.id).all()
+    assert first.dead_lettered_on
+    assert first.attempts == 2
+    assert not second.published_on
+    assert second.attempts == 0
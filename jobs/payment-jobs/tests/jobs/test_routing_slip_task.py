@@ -20,6 +20,7 @@ Test-Suite to ensure that the CreateAccountTask for routing slip is working as e
 from unittest.mock import MagicMock, patch
 
 import pytest
+from flask import current_app
 
 from pay_api.models import CfsAccount as CfsAccountModel
 from pay_api.models import FeeSchedule as FeeScheduleModel
@@ -37,7 +38,7 @@ from pay_api.utils.enums import (
     ReverseOperation,
     RoutingSlipStatus,
 )
-from tasks.routing_slip_task import RoutingSlipTask
+from tasks.routing_slip_task import RoutingSlipCfsAccount, RoutingSlipTask
 
 from .factory import (
     factory_distribution,
@@ -71,7 +72,11 @@ def test_link_rs(session):
             with patch.object(CFSService, "get_receipt") as mock_get_receipt:
                 RoutingSlipTask.link_routing_slips()
                 mock_cfs_reverse.assert_called()
-                mock_cfs_reverse.assert_called_with(cfs_account, child_rs.number, ReverseOperation.LINK.value)
+                mock_cfs_reverse.assert_called_with(
+                    RoutingSlipCfsAccount(cfs_account.cfs_party, cfs_account.cfs_account, cfs_account.cfs_site),
+                    child_rs.number,
+                    ReverseOperation.LINK.value,
+                )
                 mock_create_cfs.assert_called()
                 mock_get_receipt.assert_called()
 
@@ -90,6 +95,36 @@ def test_link_rs(session):
             mock_create_cfs.assert_not_called()
 
 
+def test_link_rs_token_failure_only_fails_one(session, monkeypatch):
+    """Test a failed FAS token fetch only fails the routing slip that needed it, the rest are saved."""
+    monkeypatch.setitem(current_app.config, "ROUTING_SLIP_CFS_WORKERS", 2)
+    children = []
+    for parent, child in (("444444444", "444444445"), ("555555555", "555555556")):
+        factory_routing_slip_account(number=child, status=CfsAccountStatus.ACTIVE.value, total=10)
+        factory_routing_slip_account(number=parent, status=CfsAccountStatus.ACTIVE.value, total=10)
+        child_rs = RoutingSlipModel.find_by_number(child)
+        child_rs.status = RoutingSlipStatus.LINKED.value
+        child_rs.parent_number = parent
+        child_rs.save()
+        children.append(child_rs)
+
+    token = MagicMock()
+    token.json.return_value = {"access_token": "token"}
+    with (
+        patch("pay_api.services.CFSService.reverse_rs_receipt_in_cfs"),
+        patch("pay_api.services.CFSService.create_cfs_receipt") as mock_create_cfs,
+        patch.object(CFSService, "get_receipt"),
+        patch.object(CFSService, "get_token", side_effect=[ConnectionError("FAS unavailable"), token]),
+    ):
+        RoutingSlipTask.link_routing_slips()
+
+    mock_create_cfs.assert_called_once()
+    statuses = sorted(
+        CfsAccountModel.find_by_account_id(child_rs.payment_account_id)[0].status for child_rs in children
+    )
+    assert statuses == [CfsAccountStatus.ACTIVE.value, CfsAccountStatus.INACTIVE.value]
+
+
 def test_process_nsf(session):
     """Test process NSF."""
     # 1. Link 2 child routing slips with parent.
@@ -202,6 +237,41 @@ def test_process_void(session):
         mock_cfs_reverse_2.assert_not_called()
 
 
+def test_process_void_in_parallel(session, monkeypatch):
+    """Test VOID routing slips are reversed in parallel, each parent before its children."""
+    monkeypatch.setitem(current_app.config, "ROUTING_SLIP_CFS_WORKERS", 4)
+    parents = []
+    for parent, child in (("222222222", "222222223"), ("333333333", "333333334")):
+        factory_routing_slip_account(number=child, status=CfsAccountStatus.ACTIVE.value, total=10)
+        factory_routing_slip_account(number=parent, status=CfsAccountStatus.ACTIVE.value, total=10)
+        child_rs = RoutingSlipModel.find_by_number(child)
+        child_rs.status = RoutingSlipStatus.LINKED.value
+        child_rs.parent_number = parent
+        child_rs.save()
+        parents.append(parent)
+
+    with (
+        patch("pay_api.services.CFSService.reverse_rs_receipt_in_cfs"),
+        patch("pay_api.services.CFSService.create_cfs_receipt"),
+        patch.object(CFSService, "get_receipt"),
+    ):
+        RoutingSlipTask.link_routing_slips()
+
+    for parent in parents:
+        parent_rs = RoutingSlipModel.find_by_number(parent)
+        parent_rs.status = RoutingSlipStatus.VOID.value
+        parent_rs.save()
+
+    with patch("pay_api.services.CFSService.reverse_rs_receipt_in_cfs") as mock_cfs_reverse:
+        RoutingSlipTask.process_void()
+
+    receipt_numbers = [call.args[1] for call in mock_cfs_reverse.call_args_list]
+    assert len(receipt_numbers) == 4
+    for parent in parents:
+        assert receipt_numbers.index(parent) < receipt_numbers.index(f"{int(parent) + 1}L")
+        assert float(RoutingSlipModel.find_by_number(parent).remaining_amount) == 0
+
+
 def test_process_correction(session):
     """Test Routing slip set to CORRECTION."""
     number = "1111111"
@@ -28,7 +28,8 @@ from pay_api.models import Invoice as InvoiceModel
 from pay_api.models import PaymentAccount as PaymentAccountModel
 from pay_api.models import PaymentTransaction as PaymentTransactionModel
 from pay_api.utils.enums import InvoiceStatus, PaymentMethod, PaymentStatus, TransactionStatus
-from tasks.stale_payment_task import StalePaymentTask
+from tasks.common.rate_limiter import HostRateLimiter
+from tasks.stale_payment_task import StalePaymentTask, VerificationRun
 
 from .factory import factory_create_pad_account, factory_invoice, factory_invoice_reference, factory_payment
 
@@ -113,6 +114,60 @@ def test_verify_created_credit_card_invoices(
     assert invoice.invoice_status_code == InvoiceStatus.PAID.value
 
 
+def test_verify_reuses_paid_order_status(session):
+    """Assert invoices sharing an invoice reference only query PAYBC once the order is PAID."""
+    account = factory_create_pad_account(auth_account_id="1234", payment_method=PaymentMethod.DIRECT_PAY.value)
+    invoices = []
+    for _ in range(2):
+        invoice = factory_invoice(
+            payment_account=account,
+            status_code=InvoiceStatus.CREATED.value,
+            payment_method_code=PaymentMethod.DIRECT_PAY.value,
+            total=50.0,
+        )
+        factory_invoice_reference(invoice_id=invoice.id, invoice_number="REF-SHARED", status_code="ACTIVE")
+        invoices.append(invoice)
+
+    run = VerificationRun(HostRateLimiter(0))
+    with patch(
+        "pay_api.services.direct_sale_service.DirectSaleService.query_order_status",
+        return_value=MagicMock(paymentstatus="PAID"),
+    ) as mock_query:
+        for invoice in invoices:
+            StalePaymentTask._verify_invoice(invoice, run)
+
+    assert mock_query.call_count == 1
+    assert run.outcomes["checked"] == 2
+    assert run.outcomes["cached"] == 1
+
+
+def test_credit_card_receipts_rate_limited(session):
+    """Assert the batched receipt lookups wait on the rate limiter before each CFS call."""
+    rate_limiter = MagicMock()
+
+    def _get_receipts(_invoice_references, throttle):
+        throttle()
+        throttle()
+        return {}
+
+    with patch("tasks.stale_payment_task.DirectPayService.get_receipts", side_effect=_get_receipts):
+        StalePaymentTask._get_credit_card_receipts([MagicMock()], rate_limiter)
+
+    assert rate_limiter.acquire.call_count == 2
+
+
+def test_host_rate_limiter():
+    """Assert calls to the same host are spaced out and other hosts are not held up."""
+    limiter = HostRateLimiter(calls_per_second=20)
+    with patch("tasks.common.rate_limiter.time.sleep") as mock_sleep:
+        limiter.acquire("https://paybc.example.com/orders/1")
+        limiter.acquire("https://cfs.example.com/receipts/1")
+        assert mock_sleep.call_count == 0
+        limiter.acquire("https://paybc.example.com/orders/2")
+        assert mock_sleep.call_count == 1
+        assert 0 < mock_sleep.call_args[0][0] <= 0.05
+
+
 @pytest.mark.parametrize(
     "connector_scenario, expected_invoice_status",
     [
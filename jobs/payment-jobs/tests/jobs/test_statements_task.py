@@ -21,6 +21,7 @@ from datetime import UTC, datetime, timedelta
 
 import pytest
 import pytz
+from flask import current_app
 from freezegun import freeze_time
 from sqlalchemy import insert
 
@@ -31,6 +32,7 @@ from pay_api.services import StatementSettings as StatementSettingsService
 from pay_api.services.payment_account import PaymentAccount as PaymentAccountService
 from pay_api.utils.enums import InvoiceStatus, PaymentMethod, StatementFrequency
 from pay_api.utils.util import get_previous_day
+from tasks.common.statement_generation import StatementShard
 from tasks.statement_task import StatementTask
 
 from .factory import (
@@ -98,6 +100,100 @@ def test_statements(session):
     assert len(StatementInvoices.find_all_invoices_for_statement(first_statement_id)) == 1
 
 
+@freeze_time("2023-01-01 12:00:00T08:00:00")
+def test_statements_set_based_generation(session, monkeypatch):
+    """Test set based generation creates daily, weekly and monthly statements in one pass."""
+    monkeypatch.setitem(current_app.config, "STATEMENT_SET_BASED_GENERATION", True)
+    previous_day = localize_date(get_previous_day(datetime.utcnow()))
+
+    accounts = {}
+    frequencies = [StatementFrequency.DAILY.value, StatementFrequency.WEEKLY.value, StatementFrequency.MONTHLY.value]
+    for index, frequency in enumerate(frequencies):
+        account = factory_premium_payment_account(auth_account_id=f"set-based-{index}")
+        factory_invoice(payment_account=account, created_on=previous_day)
+        factory_statement_settings(
+            pay_account_id=account.id, from_date=previous_day - timedelta(days=40), frequency=frequency
+        )
+        accounts[frequency] = account
+    empty_account = factory_premium_payment_account(auth_account_id="set-based-empty")
+    factory_statement_settings(
+        pay_account_id=empty_account.id, from_date=previous_day - timedelta(days=40), frequency="DAILY"
+    )
+
+    StatementTask.generate_statements()
+
+    for frequency, account in accounts.items():
+        statements = StatementService.get_account_statements(auth_account_id=account.auth_account_id, page=1, limit=100)
+        assert statements[1] == 1
+        statement = statements[0][0]
+        assert statement.frequency == frequency
+        assert statement.is_empty is False
+        assert statement.payment_methods == PaymentMethod.DIRECT_PAY.value
+        assert len(StatementInvoices.find_all_invoices_for_statement(statement.id)) == 1
+
+    statements = StatementService.get_account_statements(
+        auth_account_id=empty_account.auth_account_id, page=1, limit=100
+    )
+    assert statements[0][0].is_empty is True
+
+    # Date override regenerates in place, the existing statement is reused.
+    first_statement_id = statements[0][0].id
+    StatementTask.generate_statements([previous_day.strftime("%Y-%m-%d")])
+    statements = StatementService.get_account_statements(
+        auth_account_id=empty_account.auth_account_id, page=1, limit=100
+    )
+    assert statements[1] == 1
+    assert statements[0][0].id == first_statement_id
+
+
+@pytest.mark.parametrize(
+    "arguments, expected",
+    [
+        (None, ([], None, None)),
+        (["2023-01-01"], (["2023-01-01"], None, None)),
+        (["--shard", "1/4", "2023-01-01"], (["2023-01-01"], StatementShard(1, 4), None)),
+        (["2023-01-01", "1234", "--shard=3/4"], (["2023-01-01", "1234"], StatementShard(3, 4), None)),
+        (["--shards=8"], ([], None, 8)),
+    ],
+)
+def test_parse_shard_arguments(arguments, expected):
+    """Test shard arguments are split from the positional arguments."""
+    assert StatementTask._parse_shard_arguments(arguments) == expected
+
+
+@pytest.mark.parametrize("value", ["4/4", "-1/4", "1", "a/b", "0/0"])
+def test_parse_invalid_shard(value):
+    """Test invalid shards are rejected."""
+    with pytest.raises(ValueError):
+        StatementShard.parse(value)
+
+
+@pytest.mark.parametrize("set_based", [False, True])
+@freeze_time("2023-01-02 12:00:00T08:00:00")
+def test_sharded_statements(session, monkeypatch, set_based):
+    """Test each shard only generates its own accounts and re-running a shard doesn't duplicate statements."""
+    monkeypatch.setitem(current_app.config, "STATEMENT_SET_BASED_GENERATION", set_based)
+    previous_day = localize_date(get_previous_day(datetime.utcnow()))
+    accounts = []
+    for index in range(4):
+        account = factory_premium_payment_account(auth_account_id=f"shard-{index}")
+        factory_invoice(payment_account=account, created_on=previous_day)
+        factory_statement_settings(pay_account_id=account.id, from_date=previous_day, frequency="DAILY")
+        accounts.append(account)
+
+    def statement_count(account):
+        return StatementService.get_account_statements(auth_account_id=account.auth_account_id, page=1, limit=100)[1]
+
+    StatementTask.generate_statements(["--shard", "0/2"])
+    for account in accounts:
+        assert statement_count(account) == (1 if account.id % 2 == 0 else 0)
+
+    StatementTask.generate_statements(["--shard", "0/2"])
+    StatementTask.generate_statements(["--shard", "1/2"])
+    for account in accounts:
+        assert statement_count(account) == 1
+
+
 def test_statements_for_empty_results(session):
     """Test daily statement generation works.
 
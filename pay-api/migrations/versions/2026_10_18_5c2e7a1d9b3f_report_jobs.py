@@ -0,0 +1,50 @@
+"""report_jobs
+
+Revision ID: 5c2e7a1d9b3f
+Revises: 968a2e428d4c
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "5c2e7a1d9b3f"
+down_revision = "968a2e428d4c"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "report_jobs",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("auth_account_id", sa.String(length=50), nullable=True),
+        sa.Column("completed_on", sa.DateTime(), nullable=True),
+        sa.Column("content_type", sa.String(length=100), nullable=False),
+        sa.Column("created_by", sa.String(length=50), nullable=True),
+        sa.Column("created_on", sa.DateTime(), nullable=False),
+        sa.Column("error_message", sa.String(), nullable=True),
+        sa.Column("file_name", sa.String(length=200), nullable=False),
+        sa.Column("job_key", sa.String(length=64), nullable=False),
+        sa.Column("report_type", sa.String(length=50), nullable=False),
+        sa.Column("status_code", sa.String(length=20), nullable=False),
+        sa.Column("storage_path", sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_report_jobs_auth_account_id"), "report_jobs", ["auth_account_id"], unique=False)
+    op.create_index(op.f("ix_report_jobs_job_key"), "report_jobs", ["job_key"], unique=False)
+    # Only one in-flight job per fingerprint, identical concurrent submissions collide here.
+    op.create_index(
+        "uq_report_jobs_in_flight_job_key",
+        "report_jobs",
+        ["job_key"],
+        unique=True,
+        postgresql_where=sa.text("status_code IN ('PENDING', 'IN_PROGRESS')"),
+    )
+
+
+def downgrade():
+    op.drop_index("uq_report_jobs_in_flight_job_key", table_name="report_jobs")
+    op.drop_index(op.f("ix_report_jobs_job_key"), table_name="report_jobs")
+    op.drop_index(op.f("ix_report_jobs_auth_account_id"), table_name="report_jobs")
+    op.drop_table("report_jobs")
@@ -0,0 +1,31 @@
+"""payment_request_keys
+
+Revision ID: 5c8e2a7d913f
+Revises: b6f1c9e04d27
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "5c8e2a7d913f"
+down_revision = "b6f1c9e04d27"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "payment_request_keys",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("created_on", sa.DateTime(), nullable=False),
+        sa.Column("invoice_id", sa.Integer(), nullable=False),
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.ForeignKeyConstraint(["invoice_id"], ["invoices.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("key"),
+    )
+
+
+def downgrade():
+    op.drop_table("payment_request_keys")
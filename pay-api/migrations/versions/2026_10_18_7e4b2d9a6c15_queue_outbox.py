@@ -0,0 +1,47 @@
+"""queue_outbox
+
+Revision ID: 7e4b2d9a6c15
+Revises: a3d91f6c2b84
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "7e4b2d9a6c15"
+down_revision = "a3d91f6c2b84"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "queue_outbox",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("corp_type", sa.String(length=10), nullable=True),
+        sa.Column("created_on", sa.DateTime(), nullable=False),
+        sa.Column("error_message", sa.String(), nullable=True),
+        sa.Column("event_id", sa.String(length=36), nullable=False),
+        sa.Column("message_type", sa.String(length=100), nullable=False),
+        sa.Column("ordering_key", sa.String(length=100), nullable=True),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("published_on", sa.DateTime(), nullable=True),
+        sa.Column("source", sa.String(length=50), nullable=False),
+        sa.Column("topic", sa.String(length=200), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    # The relay only scans unpublished messages, keep that index small.
+    op.create_index(
+        "ix_queue_outbox_pending",
+        "queue_outbox",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("published_on IS NULL"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_queue_outbox_pending", table_name="queue_outbox")
+    op.drop_table("queue_outbox")
@@ -0,0 +1,24 @@
+"""report_job_lease
+
+Revision ID: 9a4d6b2e8c71
+Revises: 5c8e2a7d913f
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "9a4d6b2e8c71"
+down_revision = "5c8e2a7d913f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("report_jobs", sa.Column("content", sa.LargeBinary(), nullable=True))
+    op.add_column("report_jobs", sa.Column("heartbeat_on", sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("report_jobs", "heartbeat_on")
+    op.drop_column("report_jobs", "content")
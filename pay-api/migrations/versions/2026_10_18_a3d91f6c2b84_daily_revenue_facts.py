@@ -0,0 +1,45 @@
+"""daily_revenue_facts
+
+Revision ID: a3d91f6c2b84
+Revises: 5c2e7a1d9b3f
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "a3d91f6c2b84"
+down_revision = "5c2e7a1d9b3f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "daily_revenue_facts",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("corp_type_code", sa.String(length=10), nullable=True),
+        sa.Column("fact_date", sa.Date(), nullable=False),
+        sa.Column("gst", sa.Numeric(precision=19, scale=2), nullable=False),
+        sa.Column("invoice_count", sa.Integer(), nullable=False),
+        sa.Column("invoice_status_code", sa.String(length=20), nullable=False),
+        sa.Column("paid", sa.Numeric(precision=19, scale=2), nullable=False),
+        sa.Column("payment_method_code", sa.String(length=15), nullable=False),
+        sa.Column("refreshed_on", sa.DateTime(), nullable=False),
+        sa.Column("refund", sa.Numeric(precision=19, scale=2), nullable=False),
+        sa.Column("service_fees", sa.Numeric(precision=19, scale=2), nullable=False),
+        sa.Column("statutory_fees", sa.Numeric(precision=19, scale=2), nullable=False),
+        sa.Column("total", sa.Numeric(precision=19, scale=2), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_daily_revenue_facts_fact_date"), "daily_revenue_facts", ["fact_date"], unique=False)
+    # The fact job finds changed invoices by updated_on.
+    with op.batch_alter_table("invoices", schema=None) as batch_op:
+        batch_op.create_index(batch_op.f("ix_invoices_updated_on"), ["updated_on"], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table("invoices", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_invoices_updated_on"))
+    op.drop_index(op.f("ix_daily_revenue_facts_fact_date"), table_name="daily_revenue_facts")
+    op.drop_table("daily_revenue_facts")
@@ -0,0 +1,37 @@
+"""invoice_latest_refund
+
+Revision ID: b6f1c9e04d27
+Revises: 7e4b2d9a6c15
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "b6f1c9e04d27"
+down_revision = "7e4b2d9a6c15"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("invoices", sa.Column("latest_refund_id", sa.Integer(), nullable=True))
+    op.add_column("invoices", sa.Column("latest_refund_status", sa.String(length=25), nullable=True))
+    op.execute(
+        """
+        UPDATE invoices
+        SET latest_refund_id = latest_refunds.id, latest_refund_status = latest_refunds.status
+        FROM (
+            SELECT DISTINCT ON (invoice_id) invoice_id, id, status
+            FROM refunds
+            WHERE invoice_id IS NOT NULL
+            ORDER BY invoice_id, id DESC
+        ) AS latest_refunds
+        WHERE invoices.id = latest_refunds.invoice_id
+        """
+    )
+
+
+def downgrade():
+    op.drop_column("invoices", "latest_refund_status")
+    op.drop_column("invoices", "latest_refund_id")
@@ -0,0 +1,33 @@
+"""queue_outbox_claims
+
+Revision ID: b7c3e1f05d92
+Revises: 9a4d6b2e8c71
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "b7c3e1f05d92"
+down_revision = "9a4d6b2e8c71"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("queue_outbox", sa.Column("claimed_on", sa.DateTime(), nullable=True))
+    op.add_column("queue_outbox", sa.Column("dead_lettered_on", sa.DateTime(), nullable=True))
+    # The relay checks for an earlier unpublished message with the same ordering key before claiming one.
+    op.create_index(
+        "ix_queue_outbox_pending_ordering_key",
+        "queue_outbox",
+        ["topic", "ordering_key", "id"],
+        unique=False,
+        postgresql_where=sa.text("published_on IS NULL AND ordering_key IS NOT NULL"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_queue_outbox_pending_ordering_key", table_name="queue_outbox")
+    op.drop_column("queue_outbox", "dead_lettered_on")
+    op.drop_column("queue_outbox", "claimed_on")
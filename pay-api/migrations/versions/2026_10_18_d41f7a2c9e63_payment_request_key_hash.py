@@ -0,0 +1,25 @@
+"""payment_request_key_hash
+
+Revision ID: d41f7a2c9e63
+Revises: b7c3e1f05d92
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "d41f7a2c9e63"
+down_revision = "b7c3e1f05d92"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("payment_request_keys", sa.Column("request_hash", sa.String(length=64), nullable=True))
+    # The payment jobs purge expired keys by age.
+    op.create_index("ix_payment_request_keys_created_on", "payment_request_keys", ["created_on"], unique=False)
+
+
+def downgrade():
+    op.drop_index("ix_payment_request_keys_created_on", table_name="payment_request_keys")
+    op.drop_column("payment_request_keys", "request_hash")
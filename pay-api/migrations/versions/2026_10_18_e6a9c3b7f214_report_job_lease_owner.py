@@ -0,0 +1,22 @@
+"""report_job_lease_owner
+
+Revision ID: e6a9c3b7f214
+Revises: d41f7a2c9e63
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "e6a9c3b7f214"
+down_revision = "d41f7a2c9e63"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("report_jobs", sa.Column("lease_owner", sa.String(length=36), nullable=True))
+
+
+def downgrade():
+    op.drop_column("report_jobs", "lease_owner")
@@ -18,11 +18,13 @@ This module is the API for the Payment system.
 
 import os
 import sys
+import threading
+import time
+from contextlib import contextmanager
 
 from cloud_sql_connector import setup_pg8000_close_event_listener
 from flask import Flask, request
 from flask_migrate import Migrate, upgrade
-from gcp_tracing import tracing
 from sbc_common_components.exception_handling.exception_handler import ExceptionHandler
 from sbc_common_components.utils.camel_case_response import convert_to_camel
 
@@ -52,11 +54,16 @@ def create_app(run_mode=None):
     app = Flask(__name__)
     app.env = run_mode
     app.config.from_object(config.CONFIGURATION[run_mode])
+    app.extensions["startup_profile"] = {}
+    started = time.perf_counter()
 
-    flags.init_app(app)
+    with startup_step(app, "flags"):
+        flags.init_app(app)
 
-    db.init_app(app)
-    queue.init_app(app)
+    with startup_step(app, "db"):
+        db.init_app(app)
+    with startup_step(app, "queue"):
+        queue.init_app(app)
     if run_mode != "testing":
         Migrate(app, db)
         if app.config.get("RUN_MIGRATION") is True:
@@ -65,13 +72,13 @@ def create_app(run_mode=None):
             else:
                 app.logger.info(f"Booting up with CPU count (useful for GCP): {os.cpu_count()}")
                 app.logger.info("Running migration upgrade.")
-                with app.app_context():
+                with startup_step(app, "migrations"), app.app_context():
                     execute_migrations(app)
                 # Alembic has it's own logging config, we'll need to restore our logging here.
                 setup_logging(os.path.join(_Config.PROJECT_ROOT, "logging.conf"), _Config.LOGGING_OVERRIDE_CONFIG)
                 app.logger.info("Finished migration upgrade.")
         else:
-            with app.app_context():
+            with startup_step(app, "db_engine"), app.app_context():
                 engine = db.engine
                 setup_pg8000_close_event_listener(engine)
             app.logger.info("Migrations were executed on prehook.")
@@ -80,20 +87,46 @@ def create_app(run_mode=None):
         return app
 
     ma.init_app(app)
-    endpoints.init_app(app)
+    with startup_step(app, "endpoints"):
+        endpoints.init_app(app)
 
     app.after_request(convert_to_camel)
 
-    tracing.init_app(app, db=db)
-    setup_jwt_manager(app, jwt)
+    with startup_step(app, "tracing"):
+        setup_tracing(app)
+    with startup_step(app, "jwt"):
+        setup_jwt_manager(app, jwt)
     ExceptionHandler(app)
     setup_403_logging(app)
     setup_response_headers(app)
     register_shellcontext(app)
-    build_cache(app)
+    with startup_step(app, "cache"):
+        build_cache(app)
+    if app.config.get("STARTUP_PROFILE"):
+        app.logger.info(f"Startup finished in {time.perf_counter() - started:.3f}s")
     return app
 
 
+@contextmanager
+def startup_step(app, name: str):
+    """Time a create_app initialization step, logged when STARTUP_PROFILE is enabled."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        app.extensions["startup_profile"][name] = elapsed
+        if app.config.get("STARTUP_PROFILE"):
+            app.logger.info(f"Startup step {name} took {elapsed:.3f}s")
+
+
+def setup_tracing(app):
+    """Initialize tracing, the import is deferred as it pulls in the OpenTelemetry SDK."""
+    from gcp_tracing import tracing  # pylint: disable=import-outside-toplevel
+
+    tracing.init_app(app, db=db)
+
+
 def setup_response_headers(app):
     """Register after_request handler for CORS and version headers."""
 
@@ -160,15 +193,34 @@ def register_shellcontext(app):
 
 
 def build_cache(app):
-    """Build cache."""
+    """Build cache.
+
+    CODE_CACHE_WARMUP controls how code tables are loaded:
+    eager - load every code table before serving (default).
+    background - load in a daemon thread so the app can start serving immediately.
+    lazy - load each code table on its first cache miss.
+    """
     cache.init_app(app)
     with app.app_context():
         cache.clear()
-        if not app.config.get("TESTING", False):
-            try:
-                from pay_api.services.code import Code as CodeService  # pylint: disable=import-outside-toplevel
-
-                CodeService.build_all_codes_cache()
-            except Exception as e:  # NOQA pylint:disable=broad-except
-                app.logger.error("Error on caching ")
-                app.logger.error(e)
+    if app.config.get("TESTING", False):
+        return
+    warmup = app.config.get("CODE_CACHE_WARMUP", "eager")
+    if warmup == "lazy":
+        app.logger.info("Code table cache will be loaded on demand.")
+    elif warmup == "background":
+        threading.Thread(target=_warm_code_cache, args=(app,), name="code-cache-warmup", daemon=True).start()
+    else:
+        _warm_code_cache(app)
+
+
+def _warm_code_cache(app):
+    """Load all code tables into the cache."""
+    with app.app_context():
+        try:
+            from pay_api.services.code import Code as CodeService  # pylint: disable=import-outside-toplevel
+
+            CodeService.build_all_codes_cache()
+        except Exception as e:  # NOQA pylint:disable=broad-except
+            app.logger.error("Error on caching ")
+            app.logger.error(e)
@@ -125,6 +125,7 @@ class _Config:  # pylint: disable=too-few-public-methods
     JWT_OIDC_CACHING_ENABLED = _get_config("JWT_OIDC_CACHING_ENABLED", default=False)
     JWT_OIDC_JWKS_CACHE_TIMEOUT = int(_get_config("JWT_OIDC_JWKS_CACHE_TIMEOUT", default=300))
     FEE_CACHE_TIMEOUT = int(_get_config("FEE_CACHE_TIMEOUT", default=300))
+    REFUND_RULES_CACHE_TIMEOUT = int(_get_config("REFUND_RULES_CACHE_TIMEOUT", default=300))
 
     # CFS API Settings
     CFS_BASE_URL = _get_config("CFS_BASE_URL")
@@ -161,6 +162,16 @@ class _Config:  # pylint: disable=too-few-public-methods
     STRR_PAY_TOPIC = os.getenv("STRR_PAY_TOPIC", BUSINESS_PAY_TOPIC)
     ASSETS_PAY_TOPIC = os.getenv("ASSETS_PAY_TOPIC", "assets-pay-notification-dev")
 
+    # Queue publishing: sync (publish in the caller), async (batched per topic by the PubSub publisher client) or
+    # outbox (written to the queue outbox table, published by the QUEUE_OUTBOX_RELAY job).
+    QUEUE_PUBLISH_MODE = os.getenv("QUEUE_PUBLISH_MODE", "sync").lower()
+    QUEUE_PUBLISH_BATCH_SIZE = int(os.getenv("QUEUE_PUBLISH_BATCH_SIZE", "100"))
+    QUEUE_PUBLISH_BATCH_LATENCY_SECONDS = float(os.getenv("QUEUE_PUBLISH_BATCH_LATENCY_SECONDS", "0.05"))
+    QUEUE_PUBLISH_FLUSH_TIMEOUT_SECONDS = float(os.getenv("QUEUE_PUBLISH_FLUSH_TIMEOUT_SECONDS", "30"))
+    QUEUE_OUTBOX_BATCH_SIZE = int(os.getenv("QUEUE_OUTBOX_BATCH_SIZE", "500"))
+    QUEUE_OUTBOX_MAX_ATTEMPTS = int(os.getenv("QUEUE_OUTBOX_MAX_ATTEMPTS", "10"))
+    QUEUE_OUTBOX_CLAIM_SECONDS = int(os.getenv("QUEUE_OUTBOX_CLAIM_SECONDS", "300"))
+
     # API Endpoints
     AUTH_API_URL = os.getenv("AUTH_API_URL", "")
     AUTH_API_VERSION = os.getenv("AUTH_API_VERSION", "")
@@ -229,6 +240,25 @@ class _Config:  # pylint: disable=too-few-public-methods
     # To bypass 25MB limit for CloudRun on HTTP/1.1 requests.
     ENABLE_GZIP_BODY = _get_config("ENABLE_GZIP_BODY", default="True").lower() == "true"
 
+    # Asynchronous report jobs, rendered output goes to this bucket or the report_jobs table when no bucket is set.
+    REPORT_JOB_BUCKET_NAME = os.getenv("REPORT_JOB_BUCKET_NAME", "")
+    REPORT_JOB_WORKERS = int(os.getenv("REPORT_JOB_WORKERS", "4"))
+    # Seconds without a heartbeat before an in flight job is treated as lost (restart, scale in) and reclaimed.
+    REPORT_JOB_LEASE_SECONDS = int(os.getenv("REPORT_JOB_LEASE_SECONDS", "300"))
+
+    # Concurrent CFS calls when resolving receipts for a batch of invoices.
+    CFS_RECEIPT_LOOKUP_WORKERS = int(os.getenv("CFS_RECEIPT_LOOKUP_WORKERS", "8"))
+
+    # Seconds a retried payment request returns the invoice it already created, 0 turns this off.
+    PAYMENT_REQUEST_KEY_TTL = int(_get_config("PAYMENT_REQUEST_KEY_TTL", default=600))
+    # Without an Idempotency-Key header, match retries on account, business, filing identifier and filing types.
+    PAYMENT_REQUEST_FINGERPRINT = _get_config("PAYMENT_REQUEST_FINGERPRINT", default="False").lower() == "true"
+
+    # Code table cache warmup on startup: eager (block until loaded), background (thread) or lazy (on first miss).
+    CODE_CACHE_WARMUP = _get_config("CODE_CACHE_WARMUP", default="eager").lower()
+    # Log the time spent in each create_app initialization step.
+    STARTUP_PROFILE = _get_config("STARTUP_PROFILE", default="False").lower() == "true"
+
     TESTING = False
     DEBUG = True
 
@@ -348,6 +378,9 @@ NrQw+2OdQACBJiEHsdZzAkBcsTk7frTH4yGx0VfHxXDPjfTj4wmD6gZIlcIr9lZg
 
     TRANSACTION_REPORT_DEFAULT_TOTAL = 10
 
+    # Tests change corp type and payment method refund settings between requests.
+    REFUND_RULES_CACHE_TIMEOUT = 0
+
     PAYBC_DIRECT_PAY_API_KEY = "TESTKEYSECRET"
     PAYBC_DIRECT_PAY_REF_NUMBER = "REF1234"
     PAYBC_DIRECT_PAY_PORTAL_URL = "https://paydev.gov.bc.ca/public/directsale"
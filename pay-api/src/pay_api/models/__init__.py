@@ -26,6 +26,7 @@ from .cfs_account_status_code import CfsAccountStatusCode, CfsAccountStatusCodeS
 from .corp_type import CorpType, CorpTypeSchema
 from .credit import Credit
 from .custom_query import CustomQuery
+from .daily_revenue_fact import DailyRevenueFact
 from .db import db, ma
 from .disbursement_status_code import DisbursementStatusCode
 from .distribution_code import DistributionCode, DistributionCodeLink
@@ -58,12 +59,15 @@ from .payment import Payment, PaymentSchema
 from .payment_account import PaymentAccount, PaymentAccountSchema, PaymentAccountSearchModel
 from .payment_line_item import PaymentLineItem, PaymentLineItemSchema
 from .payment_method import PaymentMethod, PaymentMethodSchema
+from .payment_request_key import PaymentRequestKey
 from .payment_status_code import PaymentStatusCode, PaymentStatusCodeSchema
 from .payment_transaction import PaymentTransaction, PaymentTransactionSchema
+from .queue_outbox import QueueOutbox
 from .receipt import Receipt, ReceiptSchema
 from .refund import Refund
 from .refunds_partial import RefundPartialLine, RefundPartialSearch, RefundsPartial
-from .routing_slip import RoutingSlip, RoutingSlipSchema
+from .report_job import ReportJob
+from .routing_slip import RoutingSlip, RoutingSlipSchema, RoutingSlipTree
 from .routing_slip_status_code import RoutingSlipStatusCode, RoutingSlipStatusCodeSchema
 from .search.invoice_composite_model import InvoiceCompositeModel
 from .statement import Statement, StatementDTO, StatementSchema
@@ -0,0 +1,67 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Model for the daily revenue fact table used by reporting."""
+
+from .base_model import BaseModel
+from .db import db
+
+
+class DailyRevenueFact(BaseModel):  # pylint: disable=too-many-instance-attributes
+    """Invoice totals per created day (Pacific), corp type, payment method and invoice status.
+
+    Maintained by the DAILY_REVENUE_FACTS payment job, which recomputes the days touched by invoice changes.
+    """
+
+    __tablename__ = "daily_revenue_facts"
+    # this mapper is used so that new and old versions of the service can be run simultaneously,
+    # making rolling upgrades easier
+    # This is used by SQLAlchemy to explicitly define which fields we're interested
+    # so it doesn't freak out and say it can't map the structure if other fields are present.
+    # This could occur from a failed deploy or during an upgrade.
+    # The other option is to tell SQLAlchemy to ignore differences, but that is ambiguous
+    # and can interfere with Alembic upgrades.
+    #
+    # NOTE: please keep mapper names in alpha-order, easier to track that way
+    #       Exception, id is always first, _fields first
+    __mapper_args__ = {
+        "include_properties": [
+            "id",
+            "corp_type_code",
+            "fact_date",
+            "gst",
+            "invoice_count",
+            "invoice_status_code",
+            "paid",
+            "payment_method_code",
+            "refreshed_on",
+            "refund",
+            "service_fees",
+            "statutory_fees",
+            "total",
+        ]
+    }
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    corp_type_code = db.Column(db.String(10), nullable=True)
+    fact_date = db.Column(db.Date, nullable=False, index=True)
+    gst = db.Column(db.Numeric(19, 2), nullable=False, default=0)
+    invoice_count = db.Column(db.Integer, nullable=False, default=0)
+    invoice_status_code = db.Column(db.String(20), nullable=False)
+    paid = db.Column(db.Numeric(19, 2), nullable=False, default=0)
+    payment_method_code = db.Column(db.String(15), nullable=False)
+    refreshed_on = db.Column(db.DateTime, nullable=False)
+    refund = db.Column(db.Numeric(19, 2), nullable=False, default=0)
+    service_fees = db.Column(db.Numeric(19, 2), nullable=False, default=0)
+    statutory_fees = db.Column(db.Numeric(19, 2), nullable=False, default=0)
+    total = db.Column(db.Numeric(19, 2), nullable=False, default=0)
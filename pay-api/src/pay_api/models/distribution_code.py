@@ -194,6 +194,22 @@ class DistributionCode(Audit, Versioned, BaseModel):
         distribution_code = query.one_or_none()
         return distribution_code
 
+    @classmethod
+    def find_active_by_fee_schedule_ids(cls, fee_schedule_ids) -> dict[int, DistributionCode]:
+        """Return the active distribution for each fee schedule, keyed by fee schedule id."""
+        if not fee_schedule_ids:
+            return {}
+        valid_date = datetime.now(tz=UTC).date()
+        query = (
+            db.session.query(DistributionCodeLink.fee_schedule_id, DistributionCode)
+            .select_from(DistributionCode)
+            .join(DistributionCodeLink)
+            .filter(DistributionCodeLink.fee_schedule_id.in_(fee_schedule_ids))
+            .filter(DistributionCode.start_date <= valid_date)
+            .filter((DistributionCode.end_date.is_(None)) | (DistributionCode.end_date >= valid_date))
+        )
+        return dict(query.all())
+
     @classmethod
     def find_by_active_for_account(cls, account_id: int):
         """Return active distribution for account."""
@@ -78,6 +78,11 @@ class EFTCreditInvoiceLink(BaseModel):  # pylint: disable=too-few-public-methods
         # Order is important here, we use it in the jobs.
         return cls.query.filter_by(invoice_id=invoice_id).order_by(EFTCreditInvoiceLink.id.desc()).all()
 
+    @classmethod
+    def bulk_save_links(cls, links: list):
+        """Bulk insert credit invoice links, they are not added to the session."""
+        db.session.bulk_save_objects(links)
+
     @classmethod
     def get_next_group_link_seq(cls):
         """Get next value of EFT Group Link Sequence."""
@@ -13,7 +13,7 @@
 # limitations under the License.
 """Model to link invoices with Electronic Journal Voucher."""
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, insert
 
 from .base_model import BaseModel
 from .db import db
@@ -57,3 +57,10 @@ class EjvLink(BaseModel):  # pylint: disable=too-few-public-methods
     def find_ejv_link_by_link_id(cls, link_id: str):
         """Return any ejv link by link_id."""
         return cls.query.filter_by(link_id=link_id).first()
+
+    @classmethod
+    def bulk_insert_links(cls, links: list[dict]):
+        """Insert the links with multi-row inserts, they are not added to the session."""
+        if not links:
+            return
+        db.session.execute(insert(cls), links)
@@ -22,8 +22,8 @@ import pytz
 from attrs import define
 from dateutil.relativedelta import relativedelta
 from marshmallow import fields, post_dump
-from sqlalchemy import ForeignKey
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import ForeignKey, Integer, cast, func, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import relationship
 
 from pay_api.models.applied_credits import AppliedCreditsSearchModel
@@ -84,6 +84,8 @@ class Invoice(Audit):  # pylint: disable=too-many-instance-attributes
             "folio_number",
             "gst",
             "invoice_status_code",
+            "latest_refund_id",
+            "latest_refund_status",
             "payment_account_id",
             "payment_date",
             "payment_method_code",
@@ -130,6 +132,9 @@ class Invoice(Audit):  # pylint: disable=too-many-instance-attributes
     overdue_date = db.Column(db.DateTime, nullable=True, default=determine_overdue_date)
     refund_date = db.Column(db.DateTime, nullable=True)
     refund = db.Column(db.Numeric(19, 2), nullable=True)
+    # Copied from the latest refund row (kept in step by the Refund model) so invoice search avoids a subquery.
+    latest_refund_id = db.Column(db.Integer, nullable=True)
+    latest_refund_status = db.Column(db.String(25), nullable=True)
     routing_slip = db.Column(db.String(50), nullable=True, index=True)
     filing_id = db.Column(db.String(50), nullable=True)
     folio_number = db.Column(db.String(50), nullable=True, index=True)
@@ -158,6 +163,8 @@ class Invoice(Audit):  # pylint: disable=too-many-instance-attributes
             payment_account_id,
             invoice_status_code,
         ),
+        # updated_on comes from Audit, the daily revenue facts job finds changed invoices by it.
+        db.Index("ix_invoices_updated_on", "updated_on"),
     )
 
     @classmethod
@@ -178,6 +185,18 @@ class Invoice(Audit):  # pylint: disable=too-many-instance-attributes
         db.session.bulk_save_objects(invoices)
         cls.commit()
 
+    @classmethod
+    def update_disbursement_status(cls, invoice_ids: list[int], disbursement_status_code: str):
+        """Set the disbursement status of the invoices in a single statement."""
+        if not invoice_ids:
+            return
+        db.session.execute(
+            update(cls)
+            .where(cls.id == func.any(cast(list(invoice_ids), ARRAY(Integer))))
+            .values(disbursement_status_code=disbursement_status_code)
+            .execution_options(synchronize_session="fetch")
+        )
+
     @classmethod
     def find_by_business_identifier(cls, business_identifier: str):
         """Find all payment accounts by business_identifier."""
@@ -245,7 +264,7 @@ class InvoiceSchema(AuditSchema, BaseSchema):  # pylint: disable=too-many-ancest
         """Returns all the fields from the SQLAlchemy class."""
 
         model = Invoice
-        exclude = ["corp_type"]
+        exclude = ["corp_type", "latest_refund_id", "latest_refund_status"]
 
     invoice_status_code = fields.String(data_key="status_code")
     corp_type_code = fields.String(data_key="corp_type_code")
@@ -23,6 +23,9 @@ This is used in three different distinct flows for EFT only currently (provided
 
 from datetime import UTC, datetime
 
+from sqlalchemy import Integer, cast, func, update
+from sqlalchemy.dialects.postgresql import ARRAY
+
 from pay_api.utils.enums import DisbursementStatus
 
 from .base_model import BaseModel
@@ -88,3 +91,32 @@ class PartnerDisbursements(BaseModel):  # pylint: disable=too-many-instance-attr
             .order_by(PartnerDisbursements.id.desc())
             .first()
         )
+
+    @classmethod
+    def find_latest_by_targets_exclude_cancelled(cls, target_ids: list[int], target_type: str) -> dict:
+        """Find the latest Partner Disbursement for each target, keyed by target id."""
+        if not target_ids:
+            return {}
+        query = (
+            cls.query.filter(PartnerDisbursements.target_id.in_(target_ids))
+            .filter(PartnerDisbursements.target_type == target_type)
+            .filter(PartnerDisbursements.status_code != DisbursementStatus.CANCELLED.value)
+            .distinct(PartnerDisbursements.target_id)
+            .order_by(PartnerDisbursements.target_id, PartnerDisbursements.id.desc())
+        )
+        return {disbursement.target_id: disbursement for disbursement in query.all()}
+
+    @classmethod
+    def update_status(cls, partner_disbursement_ids: list[int], status_code: str, processed_on: datetime = None):
+        """Set the status, and processed on when given, of the partner disbursements in a single statement."""
+        if not partner_disbursement_ids:
+            return
+        values = {"status_code": status_code}
+        if processed_on:
+            values["processed_on"] = processed_on
+        db.session.execute(
+            update(cls)
+            .where(cls.id == func.any(cast(list(partner_disbursement_ids), ARRAY(Integer))))
+            .values(**values)
+            .execution_options(synchronize_session="fetch")
+        )
@@ -15,15 +15,21 @@
 
 from __future__ import annotations
 
+from decimal import Decimal
+
 from attrs import define
+from flask import current_app
 from marshmallow import fields
 from sql_versioning import Versioned
-from sqlalchemy import Boolean, ForeignKey
+from sqlalchemy import Boolean, ForeignKey, event
 
 from .base_model import BaseModel
 from .base_schema import BaseSchema
 from .db import db
 
+# Session info key for the credit reserved in separate transactions, returned if the session rolls back.
+CREDIT_RESERVATIONS = "credit_reservations"
+
 
 class PaymentAccount(Versioned, BaseModel):  # pylint: disable=too-many-instance-attributes
     """This class manages all of the base data about Payment Account."""
@@ -105,6 +111,60 @@ class PaymentAccount(Versioned, BaseModel):  # pylint: disable=too-many-instance
         """Return a Account by id."""
         return cls.query.filter_by(auth_account_id=str(auth_account_id)).one_or_none()
 
+    @classmethod
+    def reserve_credit(cls, account_id: int, credit_field: str, amount: Decimal) -> Decimal:
+        """Take up to the amount from one of the account's credit balances, return the amount taken.
+
+        The balance is decremented and committed in a short transaction of its own, so concurrent invoices for the
+        account only wait on the row lock for the decrement instead of the rest of the caller's transaction. The
+        decrement is an ORM write, so the history row is still written. The reservation is recorded on the caller's
+        session and the credit is returned if that transaction rolls back.
+        """
+        with db.session.session_factory() as reservation_session:
+            account = reservation_session.get(cls, account_id, with_for_update=True)
+            available_credit = getattr(account, credit_field) or 0
+            taken = min(available_credit, max(amount, 0))
+            if taken:
+                setattr(account, credit_field, available_credit - taken)
+            reservation_session.commit()
+        if not taken:
+            return Decimal("0")
+        db.session.info.setdefault(CREDIT_RESERVATIONS, []).append((account_id, credit_field, taken))
+        if account := db.session.identity_map.get(db.session.identity_key(cls, account_id)):
+            db.session.expire(account, [credit_field])
+        return taken
+
+    @classmethod
+    def release_credit(cls, account_id: int, credit_field: str, amount: Decimal):
+        """Return reserved credit to the account's balance in a short transaction of its own."""
+        with db.session.session_factory() as release_session:
+            account = release_session.get(cls, account_id, with_for_update=True)
+            setattr(account, credit_field, (getattr(account, credit_field) or 0) + amount)
+            release_session.commit()
+
+
+def _discard_credit_reservations(session):
+    """The caller's transaction committed, so the reserved credit stays taken."""
+    if not session.in_nested_transaction():
+        session.info.pop(CREDIT_RESERVATIONS, None)
+
+
+def _release_credit_reservations(session):
+    """The caller's transaction rolled back, return the credit it reserved."""
+    if session.in_nested_transaction():
+        return
+    for account_id, credit_field, amount in session.info.pop(CREDIT_RESERVATIONS, []):
+        try:
+            PaymentAccount.release_credit(account_id, credit_field, amount)
+        except Exception:  # NOQA # pylint: disable=broad-except
+            current_app.logger.error(
+                f"Error returning {amount} {credit_field} to payment account {account_id}", exc_info=True
+            )
+
+
+event.listen(db.session, "after_commit", _discard_credit_reservations)
+event.listen(db.session, "after_rollback", _release_credit_reservations)
+
 
 class PaymentAccountSchema(BaseSchema):  # pylint: disable=too-many-ancestors
     """Main schema used to serialize the Payment Account."""
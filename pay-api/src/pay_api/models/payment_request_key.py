@@ -0,0 +1,105 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Model for the keys of recent payment requests, so a retried request returns the invoice it already created."""
+
+from datetime import UTC, datetime
+from typing import Self
+
+from sqlalchemy import ForeignKey, and_, delete, exists
+from sqlalchemy.dialects.postgresql import insert
+
+from pay_api.utils.enums import InvoiceStatus
+
+from .base_model import BaseModel
+from .db import db
+from .invoice import Invoice
+
+# A retry of a payment request for these invoices creates a new invoice.
+INACTIVE_INVOICE_STATUSES = (
+    InvoiceStatus.CANCELLED.value,
+    InvoiceStatus.DELETE_ACCEPTED.value,
+    InvoiceStatus.DELETED.value,
+)
+
+
+class PaymentRequestKey(BaseModel):  # pylint: disable=too-few-public-methods
+    """This class manages the idempotency key or request fingerprint of recently created invoices."""
+
+    __tablename__ = "payment_request_keys"
+    # this mapper is used so that new and old versions of the service can be run simultaneously,
+    # making rolling upgrades easier
+    # This is used by SQLAlchemy to explicitly define which fields we're interested
+    # so it doesn't freak out and say it can't map the structure if other fields are present.
+    # This could occur from a failed deploy or during an upgrade.
+    # The other option is to tell SQLAlchemy to ignore differences, but that is ambiguous
+    # and can interfere with Alembic upgrades.
+    #
+    # NOTE: please keep mapper names in alpha-order, easier to track that way
+    #       Exception, id is always first, _fields first
+    __mapper_args__ = {
+        "include_properties": [
+            "id",
+            "created_on",
+            "invoice_id",
+            "key",
+            "request_hash",
+        ]
+    }
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    created_on = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(tz=UTC))
+    invoice_id = db.Column(db.Integer, ForeignKey("invoices.id"), nullable=False)
+    key = db.Column(db.String(64), nullable=False, unique=True)
+    # Hash of the request body, a retry that reuses the key with a different body is rejected.
+    request_hash = db.Column(db.String(64), nullable=True)
+
+    @classmethod
+    def _is_live(cls, created_after: datetime):
+        """Return the condition for a key that still points a retry at its invoice."""
+        return and_(
+            cls.created_on >= created_after,
+            exists().where(Invoice.id == cls.invoice_id, Invoice.invoice_status_code.notin_(INACTIVE_INVOICE_STATUSES)),
+        )
+
+    @classmethod
+    def find_live(cls, key: str, created_after: datetime) -> Self | None:
+        """Return the key with the invoice created for it, when the key hasn't expired."""
+        return cls.query.filter(cls.key == key, cls._is_live(created_after)).one_or_none()
+
+    @classmethod
+    def claim(cls, key: str, request_hash: str, invoice_id: int, created_after: datetime) -> bool:
+        """Point the key at the invoice, return False if the key is still live for another invoice.
+
+        A concurrent request with the same key waits on the uncommitted key row here, before any payment system work.
+        """
+        statement = insert(cls).values(
+            key=key, request_hash=request_hash, invoice_id=invoice_id, created_on=datetime.now(tz=UTC)
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[cls.key],
+            set_={
+                "created_on": statement.excluded.created_on,
+                "invoice_id": statement.excluded.invoice_id,
+                "request_hash": statement.excluded.request_hash,
+            },
+            where=~cls._is_live(created_after),
+        ).returning(cls.id)
+        return db.session.execute(statement).first() is not None
+
+    @classmethod
+    def delete_expired(cls, created_before: datetime) -> int:
+        """Delete the keys created before the cutoff, return how many were deleted."""
+        result = db.session.execute(delete(cls).where(cls.created_on < created_before))
+        db.session.commit()
+        return result.rowcount
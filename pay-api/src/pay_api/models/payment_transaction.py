@@ -18,7 +18,7 @@ from datetime import UTC, datetime, timedelta
 
 import pytz
 from marshmallow import fields
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, update
 from sqlalchemy.dialects.postgresql import UUID
 
 from pay_api.utils.constants import LEGISLATIVE_TIMEZONE
@@ -177,6 +177,19 @@ class PaymentTransaction(BaseModel):  # pylint: disable=too-few-public-methods,
             .all()
         )
 
+    @classmethod
+    def mark_event_failed(cls, transaction_id: uuid.UUID) -> bool:
+        """Mark a completed transaction EVENT_FAILED, return True if it was still completed."""
+        result = db.session.execute(
+            update(cls)
+            .where(cls.id == transaction_id)
+            .where(cls.status_code == TransactionStatus.COMPLETED.value)
+            .values(status_code=TransactionStatus.EVENT_FAILED.value)
+            .execution_options(synchronize_session="fetch")
+        )
+        db.session.commit()
+        return result.rowcount > 0
+
 
 class PaymentTransactionSchema(BaseSchema):  # pylint: disable=too-many-ancestors
     """Main schema used to serialize the PaymentTransaction."""
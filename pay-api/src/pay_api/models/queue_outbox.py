@@ -0,0 +1,165 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Model for queue messages written in the business transaction and relayed to the queue afterwards."""
+
+from datetime import UTC, datetime
+from typing import Self
+
+from sqlalchemy import and_, event, exists, or_, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import aliased
+
+from .base_model import BaseModel
+from .db import db
+
+
+class QueueOutbox(BaseModel):  # pylint: disable=too-many-instance-attributes
+    """This class manages queue messages waiting to be relayed."""
+
+    __tablename__ = "queue_outbox"
+    # this mapper is used so that new and old versions of the service can be run simultaneously,
+    # making rolling upgrades easier
+    # This is used by SQLAlchemy to explicitly define which fields we're interested
+    # so it doesn't freak out and say it can't map the structure if other fields are present.
+    # This could occur from a failed deploy or during an upgrade.
+    # The other option is to tell SQLAlchemy to ignore differences, but that is ambiguous
+    # and can interfere with Alembic upgrades.
+    #
+    # NOTE: please keep mapper names in alpha-order, easier to track that way
+    #       Exception, id is always first, _fields first
+    __mapper_args__ = {
+        "include_properties": [
+            "id",
+            "attempts",
+            "claimed_on",
+            "corp_type",
+            "created_on",
+            "dead_lettered_on",
+            "error_message",
+            "event_id",
+            "message_type",
+            "ordering_key",
+            "payload",
+            "published_on",
+            "source",
+            "topic",
+        ]
+    }
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    # Set while a relay is publishing the message, an expired claim is picked up again.
+    claimed_on = db.Column(db.DateTime, nullable=True)
+    corp_type = db.Column(db.String(10), nullable=True)
+    created_on = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(tz=UTC))
+    # Set once the attempts run out, the message and the rest of its ordering key wait for someone to look.
+    dead_lettered_on = db.Column(db.DateTime, nullable=True)
+    error_message = db.Column(db.String(), nullable=True)
+    # Cloud event id, kept across relay attempts so consumers can de-duplicate redeliveries.
+    event_id = db.Column(db.String(36), nullable=False)
+    message_type = db.Column(db.String(100), nullable=False)
+    ordering_key = db.Column(db.String(100), nullable=True)
+    payload = db.Column(JSONB, nullable=True)
+    published_on = db.Column(db.DateTime, nullable=True)
+    source = db.Column(db.String(50), nullable=False)
+    topic = db.Column(db.String(200), nullable=False)
+
+    @classmethod
+    def has_uncommitted_writes(cls) -> bool:
+        """Return True if the session has changes that the caller still has to commit."""
+        return bool(
+            db.session.new or db.session.dirty or db.session.deleted or db.session.info.get(_UNCOMMITTED_WRITES)
+        )
+
+    @classmethod
+    def claim_pending(cls, batch_size: int, claim_expired_before: datetime) -> list[Self]:
+        """Claim the oldest publishable messages for this relay, the caller commits before publishing.
+
+        A message is held back while an earlier message with the same ordering key is unpublished, so a key is
+        relayed in order and stays blocked behind a dead lettered message. Rows another relay is claiming are skipped.
+        """
+        earlier = aliased(cls)
+        messages = (
+            cls.query.filter(cls.published_on.is_(None))
+            .filter(cls.dead_lettered_on.is_(None))
+            .filter(or_(cls.claimed_on.is_(None), cls.claimed_on < claim_expired_before))
+            .filter(
+                or_(
+                    cls.ordering_key.is_(None),
+                    ~exists().where(
+                        and_(
+                            earlier.topic == cls.topic,
+                            earlier.ordering_key == cls.ordering_key,
+                            earlier.id < cls.id,
+                            earlier.published_on.is_(None),
+                        )
+                    ),
+                )
+            )
+            .order_by(cls.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True, of=cls)
+            .all()
+        )
+        claimed_on = datetime.now(tz=UTC)
+        for message in messages:
+            message.attempts += 1
+            message.claimed_on = claimed_on
+        return messages
+
+    @classmethod
+    def mark_published(cls, message_ids: list[int]):
+        """Mark claimed messages published."""
+        db.session.execute(
+            update(cls)
+            .where(cls.id.in_(message_ids))
+            .values(published_on=datetime.now(tz=UTC), claimed_on=None, error_message=None)
+        )
+
+    @classmethod
+    def mark_failed(cls, message_id: int, error_message: str, dead_letter: bool):
+        """Release a claimed message for a later run, or dead letter it."""
+        db.session.execute(
+            update(cls)
+            .where(cls.id == message_id)
+            .values(
+                claimed_on=None,
+                error_message=error_message,
+                dead_lettered_on=datetime.now(tz=UTC) if dead_letter else None,
+            )
+        )
+
+
+_UNCOMMITTED_WRITES = "queue_outbox_uncommitted_writes"
+
+
+def _track_flush(session, flush_context):  # noqa: ARG001 # pylint: disable=unused-argument
+    """Remember the session flushed changes that are not committed yet."""
+    session.info[_UNCOMMITTED_WRITES] = True
+
+
+def _track_orm_execute(orm_execute_state):
+    """Remember bulk inserts, updates and deletes executed through the session."""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[_UNCOMMITTED_WRITES] = True
+
+
+def _reset_writes(session, transaction):  # noqa: ARG001 # pylint: disable=unused-argument
+    """Forget tracked writes once the transaction is committed or rolled back."""
+    session.info.pop(_UNCOMMITTED_WRITES, None)
+
+
+event.listen(db.session, "after_flush", _track_flush)
+event.listen(db.session, "do_orm_execute", _track_orm_execute)
+event.listen(db.session, "after_transaction_end", _reset_writes)
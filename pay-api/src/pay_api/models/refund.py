@@ -17,7 +17,7 @@ from decimal import Decimal
 from typing import Self
 
 from attrs import define
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, event, inspect, or_, update
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.schema import CheckConstraint
 
@@ -27,6 +27,7 @@ from pay_api.utils.util import date_to_string
 
 from .base_model import BaseModel
 from .db import db, ma
+from .invoice import Invoice
 
 
 class Refund(BaseModel):
@@ -93,6 +94,19 @@ class Refund(BaseModel):
     gl_posted = db.Column(db.DateTime, nullable=True)
     gl_error = db.Column(db.String(250), nullable=True)
 
+    @staticmethod
+    def update_invoice_latest_refund(mapper, connection, target: Self):  # noqa: ARG004 # pylint: disable=unused-argument
+        """Copy the refund id and status to its invoice, unless the invoice already has a later refund."""
+        if target.invoice_id is None or not inspect(target).attrs.status.history.has_changes():
+            return
+        invoices = Invoice.__table__
+        connection.execute(
+            update(invoices)
+            .where(invoices.c.id == target.invoice_id)
+            .where(or_(invoices.c.latest_refund_id.is_(None), invoices.c.latest_refund_id <= target.id))
+            .values(latest_refund_id=target.id, latest_refund_status=target.status)
+        )
+
     @classmethod
     def find_latest_by_invoice_id(
         cls, invoice_id: int, statuses=(RefundStatus.APPROVAL_NOT_REQUIRED.value, RefundStatus.APPROVED.value)
@@ -104,6 +118,22 @@ class Refund(BaseModel):
             .first()
         )
 
+    @classmethod
+    def find_latest_by_invoice_ids(
+        cls,
+        invoice_ids: list[int],
+        statuses=(RefundStatus.APPROVAL_NOT_REQUIRED.value, RefundStatus.APPROVED.value),
+    ) -> dict[int, Self]:
+        """Return the latest refund for each invoice, keyed by invoice id."""
+        if not invoice_ids:
+            return {}
+        query = (
+            cls.query.filter(cls.invoice_id.in_(invoice_ids), cls.status.in_(statuses))
+            .distinct(cls.invoice_id)
+            .order_by(cls.invoice_id, cls.requested_date.desc())
+        )
+        return {refund.invoice_id: refund for refund in query.all()}
+
     @classmethod
     def find_by_invoice_and_refund_id(cls, invoice_id: int, refund_id: int) -> Self:
         """Return a refund by invoice id."""
@@ -117,6 +147,11 @@ class Refund(BaseModel):
         return cls.query.filter(cls.routing_slip_id == routing_slip_id, cls.status.in_(statuses)).one_or_none()
 
 
+# Runs inside the flush, so refunds created or decided anywhere (API, jobs, queue) keep the invoice in step.
+event.listen(Refund, "after_insert", Refund.update_invoice_latest_refund)
+event.listen(Refund, "after_update", Refund.update_invoice_latest_refund)
+
+
 class RefundSchema(ma.SQLAlchemyAutoSchema):  # pylint: disable=too-many-ancestors
     """Main schema used to serialize the Refund."""
 
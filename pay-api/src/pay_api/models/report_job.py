@@ -0,0 +1,145 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Model to track reports rendered asynchronously."""
+
+from datetime import UTC, datetime
+from typing import Self
+
+from sqlalchemy import func, update
+
+from pay_api.utils.enums import ReportJobStatus
+
+from .base_model import BaseModel
+from .db import db
+
+
+class ReportJob(BaseModel):  # pylint: disable=too-many-instance-attributes
+    """This class manages asynchronous report jobs."""
+
+    __tablename__ = "report_jobs"
+    # this mapper is used so that new and old versions of the service can be run simultaneously,
+    # making rolling upgrades easier
+    # This is used by SQLAlchemy to explicitly define which fields we're interested
+    # so it doesn't freak out and say it can't map the structure if other fields are present.
+    # This could occur from a failed deploy or during an upgrade.
+    # The other option is to tell SQLAlchemy to ignore differences, but that is ambiguous
+    # and can interfere with Alembic upgrades.
+    #
+    # NOTE: please keep mapper names in alpha-order, easier to track that way
+    #       Exception, id is always first, _fields first
+    __mapper_args__ = {
+        "include_properties": [
+            "id",
+            "auth_account_id",
+            "completed_on",
+            "content",
+            "content_type",
+            "created_by",
+            "created_on",
+            "error_message",
+            "file_name",
+            "heartbeat_on",
+            "job_key",
+            "lease_owner",
+            "report_type",
+            "status_code",
+            "storage_path",
+        ]
+    }
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    auth_account_id = db.Column(db.String(50), nullable=True, index=True)
+    completed_on = db.Column(db.DateTime, nullable=True)
+    # Rendered output when no bucket is configured, deferred so status polls don't load it.
+    content = db.deferred(db.Column(db.LargeBinary, nullable=True))
+    content_type = db.Column(db.String(100), nullable=False)
+    created_by = db.Column(db.String(50), nullable=True)
+    created_on = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(tz=UTC))
+    error_message = db.Column(db.String(), nullable=True)
+    file_name = db.Column(db.String(200), nullable=False)
+    # Refreshed while the job renders, an in flight job without a recent heartbeat was lost with its instance.
+    heartbeat_on = db.Column(db.DateTime, nullable=True)
+    # Fingerprint of the report request, identical in-flight requests share a job.
+    job_key = db.Column(db.String(64), nullable=False, index=True)
+    # Set by the worker that starts rendering the job, only that worker can finish it.
+    lease_owner = db.Column(db.String(36), nullable=True)
+    report_type = db.Column(db.String(50), nullable=False)
+    status_code = db.Column(db.String(20), nullable=False, default=ReportJobStatus.PENDING.value)
+    storage_path = db.Column(db.String(), nullable=True)
+
+    @classmethod
+    def find_in_flight_by_job_key(cls, job_key: str) -> Self:
+        """Return the pending or in progress job for a job key."""
+        return (
+            cls.query.filter(cls.job_key == job_key)
+            .filter(cls.status_code.in_(ReportJobStatus.in_flight_statuses()))
+            .one_or_none()
+        )
+
+    @classmethod
+    def fail_if_lease_expired(cls, job_id: int, lease_expired_before: datetime, error_message: str) -> bool:
+        """Mark an in flight job failed when its last heartbeat is older than the lease, return True if it was."""
+        result = db.session.execute(
+            update(cls)
+            .where(cls.id == job_id)
+            .where(cls.status_code.in_(ReportJobStatus.in_flight_statuses()))
+            .where(func.coalesce(cls.heartbeat_on, cls.created_on) < lease_expired_before)
+            .values(
+                status_code=ReportJobStatus.FAILED.value,
+                error_message=error_message,
+                completed_on=datetime.now(tz=UTC),
+            )
+            .execution_options(synchronize_session="fetch")
+        )
+        return result.rowcount > 0
+
+    @classmethod
+    def start(cls, job_id: int, lease_owner: str) -> bool:
+        """Move a pending job in progress for the lease owner, return True if it was still pending."""
+        result = db.session.execute(
+            update(cls)
+            .where(cls.id == job_id)
+            .where(cls.status_code == ReportJobStatus.PENDING.value)
+            .values(
+                status_code=ReportJobStatus.IN_PROGRESS.value,
+                heartbeat_on=datetime.now(tz=UTC),
+                lease_owner=lease_owner,
+            )
+            .execution_options(synchronize_session="fetch")
+        )
+        return result.rowcount > 0
+
+    @classmethod
+    def finish(cls, job_id: int, lease_owner: str, **values) -> bool:
+        """Complete or fail a job the lease owner still holds, return False if the job was reclaimed."""
+        result = db.session.execute(
+            update(cls)
+            .where(cls.id == job_id)
+            .where(cls.status_code == ReportJobStatus.IN_PROGRESS.value)
+            .where(cls.lease_owner == lease_owner)
+            .values(completed_on=datetime.now(tz=UTC), **values)
+            .execution_options(synchronize_session="fetch")
+        )
+        return result.rowcount > 0
+
+    @classmethod
+    def heartbeat(cls, job_id: int, lease_owner: str):
+        """Extend the lease of a job that is still rendering."""
+        db.session.execute(
+            update(cls)
+            .where(cls.id == job_id)
+            .where(cls.status_code == ReportJobStatus.IN_PROGRESS.value)
+            .where(cls.lease_owner == lease_owner)
+            .values(heartbeat_on=datetime.now(tz=UTC))
+        )
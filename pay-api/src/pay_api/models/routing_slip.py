@@ -15,16 +15,20 @@
 
 from __future__ import annotations
 
+from collections import defaultdict
+from dataclasses import dataclass
+
 from marshmallow import fields
-from sqlalchemy import ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import ForeignKey, select
+from sqlalchemy.orm import lazyload, relationship, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from pay_api.utils.enums import PaymentMethod, RoutingSlipStatus
 
 from .audit import Audit, AuditSchema
 from .base_schema import BaseSchema
 from .db import db, ma
-from .invoice import InvoiceSchema
+from .invoice import Invoice, InvoiceSchema
 from .payment import PaymentSchema
 from .payment_account import PaymentAccountSchema
 from .refund import RefundSchema
@@ -164,6 +168,71 @@ class RoutingSlip(Audit):  # pylint: disable=too-many-instance-attributes
         """Return children for the routing slip."""
         return cls.query.filter_by(parent_number=number).all()
 
+    @classmethod
+    def find_tree(cls, number: str, with_invoices: bool = True) -> RoutingSlipTree | None:
+        """Return the routing slip with its linked routing slips and their invoices."""
+        return cls.find_trees([number], with_invoices).get(number)
+
+    @classmethod
+    def find_trees(cls, numbers: list[str], with_invoices: bool = True) -> dict[str, RoutingSlipTree]:
+        """Return the trees of many routing slips, keyed by routing slip number.
+
+        The routing slips of every tree come from one recursive query and the invoices from one more, with their
+        references, receipts and other collections select in loaded. The INTERNAL invoices are set on each routing
+        slip's invoices relationship, so serializing a tree doesn't query again.
+        """
+        if not numbers:
+            return {}
+        tree = (
+            select(cls.number.label("number"), cls.number.label("root"))
+            .where(cls.number.in_(numbers))
+            .cte("routing_slip_tree", recursive=True)
+        )
+        tree = tree.union_all(select(cls.number, tree.c.root).join(tree, cls.parent_number == tree.c.number))
+        rows = (
+            db.session.query(cls, tree.c.root)
+            .join(tree, tree.c.number == cls.number)
+            .options(lazyload(cls.invoices))
+            .order_by(cls.id)
+            .all()
+        )
+        routing_slips_by_root = defaultdict(list)
+        for rs, root in rows:
+            routing_slips_by_root[root].append(rs)
+
+        invoices = []
+        if with_invoices:
+            invoices = (
+                db.session.query(Invoice)
+                .filter(Invoice.routing_slip.in_({rs.number for rs, _ in rows}))
+                .options(
+                    selectinload(Invoice.payment_line_items),
+                    selectinload(Invoice.receipts),
+                    selectinload(Invoice.references),
+                    selectinload(Invoice.partial_refunds),
+                    selectinload(Invoice.applied_credits),
+                )
+                .order_by(Invoice.id)
+                .all()
+            )
+            internal_invoices = defaultdict(list)
+            for invoice in invoices:
+                if invoice.payment_method_code == PaymentMethod.INTERNAL.value:
+                    internal_invoices[invoice.routing_slip].append(invoice)
+            for rs, _ in rows:
+                set_committed_value(rs, "invoices", internal_invoices.get(rs.number, []))
+
+        trees = {}
+        for root, routing_slips in routing_slips_by_root.items():
+            routing_slip = next(rs for rs in routing_slips if rs.number == root)
+            tree_numbers = {rs.number for rs in routing_slips}
+            trees[root] = RoutingSlipTree(
+                routing_slip=routing_slip,
+                children=[rs for rs in routing_slips if rs is not routing_slip],
+                invoices=[invoice for invoice in invoices if invoice.routing_slip in tree_numbers],
+            )
+        return trees
+
     @classmethod
     def find_by_payment_account_id(cls, payment_account_id: str) -> RoutingSlip:
         """Return a routing slip by payment account number."""
@@ -175,6 +244,29 @@ class RoutingSlip(Audit):  # pylint: disable=too-many-instance-attributes
         return cls.query.filter_by(payment_account_id=payment_account_id).all()
 
 
+@dataclass
+class RoutingSlipTree:
+    """A routing slip, the routing slips linked to it and the invoices of all of them."""
+
+    routing_slip: RoutingSlip
+    children: list[RoutingSlip]
+    # Invoices of every payment method, with references and receipts loaded.
+    invoices: list[Invoice]
+
+    @property
+    def routing_slips(self) -> list[RoutingSlip]:
+        """Return the routing slip followed by its children."""
+        return [self.routing_slip, *self.children]
+
+    def find_invoices(self, statuses: list[str], number: str = None) -> list[Invoice]:
+        """Return the invoices in the given statuses, for one routing slip number or the whole tree."""
+        return [
+            invoice
+            for invoice in self.invoices
+            if invoice.invoice_status_code in statuses and (number is None or invoice.routing_slip == number)
+        ]
+
+
 class RoutingSlipSchema(AuditSchema, BaseSchema):  # pylint: disable=too-many-ancestors, too-few-public-methods
     """Main schema used to serialize the Routing Slip."""
 
@@ -13,107 +13,87 @@
 # limitations under the License.
 """Composite Model to handle invoice search queries."""
 
+import threading
+import time
 from typing import Self
 
-from sqlalchemy import and_, exists, func, select
-from sqlalchemy.orm import column_property
-from sqlalchemy.orm.decl_api import declared_attr
+from attrs import define
+from flask import current_app
+from sqlalchemy import select
 
-from pay_api.models import CorpType, InvoiceSearchModel, PaymentLineItemSchema, PaymentMethod
+from pay_api.models import CorpType, InvoiceSearchModel, PaymentLineItemSchema, PaymentMethod, db
 from pay_api.models import Invoice as InvoiceModel
-from pay_api.models import Refund as RefundModel
 from pay_api.utils.converter import Converter
 from pay_api.utils.enums import InvoiceStatus
 
 
-def get_latest_refund_subq():
-    """Get the latest refund subquery."""
-    return (
-        select(RefundModel.id.label("refund_id"), RefundModel.status.label("refund_status"))
-        .where(RefundModel.invoice_id == InvoiceModel.id)
-        .order_by(RefundModel.id.desc())
-        .limit(1)
-        .correlate(InvoiceModel)
-        .subquery()
+@define
+class RefundRules:
+    """Refund rules from the payment method and corp type code tables."""
+
+    full_refund_statuses: dict[str, frozenset[str]]
+    partial_refund_methods: frozenset[str]
+    refund_allowed_corp_types: frozenset[str]
+    expires_at: float
+
+
+_refund_rules: RefundRules | None = None
+_refund_rules_lock = threading.Lock()
+
+
+def get_refund_rules() -> RefundRules:
+    """Return the refund rules, cached in process for REFUND_RULES_CACHE_TIMEOUT seconds."""
+    global _refund_rules  # pylint: disable=global-statement
+    rules = _refund_rules
+    if rules is None or rules.expires_at <= time.monotonic():
+        with _refund_rules_lock:
+            # Another thread may have loaded the rules while we waited on the lock.
+            rules = _refund_rules
+            if rules is None or rules.expires_at <= time.monotonic():
+                rules = _refund_rules = _load_refund_rules()
+    return rules
+
+
+def _load_refund_rules() -> RefundRules:
+    """Load the refund rules from the code tables."""
+    payment_methods = PaymentMethod.find_all()
+    return RefundRules(
+        full_refund_statuses={
+            payment_method.code: frozenset(payment_method.full_refund_statuses or ())
+            for payment_method in payment_methods
+        },
+        partial_refund_methods=frozenset(
+            payment_method.code for payment_method in payment_methods if payment_method.partial_refund
+        ),
+        refund_allowed_corp_types=frozenset(
+            db.session.scalars(select(CorpType.code).where(CorpType.refund_allowed.is_(True)))
+        ),
+        expires_at=time.monotonic() + current_app.config.get("REFUND_RULES_CACHE_TIMEOUT", 300),
     )
 
 
-def get_latest_refund_id_expr():
-    """Get the latest refund ID expression."""
-    latest_refund_subq = get_latest_refund_subq()
-    return select(latest_refund_subq.c.refund_id).scalar_subquery()
-
-
-def get_latest_refund_status_expr():
-    """Get the latest refund status expression."""
-    latest_refund_subq = get_latest_refund_subq()
-    return select(latest_refund_subq.c.refund_status).scalar_subquery()
-
-
-def get_corp_type_refund_allowed_expr():
-    """Return an EXISTS clause asserting the invoice's corp type permits refunds."""
-    return (
-        select(CorpType.code)
-        .where(and_(CorpType.code == InvoiceModel.corp_type_code, CorpType.refund_allowed.is_(True)))
-        .correlate(InvoiceModel)
-        .exists()
-    )
-
-
-def get_full_refundable_expr():
-    """Get the full refundable expression."""
-    return (
-        and_(
-            exists().where(
-                and_(
-                    PaymentMethod.code == InvoiceModel.payment_method_code,
-                    InvoiceModel.invoice_status_code == func.any(PaymentMethod.full_refund_statuses),
-                )
-            ),
-            get_corp_type_refund_allowed_expr(),
-        )
-    ).label("full_refundable")
-
-
-def get_partial_refundable_expr():
-    """Get the partial refundable expression."""
-    return (
-        and_(
-            exists().where(
-                and_(
-                    PaymentMethod.code == InvoiceModel.payment_method_code,
-                    PaymentMethod.partial_refund.is_(True),
-                    InvoiceModel.invoice_status_code == InvoiceStatus.PAID.value,
-                    InvoiceModel.refund_date.is_(None),
-                )
-            ),
-            get_corp_type_refund_allowed_expr(),
-        )
-    ).label("partial_refundable")
-
-
 class InvoiceCompositeModel(InvoiceModel):
     """This class is a composite of the Invoice and other additional information required for search results."""
 
-    @declared_attr
-    def latest_refund_id(self):
-        """Latest refund ID as a column property."""
-        return column_property(get_latest_refund_id_expr())
-
-    @declared_attr
-    def latest_refund_status(self):
-        """Latest refund status as a column property."""
-        return column_property(get_latest_refund_status_expr())
-
-    @declared_attr
-    def full_refundable(self):
-        """Full refundable indicator as a column property."""
-        return column_property(get_full_refundable_expr())
-
-    @declared_attr
-    def partial_refundable(self):
-        """Partial refundable indicator as a column property."""
-        return column_property(get_partial_refundable_expr())
+    @property
+    def full_refundable(self) -> bool:
+        """Full refundable indicator, from the payment method's full refund statuses and the corp type."""
+        rules = get_refund_rules()
+        return (
+            self.invoice_status_code in rules.full_refund_statuses.get(self.payment_method_code, ())
+            and self.corp_type_code in rules.refund_allowed_corp_types
+        )
+
+    @property
+    def partial_refundable(self) -> bool:
+        """Partial refundable indicator, only paid invoices that haven't been refunded."""
+        rules = get_refund_rules()
+        return (
+            self.payment_method_code in rules.partial_refund_methods
+            and self.invoice_status_code == InvoiceStatus.PAID.value
+            and self.refund_date is None
+            and self.corp_type_code in rules.refund_allowed_corp_types
+        )
 
     @classmethod
     def dao_to_dict(cls, invoice_dao: Self) -> dict:
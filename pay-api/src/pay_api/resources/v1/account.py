@@ -24,11 +24,12 @@ from pay_api.schemas import utils as schema_utils
 from pay_api.services.auth import check_auth
 from pay_api.services.invoice_search import InvoiceSearch
 from pay_api.services.payment_account import PaymentAccount as PaymentAccountService
+from pay_api.services.report_job import ReportJobService
 from pay_api.utils.auth import jwt as _jwt
 from pay_api.utils.constants import EDIT_ROLE, VIEW_ROLE
 from pay_api.utils.dataclasses import PurchaseHistorySearch
 from pay_api.utils.endpoints_enums import EndpointEnum
-from pay_api.utils.enums import CfsAccountStatus, ContentType, PaymentMethod, Role, RolePattern
+from pay_api.utils.enums import CfsAccountStatus, ContentType, PaymentMethod, ReportJobType, Role, RolePattern
 from pay_api.utils.errors import Error
 from pay_api.utils.product_auth_util import ProductAuthUtil
 from pay_api.utils.user_context import UserContext, user_context
@@ -370,6 +371,18 @@ def post_account_purchase_report(account_number: str):
         one_of_roles=[EDIT_ROLE, Role.VIEW_ACCOUNT_TRANSACTIONS.value],
     )
     try:
+        if request.args.get("async", "false").lower() == "true":
+            job = ReportJobService.submit(
+                report_type=ReportJobType.PAYMENT_TRANSACTIONS.value,
+                file_name=report_name,
+                content_type=response_content_type,
+                params=request_json,
+                render=lambda: InvoiceSearch.create_payment_report(
+                    account_number, request_json, response_content_type, report_name
+                ),
+                auth_account_id=account_number,
+            )
+            return jsonify(job), HTTPStatus.ACCEPTED
         report = InvoiceSearch.create_payment_report(account_number, request_json, response_content_type, report_name)
         response = Response(report, 201)
         response.headers.set("Content-Disposition", "attachment", filename=report_name)
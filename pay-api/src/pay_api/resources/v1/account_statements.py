@@ -20,10 +20,11 @@ from flask_cors import cross_origin
 
 from pay_api.services import Statement as StatementService
 from pay_api.services.auth import check_auth
+from pay_api.services.report_job import ReportJobService
 from pay_api.utils.auth import jwt as _jwt
 from pay_api.utils.constants import EDIT_ROLE
 from pay_api.utils.endpoints_enums import EndpointEnum
-from pay_api.utils.enums import ContentType, Role
+from pay_api.utils.enums import ContentType, ReportJobType, Role
 from pay_api.utils.util import string_to_bool
 
 bp = Blueprint(
@@ -67,6 +68,20 @@ def get_account_statement(account_id: str, statement_id: str):
         business_identifier=None, account_id=account_id, one_of_roles=[EDIT_ROLE, Role.VIEW_STATEMENTS.value]
     )
 
+    if string_to_bool(request.args.get("async", "false")):
+        job = ReportJobService.submit(
+            report_type=ReportJobType.STATEMENT.value,
+            file_name=f"statement-{statement_id}",
+            content_type=response_content_type,
+            params={"statement_id": statement_id},
+            render=lambda: StatementService.get_statement_report(
+                statement_id=statement_id, content_type=response_content_type, auth=auth
+            ),
+            auth_account_id=account_id,
+        )
+        current_app.logger.info(">get_account_statement")
+        return jsonify(job), HTTPStatus.ACCEPTED
+
     report, report_name = StatementService.get_statement_report(
         statement_id=statement_id, content_type=response_content_type, auth=auth
     )
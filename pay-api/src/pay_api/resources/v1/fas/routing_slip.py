@@ -22,10 +22,11 @@ from flask_cors import cross_origin
 from pay_api.exceptions import BusinessException, ServiceUnavailableException, error_to_response
 from pay_api.schemas import utils as schema_utils
 from pay_api.services.fas import CommentService, RoutingSlipService
+from pay_api.services.report_job import ReportJobService
 from pay_api.utils.auth import jwt as _jwt
 from pay_api.utils.dataclasses import RoutingSlipSearch
 from pay_api.utils.endpoints_enums import EndpointEnum
-from pay_api.utils.enums import Role
+from pay_api.utils.enums import ContentType, ReportJobType, Role
 from pay_api.utils.errors import Error
 
 bp = Blueprint(
@@ -95,6 +96,17 @@ def post_routing_slip_report(date: str):
     if not re.match(r"^\d{4}-\d{2}-\d{2}$", date):
         return error_to_response(Error.INVALID_REQUEST, invalid_params=["date"])
 
+    if request.args.get("async", "false").lower() == "true":
+        job = ReportJobService.submit(
+            report_type=ReportJobType.ROUTING_SLIP_DAILY.value,
+            file_name=f"Routing-Slip-Daily-Report-{date}.pdf",
+            content_type=ContentType.PDF.value,
+            params={"date": date},
+            render=lambda: RoutingSlipService.create_daily_reports(date)[0],
+        )
+        current_app.logger.debug(">post_routing_slip_report")
+        return jsonify(job), HTTPStatus.ACCEPTED
+
     pdf, file_name = RoutingSlipService.create_daily_reports(date)
 
     response = Response(pdf, 201)
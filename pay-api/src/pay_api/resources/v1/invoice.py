@@ -73,7 +73,9 @@ def post_invoice():
     )
     try:
         response, status = (
-            PaymentService.create_invoice(request_json, authorization),
+            PaymentService.create_invoice(
+                request_json, authorization, idempotency_key=request.headers.get("Idempotency-Key")
+            ),
             HTTPStatus.CREATED,
         )
     except (BusinessException, ServiceUnavailableException) as exception:
@@ -0,0 +1,58 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Resource for polling asynchronous report jobs."""
+
+from http import HTTPStatus
+
+from flask import Blueprint, Response, current_app, jsonify
+from flask_cors import cross_origin
+
+from pay_api.exceptions import BusinessException
+from pay_api.services.report_job import ReportJobService
+from pay_api.utils.auth import jwt as _jwt
+from pay_api.utils.endpoints_enums import EndpointEnum
+
+bp = Blueprint("REPORT_JOBS", __name__, url_prefix=f"{EndpointEnum.API_V1.value}/report-jobs")
+
+
+@bp.route("/<int:job_id>", methods=["GET", "OPTIONS"])
+@cross_origin(origins="*", methods=["GET"])
+@_jwt.requires_auth
+def get_report_job(job_id: int):
+    """Get the status of a report job."""
+    current_app.logger.info("<get_report_job")
+    try:
+        response, status = ReportJobService.asdict(ReportJobService.find_by_id(job_id)), HTTPStatus.OK
+    except BusinessException as exception:
+        return exception.response()
+    current_app.logger.debug(">get_report_job")
+    return jsonify(response), status
+
+
+@bp.route("/<int:job_id>/content", methods=["GET", "OPTIONS"])
+@cross_origin(origins="*", methods=["GET"])
+@_jwt.requires_auth
+def get_report_job_content(job_id: int):
+    """Download the rendered output of a completed report job."""
+    current_app.logger.info("<get_report_job_content")
+    try:
+        job = ReportJobService.find_by_id(job_id)
+        response = Response(ReportJobService.get_content(job), HTTPStatus.OK.value)
+    except BusinessException as exception:
+        return exception.response()
+    response.headers.set("Content-Disposition", "attachment", filename=job.file_name)
+    response.headers.set("Content-Type", job.content_type)
+    response.headers.set("Access-Control-Expose-Headers", "Content-Disposition")
+    current_app.logger.debug(">get_report_job_content")
+    return response
@@ -374,10 +374,10 @@ class CFSService(OAuthService):
         return payment_details
 
     @classmethod
-    def get_invoice(cls, cfs_account: CfsAccountModel, inv_number: str):
+    def get_invoice(cls, cfs_account: CfsAccountModel, inv_number: str, access_token: str = None, session=None):
         """Get invoice from CFS."""
         current_app.logger.debug(f"<Getting invoice from CFS : {inv_number}")
-        access_token: str = CFSService.get_token().json().get("access_token")
+        access_token: str = access_token or CFSService.get_token().json().get("access_token")
         invoice_url = (
             current_app.config.get("CFS_BASE_URL")
             + f"/cfs/parties/{cfs_account.cfs_party}/accs/{cfs_account.cfs_account}/"
@@ -390,6 +390,7 @@ class CFSService(OAuthService):
             AuthHeaderType.BEARER,
             ContentType.JSON,
             additional_headers={"Pay-Connector": current_app.config.get("PAY_CONNECTOR_AUTH")},
+            session=session,
         )
         return invoice_response.json()
 
@@ -13,6 +13,9 @@
 # limitations under the License.
 """Service to manage Fee Calculation."""
 
+import threading
+from collections import defaultdict
+
 from flask import current_app
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.sql import func
@@ -28,6 +31,10 @@ from pay_api.utils.cache import cache
 from pay_api.utils.enums import Code as CodeValue
 from pay_api.utils.enums import PaymentMethod
 
+# One lock per code type so concurrent cache misses load a code table once (single-flight).
+_code_type_locks = defaultdict(threading.Lock)
+_code_type_locks_guard = threading.Lock()
+
 
 class Code:
     """Service to manage Fee related operations."""
@@ -49,34 +56,48 @@ class Code:
 
         # Get from cache and if still none look up in database
         codes_response = cache.get(code_type)
-        codes_models, schema = None, None
         if not codes_response:
-            if code_type == CodeValue.ERROR.value:
-                codes_models = ErrorCode.find_all()
-                schema = ErrorCodeSchema()
-            elif code_type == CodeValue.INVOICE_STATUS.value:
-                codes_models = InvoiceStatusCode.find_all()
-                schema = InvoiceStatusCodeSchema()
-            elif code_type == CodeValue.CORP_TYPE.value:
-                codes_models = CorpType.find_all()
-                schema = CorpTypeSchema()
-            elif code_type == CodeValue.FEE_CODE.value:
-                codes_models = FeeCode.find_all()
-                schema = FeeCodeSchema()
-            elif code_type == CodeValue.ROUTING_SLIP_STATUS.value:
-                codes_models = RoutingSlipStatusCode.find_all()
-                schema = RoutingSlipStatusCodeSchema()
-            elif code_type == CodeValue.PAYMENT_METHODS.value:
-                codes_models = PaymentMethodModel.find_all()
-                schema = PaymentMethodSchema()
-            if schema and codes_models:
-                codes_response = schema.dump(codes_models, many=True)
-                cache.set(code_type, codes_response)
+            with cls._get_code_type_lock(code_type):
+                # Another request may have loaded this code type while we waited on the lock.
+                codes_response = cache.get(code_type) or cls._load_code_values(code_type)
 
         response["codes"] = codes_response
         current_app.logger.debug(">find_code_values_by_type")
         return response
 
+    @staticmethod
+    def _get_code_type_lock(code_type: str) -> threading.Lock:
+        """Return the lock guarding the cache load for a code type."""
+        with _code_type_locks_guard:
+            return _code_type_locks[code_type]
+
+    @staticmethod
+    def _load_code_values(code_type: str):
+        """Load code values for a code type from the database and cache them."""
+        codes_models, schema, codes_response = None, None, None
+        if code_type == CodeValue.ERROR.value:
+            codes_models = ErrorCode.find_all()
+            schema = ErrorCodeSchema()
+        elif code_type == CodeValue.INVOICE_STATUS.value:
+            codes_models = InvoiceStatusCode.find_all()
+            schema = InvoiceStatusCodeSchema()
+        elif code_type == CodeValue.CORP_TYPE.value:
+            codes_models = CorpType.find_all()
+            schema = CorpTypeSchema()
+        elif code_type == CodeValue.FEE_CODE.value:
+            codes_models = FeeCode.find_all()
+            schema = FeeCodeSchema()
+        elif code_type == CodeValue.ROUTING_SLIP_STATUS.value:
+            codes_models = RoutingSlipStatusCode.find_all()
+            schema = RoutingSlipStatusCodeSchema()
+        elif code_type == CodeValue.PAYMENT_METHODS.value:
+            codes_models = PaymentMethodModel.find_all()
+            schema = PaymentMethodSchema()
+        if schema and codes_models:
+            codes_response = schema.dump(codes_models, many=True)
+            cache.set(code_type, codes_response)
+        return codes_response
+
     @classmethod
     def find_code_value_by_type_and_code(cls, code_type: str, code: str):
         """Find code values by code type and code."""
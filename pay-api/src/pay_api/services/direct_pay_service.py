@@ -19,20 +19,26 @@ PaymentMethod.CC is used for Direct Pay PAYBC Payments.
 """
 
 import urllib.parse
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 from typing import Any
 
+import requests
 from dateutil import parser
 from flask import current_app
+from requests.adapters import HTTPAdapter
 
 from pay_api.models import CfsAccount as CfsAccountModel
 from pay_api.models import Invoice as InvoiceModel
+from pay_api.models import InvoiceReference as InvoiceReferenceModel
 from pay_api.models import PaymentLineItem as PaymentLineItemModel
-from pay_api.models import RefundPartialLine
+from pay_api.models import RefundPartialLine, db
 from pay_api.services.base_payment_system import PaymentSystemService
 from pay_api.services.cfs_service import CFSService
 from pay_api.services.invoice import Invoice
 from pay_api.services.invoice_reference import InvoiceReference
+from pay_api.services.oauth_service import RETRY_ADAPTER
 from pay_api.services.payment import Payment
 from pay_api.services.payment_account import PaymentAccount
 from pay_api.utils.enums import AuthHeaderType, CfsAccountStatus, ContentType, PaymentMethod, PaymentSystem
@@ -40,6 +46,9 @@ from pay_api.utils.util import parse_url_params
 
 from .payment_line_item import PaymentLineItem
 
+# Marks a batched CFS lookup that raised, as opposed to an invoice without a receipt.
+_LOOKUP_FAILED = object()
+
 
 class DirectPayService(PaymentSystemService, CFSService):
     """Service to manage DirectPay PayBC integration. - for NSF/balance payments, we usually use Direct Sale service instead."""
@@ -148,47 +157,154 @@ class DirectPayService(PaymentSystemService, CFSService):
         if not receipt_number:
             invoice = InvoiceModel.find_by_id(invoice_reference.invoice_id)
             cfs_account = CfsAccountModel.find_by_id(invoice.cfs_account_id)
-            invoice = self.get_invoice(cfs_account, invoice_reference.invoice_number)
-            for receipt in invoice.get("receipts", []):
-                receipt_applied_links = [
-                    link for link in receipt.get("links", []) if link.get("rel") == "receipt_applied"
-                ]
-                if receipt_applied_links:
-                    # Takes the top, there could definitely be multiple, will have to tackle this in the future.
-                    href = receipt_applied_links[0].get("href")
-                    if href:
-                        receipt_number = href.rstrip("/").split("/")[-1]
-                        break
+            receipt_number = self._find_receipt_number(self.get_invoice(cfs_account, invoice_reference.invoice_number))
         if receipt_number:
             receipt_response = self._get_receipt_by_number(
                 CFSService.get_token().json().get("access_token"), receipt_url, receipt_number
             )
-            receipt_date = parser.parse(receipt_response.get("receipt_date"))
+            return self._get_receipt_details(receipt_response, receipt_number, invoice_reference.invoice_number)
+        return None
+
+    @classmethod
+    def get_receipts(
+        cls, invoice_references: list[InvoiceReferenceModel], throttle: Callable[[], None] | None = None
+    ) -> dict[int, tuple | None]:
+        """Get receipts for many invoice references, keyed by invoice id.
+
+        One token and one pooled session are used for the batch, CFS invoices and receipts are fetched concurrently
+        and a receipt applied to several invoices is only fetched once. Invoices without a receipt map to None,
+        invoices whose lookup failed are left out so callers can fall back to get_receipt for them. throttle is
+        called before every CFS call, so callers can rate limit the lookups.
+        """
+        if not invoice_references:
+            return {}
+        cfs_accounts = dict(
+            db.session.query(InvoiceModel.id, CfsAccountModel)
+            .join(CfsAccountModel, CfsAccountModel.id == InvoiceModel.cfs_account_id)
+            .filter(InvoiceModel.id.in_({reference.invoice_id for reference in invoice_references}))
+            .all()
+        )
+        access_token = CFSService.get_token().json().get("access_token")
+        workers = current_app.config.get("CFS_RECEIPT_LOOKUP_WORKERS", 8)
+        app = current_app._get_current_object()  # pylint: disable=protected-access
+
+        def _in_app_context(func, *args):
+            with app.app_context():
+                try:
+                    return func(*args)
+                except Exception as e:  # NOQA # pylint: disable=broad-except
+                    current_app.logger.error(f"Error getting receipt from CFS: {str(e)}", exc_info=True)
+                    return _LOOKUP_FAILED
+
+        def _find_receipt_number(reference: InvoiceReferenceModel):
+            if not (cfs_account := cfs_accounts.get(reference.invoice_id)):
+                return None
+            if throttle:
+                throttle()
+            cfs_invoice = cls.get_invoice(cfs_account, reference.invoice_number, access_token, session)
+            return cls._find_receipt_number(cfs_invoice)
+
+        def _get_receipt(receipt_key: tuple):
+            cfs_account_id, receipt_number = receipt_key
+            if throttle:
+                throttle()
+            return cls._get_receipt_by_number(
+                access_token, cls._get_receipt_url(cfs_by_id[cfs_account_id]), receipt_number, session
+            )
 
-            amount = Decimal("0")
-            for invoice in receipt_response.get("invoices"):
-                if invoice.get("invoice_number") == invoice_reference.invoice_number:
-                    amount += Decimal(invoice.get("amount_applied"))
+        with requests.Session() as session:
+            # Mounted once before any work is submitted, the shared session is not mutated by the workers.
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers, max_retries=RETRY_ADAPTER.max_retries)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cfs-receipt") as executor:
+                receipt_numbers = list(
+                    executor.map(lambda reference: _in_app_context(_find_receipt_number, reference), invoice_references)
+                )
+                cfs_by_id = {cfs_account.id: cfs_account for cfs_account in cfs_accounts.values()}
+                receipt_keys = list(
+                    {
+                        (cfs_accounts[reference.invoice_id].id, receipt_number)
+                        for reference, receipt_number in zip(invoice_references, receipt_numbers, strict=True)
+                        if receipt_number and receipt_number is not _LOOKUP_FAILED
+                    }
+                )
+                receipts = dict(
+                    zip(
+                        receipt_keys,
+                        executor.map(lambda key: _in_app_context(_get_receipt, key), receipt_keys),
+                        strict=True,
+                    )
+                )
 
-            return receipt_number, receipt_date, float(amount)
+        results = {}
+        for reference, receipt_number in zip(invoice_references, receipt_numbers, strict=True):
+            if receipt_number is _LOOKUP_FAILED:
+                continue
+            if not receipt_number:
+                results[reference.invoice_id] = None
+                continue
+            receipt_response = receipts[(cfs_accounts[reference.invoice_id].id, receipt_number)]
+            if receipt_response is _LOOKUP_FAILED:
+                continue
+            results[reference.invoice_id] = cls._get_receipt_details(
+                receipt_response, receipt_number, reference.invoice_number
+            )
+        current_app.logger.info(
+            f"Resolved {sum(1 for result in results.values() if result)} of {len(results)} invoice receipts "
+            f"from {len(receipt_keys)} CFS receipts."
+        )
+        return results
+
+    @staticmethod
+    def _get_receipt_url(cfs_account: CfsAccountModel) -> str:
+        """Return the receipts url for a CFS account."""
+        return (
+            current_app.config.get("CFS_BASE_URL") + f"/cfs/parties/{cfs_account.cfs_party}/accs/"
+            f"{cfs_account.cfs_account}/sites/{cfs_account.cfs_site}/rcpts/"
+        )
+
+    @staticmethod
+    def _find_receipt_number(cfs_invoice: dict) -> str | None:
+        """Return the receipt number applied to a CFS invoice."""
+        for receipt in cfs_invoice.get("receipts", []):
+            receipt_applied_links = [link for link in receipt.get("links", []) if link.get("rel") == "receipt_applied"]
+            if receipt_applied_links:
+                # Takes the top, there could definitely be multiple, will have to tackle this in the future.
+                href = receipt_applied_links[0].get("href")
+                if href:
+                    return href.rstrip("/").split("/")[-1]
         return None
 
+    @staticmethod
+    def _get_receipt_details(receipt_response: dict, receipt_number: str, invoice_number: str) -> tuple:
+        """Return the receipt number, date and amount applied to the invoice."""
+        receipt_date = parser.parse(receipt_response.get("receipt_date"))
+        amount = Decimal("0")
+        for invoice in receipt_response.get("invoices"):
+            if invoice.get("invoice_number") == invoice_number:
+                amount += Decimal(invoice.get("amount_applied"))
+        return receipt_number, receipt_date, float(amount)
+
+    @classmethod
     def _get_receipt_by_number(
-        self,
+        cls,
         access_token: str = None,  # noqa: ARG002
         receipt_url: str = None,  # noqa: ARG002
         receipt_number: str = None,  # noqa: ARG002
+        session: requests.Session = None,
     ):
         """Get receipt details by receipt number."""
         if receipt_number:
             receipt_url = receipt_url + f"{receipt_number}/"
-        return self.get(
+        return cls.get(
             receipt_url,
             access_token,
             AuthHeaderType.BEARER,
             ContentType.JSON,
             True,
             additional_headers={"Pay-Connector": current_app.config.get("PAY_CONNECTOR_AUTH")},
+            session=session,
         ).json()
 
     def process_cfs_refund(
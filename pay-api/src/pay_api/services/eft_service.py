@@ -237,6 +237,12 @@ class EftService(DepositService):
             statuses=[EFTCreditInvoiceStatus.PENDING.value],
             statement_id=statement_id,
         )
+        EftService._cancel_credit_links(credit_links)
+        current_app.logger.debug(">cancel_payment_action")
+
+    @staticmethod
+    def _cancel_credit_links(credit_links: list[EFTCreditInvoiceLinkModel]):
+        """Cancel pending credit links, returning their amounts to the EFT credits."""
         link_group_ids = set()
         for credit_link in credit_links:
             eft_credit = EFTRefundService.return_eft_credit(
@@ -256,7 +262,6 @@ class EftService(DepositService):
                 db.session.delete(history_model)
 
         db.session.flush()
-        current_app.logger.debug(">cancel_payment_action")
 
     @staticmethod
     def reverse_payment_action(short_name_id: int, statement_id: int):
@@ -354,6 +359,7 @@ class EftService(DepositService):
         statuses: list[str],  # noqa: ARG002
         invoice_id: int = None,  # noqa: ARG002
         statement_id: int = None,  # noqa: ARG002
+        invoice_ids: list[int] = None,
     ) -> list[EFTCreditInvoiceLinkModel]:
         """Get short name credit invoice links by account."""
         credit_links_query = (
@@ -370,6 +376,8 @@ class EftService(DepositService):
         )
         credit_links_query = credit_links_query.filter_conditionally(statement_id, StatementInvoicesModel.statement_id)
         credit_links_query = credit_links_query.filter_conditionally(invoice_id, InvoiceModel.id)
+        if invoice_ids is not None:
+            credit_links_query = credit_links_query.filter(InvoiceModel.id.in_(invoice_ids))
         return credit_links_query.all()
 
     @staticmethod
@@ -480,47 +488,61 @@ class EftService(DepositService):
         return query.all()
 
     @staticmethod
-    def apply_eft_credit(invoice_id: int, short_name_id: int, link_group_id: int, auto_save: bool = False):
-        """Apply EFT credit and update remaining credit records."""
-        invoice = InvoiceModel.find_by_id(invoice_id)
-        payment_account = PaymentAccountModel.find_by_id(invoice.payment_account_id)
+    def apply_eft_credits(short_name_id: int, payment_account_id: int, link_groups: dict[InvoiceModel, int]):
+        """Apply EFT credit to the owing invoices, oldest first, and update remaining credit records.
 
-        # Clear any existing pending credit links on this invoice
-        EftService.cancel_payment_action(short_name_id, payment_account.auth_account_id, invoice_id)
+        The short name's credits are locked once and allocated across all of the invoices in memory, the credit
+        invoice links are then inserted in bulk.
+        """
+        eft_credits = EFTCreditModel.get_eft_credits(short_name_id, include_zero_remaining=True)
 
-        eft_credit_balance = EFTCreditModel.get_eft_credit_balance(short_name_id)
-        invoice_balance = invoice.total - (invoice.paid or 0)
+        # Clear any existing pending credit links on these invoices, their amounts go back to the locked credits.
+        EftService._cancel_credit_links(
+            EftService._get_shortname_invoice_links(
+                short_name_id=short_name_id,
+                payment_account_id=payment_account_id,
+                statuses=[EFTCreditInvoiceStatus.PENDING.value],
+                invoice_ids=[invoice.id for invoice in link_groups],
+            )
+        )
 
-        if eft_credit_balance < invoice_balance:
-            return
+        eft_credits = [eft_credit for eft_credit in eft_credits if eft_credit.remaining_amount > 0]
+        eft_credit_balance = sum(eft_credit.remaining_amount for eft_credit in eft_credits)
+        credit_index = 0
+        credit_invoice_links = []
+        paid_invoices = []
+        for invoice in sorted(link_groups, key=lambda invoice: (invoice.created_on, invoice.id)):
+            invoice_balance = invoice.total - (invoice.paid or 0)
+            if eft_credit_balance < invoice_balance:
+                continue
 
-        eft_credits = EFTCreditModel.get_eft_credits(short_name_id)
-        for eft_credit in eft_credits:
-            credit_invoice_link = EFTCreditInvoiceLinkModel(
-                eft_credit_id=eft_credit.id,
-                status_code=EFTCreditInvoiceStatus.PENDING.value,
-                invoice_id=invoice.id,
-                link_group_id=link_group_id,
-            )
+            eft_credit_balance -= invoice_balance
+            while credit_index < len(eft_credits):
+                eft_credit = eft_credits[credit_index]
+                # Credit covers the full invoice balance, or a partial balance when it runs out.
+                amount = min(eft_credit.remaining_amount, invoice_balance)
+                credit_invoice_links.append(
+                    EFTCreditInvoiceLinkModel(
+                        amount=amount,
+                        eft_credit_id=eft_credit.id,
+                        invoice_id=invoice.id,
+                        link_group_id=link_groups[invoice],
+                        status_code=EFTCreditInvoiceStatus.PENDING.value,
+                    )
+                )
+                eft_credit.remaining_amount -= amount
+                invoice_balance -= amount
+                if eft_credit.remaining_amount == 0:
+                    credit_index += 1
+                if invoice_balance == 0:
+                    break
 
-            if eft_credit.remaining_amount >= invoice_balance:
-                # Credit covers the full invoice balance
-                credit_invoice_link.amount = invoice_balance
-                credit_invoice_link.save_or_add(auto_save)
-                eft_credit.remaining_amount -= invoice_balance
-                eft_credit.save_or_add(auto_save)
-                invoice_balance = 0
-                break
-
-            # Credit covers partial invoice balance
-            invoice_balance -= eft_credit.remaining_amount
-            credit_invoice_link.amount = eft_credit.remaining_amount
-            credit_invoice_link.save_or_add(auto_save)
-            eft_credit.remaining_amount = 0
-            eft_credit.save_or_add(auto_save)
-
-        if invoice_balance == 0:
-            PartnerDisbursements.handle_payment(invoice)
+            if invoice_balance == 0:
+                paid_invoices.append(invoice)
+
+        EFTCreditInvoiceLinkModel.bulk_save_links(credit_invoice_links)
+        db.session.flush()
+        PartnerDisbursements.handle_payments(paid_invoices)
 
     @staticmethod
     def process_owing_statements(
@@ -551,7 +573,7 @@ class EftService(DepositService):
                 invoices = EftService._get_statement_invoices_owing(auth_account_id, statement.id)
                 for invoice in invoices:
                     if invoice.payment_method_code == PaymentMethod.EFT.value:
-                        link_groups[invoice.id] = link_group_id
+                        link_groups[invoice] = link_group_id
 
                 if invoices:
                     credit_balance -= statement.amount_owing
@@ -568,8 +590,9 @@ class EftService(DepositService):
                         )
                     ).flush()
 
-        for invoice_id, group_id in link_groups.items():
-            EftService.apply_eft_credit(invoice_id, short_name_id, group_id)
+        if link_groups:
+            payment_account = PaymentAccountModel.find_by_auth_account_id(auth_account_id)
+            EftService.apply_eft_credits(short_name_id, payment_account.id, link_groups)
 
         current_app.logger.debug(">process_owing_statements")
 
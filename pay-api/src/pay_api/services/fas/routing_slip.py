@@ -22,7 +22,7 @@ from operator import and_
 import pytz
 from flask import abort, current_app
 from sqlalchemy import Numeric, cast, func
-from sqlalchemy.orm import contains_eager, lazyload, load_only, with_expression
+from sqlalchemy.orm import contains_eager, lazyload, load_only
 
 from pay_api.exceptions import BusinessException
 from pay_api.models import CfsAccount as CfsAccountModel
@@ -32,13 +32,7 @@ from pay_api.models import Payment as PaymentModel
 from pay_api.models import PaymentAccount as PaymentAccountModel
 from pay_api.models import RoutingSlip as RoutingSlipModel
 from pay_api.models import RoutingSlipSchema, db
-from pay_api.models.search.invoice_composite_model import (
-    InvoiceCompositeModel,
-    get_full_refundable_expr,
-    get_latest_refund_id_expr,
-    get_latest_refund_status_expr,
-    get_partial_refundable_expr,
-)
+from pay_api.models.search.invoice_composite_model import InvoiceCompositeModel
 from pay_api.services.fas.routing_slip_status_transition_service import RoutingSlipStatusTransitionService
 from pay_api.services.oauth_service import OAuthService
 from pay_api.utils.constants import DT_SHORT_FORMAT
@@ -350,12 +344,6 @@ class RoutingSlip:
                 InvoiceCompositeModel.routing_slip == rs_number,
                 InvoiceCompositeModel.payment_method_code == PaymentMethod.INTERNAL.value,
             )
-            .options(
-                with_expression(InvoiceCompositeModel.latest_refund_id, get_latest_refund_id_expr()),
-                with_expression(InvoiceCompositeModel.latest_refund_status, get_latest_refund_status_expr()),
-                with_expression(InvoiceCompositeModel.full_refundable, get_full_refundable_expr()),
-                with_expression(InvoiceCompositeModel.partial_refundable, get_partial_refundable_expr()),
-            )
             .all()
         )
 
@@ -363,7 +351,9 @@ class RoutingSlip:
     def find_by_number(cls, rs_number: str, route_version: int = 1) -> dict[str, any]:
         """Find by routing slip number."""
         routing_slip_dict: dict[str, any] = None
-        if routing_slip := RoutingSlipModel.find_by_number(rs_number):
+        # Version 2 replaces the invoices with invoice composites, so they aren't loaded with the routing slip.
+        if tree := RoutingSlipModel.find_tree(rs_number, with_invoices=route_version != 2):
+            routing_slip = tree.routing_slip
             # Future: Use CATTRS
             routing_slip_schema = RoutingSlipSchema(
                 exclude=(
@@ -374,6 +364,7 @@ class RoutingSlip:
                     "region",
                     "street",
                     "street_additional",
+                    *(("invoices",) if route_version == 2 else ()),
                 )
             )
             routing_slip_dict = routing_slip_schema.dump(routing_slip)
@@ -402,12 +393,13 @@ class RoutingSlip:
     def get_links(cls, rs_number: str) -> dict[str, any]:
         """Find dependents/links of a routing slips."""
         links: dict[str, any] = None
-        if routing_slip := RoutingSlipModel.find_by_number(rs_number):
+        if tree := RoutingSlipModel.find_tree(rs_number):
             routing_slip_schema = RoutingSlipSchema()
-            children = RoutingSlipModel.find_children(rs_number)
             links = {
-                "parent": routing_slip_schema.dump(routing_slip.parent),
-                "children": routing_slip_schema.dump(children, many=True),
+                "parent": routing_slip_schema.dump(tree.routing_slip.parent),
+                "children": routing_slip_schema.dump(
+                    [child for child in tree.children if child.parent_number == rs_number], many=True
+                ),
             }
 
         return links
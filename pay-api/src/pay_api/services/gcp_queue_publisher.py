@@ -1,12 +1,28 @@
-"""This module provides Queue type services."""
+"""This module provides Queue type services.
 
+Messages are published synchronously by default. With QUEUE_PUBLISH_MODE=async they are handed to the PubSub
+publisher client, which batches them per topic and publishes them in the background. publish_to_queue returns the
+client's future and requests don't wait on it. Batched messages are sent when the process exits, jobs flush them
+when they finish. With QUEUE_PUBLISH_MODE=outbox they are written to the queue outbox and relay_outbox publishes
+them once committed. The outbox row joins the caller's transaction when it has uncommitted changes, so a rolled back
+transaction sends nothing, otherwise it is committed straight away.
+"""
+
+import atexit
+import threading
 import uuid
-from dataclasses import dataclass
-from datetime import UTC, datetime
+from collections.abc import Callable
+from concurrent.futures import Future, wait
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from functools import partial
 
 from flask import current_app
+from google.cloud import pubsub_v1
 from simple_cloudevent import SimpleCloudEvent
 
+from pay_api.models import QueueOutbox as QueueOutboxModel
+from pay_api.models import db
 from pay_api.services.gcp_queue import GcpQueue, queue
 
 
@@ -22,26 +38,207 @@ class QueueMessage:
     corp_type: str | None = None
 
 
-def publish_to_queue(queue_message: QueueMessage):
-    """Publish to GCP PubSub Queue using queue."""
-    if queue_message.topic is None:
-        current_app.logger.info("Skipping queue message topic not set.")
+_publisher: pubsub_v1.PublisherClient | None = None
+_outstanding: set[Future] = set()
+_publisher_lock = threading.Lock()
+
+
+def _get_publisher() -> pubsub_v1.PublisherClient:
+    """Return the batching publisher client, created on first use so it picks up the configured settings."""
+    global _publisher  # pylint: disable=global-statement
+    with _publisher_lock:
+        if _publisher is None:
+            config = current_app.config
+            _publisher = pubsub_v1.PublisherClient(
+                credentials=queue.credentials_pub,
+                batch_settings=pubsub_v1.types.BatchSettings(
+                    max_messages=config.get("QUEUE_PUBLISH_BATCH_SIZE", 100),
+                    max_latency=config.get("QUEUE_PUBLISH_BATCH_LATENCY_SECONDS", 0.05),
+                ),
+                publisher_options=pubsub_v1.types.PublisherOptions(enable_message_ordering=True),
+            )
+            atexit.register(shutdown)
+    return _publisher
+
+
+def _published(app, topic: str, ordering_key: str | None, future: Future):
+    """Log a failed publish and resume its ordering key, the client pauses a key after a failure."""
+    with _publisher_lock:
+        _outstanding.discard(future)
+    if future.cancelled() or not (error := future.exception()):
         return
+    app.logger.error(f"Queue message to {topic} failed to publish: {error}")
+    if ordering_key and _publisher:
+        _publisher.resume_publish(topic, ordering_key)
 
-    # Create a SimpleCloudEvent from the QueueMessage
-    cloud_event = SimpleCloudEvent(
-        id=str(uuid.uuid4()),
-        source=f"sbc-pay-{queue_message.source}",
+
+def _to_cloud_event(source: str, message_type: str, payload: dict, event_id: str, event_time: datetime):
+    return SimpleCloudEvent(
+        id=event_id,
+        source=f"sbc-pay-{source}",
         # Intentionally blank, this field has been moved to topic.
         subject=None,
-        time=datetime.now(tz=UTC).isoformat(),
-        type=queue_message.message_type,
-        data=queue_message.payload,
+        time=event_time.isoformat(),
+        type=message_type,
+        data=payload,
     )
 
+
+def _publish_kwargs(ordering_key: str | None, corp_type: str | None) -> dict:
     kwargs = {}
-    if queue_message.ordering_key:
-        kwargs.update({"ordering_key": queue_message.ordering_key})
-    if queue_message.corp_type:
-        kwargs.update({"corp_type": queue_message.corp_type})
-    queue.publish(queue_message.topic, GcpQueue.to_queue_message(cloud_event), **kwargs)
+    if ordering_key:
+        kwargs.update({"ordering_key": ordering_key})
+    if corp_type:
+        kwargs.update({"corp_type": corp_type})
+    return kwargs
+
+
+def publish_to_queue(queue_message: QueueMessage) -> Future | None:
+    """Publish to GCP PubSub Queue using queue.
+
+    In async mode the message is batched and a future is returned, publish errors are raised by the future
+    instead of this call. In outbox mode the message is only added to the session, it is sent once the caller
+    commits.
+    """
+    if queue_message.topic is None:
+        current_app.logger.info("Skipping queue message topic not set.")
+        return None
+
+    publish_mode = current_app.config.get("QUEUE_PUBLISH_MODE")
+    if publish_mode == "outbox":
+        outbox_message = QueueOutboxModel(
+            corp_type=queue_message.corp_type,
+            event_id=str(uuid.uuid4()),
+            message_type=queue_message.message_type,
+            ordering_key=queue_message.ordering_key,
+            payload=queue_message.payload,
+            source=queue_message.source,
+            topic=queue_message.topic,
+        )
+        if QueueOutboxModel.has_uncommitted_writes():
+            # Committed or rolled back with the caller's changes.
+            outbox_message.flush()
+        else:
+            # Published after the caller's last commit, nothing else would commit it.
+            outbox_message.save()
+        return None
+
+    # Create a SimpleCloudEvent from the QueueMessage
+    cloud_event = _to_cloud_event(
+        queue_message.source,
+        queue_message.message_type,
+        queue_message.payload,
+        event_id=str(uuid.uuid4()),
+        event_time=datetime.now(tz=UTC),
+    )
+    kwargs = _publish_kwargs(queue_message.ordering_key, queue_message.corp_type)
+    # Serialized here, callers are free to reuse the payload once this returns.
+    message = GcpQueue.to_queue_message(cloud_event)
+    if publish_mode != "async":
+        queue.publish(queue_message.topic, message, **kwargs)
+        return None
+
+    # The client batches messages per topic and publishes them from its own threads.
+    future = _get_publisher().publish(queue_message.topic, message, **kwargs)
+    with _publisher_lock:
+        _outstanding.add(future)
+    future.add_done_callback(
+        partial(_published, current_app._get_current_object(), queue_message.topic, queue_message.ordering_key)
+    )
+    return future
+
+
+@dataclass
+class OutboxRelayResult:
+    """Counts of a relay run and the messages it dead lettered."""
+
+    published: int = 0
+    failed: int = 0
+    dead_lettered: list[dict] = field(default_factory=list)
+
+
+def relay_outbox(batch_size: int | None = None, publish: Callable | None = None) -> OutboxRelayResult:
+    """Publish a batch of committed outbox messages.
+
+    The batch is claimed and committed first, so no row locks are held while publishing. Delivery is at least once:
+    a message is marked published after the publish call returns, so a crash in between sends it again with the same
+    event id once the claim expires. A message that runs out of attempts is dead lettered and holds back the rest of
+    its ordering key. publish defaults to the queue, tests pass a local stand-in.
+    """
+    config = current_app.config
+    publish = publish or queue.publish
+    max_attempts = config.get("QUEUE_OUTBOX_MAX_ATTEMPTS", 10)
+    claim_expired_before = datetime.now(tz=UTC) - timedelta(seconds=config.get("QUEUE_OUTBOX_CLAIM_SECONDS", 300))
+    messages = [
+        (
+            message.id,
+            message.topic,
+            message.attempts,
+            GcpQueue.to_queue_message(
+                _to_cloud_event(
+                    message.source,
+                    message.message_type,
+                    message.payload,
+                    event_id=message.event_id,
+                    event_time=message.created_on.replace(tzinfo=UTC),
+                )
+            ),
+            _publish_kwargs(message.ordering_key, message.corp_type),
+        )
+        for message in QueueOutboxModel.claim_pending(
+            batch_size or config.get("QUEUE_OUTBOX_BATCH_SIZE", 500), claim_expired_before
+        )
+    ]
+    db.session.commit()
+
+    result = OutboxRelayResult()
+    published_ids = []
+    for message_id, topic, attempts, queue_message, kwargs in messages:
+        try:
+            # Only reached when a relay died holding the claim on the last attempt.
+            if attempts > max_attempts:
+                raise RuntimeError(f"Claimed {attempts} times without being published.")
+            publish(topic, queue_message, **kwargs)
+            published_ids.append(message_id)
+            result.published += 1
+        except Exception as e:  # NOQA # pylint: disable=broad-except
+            current_app.logger.warning(f"Outbox message {message_id} to {topic} failed to publish: {e}")
+            dead_letter = attempts >= max_attempts
+            QueueOutboxModel.mark_failed(message_id, str(e)[:1000], dead_letter)
+            result.failed += 1
+            if dead_letter:
+                current_app.logger.error(
+                    f"Outbox message {message_id} to {topic} dead lettered after {attempts} attempts."
+                )
+                result.dead_lettered.append({"error": f"Outbox message {message_id} to {topic}: {e}"})
+    if published_ids:
+        QueueOutboxModel.mark_published(published_ids)
+    db.session.commit()
+    return result
+
+
+def flush(futures: list[Future] | None = None, timeout: float | None = None) -> list[Exception]:
+    """Wait for queued messages to be published, all outstanding messages when no futures are given.
+
+    Returns the publish errors, failed publishes are also logged as they complete.
+    """
+    if futures is None:
+        with _publisher_lock:
+            futures = list(_outstanding)
+    if not futures:
+        return []
+    if timeout is None:
+        timeout = current_app.config.get("QUEUE_PUBLISH_FLUSH_TIMEOUT_SECONDS", 30)
+    done, not_done = wait(futures, timeout=timeout)
+    if not_done:
+        current_app.logger.warning(f"{len(not_done)} queue messages still publishing after {timeout}s.")
+    return [future.exception() for future in done if not future.cancelled() and future.exception()]
+
+
+def shutdown():
+    """Publish the batched messages and stop the publisher, registered to run when the process exits."""
+    global _publisher  # pylint: disable=global-statement
+    with _publisher_lock:
+        publisher, _publisher = _publisher, None
+    if publisher:
+        publisher.stop()
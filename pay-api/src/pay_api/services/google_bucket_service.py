@@ -62,6 +62,12 @@ class GoogleBucketService:
             file_paths.append(target_path)
         return file_paths
 
+    @staticmethod
+    def get_blobs_from_bucket_folder(bucket: storage.Bucket, folder_name: str) -> list[storage.Blob]:
+        """Get the blobs in a Google bucket folder without downloading them."""
+        current_app.logger.info(f"Listing blobs in bucket folder {folder_name}.")
+        return [blob for blob in bucket.list_blobs(prefix=f"{folder_name}/") if not blob.name.endswith("/")]
+
     @staticmethod
     def get_file_bytes_from_bucket_folder(bucket, folder_name, file_name: str):
         """Get file bytes from Google bucket."""
@@ -710,22 +710,25 @@ class Invoice:  # pylint: disable=too-many-instance-attributes,too-many-public-m
             created_from, created_to = get_first_and_last_dates_of_month(month=month, year=year)
 
         if created_from and created_to:
-            tz_name = current_app.config["LEGISLATIVE_TIMEZONE"]
-            tz_local = pytz.timezone(tz_name)
-
-            # Strip tzinfo before localizing (get_first_and_last_dates_of_month returns tz-aware)
-            naive_start = created_from.replace(tzinfo=None, hour=0, minute=0, second=0, microsecond=0)
-            naive_end = created_to.replace(tzinfo=None, hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
-
-            local_start = tz_local.localize(naive_start, is_dst=True)
-            local_end = tz_local.localize(naive_end, is_dst=True)
-
-            utc_start = local_start.astimezone(pytz.UTC)
-            utc_end = local_end.astimezone(pytz.UTC)
-
+            utc_start, utc_end = cls.get_utc_range_for_local_dates(created_from, created_to)
             query = query.filter(
                 InvoiceModel.created_on >= utc_start,
                 InvoiceModel.created_on < utc_end,
             )
 
         return query
+
+    @staticmethod
+    def get_utc_range_for_local_dates(created_from: datetime, created_to: datetime) -> tuple[datetime, datetime]:
+        """Return the UTC [start, end) range covering the local (legislative timezone) days created_from to created_to."""
+        tz_name = current_app.config["LEGISLATIVE_TIMEZONE"]
+        tz_local = pytz.timezone(tz_name)
+
+        # Strip tzinfo before localizing (get_first_and_last_dates_of_month returns tz-aware)
+        naive_start = created_from.replace(tzinfo=None, hour=0, minute=0, second=0, microsecond=0)
+        naive_end = created_to.replace(tzinfo=None, hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+        local_start = tz_local.localize(naive_start, is_dst=True)
+        local_end = tz_local.localize(naive_end, is_dst=True)
+
+        return local_start.astimezone(pytz.UTC), local_end.astimezone(pytz.UTC)
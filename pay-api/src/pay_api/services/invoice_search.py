@@ -14,12 +14,12 @@
 """Service to support invoice searches."""
 
 from collections import defaultdict
-from datetime import datetime
+from datetime import date, datetime
 
 from dateutil import parser
 from flask import current_app
-from sqlalchemy import String, and_, cast, exists, func, or_, select
-from sqlalchemy.orm import contains_eager, joinedload, lazyload, load_only, noload, with_expression
+from sqlalchemy import String, and_, case, cast, exists, func, or_, select, true
+from sqlalchemy.orm import contains_eager, joinedload, lazyload, load_only, noload
 
 from pay_api.exceptions import BusinessException
 from pay_api.models import (
@@ -36,13 +36,7 @@ from pay_api.models import (
     db,
 )
 from pay_api.models.payment import TransactionSearchParams
-from pay_api.models.search.invoice_composite_model import (
-    InvoiceCompositeModel,
-    get_full_refundable_expr,
-    get_latest_refund_id_expr,
-    get_latest_refund_status_expr,
-    get_partial_refundable_expr,
-)
+from pay_api.models.search.invoice_composite_model import InvoiceCompositeModel
 from pay_api.models.statement import Statement
 from pay_api.services.auth import get_account_info_with_contact
 from pay_api.services.invoice import Invoice as InvoiceService
@@ -98,6 +92,8 @@ class InvoiceSearch:
                 InvoiceCompositeModel.disbursement_date,
                 InvoiceCompositeModel.disbursement_reversal_date,
                 InvoiceCompositeModel.overdue_date,
+                InvoiceCompositeModel.latest_refund_id,
+                InvoiceCompositeModel.latest_refund_status,
             ),
             contains_eager(InvoiceCompositeModel.payment_line_items)
             .load_only(
@@ -121,10 +117,6 @@ class InvoiceSearch:
                 InvoiceReference.reference_number,
                 InvoiceReference.status_code,
             ),
-            with_expression(InvoiceCompositeModel.latest_refund_id, get_latest_refund_id_expr()),
-            with_expression(InvoiceCompositeModel.latest_refund_status, get_latest_refund_status_expr()),
-            with_expression(InvoiceCompositeModel.full_refundable, get_full_refundable_expr()),
-            with_expression(InvoiceCompositeModel.partial_refundable, get_partial_refundable_expr()),
         ]
 
         if include_credits_and_partial_refunds:
@@ -453,6 +445,8 @@ class InvoiceSearch:
                 return query
             purchases = query.all()
             data["total"] = count
+        if bool(search_filter.get("includeTotals")):
+            data["totals"] = cls.get_invoices_totals_from_db(search_params.auth_account_id, search_filter)
         data = cls.create_payment_report_details(purchases, data)
         current_app.logger.debug(">search_purchase_history")
         return data
@@ -516,6 +510,8 @@ class InvoiceSearch:
             "paid": 0,
             "due": 0,
         }
+        # Parse the statement boundary once, rather than once per invoice.
+        statement_to_date = parser.parse(statement.get("to_date", "")) if statement else None
 
         for invoice in invoices:
             invoice["created_on"] = get_local_formatted_date(parser.parse(invoice["created_on"]))
@@ -537,20 +533,74 @@ class InvoiceSearch:
                 if paid == 0 and refund > 0:
                     totals["due"] -= refund
             elif payment_method == PaymentMethod.EFT.value:
-                if payment_date and parser.parse(payment_date) <= parser.parse(statement.get("to_date", "")):
+                if payment_date and parser.parse(payment_date) <= statement_to_date:
                     totals["due"] -= paid
                     totals["paid"] += paid
                 # Scenario where payment was refunded, paid $0, refund = invoice total
-                if (
-                    paid == 0
-                    and refund > 0
-                    and refund_date
-                    and parser.parse(refund_date) <= parser.parse(statement.get("to_date", ""))
-                ):
+                if paid == 0 and refund > 0 and refund_date and parser.parse(refund_date) <= statement_to_date:
                     totals["due"] -= refund
 
         return totals
 
+    @classmethod
+    def get_invoices_totals_from_db(
+        cls, auth_account_id: str, search_filter: dict, statement_to_date: date | datetime = None
+    ) -> dict:
+        """Tally up totals for the invoices matching a search filter using a single aggregate query.
+
+        Mirrors get_invoices_totals: EFT payments and refunds only count when they fall on or before the
+        statement to date, everything else counts as soon as it is paid or refunded.
+        """
+        invoice_ids_subq = (
+            cls.filter(db.session.query(Invoice.id), auth_account_id, search_filter, include_joins=True)
+            .distinct()
+            .subquery()
+        )
+        total = func.coalesce(Invoice.total, 0)
+        service_fees = func.coalesce(Invoice.service_fees, 0)
+        paid = func.coalesce(Invoice.paid, 0)
+        refund = func.coalesce(Invoice.refund, 0)
+
+        paid_counted = Invoice.payment_method_code != PaymentMethod.EFT.value
+        refund_counted = Invoice.payment_method_code != PaymentMethod.EFT.value
+        if statement_to_date is None:
+            paid_counted = refund_counted = true()
+        else:
+            # Same boundary as the python tally, a statement to date is parsed to midnight at the start of the day.
+            counted_until = (
+                statement_to_date
+                if isinstance(statement_to_date, datetime)
+                else datetime.combine(statement_to_date, datetime.min.time())
+            )
+            paid_counted = or_(
+                paid_counted,
+                and_(Invoice.payment_date.isnot(None), Invoice.payment_date <= counted_until),
+            )
+            refund_counted = or_(
+                refund_counted,
+                and_(Invoice.refund_date.isnot(None), Invoice.refund_date <= counted_until),
+            )
+        counted_paid = func.sum(case((paid_counted, paid), else_=0))
+        counted_refund = func.sum(case((and_(paid == 0, refund > 0, refund_counted), refund), else_=0))
+
+        row = (
+            db.session.query(
+                func.coalesce(func.sum(total), 0).label("fees"),
+                func.coalesce(func.sum(service_fees), 0).label("service_fees"),
+                func.coalesce(counted_paid, 0).label("paid"),
+                func.coalesce(counted_refund, 0).label("refund"),
+            )
+            .join(invoice_ids_subq, invoice_ids_subq.c.id == Invoice.id)
+            .one()
+        )
+        return {
+            "statutoryFees": row.fees - row.service_fees,
+            "serviceFees": row.service_fees,
+            "fees": row.fees,
+            "paid": row.paid,
+            "due": row.fees - row.paid - row.refund,
+        }
+
     @staticmethod
     @user_context
     def generate_payment_report(report_inputs: PaymentReportInput, **kwargs):  # noqa: ARG004 pylint: disable=too-many-locals,unused-argument
@@ -48,8 +48,9 @@ class OAuthService:
         auth_header_name: str = "Authorization",
         stream: bool = False,
         gzip_body: bool = False,
+        session: requests.Session = None,
     ):
-        """POST service."""
+        """POST service, pass a session to reuse pooled connections across calls."""
         current_app.logger.debug("<post")
 
         headers = {
@@ -77,8 +78,9 @@ class OAuthService:
         current_app.logger.debug(f"data : {data}")
         response = None
         try:
+            requester = session or requests
             if is_put:
-                response = requests.put(
+                response = requester.put(
                     endpoint,
                     data=data,
                     headers=headers,
@@ -86,7 +88,7 @@ class OAuthService:
                     timeout=current_app.config.get("CONNECT_TIMEOUT"),
                 )
             else:
-                response = requests.post(
+                response = requester.post(
                     endpoint,
                     data=data,
                     headers=headers,
@@ -147,8 +149,9 @@ class OAuthService:
         return_none_if_404: bool = False,
         additional_headers: dict = None,
         auth_header_name: str = "Authorization",
+        session: requests.Session = None,
     ):
-        """GET service."""
+        """GET service, pass a session to reuse pooled connections across calls, its adapters are left as mounted."""
         current_app.logger.debug("<GET")
 
         headers = {
@@ -164,9 +167,10 @@ class OAuthService:
         safe_headers.pop("Pay-Connector", None)
         current_app.logger.debug(f"Endpoint : {endpoint}")
         current_app.logger.debug(f"headers : {safe_headers}")
-        session = requests.Session()
-        if retry_on_failure:
-            session.mount(endpoint, RETRY_ADAPTER)
+        if session is None:
+            session = requests.Session()
+            if retry_on_failure:
+                session.mount(endpoint, RETRY_ADAPTER)
         response = None
         try:
             response = session.get(
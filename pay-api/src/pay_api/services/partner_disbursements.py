@@ -5,6 +5,7 @@ from datetime import UTC, datetime
 from flask import current_app
 
 from pay_api.models.corp_type import CorpType as CorpTypeModel
+from pay_api.models.db import db
 from pay_api.models.invoice import Invoice as InvoiceModel
 from pay_api.models.partner_disbursements import PartnerDisbursements as PartnerDisbursementsModel
 from pay_api.models.refunds_partial import RefundsPartial as RefundsPartialModel
@@ -15,13 +16,29 @@ class PartnerDisbursements:
     """Partner Disbursements service."""
 
     @staticmethod
-    def _skip_partner_disbursement(invoice: InvoiceModel) -> bool:
+    def _skip_partner_disbursement(invoice: InvoiceModel, corp_types: dict[str, CorpTypeModel] = None) -> bool:
         """Determine if partner disbursement should be skipped."""
         if invoice.payment_method_code in [PaymentMethod.INTERNAL.value, PaymentMethod.DRAWDOWN.value]:
             return True
-        return (
-            invoice.total - invoice.service_fees <= 0
-            or bool(CorpTypeModel.find_by_code(invoice.corp_type_code).has_partner_disbursements) is False
+        if invoice.total - invoice.service_fees <= 0:
+            return True
+        # Callers handling many invoices pass a dict so each corp type is only looked up once.
+        corp_types = {} if corp_types is None else corp_types
+        if invoice.corp_type_code not in corp_types:
+            corp_types[invoice.corp_type_code] = CorpTypeModel.find_by_code(invoice.corp_type_code)
+        return bool(corp_types[invoice.corp_type_code].has_partner_disbursements) is False
+
+    @staticmethod
+    def _payment_disbursement(invoice: InvoiceModel) -> PartnerDisbursementsModel:
+        """Return the partner disbursement row for a paid invoice."""
+        service_fee_gst = sum(pli.service_fees_gst for pli in invoice.payment_line_items)
+        return PartnerDisbursementsModel(
+            amount=invoice.total - invoice.service_fees - service_fee_gst,
+            is_reversal=False,
+            partner_code=invoice.corp_type_code,
+            status_code=DisbursementStatus.WAITING_FOR_JOB.value,
+            target_id=invoice.id,
+            target_type=EJVLinkType.INVOICE.value,
         )
 
     @staticmethod
@@ -35,20 +52,32 @@ class PartnerDisbursements:
         )
 
         if latest_active_disbursement is None or latest_active_disbursement.is_reversal:
-            service_fee_gst = sum(pli.service_fees_gst for pli in invoice.payment_line_items)
-            PartnerDisbursementsModel(
-                amount=invoice.total - invoice.service_fees - service_fee_gst,
-                is_reversal=False,
-                partner_code=invoice.corp_type_code,
-                status_code=DisbursementStatus.WAITING_FOR_JOB.value,
-                target_id=invoice.id,
-                target_type=EJVLinkType.INVOICE.value,
-            ).flush()
+            PartnerDisbursements._payment_disbursement(invoice).flush()
         else:
             # If this was already called at invoice creation, it might be called again when mapping credits.
             # If we're mapping credits after invoice creation, we don't want to create a new row.
             current_app.logger.info(f"Skipping Partner Disbursement Payment creation for {invoice.id} already exists.")
 
+    @staticmethod
+    def handle_payments(invoices: list[InvoiceModel]):
+        """Insert partner disbursement rows for many paid invoices, looking up corp types and disbursements once."""
+        corp_types = {}
+        invoices = [
+            invoice for invoice in invoices if not PartnerDisbursements._skip_partner_disbursement(invoice, corp_types)
+        ]
+        latest_active_disbursements = PartnerDisbursementsModel.find_latest_by_targets_exclude_cancelled(
+            [invoice.id for invoice in invoices], EJVLinkType.INVOICE.value
+        )
+        for invoice in invoices:
+            latest_active_disbursement = latest_active_disbursements.get(invoice.id)
+            if latest_active_disbursement is None or latest_active_disbursement.is_reversal:
+                db.session.add(PartnerDisbursements._payment_disbursement(invoice))
+            else:
+                current_app.logger.info(
+                    f"Skipping Partner Disbursement Payment creation for {invoice.id} already exists."
+                )
+        db.session.flush()
+
     @staticmethod
     def handle_reversal(invoice: InvoiceModel):
         """Cancel existing row or insert new row if non reversal is found."""
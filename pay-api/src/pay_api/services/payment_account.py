@@ -74,17 +74,21 @@ class PaymentDetails:
 class PaymentAccount:  # pylint: disable=too-many-instance-attributes, too-many-public-methods
     """Service to manage Payment Account model related operations."""
 
+    # Service attribute -> CFS account attribute, resolved from the effective CFS account on first access.
+    _CFS_FIELDS = {
+        "cfs_account": "cfs_account",
+        "cfs_party": "cfs_party",
+        "cfs_site": "cfs_site",
+        "bank_number": "bank_number",
+        "bank_branch_number": "bank_branch_number",
+        "bank_account_number": "bank_account_number",
+        "cfs_account_id": "id",
+        "cfs_account_status": "status",
+    }
+
     def __init__(self):
         """Initialize service."""
         self.__dao = None
-        self.cfs_account: str = None
-        self.cfs_party: str = None
-        self.cfs_site: str = None
-        self.bank_number: str = None
-        self.bank_branch_number: str = None
-        self.bank_account_number: str = None
-        self.cfs_account_id: int = None
-        self.cfs_account_status: str = None
 
     @property
     def _dao(self):
@@ -95,22 +99,28 @@ class PaymentAccount:  # pylint: disable=too-many-instance-attributes, too-many-
     @_dao.setter
     def _dao(self, value: PaymentAccountModel):
         self.__dao = value
-        if not hasattr(self.__dao, "id"):
-            return
-        cfs_account = CfsAccountModel.find_effective_by_payment_method(self.__dao.id, self.__dao.payment_method)
-        if not cfs_account:
-            return
-        self.cfs_account: str = cfs_account.cfs_account
-        self.cfs_party: str = cfs_account.cfs_party
-        self.cfs_site: str = cfs_account.cfs_site
-        self.bank_number: str = cfs_account.bank_number
-        self.bank_branch_number: str = cfs_account.bank_branch_number
-        self.bank_account_number: str = cfs_account.bank_account_number
-        self.cfs_account_id: int = cfs_account.id
-        self.cfs_account_status: str = cfs_account.status
+        # Drop CFS details resolved for a previous account, they are looked up again when first used.
+        for name in self._CFS_FIELDS:
+            self.__dict__.pop(name, None)
+
+    def _set_cfs_fields(self, cfs_account: CfsAccountModel | None):
+        """Set the CFS details from the effective CFS account, without overriding values set explicitly."""
+        for name, cfs_name in self._CFS_FIELDS.items():
+            self.__dict__.setdefault(name, getattr(cfs_account, cfs_name) if cfs_account else None)
+
+    def _get_cfs_field(self, name):
+        """Look up the effective CFS account once and keep its details on this instance."""
+        account_id = self._dao.id
+        if account_id is None:
+            # Not saved yet, a CFS account can't exist so don't keep the empty value.
+            return None
+        self._set_cfs_fields(CfsAccountModel.find_effective_by_payment_method(account_id, self._dao.payment_method))
+        return self.__dict__[name]
 
     def __getattr__(self, name):
         """Dynamic way of getting the properties from the DAO, anything not in __init__."""
+        if name in PaymentAccount._CFS_FIELDS:
+            return self._get_cfs_field(name)
         if hasattr(self._dao, name):
             return getattr(self._dao, name)
         raise AttributeError(f"Attribute {name} not found.")
@@ -511,23 +521,46 @@ class PaymentAccount:  # pylint: disable=too-many-instance-attributes, too-many-
         statement_settings_model.save()
 
     @classmethod
-    def find_account(cls, authorization: dict[str, Any]) -> PaymentAccount | None:
+    def find_account(cls, authorization: dict[str, Any], with_cfs_account: bool = False) -> PaymentAccount | None:
         """Find payment account by corp number, corp type and payment system code."""
         current_app.logger.debug("<find_payment_account")
         auth_account_id: str = get_str_by_path(authorization, "account/paymentAccountId") or get_str_by_path(
             authorization, "account/id"
         )
-        return PaymentAccount.find_by_auth_account_id(auth_account_id)
+        return PaymentAccount.find_by_auth_account_id(auth_account_id, with_cfs_account=with_cfs_account)
 
     @classmethod
-    def find_by_auth_account_id(cls, auth_account_id: str) -> PaymentAccount:
-        """Find payment account by corp number, corp type and payment system code."""
+    def find_by_auth_account_id(cls, auth_account_id: str, with_cfs_account: bool = False) -> PaymentAccount:
+        """Find payment account by corp number, corp type and payment system code.
+
+        with_cfs_account loads the effective CFS account in the same query, for callers that need the CFS details.
+        """
         current_app.logger.debug("<find_by_auth_account_id")
-        payment_account: PaymentAccountModel = PaymentAccountModel.find_by_auth_account_id(auth_account_id)
+        cfs_account = None
+        if with_cfs_account:
+            row = (
+                db.session.query(PaymentAccountModel, CfsAccountModel)
+                .outerjoin(
+                    CfsAccountModel,
+                    and_(
+                        CfsAccountModel.account_id == PaymentAccountModel.id,
+                        # Same match as find_effective_by_payment_method, which treats a missing method as IS NULL.
+                        CfsAccountModel.payment_method.is_not_distinct_from(PaymentAccountModel.payment_method),
+                        CfsAccountModel.status != CfsAccountStatus.INACTIVE.value,
+                    ),
+                )
+                .filter(PaymentAccountModel.auth_account_id == str(auth_account_id))
+                .one_or_none()
+            )
+            payment_account, cfs_account = row if row else (None, None)
+        else:
+            payment_account: PaymentAccountModel = PaymentAccountModel.find_by_auth_account_id(auth_account_id)
         p = None
         if payment_account:
             p = PaymentAccount()
             p._dao = payment_account  # pylint: disable=protected-access
+            if with_cfs_account:
+                p._set_cfs_fields(cfs_account)  # pylint: disable=protected-access
             current_app.logger.debug(">find_payment_account")
         return p
 
@@ -13,18 +13,23 @@
 # limitations under the License.
 """Service to manage Payment Line Items."""
 
+from __future__ import annotations
+
 from decimal import Decimal
+from typing import TYPE_CHECKING
 
 from flask import current_app
 
 from pay_api.exceptions import BusinessException
 from pay_api.models import DistributionCode as DistributionCodeModel
 from pay_api.models import PaymentLineItem as PaymentLineItemModel
-from pay_api.services.fee_schedule import FeeSchedule
 from pay_api.utils.enums import LineItemStatus, Role
 from pay_api.utils.errors import Error
 from pay_api.utils.user_context import UserContext, user_context
 
+if TYPE_CHECKING:
+    from pay_api.services.fee_schedule import FeeSchedule
+
 
 class PaymentLineItem:  # pylint: disable=too-many-instance-attributes, too-many-public-methods
     """Service to manage Payment Line Item operations."""
@@ -289,9 +294,52 @@ class PaymentLineItem:  # pylint: disable=too-many-instance-attributes, too-many
     def create(invoice_id: int, fee: FeeSchedule, **kwargs):
         """Create Payment Line Item record."""
         current_app.logger.debug("<create")
-        user: UserContext = kwargs["user"]
-        p = PaymentLineItem()
+        distribution_code = None
+        if PaymentLineItem._needs_distribution(fee):
+            distribution_code = DistributionCodeModel.find_by_active_for_fee_schedule(fee.fee_schedule_id)
+        p = PaymentLineItem._build(fee, distribution_code, kwargs["user"])
         p.invoice_id = invoice_id
+        p_dao = p.flush()
+
+        p = PaymentLineItem()
+        p._dao = p_dao  # pylint: disable=protected-access
+
+        # Set distribution model to avoid more queries to DB
+        p.fee_distribution = distribution_code
+        current_app.logger.debug(">create")
+        return p
+
+    @staticmethod
+    @user_context
+    def create_all(invoice_dao, fees: list[FeeSchedule], **kwargs) -> list[PaymentLineItem]:
+        """Create the line items of a new invoice, inserted together with the invoice in one flush."""
+        distribution_codes = DistributionCodeModel.find_active_by_fee_schedule_ids(
+            {fee.fee_schedule_id for fee in fees if PaymentLineItem._needs_distribution(fee)}
+        )
+        built = [
+            PaymentLineItem._build(fee, distribution_codes.get(fee.fee_schedule_id), kwargs["user"]) for fee in fees
+        ]
+        # The invoice and its line items are inserted by a single flush, the line items in one batched statement.
+        invoice_dao.payment_line_items = [p._dao for p in built]  # pylint: disable=protected-access
+        invoice_dao.flush()
+
+        line_items = []
+        for p in built:
+            line_item = PaymentLineItem()
+            line_item._dao = p._dao  # pylint: disable=protected-access
+            line_item.fee_distribution = p.fee_distribution
+            line_items.append(line_item)
+        return line_items
+
+    @staticmethod
+    def _needs_distribution(fee: FeeSchedule) -> bool:
+        """Return True when the line item for the fee carries money that needs a distribution code."""
+        return fee.total_excluding_service_fees > 0 or fee.service_fees > 0
+
+    @staticmethod
+    def _build(fee: FeeSchedule, distribution_code: DistributionCodeModel, user: UserContext) -> PaymentLineItem:
+        """Return an unsaved line item for the fee."""
+        p = PaymentLineItem()
         p.total = fee.total_excluding_service_fees
         p.fee_schedule_id = fee.fee_schedule_id
         p.description = fee.description
@@ -307,25 +355,15 @@ class PaymentLineItem:  # pylint: disable=too-many-instance-attributes, too-many
         p.statutory_fees_gst = fee.statutory_fees_gst
 
         # Set distribution details to line item
-        distribution_code = None
         if p.total > 0 or p.service_fees > 0:
-            distribution_code = DistributionCodeModel.find_by_active_for_fee_schedule(fee.fee_schedule_id)
             p.fee_distribution_id = distribution_code.distribution_code_id
+            p.fee_distribution = distribution_code
 
         if fee.waived_fee_amount > 0:
             if user.has_role(Role.STAFF.value):
                 p.waived_by = user.user_name
             else:
                 raise BusinessException(Error.FEE_OVERRIDE_NOT_ALLOWED)
-
-        p_dao = p.flush()
-
-        p = PaymentLineItem()
-        p._dao = p_dao  # pylint: disable=protected-access
-
-        # Set distribution model to avoid more queries to DB
-        p.fee_distribution = distribution_code
-        current_app.logger.debug(">create")
         return p
 
     @staticmethod
@@ -13,8 +13,10 @@
 # limitations under the License.
 """Service class to control all the operations related to Payment."""
 
+import hashlib
+import json
 import uuid
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from decimal import Decimal
 from threading import Thread
 from typing import Any
@@ -25,6 +27,8 @@ from pay_api.exceptions import BusinessException
 from pay_api.factory.payment_system_factory import PaymentSystemFactory
 from pay_api.models import CfsAccount as CfsAccountModel
 from pay_api.models import PaymentAccount as PaymentAccountModel
+from pay_api.models import PaymentRequestKey as PaymentRequestKeyModel
+from pay_api.models import db
 from pay_api.models.receipt import Receipt
 from pay_api.services.code import Code as CodeService
 from pay_api.services.direct_sale_service import STATUS_PAID, DirectSaleService
@@ -68,12 +72,14 @@ class PaymentService:  # pylint: disable=too-few-public-methods
             2.1 If yes, use the one from database.
             2.2 Else create one in payment system and update database.
         3. Create payment record in database and flush.
-        4. Create invoice record in database and flush.
-        5. Create payment line items in database and flush.
-        6. Create invoice in payment system;
-            6.1 If successful update the invoice table with references from payment system.
-                6.1.1 If failed adjust the invoice to zero and roll back the transaction.
-            6.2 If fails rollback the transaction
+        4. Create invoice and payment line item records in database with a single flush.
+        5. Create invoice in payment system;
+            5.1 If successful update the invoice table with references from payment system.
+                5.1.1 If failed adjust the invoice to zero and roll back the transaction.
+            5.2 If fails rollback the transaction
+        6. Return the invoice serialized from the session, without reloading it.
+
+        A retry of a request, matched by its Idempotency-Key or fingerprint, returns the invoice already created.
         """
         business_info = payment_request.get("businessInfo")
         filing_info = payment_request.get("filingInfo")
@@ -83,6 +89,10 @@ class PaymentService:  # pylint: disable=too-few-public-methods
         business_identifier = business_info.get("businessIdentifier")
 
         payment_account = cls._find_payment_account(authorization)
+        request_key = cls._get_request_key(payment_request, payment_account, kwargs.get("idempotency_key"))
+        request_hash = cls._get_request_hash(payment_request) if request_key else None
+        if request_key and (original_invoice := cls._find_invoice_for_request_key(request_key, request_hash)):
+            return original_invoice
         # Note this can change after PaymentSystemFactory.create depending on role.
         initial_payment_method = _get_payment_method(payment_request, payment_account)
         bcol_account = cls._get_bcol_account(account_info, payment_account)
@@ -140,11 +150,16 @@ class PaymentService:  # pylint: disable=too-few-public-methods
             if not details or details == "null":
                 details = []
             invoice.details = details
-            invoice = invoice.flush()
-
-            line_items = []
-            for fee in fees:
-                line_items.append(PaymentLineItem.create(invoice.id, fee))
+            invoice = invoice._dao  # pylint: disable=protected-access
+            line_items = PaymentLineItem.create_all(invoice, fees)
+            if request_key and not PaymentRequestKeyModel.claim(
+                request_key, request_hash, invoice.id, cls._request_key_created_after()
+            ):
+                # Another attempt of this request created its invoice first, this one waited for it to commit.
+                invoice.rollback()
+                if original_invoice := cls._find_invoice_for_request_key(request_key, request_hash):
+                    return original_invoice
+                raise BusinessException(Error.PAYMENT_REQUEST_IN_PROGRESS)
 
             current_app.logger.info(f"Handing off to payment system to create invoice for {invoice.id}")
             invoice_reference = pay_service.create_invoice(
@@ -154,9 +169,17 @@ class PaymentService:  # pylint: disable=too-few-public-methods
                 corp_type_code=invoice.corp_type_code,
             )
 
-            cls._handle_invoice(invoice, invoice_reference, pay_service, skip_payment)
-
-            invoice = Invoice.find_by_id(invoice.id, skip_auth_check=True)
+            session = db.session()
+            expire_on_commit = session.expire_on_commit
+            # The response is serialized from the objects in the session instead of reloading them after commit.
+            session.expire_on_commit = False
+            try:
+                cls._handle_invoice(invoice, invoice_reference, pay_service, skip_payment)
+            finally:
+                session.expire_on_commit = expire_on_commit
+            # Receipts and references are created against the invoice id rather than through these collections.
+            session.refresh(invoice, ["receipts", "references"])
+            invoice = Invoice.populate(invoice)
 
         except Exception as e:  # NOQA pylint: disable=broad-except
             if payment_method_code != PaymentMethod.DRAWDOWN.value or (
@@ -176,6 +199,52 @@ class PaymentService:  # pylint: disable=too-few-public-methods
 
         return invoice.asdict(include_dynamic_fields=True)
 
+    @classmethod
+    def _get_request_key(
+        cls, payment_request: dict[str, Any], payment_account: PaymentAccount, idempotency_key: str = None
+    ) -> str | None:
+        """Return the key retries of the payment request share, from the Idempotency-Key or a request fingerprint."""
+        if not current_app.config.get("PAYMENT_REQUEST_KEY_TTL"):
+            return None
+        filing_identifier = get_str_by_path(payment_request, "filingInfo/filingIdentifier")
+        if idempotency_key:
+            key_parts = {"account": payment_account.id, "idempotencyKey": idempotency_key}
+        elif filing_identifier and current_app.config.get("PAYMENT_REQUEST_FINGERPRINT"):
+            key_parts = {
+                "account": payment_account.id,
+                "businessInfo": payment_request.get("businessInfo"),
+                "filingIdentifier": filing_identifier,
+                "filingTypes": get_str_by_path(payment_request, "filingInfo/filingTypes"),
+            }
+        else:
+            return None
+        return hashlib.sha256(json.dumps(key_parts, sort_keys=True, default=str).encode()).hexdigest()
+
+    @staticmethod
+    def _get_request_hash(payment_request: dict[str, Any]) -> str:
+        """Return the hash of the request body, so a key reused for a different request can be told apart."""
+        return hashlib.sha256(json.dumps(payment_request, sort_keys=True, default=str).encode()).hexdigest()
+
+    @staticmethod
+    def _request_key_created_after() -> datetime:
+        """Return the creation time after which a request key is still live."""
+        return datetime.now(tz=UTC) - timedelta(seconds=current_app.config.get("PAYMENT_REQUEST_KEY_TTL"))
+
+    @classmethod
+    def _find_invoice_for_request_key(cls, request_key: str, request_hash: str) -> dict | None:
+        """Return the invoice created for an earlier attempt of the request, if the key is still live.
+
+        A live key sent with a different request body is rejected instead of returning the other request's invoice.
+        """
+        if not (key := PaymentRequestKeyModel.find_live(request_key, cls._request_key_created_after())):
+            return None
+        if key.request_hash and key.request_hash != request_hash:
+            current_app.logger.info(f"Payment request key for invoice {key.invoice_id} reused for a different request.")
+            raise BusinessException(Error.PAYMENT_REQUEST_KEY_MISMATCH)
+        current_app.logger.info(f"Returning invoice {key.invoice_id} created by an earlier attempt of the request.")
+        # The key is scoped to the payment account, so the caller was authorized for the original request.
+        return Invoice.find_by_id(key.invoice_id, skip_auth_check=True).asdict(include_dynamic_fields=True)
+
     @classmethod
     def _handle_invoice(cls, invoice, invoice_reference, pay_service, skip_payment):
         """Handle invoice related operations."""
@@ -212,7 +281,7 @@ class PaymentService:  # pylint: disable=too-few-public-methods
     @classmethod
     def _find_payment_account(cls, authorization):
         # find payment account
-        payment_account = PaymentAccount.find_account(authorization)
+        payment_account = PaymentAccount.find_account(authorization, with_cfs_account=True)
 
         # If there is no payment_account it must be a request with no account (NR, Staff payment etc.)
         # and invoked using a service account or a staff token
@@ -240,36 +309,27 @@ class PaymentService:  # pylint: disable=too-few-public-methods
     @classmethod
     def _apply_credit(cls, invoice: Invoice):
         """Apply credit to invoice and update payment account for online banking only."""
-        credit_balance = Decimal("0")
-        payment_account = PaymentAccountModel.find_by_id_for_update(invoice.payment_account_id)
         invoice_balance = invoice.total - (invoice.paid or 0)
 
         cfs_account = CfsAccountModel.find_by_id(invoice.cfs_account_id)
         match cfs_account.payment_method:
             case PaymentMethod.ONLINE_BANKING.value:
-                available_credit = payment_account.ob_credit or 0
+                credit_field = "ob_credit"
             case _:
                 raise NotImplementedError(f"Payment method {cfs_account.payment_method} invalid Online Banking only.")
 
-        if available_credit >= invoice_balance:
+        # The credit is reserved without holding the account row lock for the rest of the transaction.
+        applied_credit = PaymentAccountModel.reserve_credit(invoice.payment_account_id, credit_field, invoice_balance)
+        if applied_credit >= invoice_balance:
             pay_service: PaymentSystemService = PaymentSystemFactory.create_from_payment_method(
                 invoice.payment_method_code
             )
             # Only release records, as the actual status change should happen during reconciliation in pay-queue.
             pay_service.apply_credit(invoice)
-            credit_balance = available_credit - invoice_balance
             invoice.paid = invoice.total
-            invoice.save()
-        elif available_credit <= invoice_balance:
-            invoice.paid = (invoice.paid or 0) + available_credit
-            invoice.save()
-
-        match cfs_account.payment_method:
-            case PaymentMethod.ONLINE_BANKING.value:
-                payment_account.ob_credit = credit_balance
-            case _:
-                raise NotImplementedError(f"Payment method {cfs_account.payment_method} invalid Online Banking only.")
-        payment_account.save()
+        else:
+            invoice.paid = (invoice.paid or 0) + applied_credit
+        invoice.save()
 
     @classmethod
     def _convert_invoice_to_credit_card(cls, invoice: Invoice, payment_request: tuple[dict[str, Any]]):
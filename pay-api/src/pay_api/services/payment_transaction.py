@@ -16,7 +16,9 @@
 from __future__ import annotations
 
 import uuid  # noqa: TC003
+from concurrent.futures import Future  # noqa: TC003
 from datetime import UTC, datetime
+from functools import partial
 
 from flask import current_app
 from sbc_common_components.utils.enums import QueueMessageTypes
@@ -392,8 +394,10 @@ class PaymentTransaction:  # pylint: disable=too-many-instance-attributes, too-m
         return False
 
     @staticmethod
-    def update_transaction(transaction_id: uuid, pay_response_url: str):  # pylint: disable=too-many-locals
-        """Update transaction record.
+    def update_transaction(  # pylint: disable=too-many-locals
+        transaction_id: uuid, pay_response_url: str, receipts: dict = None
+    ):
+        """Update transaction record, receipts resolved in a batch (DirectPayService.get_receipts) can be passed in.
 
         Does the following:
         1. Find the payment record with the id
@@ -428,11 +432,14 @@ class PaymentTransaction:  # pylint: disable=too-many-instance-attributes, too-m
                 transaction_dao.status_code = TransactionStatus.COMPLETED.value
 
                 # Publish status to Queue
+                futures = []
                 for invoice in invoices:
                     current_app.logger.info(f"Publishing stale payment for Invoice {invoice.id}.")
-                    PaymentTransaction.publish_status(transaction_dao, invoice)
+                    futures.append(PaymentTransaction.publish_status(transaction_dao, invoice))
 
-                return PaymentTransaction.__wrap_dao(transaction_dao.save())
+                transaction_dao = transaction_dao.save()
+                PaymentTransaction._mark_event_failed_on_error(transaction_dao.id, futures)
+                return PaymentTransaction.__wrap_dao(transaction_dao)
 
             raise BusinessException(Error.COMPLETED_PAYMENT)
 
@@ -443,7 +450,10 @@ class PaymentTransaction:  # pylint: disable=too-many-instance-attributes, too-m
         try:
             # This doesn't handle multiple receipts, a user could under directPay (CC - NSF flow)
             # EG. Just pay $1, which means it wont cover the entire balance.
-            receipt_details = pay_system_service.get_receipt(payment_account, pay_response_url, invoice_reference)
+            if receipts is not None and invoice_reference and invoice_reference.invoice_id in receipts:
+                receipt_details = receipts[invoice_reference.invoice_id]
+            else:
+                receipt_details = pay_system_service.get_receipt(payment_account, pay_response_url, invoice_reference)
             transaction_dao.pay_system_reason_code = None
         except ServiceUnavailableException as exc:
             txn_reason_code = exc.status
@@ -454,8 +464,9 @@ class PaymentTransaction:  # pylint: disable=too-many-instance-attributes, too-m
             current_app.logger.error(f"Exception while grabbing receipt: {str(exc)}", exc_info=True)
 
         current_app.logger.info(f"Receipt details for {payment.invoice_number} : {receipt_details}")
+        futures = []
         if receipt_details:
-            PaymentTransaction._update_receipt_details(invoices, payment, receipt_details, transaction_dao)
+            futures = PaymentTransaction._update_receipt_details(invoices, payment, receipt_details, transaction_dao)
         else:
             transaction_dao.status_code = TransactionStatus.FAILED.value
 
@@ -468,6 +479,8 @@ class PaymentTransaction:  # pylint: disable=too-many-instance-attributes, too-m
         transaction_dao.transaction_end_time = datetime.now(tz=UTC)
         transaction_dao.pay_response_url = pay_response_url
         transaction_dao = transaction_dao.save()
+        # Only after COMPLETED is committed, so a failed publish can't be overwritten by this save.
+        PaymentTransaction._mark_event_failed_on_error(transaction_dao.id, futures)
 
         # Publish message to unlock account if account is locked.
         if payment.payment_status_code == PaymentStatus.COMPLETED.value:
@@ -487,8 +500,9 @@ class PaymentTransaction:  # pylint: disable=too-many-instance-attributes, too-m
         return transaction
 
     @staticmethod
-    def _update_receipt_details(invoices, payment, receipt_details, transaction_dao):
-        """Update receipt details to invoice."""
+    def _update_receipt_details(invoices, payment, receipt_details, transaction_dao) -> list:
+        """Update receipt details to invoice, return the futures of the published status events."""
+        futures = []
         payment.paid_amount = receipt_details[2]
         payment.payment_date = datetime.now(tz=UTC)
         transaction_dao.status_code = TransactionStatus.COMPLETED.value
@@ -533,7 +547,8 @@ class PaymentTransaction:  # pylint: disable=too-many-instance-attributes, too-m
                         PaymentMethod.EFT.value,
                     ]:
                         current_app.logger.info(f"Release record for invoice : {invoice.id} ")
-                        PaymentTransaction.publish_status(transaction_dao, invoice)
+                        futures.append(PaymentTransaction.publish_status(transaction_dao, invoice))
+        return futures
 
     @staticmethod
     def __wrap_dao(transaction_dao):
@@ -570,20 +585,21 @@ class PaymentTransaction:  # pylint: disable=too-many-instance-attributes, too-m
         return data
 
     @staticmethod
-    def publish_status(transaction_dao: PaymentTransactionModel, invoice: Invoice):
-        """Publish payment/transaction status to the Queue."""
+    def publish_status(transaction_dao: PaymentTransactionModel, invoice: Invoice) -> Future | None:
+        """Publish payment/transaction status to the Queue, return the future when publishing asynchronously."""
         current_app.logger.debug("<publish_status")
         if transaction_dao.status_code == TransactionStatus.COMPLETED.value:
             if invoice.invoice_status_code == InvoiceStatus.PAID.value:
                 status_code = TransactionStatus.COMPLETED.value
             else:
                 current_app.logger.info(f"Status {invoice.invoice_status_code} received for invoice {invoice.id}")
-                return
+                return None
         else:
             status_code = "TRANSACTION_FAILED"
 
+        future = None
         try:
-            gcp_queue_publisher.publish_to_queue(
+            future = gcp_queue_publisher.publish_to_queue(
                 QueueMessage(
                     source=QueueSources.PAY_API.value,
                     message_type=QueueMessageTypes.PAYMENT.value,
@@ -601,6 +617,27 @@ class PaymentTransaction:  # pylint: disable=too-many-instance-attributes, too-m
             )
             transaction_dao.status_code = TransactionStatus.EVENT_FAILED.value
         current_app.logger.debug(">publish_status")
+        return future
+
+    @staticmethod
+    def _mark_event_failed_on_error(transaction_id: uuid.UUID, futures: list):
+        """Mark the saved transaction EVENT_FAILED when any of its async status events fails to publish."""
+        app = current_app._get_current_object()  # pylint: disable=protected-access
+        for future in futures:
+            if future:
+                future.add_done_callback(partial(PaymentTransaction._mark_event_failed, app, transaction_id))
+
+    @staticmethod
+    def _mark_event_failed(app, transaction_id: uuid.UUID, future: Future):
+        """Mark the transaction as EVENT_FAILED when its async published status event fails."""
+        if future.cancelled() or not (error := future.exception()):
+            return
+        with app.app_context():
+            current_app.logger.warning(
+                f"Notification to Queue failed, marking the transaction : {transaction_id} as EVENT_FAILED {error}"
+            )
+            if not PaymentTransactionModel.mark_event_failed(transaction_id):
+                current_app.logger.info(f"Transaction {transaction_id} is no longer COMPLETED, not marking it.")
 
     @staticmethod
     def _get_product_release_and_reversal_dates(invoice):
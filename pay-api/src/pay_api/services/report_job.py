@@ -0,0 +1,267 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Service to render long running reports outside of the HTTP request.
+
+A submitted report is recorded as a report job and rendered on a background thread, the output is stored in
+a Google bucket (or on the job row when no bucket is configured) and clients poll the job until it completes.
+Identical requests submitted while a job is still in flight share that job. A rendering job keeps a heartbeat,
+an in flight job whose heartbeat lapses (the instance was restarted or scaled in) is failed so it is re-submitted.
+"""
+
+import hashlib
+import json
+import threading
+import uuid
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+
+from flask import copy_current_request_context, current_app
+from sqlalchemy.exc import IntegrityError
+
+from pay_api.exceptions import BusinessException
+from pay_api.models import ReportJob as ReportJobModel
+from pay_api.models import db
+from pay_api.utils.enums import ReportJobStatus, Role
+from pay_api.utils.errors import Error
+from pay_api.utils.user_context import UserContext, user_context
+
+from .google_bucket_service import GoogleBucketService
+
+REPORT_JOB_FOLDER = "report-jobs"
+REPORT_JOB_ERROR_MESSAGE = "The report could not be generated, please try again."
+REPORT_JOB_LEASE_EXPIRED_MESSAGE = "The report job was interrupted, please try again."
+
+_executor = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Return the report job executor, created on first use so it picks up the configured worker count."""
+    global _executor  # pylint: disable=global-statement
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=current_app.config.get("REPORT_JOB_WORKERS", 4), thread_name_prefix="report-job"
+        )
+    return _executor
+
+
+class ReportJobService:
+    """Service to manage asynchronous report jobs."""
+
+    @staticmethod
+    def build_job_key(report_type: str, auth_account_id: str | None, content_type: str, params: dict) -> str:
+        """Return a fingerprint for a report request, used to de-duplicate in-flight jobs."""
+        payload = json.dumps(
+            {
+                "report_type": report_type,
+                "auth_account_id": auth_account_id,
+                "content_type": content_type,
+                "params": params,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @classmethod
+    @user_context
+    def submit(  # pylint: disable=too-many-arguments
+        cls,
+        report_type: str,
+        file_name: str,
+        content_type: str,
+        params: dict,
+        render: Callable,
+        auth_account_id: str | None = None,
+        **kwargs,
+    ) -> dict:
+        """Submit a report job, render is run on a background thread.
+
+        render returns the report content, or a (content, file_name) tuple when the file name is only known
+        once the report is rendered.
+        """
+        user: UserContext = kwargs["user"]
+        job_key = cls.build_job_key(report_type, auth_account_id, content_type, params)
+        if (job := ReportJobModel.find_in_flight_by_job_key(job_key)) and not cls._reclaim_if_lease_expired(job):
+            current_app.logger.info(f"Report job {job.id} already in flight for {report_type}, reusing it.")
+            return cls.asdict(job)
+
+        job = ReportJobModel(
+            auth_account_id=auth_account_id,
+            content_type=content_type,
+            created_by=user.user_name,
+            file_name=file_name,
+            job_key=job_key,
+            report_type=report_type,
+            status_code=ReportJobStatus.PENDING.value,
+        )
+        try:
+            job.save()
+        except IntegrityError:
+            # An identical request won the race to create the job.
+            db.session.rollback()
+            if job := ReportJobModel.find_in_flight_by_job_key(job_key):
+                return cls.asdict(job)
+            raise
+
+        job_id = job.id
+
+        @copy_current_request_context
+        def _run_job():
+            cls.run_job(job_id, render)
+
+        _get_executor().submit(_run_job)
+        return cls.asdict(job)
+
+    @classmethod
+    def run_job(cls, job_id: int, render: Callable):
+        """Render the report for a job and store the output.
+
+        The job is started and finished with conditional updates under a lease owner, a job reclaimed while it
+        rendered keeps its failed status and the output is discarded.
+        """
+        lease_owner = str(uuid.uuid4())
+        job = ReportJobModel.find_by_id(job_id)
+        if job is None or not ReportJobModel.start(job_id, lease_owner):
+            current_app.logger.info(f"Report job {job_id} is no longer pending, skipping it.")
+            return
+        db.session.commit()
+        started = datetime.now(tz=UTC)
+        rendered = threading.Event()
+        try:
+            cls._start_heartbeat(job_id, lease_owner, rendered)
+            report = render()
+            file_name = job.file_name
+            if isinstance(report, tuple):
+                report, file_name = report
+            content = cls._to_bytes(report)
+            storage_path = cls._store(job_id, file_name, content)
+            values = {
+                "content": None if storage_path else content,
+                "file_name": file_name,
+                "status_code": ReportJobStatus.COMPLETED.value,
+                "storage_path": storage_path,
+            }
+        except Exception:  # NOQA # pylint: disable=broad-except
+            db.session.rollback()
+            current_app.logger.error(f"Error rendering report job {job_id}", exc_info=True)
+            # The cause is logged, callers only get a generic message.
+            values = {"error_message": REPORT_JOB_ERROR_MESSAGE, "status_code": ReportJobStatus.FAILED.value}
+        finally:
+            rendered.set()
+        if not ReportJobModel.finish(job_id, lease_owner, **values):
+            db.session.rollback()
+            current_app.logger.warning(f"Report job {job_id} was reclaimed while rendering, discarding its output.")
+            return
+        db.session.commit()
+        current_app.logger.info(
+            f"Report job {job_id} {values['status_code']} in {(datetime.now(tz=UTC) - started).total_seconds():.2f}s"
+        )
+
+    @classmethod
+    @user_context
+    def find_by_id(cls, job_id: int, **kwargs) -> ReportJobModel:
+        """Return a report job the caller is allowed to see."""
+        from pay_api.services.auth import check_auth  # pylint: disable=import-outside-toplevel
+
+        user: UserContext = kwargs["user"]
+        job = ReportJobModel.find_by_id(job_id)
+        if job is None:
+            raise BusinessException(Error.REPORT_JOB_NOT_FOUND)
+        cls._reclaim_if_lease_expired(job)
+        if job.auth_account_id:
+            check_auth(
+                business_identifier=None,
+                account_id=job.auth_account_id,
+                one_of_roles=[Role.EDITOR.value, Role.VIEW_STATEMENTS.value, Role.VIEW_ACCOUNT_TRANSACTIONS.value],
+            )
+        elif not user.has_role(Role.FAS_REPORTS.value):
+            raise BusinessException(Error.REPORT_JOB_NOT_FOUND)
+        return job
+
+    @classmethod
+    def get_content(cls, job: ReportJobModel) -> bytes:
+        """Return the rendered output for a completed job."""
+        if job.status_code != ReportJobStatus.COMPLETED.value:
+            raise BusinessException(Error.REPORT_JOB_NOT_COMPLETED)
+        if job.storage_path and job.storage_path.startswith("gs://"):
+            bucket_name, blob_name = job.storage_path.removeprefix("gs://").split("/", 1)
+            folder_name, file_name = blob_name.rsplit("/", 1)
+            bucket = GoogleBucketService.get_bucket(GoogleBucketService.get_client(), bucket_name)
+            return GoogleBucketService.get_file_bytes_from_bucket_folder(bucket, folder_name, file_name)
+        return job.content
+
+    @staticmethod
+    def asdict(job: ReportJobModel) -> dict:
+        """Return the job status payload."""
+        return {
+            "id": job.id,
+            "reportType": job.report_type,
+            "status": job.status_code,
+            "fileName": job.file_name,
+            "contentType": job.content_type,
+            "createdOn": job.created_on.isoformat() if job.created_on else None,
+            "completedOn": job.completed_on.isoformat() if job.completed_on else None,
+            "errorMessage": job.error_message,
+        }
+
+    @staticmethod
+    def _reclaim_if_lease_expired(job: ReportJobModel) -> bool:
+        """Fail an in flight job whose heartbeat lapsed, returning True if it was reclaimed."""
+        lease_seconds = current_app.config.get("REPORT_JOB_LEASE_SECONDS", 300)
+        lease_expired_before = datetime.now(tz=UTC) - timedelta(seconds=lease_seconds)
+        if not ReportJobModel.fail_if_lease_expired(job.id, lease_expired_before, REPORT_JOB_LEASE_EXPIRED_MESSAGE):
+            return False
+        db.session.commit()
+        current_app.logger.warning(f"Report job {job.id} missed its heartbeat for {lease_seconds}s, marked failed.")
+        return True
+
+    @staticmethod
+    def _start_heartbeat(job_id: int, lease_owner: str, rendered: threading.Event):
+        """Extend the job lease on a daemon thread until rendering finishes."""
+        app = current_app._get_current_object()  # pylint: disable=protected-access
+        interval = max(app.config.get("REPORT_JOB_LEASE_SECONDS", 300) / 3, 1)
+
+        def _beat():
+            with app.app_context():
+                while not rendered.wait(interval):
+                    try:
+                        ReportJobModel.heartbeat(job_id, lease_owner)
+                        db.session.commit()
+                    except Exception:  # NOQA # pylint: disable=broad-except
+                        db.session.rollback()
+                        app.logger.warning(f"Could not extend the lease of report job {job_id}", exc_info=True)
+
+        threading.Thread(target=_beat, name=f"report-job-heartbeat-{job_id}", daemon=True).start()
+
+    @staticmethod
+    def _to_bytes(report) -> bytes:
+        """Normalize the report renderers output (response, bytes or chunk iterator) to bytes."""
+        if isinstance(report, bytes | bytearray):
+            return bytes(report)
+        if hasattr(report, "content"):
+            return report.content
+        if isinstance(report, Iterable):
+            return b"".join(chunk if isinstance(chunk, bytes) else str(chunk).encode("utf-8") for chunk in report)
+        raise ValueError(f"Unsupported report content {type(report)}")
+
+    @staticmethod
+    def _store(job_id: int, file_name: str, content: bytes) -> str | None:
+        """Store the rendered output in the bucket, returning its path or None when it is kept on the job row."""
+        if bucket_name := current_app.config.get("REPORT_JOB_BUCKET_NAME"):
+            file_name = f"{job_id}-{file_name}"
+            bucket = GoogleBucketService.get_bucket(GoogleBucketService.get_client(), bucket_name)
+            GoogleBucketService.upload_file_bytes_to_bucket_folder(bucket, REPORT_JOB_FOLDER, file_name, content)
+            return f"gs://{bucket_name}/{REPORT_JOB_FOLDER}/{file_name}"
+        return None
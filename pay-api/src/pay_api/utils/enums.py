@@ -571,6 +571,28 @@ class StatementTemplate(Enum):
     STATEMENT_REPORT = "statement_report"
 
 
+class ReportJobStatus(Enum):
+    """Asynchronous report job status."""
+
+    PENDING = "PENDING"
+    IN_PROGRESS = "IN_PROGRESS"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+    @classmethod
+    def in_flight_statuses(cls):
+        """Return statuses for jobs which have not finished yet."""
+        return [cls.PENDING.value, cls.IN_PROGRESS.value]
+
+
+class ReportJobType(Enum):
+    """Asynchronous report job types."""
+
+    PAYMENT_TRANSACTIONS = "PAYMENT_TRANSACTIONS"
+    ROUTING_SLIP_DAILY = "ROUTING_SLIP_DAILY"
+    STATEMENT = "STATEMENT"
+
+
 class SuspensionReasonCodes(Enum):
     """Suspension Reason Codes."""
 
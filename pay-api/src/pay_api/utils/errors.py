@@ -82,6 +82,8 @@ class Error(Enum):
         "PAYMENT_SEARCH_TOO_MANY_RECORDS",
         HTTPStatus.BAD_REQUEST,
     )
+    PAYMENT_REQUEST_IN_PROGRESS = "PAYMENT_REQUEST_IN_PROGRESS", HTTPStatus.CONFLICT
+    PAYMENT_REQUEST_KEY_MISMATCH = "PAYMENT_REQUEST_KEY_MISMATCH", HTTPStatus.UNPROCESSABLE_ENTITY
 
     DIRECT_PAY_INVALID_RESPONSE = "DIRECT_PAY_INVALID_RESPONSE", HTTPStatus.BAD_REQUEST
 
@@ -191,6 +193,9 @@ class Error(Enum):
     REFUND_REQUEST_REQUESTER_EMAIL_REQUIRED = "REFUND_REQUEST_REQUESTER_EMAIL_REQUIRED", HTTPStatus.BAD_REQUEST
     REFUND_REQUEST_SAME_USER_APPROVAL_FORBIDDEN = "REFUND_REQUEST_SAME_USER_APPROVAL_FORBIDDEN", HTTPStatus.FORBIDDEN
 
+    REPORT_JOB_NOT_FOUND = "REPORT_JOB_NOT_FOUND", HTTPStatus.NOT_FOUND
+    REPORT_JOB_NOT_COMPLETED = "REPORT_JOB_NOT_COMPLETED", HTTPStatus.CONFLICT
+
     RS_ALREADY_A_PARENT = "RS_ALREADY_A_PARENT", HTTPStatus.BAD_REQUEST
     RS_ALREADY_LINKED = "RS_ALREADY_LINKED", HTTPStatus.BAD_REQUEST
     RS_PARENT_ALREADY_LINKED = "RS_PARENT_ALREADY_LINKED", HTTPStatus.BAD_REQUEST
@@ -0,0 +1,47 @@
+# Copyright © 2024 Province of British Columbia.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to assure the application startup.
+
+Test-Suite to ensure that create_app is profiled and stays within its startup budget.
+"""
+
+import time
+
+from pay_api import build_cache, create_app
+from pay_api.utils.cache import cache
+from pay_api.utils.enums import Code
+
+STARTUP_BUDGET_SECONDS = 5
+
+
+def test_create_app_startup_profile():
+    """Assert each init step is timed and startup stays within budget."""
+    started = time.perf_counter()
+    app = create_app("testing")
+    elapsed = time.perf_counter() - started
+
+    profile = app.extensions["startup_profile"]
+    for step in ("flags", "db", "queue", "endpoints", "tracing", "jwt", "cache"):
+        assert step in profile
+    assert sum(profile.values()) <= elapsed
+    assert elapsed < STARTUP_BUDGET_SECONDS
+
+
+def test_build_cache_lazy(session, app_request, monkeypatch):
+    """Assert code tables are not loaded at startup when warmup is lazy."""
+    app_request.config["TESTING"] = False
+    app_request.config["CODE_CACHE_WARMUP"] = "lazy"
+    build_cache(app_request)
+    with app_request.app_context():
+        assert cache.get(Code.ERROR.value) is None
@@ -23,7 +23,8 @@ import pytest
 from dateutil.relativedelta import relativedelta
 
 from pay_api.models import Invoice, InvoiceSchema
-from pay_api.utils.enums import CorpType, InvoiceStatus, PaymentMethod
+from pay_api.models import Refund as RefundModel
+from pay_api.utils.enums import CorpType, DisbursementStatus, InvoiceStatus, PaymentMethod, RefundStatus, RefundType
 from tests.utilities.base_test import factory_invoice, factory_payment, factory_payment_account
 
 
@@ -138,3 +139,45 @@ def test_invoice_created_on(session):
         invoice.save()
         dates.append(invoice.created_on)
     assert dates[0] != dates[1]
+
+
+def test_invoice_latest_refund(session):
+    """Assert the invoice keeps the id and status of its latest refund."""
+    payment_account = factory_payment_account()
+    payment_account.save()
+    invoice = factory_invoice(payment_account=payment_account).save()
+    assert invoice.latest_refund_id is None
+
+    refunds = [
+        RefundModel(
+            type=RefundType.INVOICE.value,
+            status=RefundStatus.PENDING_APPROVAL.value,
+            invoice_id=invoice.id,
+            requested_by="test_user",
+            requested_date=datetime.now(tz=UTC),
+        ).save()
+        for _ in range(2)
+    ]
+    refunds[0].status = RefundStatus.DECLINED.value
+    refunds[0].save()
+    invoice = Invoice.find_by_id(invoice.id)
+    assert invoice.latest_refund_id == refunds[1].id
+    assert invoice.latest_refund_status == RefundStatus.PENDING_APPROVAL.value
+
+    refunds[1].status = RefundStatus.APPROVED.value
+    refunds[1].save()
+    invoice = Invoice.find_by_id(invoice.id)
+    assert invoice.latest_refund_id == refunds[1].id
+    assert invoice.latest_refund_status == RefundStatus.APPROVED.value
+
+
+def test_update_disbursement_status(session):
+    """Assert the disbursement status is set on the given invoices only."""
+    payment_account = factory_payment_account()
+    payment_account.save()
+    invoices = [factory_invoice(payment_account=payment_account).save() for _ in range(3)]
+
+    Invoice.update_disbursement_status([invoices[0].id, invoices[1].id], DisbursementStatus.UPLOADED.value)
+    assert invoices[0].disbursement_status_code == DisbursementStatus.UPLOADED.value
+    assert invoices[1].disbursement_status_code == DisbursementStatus.UPLOADED.value
+    assert invoices[2].disbursement_status_code is None
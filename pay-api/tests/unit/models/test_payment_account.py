@@ -17,6 +17,12 @@
 Test-Suite to ensure that the CorpType Class is working as expected.
 """
 
+from decimal import Decimal
+
+from sqlalchemy import update
+
+from pay_api.models import PaymentAccount as PaymentAccountModel
+from pay_api.models.payment_account import CREDIT_RESERVATIONS
 from tests.utilities.base_test import factory_payment_account
 
 
@@ -29,3 +35,50 @@ def test_payment_account(session):
     payment_account.save()
 
     assert payment_account.id is not None
+
+
+def test_reserve_credit(session):
+    """Assert credit is taken up to the available balance."""
+    payment_account = factory_payment_account()
+    payment_account.ob_credit = Decimal("50")
+    payment_account.save()
+
+    assert PaymentAccountModel.reserve_credit(payment_account.id, "ob_credit", Decimal("30")) == Decimal("30")
+    assert payment_account.ob_credit == Decimal("20")
+    assert PaymentAccountModel.reserve_credit(payment_account.id, "ob_credit", Decimal("30")) == Decimal("20")
+    assert payment_account.ob_credit == Decimal("0")
+    assert PaymentAccountModel.reserve_credit(payment_account.id, "ob_credit", Decimal("30")) == 0
+    assert session.info[CREDIT_RESERVATIONS] == [
+        (payment_account.id, "ob_credit", Decimal("30")),
+        (payment_account.id, "ob_credit", Decimal("20")),
+    ]
+
+
+def test_release_credit(session):
+    """Assert reserved credit is returned to the balance."""
+    payment_account = factory_payment_account()
+    payment_account.ob_credit = Decimal("50")
+    payment_account.save()
+
+    taken = PaymentAccountModel.reserve_credit(payment_account.id, "ob_credit", Decimal("30"))
+    PaymentAccountModel.release_credit(payment_account.id, "ob_credit", taken)
+    session.expire(payment_account)
+
+    assert payment_account.ob_credit == Decimal("50")
+
+
+def test_reserve_credit_reads_current_balance(session):
+    """Assert credit is taken from the balance in the database, not a stale copy in the session."""
+    payment_account = factory_payment_account()
+    payment_account.ob_credit = Decimal("50")
+    payment_account.save()
+    session.execute(
+        update(PaymentAccountModel)
+        .where(PaymentAccountModel.id == payment_account.id)
+        .values(ob_credit=Decimal("10"))
+        .execution_options(synchronize_session=False)
+    )
+
+    assert payment_account.ob_credit == Decimal("50")
+    assert PaymentAccountModel.reserve_credit(payment_account.id, "ob_credit", Decimal("30")) == Decimal("10")
+    assert payment_account.ob_credit == Decimal("0")
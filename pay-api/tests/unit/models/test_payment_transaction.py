@@ -19,6 +19,8 @@ Test-Suite to ensure that the CorpType Class is working as expected.
 
 from datetime import UTC, datetime, timedelta
 
+from pay_api.models import PaymentTransaction
+from pay_api.utils.enums import TransactionStatus
 from tests.utilities.base_test import (
     factory_invoice,
     factory_payment,
@@ -127,3 +129,18 @@ def test_find_older_records_invalid_status(session):
         hours=2, minutes=59
     )  # find records which are 2.59 hourolder
     assert len(all_records) == 1
+
+
+def test_mark_event_failed(session):
+    """Assert only a completed transaction is marked EVENT_FAILED."""
+    payment = factory_payment()
+    payment.save()
+    completed_transaction = factory_payment_transaction(payment_id=payment.id, status_code="COMPLETED")
+    completed_transaction.save()
+    created_transaction = factory_payment_transaction(payment_id=payment.id, status_code="CREATED")
+    created_transaction.save()
+
+    assert PaymentTransaction.mark_event_failed(completed_transaction.id)
+    assert not PaymentTransaction.mark_event_failed(created_transaction.id)
+    assert completed_transaction.status_code == TransactionStatus.EVENT_FAILED.value
+    assert created_transaction.status_code == TransactionStatus.CREATED.value
@@ -22,7 +22,15 @@ from faker import Faker
 from pay_api.models import RoutingSlip
 from pay_api.services.fas.routing_slip import RoutingSlip as RoutingSlipService
 from pay_api.utils.dataclasses import RoutingSlipSearch
-from tests.utilities.base_test import factory_payment_account, factory_routing_slip, factory_routing_slip_usd
+from pay_api.utils.enums import InvoiceStatus, PaymentMethod
+from tests.utilities.base_test import (
+    factory_invoice,
+    factory_invoice_reference,
+    factory_payment_account,
+    factory_receipt,
+    factory_routing_slip,
+    factory_routing_slip_usd,
+)
 
 fake = Faker()
 
@@ -104,3 +112,53 @@ def test_routing_slip_usd_creation(session):
 
     routing_slip = RoutingSlip()
     assert routing_slip.find_by_number(rs.number) is not None
+
+
+def test_routing_slip_find_tree(session):
+    """Assert the routing slip tree loads linked routing slips, invoices, references and receipts."""
+    payment_account = factory_payment_account()
+    payment_account.save()
+    parent = factory_routing_slip(number="111111111", payment_account_id=payment_account.id).save()
+    child = factory_routing_slip(number="222222222", payment_account_id=payment_account.id)
+    child.parent_number = parent.number
+    child.save()
+    factory_routing_slip(number="333333333", payment_account_id=payment_account.id).save()
+
+    invoice = factory_invoice(
+        payment_account,
+        status_code=InvoiceStatus.PAID.value,
+        payment_method_code=PaymentMethod.INTERNAL.value,
+        routing_slip=child.number,
+        total=10,
+        paid=10,
+    ).save()
+    factory_invoice_reference(invoice.id).save()
+    factory_receipt(invoice.id).save()
+
+    tree = RoutingSlip.find_tree(parent.number)
+    assert tree.routing_slip.number == parent.number
+    assert [rs.number for rs in tree.children] == [child.number]
+    assert [inv.id for inv in tree.find_invoices([InvoiceStatus.PAID.value])] == [invoice.id]
+    assert not tree.find_invoices([InvoiceStatus.PAID.value], number=parent.number)
+    assert len(tree.invoices[0].references) == 1
+    assert len(tree.invoices[0].receipts) == 1
+    assert [inv.id for inv in tree.children[0].invoices] == [invoice.id]
+    assert RoutingSlip.find_tree("999999999") is None
+
+
+def test_routing_slip_find_trees(session):
+    """Assert the trees of several routing slips load together, keyed by routing slip number."""
+    payment_account = factory_payment_account()
+    payment_account.save()
+    parent = factory_routing_slip(number="111111111", payment_account_id=payment_account.id).save()
+    child = factory_routing_slip(number="222222222", payment_account_id=payment_account.id)
+    child.parent_number = parent.number
+    child.save()
+    other = factory_routing_slip(number="333333333", payment_account_id=payment_account.id).save()
+
+    trees = RoutingSlip.find_trees([parent.number, other.number, "999999999"])
+    assert set(trees) == {parent.number, other.number}
+    assert [rs.number for rs in trees[parent.number].children] == [child.number]
+    assert trees[other.number].routing_slip.number == other.number
+    assert not trees[other.number].children
+    assert RoutingSlip.find_trees([]) == {}
@@ -17,6 +17,9 @@
 Test-Suite to ensure that the Code Service is working as expected.
 """
 
+import threading
+import time
+
 from pay_api.models.corp_type import CorpType
 from pay_api.services.code import Code as CodeService
 from pay_api.utils.cache import cache
@@ -91,3 +94,36 @@ def test_is_payment_method_valid_for_corp_type(session, monkeypatch):
     assert is_valid is False, f"Expected {invalid_payment_method} to be invalid for {corp_type_code}"
     is_valid = CodeService.is_payment_method_valid_for_corp_type("INVALID_CORP", valid_payment_method)
     assert is_valid is False, "Expected validation to fail for a non-existent corp type"
+
+
+def test_find_code_values_by_type_loads_once_on_concurrent_miss(session, app, monkeypatch):
+    """Assert concurrent cache misses for a code type only load it from the database once."""
+    codes_response = CodeService._load_code_values(Code.INVOICE_STATUS.value)
+    cache.clear()
+    calls = []
+    results = []
+    thread_count = 5
+    barrier = threading.Barrier(thread_count)
+
+    def _slow_load(code_type):
+        calls.append(code_type)
+        # Keep the load in flight long enough for the other threads to miss the cache.
+        time.sleep(0.2)
+        cache.set(code_type, codes_response)
+        return codes_response
+
+    def _find_codes():
+        with app.app_context():
+            barrier.wait()
+            results.append(CodeService.find_code_values_by_type(Code.INVOICE_STATUS.value))
+
+    monkeypatch.setattr(CodeService, "_load_code_values", staticmethod(_slow_load))
+    threads = [threading.Thread(target=_find_codes) for _ in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [Code.INVOICE_STATUS.value]
+    assert len(results) == thread_count
+    assert all(result.get("codes") for result in results)
@@ -20,6 +20,7 @@ Test-Suite to ensure that the DirectPay layer is working as expected.
 from datetime import datetime
 from unittest.mock import MagicMock, patch
 
+from pay_api.exceptions import ServiceUnavailableException
 from pay_api.models import CfsAccount as CfsAccountModel
 from pay_api.services.direct_pay_service import DirectPayService
 from tests.utilities.base_test import factory_invoice, factory_invoice_reference, factory_payment_account
@@ -107,3 +108,51 @@ def test_get_receipt_no_receipt_number(mock_get_token, session):
         assert isinstance(result[1], datetime)
         assert result[2] == 100.0
         mock_get_token.assert_called_once()
+
+
+@patch("pay_api.services.direct_pay_service.CFSService.get_token")
+def test_get_receipts(mock_get_token, session):
+    """Test get_receipts fetches a shared receipt once and leaves out invoices whose lookup failed."""
+    mock_token_response = MagicMock()
+    mock_token_response.json.return_value = {"access_token": "test_token"}
+    mock_get_token.return_value = mock_token_response
+
+    payment_account = factory_payment_account().save()
+    cfs_account = CfsAccountModel(cfs_party="123", cfs_account="456", cfs_site="789").save()
+    references = []
+    for invoice_number in ("INV-001", "INV-002", "INV-003", "INV-004"):
+        invoice = factory_invoice(payment_account, cfs_account_id=cfs_account.id).save()
+        references.append(factory_invoice_reference(invoice.id, invoice_number=invoice_number).save())
+
+    def _get_invoice(_cfs_account, inv_number, *_args):
+        if inv_number == "INV-004":
+            raise ServiceUnavailableException("CFS unavailable")
+        if inv_number == "INV-003":
+            return {"receipts": []}
+        return {"receipts": [{"links": [{"rel": "receipt_applied", "href": "https://cfs/rcpts/RCPT-1/"}]}]}
+
+    with (
+        patch.object(DirectPayService, "get_invoice", side_effect=_get_invoice),
+        patch.object(
+            DirectPayService,
+            "_get_receipt_by_number",
+            return_value={
+                "receipt_date": "2024-01-15T10:30:00Z",
+                "invoices": [
+                    {"invoice_number": "INV-001", "amount_applied": 100},
+                    {"invoice_number": "INV-002", "amount_applied": 50},
+                ],
+            },
+        ) as mock_get_receipt,
+    ):
+        throttle = MagicMock()
+        results = DirectPayService.get_receipts(references, throttle)
+
+    mock_get_token.assert_called_once()
+    mock_get_receipt.assert_called_once()
+    assert throttle.call_count == 5
+    assert results[references[0].invoice_id][0] == "RCPT-1"
+    assert results[references[0].invoice_id][2] == 100.0
+    assert results[references[1].invoice_id][2] == 50.0
+    assert results[references[2].invoice_id] is None
+    assert references[3].invoice_id not in results
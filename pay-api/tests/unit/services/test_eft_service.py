@@ -17,7 +17,7 @@
 Test-Suite to ensure that the EFT Service is working as expected.
 """
 
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -48,6 +48,8 @@ from tests.utilities.base_test import (
     factory_invoice_reference,
     factory_partner_disbursement,
     factory_payment_account,
+    factory_statement,
+    factory_statement_invoices,
 )
 
 eft_service = EftService()
@@ -425,3 +427,45 @@ def test_eft_partner_disbursement(session):
 
     eft_service.create_invoice(payment_account, 10, invoice)
     assert PartnerDisbursements.query.count() == 1
+
+
+def test_apply_eft_credits(session):
+    """Assert credits are allocated across invoices oldest first and existing pending links are cancelled."""
+    payment_account = factory_payment_account(payment_method_code=PaymentMethod.EFT.value)
+    eft_file = factory_eft_file()
+    short_name = factory_eft_shortname(short_name="TESTSHORTNAME")
+    first_credit = factory_eft_credit(eft_file.id, short_name.id, amount=10, remaining_amount=8)
+    second_credit = factory_eft_credit(eft_file.id, short_name.id, amount=10, remaining_amount=10)
+    statement = factory_statement(payment_account_id=payment_account.id)
+    created_on = datetime.now(tz=UTC)
+    invoices = [
+        factory_invoice(
+            payment_account=payment_account,
+            status_code=InvoiceStatus.APPROVED.value,
+            payment_method_code=PaymentMethod.EFT.value,
+            total=total,
+            created_on=created_on + timedelta(minutes=index),
+        ).save()
+        for index, total in enumerate([8, 8, 5])
+    ]
+    for invoice in invoices:
+        factory_statement_invoices(statement.id, invoice.id)
+    existing_link = factory_eft_credit_invoice_link(
+        first_credit.id, invoices[0].id, EFTCreditInvoiceStatus.PENDING.value, amount=2
+    ).save()
+
+    EftService.apply_eft_credits(short_name.id, payment_account.id, dict.fromkeys(reversed(invoices), 1))
+
+    assert existing_link.status_code == EFTCreditInvoiceStatus.CANCELLED.value
+    pending_links = (
+        EFTCreditInvoiceLinkModel.query.filter_by(status_code=EFTCreditInvoiceStatus.PENDING.value)
+        .order_by(EFTCreditInvoiceLinkModel.id)
+        .all()
+    )
+    assert [(link.invoice_id, link.eft_credit_id, link.amount) for link in pending_links] == [
+        (invoices[0].id, first_credit.id, 8),
+        (invoices[1].id, first_credit.id, 2),
+        (invoices[1].id, second_credit.id, 6),
+    ]
+    assert first_credit.remaining_amount == 0
+    assert second_credit.remaining_amount == 4
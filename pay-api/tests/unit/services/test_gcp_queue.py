@@ -17,6 +17,7 @@
 Test-Suite to ensure that the GCP Queue Service layer is working as expected.
 """
 
+from concurrent.futures import Future
 from datetime import UTC, datetime
 from unittest.mock import ANY, MagicMock, patch
 
@@ -25,11 +26,13 @@ from dotenv import load_dotenv
 from gcp_queue.gcp_queue import GcpQueue
 
 from pay_api import create_app
+from pay_api.models import QueueOutbox as QueueOutboxModel
 from pay_api.services import gcp_queue_publisher
 from pay_api.services.gcp_queue_publisher import QueueMessage, publish_to_queue
 from pay_api.services.payment_transaction import PaymentTransaction
 from pay_api.utils.dataclasses import PaymentToken
 from pay_api.utils.enums import PaymentMethod, TransactionStatus
+from tests.utilities.base_test import factory_payment_account
 
 
 @pytest.fixture()
@@ -76,6 +79,114 @@ def test_publish_to_queue_no_topic(app, mock_credentials, mock_publisher_client)
             mock_publisher.publish.assert_not_called()
 
 
+def test_publish_to_queue_async(app, monkeypatch, mock_credentials, mock_publisher_client):
+    """Test async publishing hands messages to the batching client without waiting and flushes on shutdown."""
+    monkeypatch.setattr(gcp_queue_publisher, "_publisher", None)
+    futures = [Future() for _ in range(2)]
+    mock_publisher_client.publish.side_effect = futures
+    with app.app_context():
+        monkeypatch.setitem(app.config, "QUEUE_PUBLISH_MODE", "async")
+        for index in range(2):
+            assert (
+                publish_to_queue(
+                    QueueMessage(
+                        source="test-source",
+                        message_type="test-message-type",
+                        payload={"key": index},
+                        topic="projects/project-id/topics/topic",
+                        ordering_key="async-test",
+                    )
+                )
+                is futures[index]
+            )
+        mock_publisher_client.publish.assert_called_with(
+            "projects/project-id/topics/topic", ANY, ordering_key="async-test"
+        )
+
+        futures[0].set_exception(Exception("unavailable"))
+        futures[1].set_result("message-id")
+        mock_publisher_client.resume_publish.assert_called_once_with("projects/project-id/topics/topic", "async-test")
+        assert gcp_queue_publisher.flush(futures) == [futures[0].exception()]
+        assert gcp_queue_publisher.flush() == []
+
+        gcp_queue_publisher.shutdown()
+        mock_publisher_client.stop.assert_called_once()
+    assert gcp_queue_publisher._publisher is None  # pylint: disable=protected-access
+
+
+def test_publish_to_queue_outbox(session, app, monkeypatch):
+    """Test outbox messages follow the caller's transaction and are retried until published."""
+    monkeypatch.setitem(app.config, "QUEUE_PUBLISH_MODE", "outbox")
+    topic = "projects/project-id/topics/outbox"
+    factory_payment_account().flush()
+    for index in range(2):
+        publish_to_queue(
+            QueueMessage(
+                source="test-source",
+                message_type="test-message-type",
+                payload={"key": index},
+                topic=topic,
+                ordering_key="outbox-test",
+            )
+        )
+    session.rollback()
+    assert QueueOutboxModel.query.filter_by(topic=topic).count() == 0
+
+    # Nothing left to commit, so the message is committed on its own.
+    publish_to_queue(
+        QueueMessage(source="test-source", message_type="test-message-type", payload={"key": 1}, topic=topic)
+    )
+    session.rollback()
+    published = []
+
+    def _publish(topic_name, message, **kwargs):
+        if not published:
+            published.append(None)
+            raise Exception("unavailable")  # pylint: disable=broad-exception-raised
+        published.append((topic_name, message, kwargs))
+
+    result = gcp_queue_publisher.relay_outbox(publish=_publish)
+    assert (result.published, result.failed, result.dead_lettered) == (0, 1, [])
+    assert gcp_queue_publisher.relay_outbox(publish=_publish).published == 1
+    outbox_message = QueueOutboxModel.query.filter_by(topic=topic).one()
+    assert outbox_message.published_on
+    assert outbox_message.claimed_on is None
+    assert outbox_message.attempts == 2
+    assert published[-1][0] == topic
+    assert gcp_queue_publisher.relay_outbox(publish=_publish).published == 0
+
+
+def test_relay_outbox_dead_letter(session, app, monkeypatch):
+    """Test a message that runs out of attempts is dead lettered and holds back the rest of its ordering key."""
+    monkeypatch.setitem(app.config, "QUEUE_PUBLISH_MODE", "outbox")
+    monkeypatch.setitem(app.config, "QUEUE_OUTBOX_MAX_ATTEMPTS", 1)
+    topic = "projects/project-id/topics/outbox"
+    for index in range(2):
+        publish_to_queue(
+            QueueMessage(
+                source="test-source",
+                message_type="test-message-type",
+                payload={"key": index},
+                topic=topic,
+                ordering_key="outbox-dead-letter",
+            )
+        )
+    publish = MagicMock(side_effect=Exception("unavailable"))
+
+    result = gcp_queue_publisher.relay_outbox(publish=publish)
+    assert (result.published, result.failed, len(result.dead_lettered)) == (0, 1, 1)
+    assert publish.call_count == 1
+    first, second = QueueOutboxModel.query.filter_by(topic=topic).order_by(QueueOutboxModel.id).all()
+    assert first.dead_lettered_on
+    assert first.error_message == "unavailable"
+    assert second.attempts == 0
+
+    publish.side_effect = None
+    result = gcp_queue_publisher.relay_outbox(publish=publish)
+    assert (result.published, result.failed) == (0, 0)
+    assert publish.call_count == 1
+
+
 @pytest.mark.skip(reason="ADHOC only test.")
 def test_gcp_pubsub_connectivity(monkeypatch):
     """Test that a queue can publish to gcp pubsub."""
@@ -17,6 +17,7 @@
 Test-Suite to ensure that the FeeSchedule Service is working as expected.
 """
 
+import copy
 from datetime import UTC, datetime, timedelta
 
 import pytest
@@ -1018,6 +1019,71 @@ def test_get_invoice_totals_for_statements(session):
     assert totals["due"] == 650 - 200 - 100
 
 
+def test_get_invoice_totals_from_db(session):
+    """Assert the database totals match the python tally for the same invoices."""
+    payment_account = factory_payment_account(auth_account_id="987654").save()
+    invoices = [
+        factory_invoice(payment_account, total=100, service_fees=50).save(),
+        factory_invoice(payment_account, paid=75, total=100, service_fees=50).save(),
+        factory_invoice(payment_account, paid=0, refund=10, total=10).save(),
+        factory_invoice(payment_account, refund=100, paid=100, total=100, service_fees=20).save(),
+    ]
+    data = InvoiceSearch.create_payment_report_details(invoices, {"items": []})
+    expected = InvoiceSearch.get_invoices_totals(data["items"], None)
+
+    totals = InvoiceSearch.get_invoices_totals_from_db("987654", {})
+    for key in ("statutoryFees", "serviceFees", "fees", "paid", "due"):
+        assert totals[key] == expected[key]
+    assert totals["due"] == 125
+
+    to_date = datetime.now(tz=UTC)
+    factory_invoice(
+        payment_account,
+        paid=100,
+        total=100,
+        payment_method_code=PaymentMethod.EFT.value,
+        payment_date=to_date + timedelta(days=1),
+    ).save()
+    totals = InvoiceSearch.get_invoices_totals_from_db("987654", {}, statement_to_date=to_date.date())
+    assert totals["fees"] == 410
+    assert totals["paid"] == 175
+    assert totals["due"] == 225
+
+    # Like the python tally, a payment after midnight on the statement to date is not counted.
+    late_invoice = factory_invoice(
+        payment_account,
+        paid=50,
+        total=50,
+        payment_method_code=PaymentMethod.EFT.value,
+        payment_date=datetime.combine(to_date.date(), datetime.max.time()),
+    ).save()
+    totals = InvoiceSearch.get_invoices_totals_from_db("987654", {}, statement_to_date=to_date.date())
+    data = InvoiceSearch.create_payment_report_details([*invoices, late_invoice], {"items": []})
+    expected = InvoiceSearch.get_invoices_totals(data["items"], {"to_date": to_date.strftime("%Y-%m-%d")})
+    assert totals["paid"] == expected["paid"] == 175
+    assert totals["due"] == 275
+
+
+def test_search_purchase_history_include_totals(session):
+    """Assert includeTotals returns the same totals as the python tally of the matching invoices."""
+    payment_account = factory_payment_account(auth_account_id="987654").save()
+    for invoice in (
+        factory_invoice(payment_account, total=100, service_fees=50),
+        factory_invoice(payment_account, paid=75, total=100, service_fees=50),
+        factory_invoice(payment_account, paid=0, refund=10, total=10),
+        factory_invoice(payment_account, paid=100, total=100, payment_method_code=PaymentMethod.EFT.value),
+    ):
+        invoice.save()
+        factory_invoice_reference(invoice.id).save()
+
+    results = InvoiceSearch.search_purchase_history(
+        PurchaseHistorySearch(auth_account_id="987654", search_filter={"includeTotals": True}, limit=10, page=1)
+    )
+
+    assert len(results["items"]) == 4
+    assert results["totals"] == InvoiceSearch.get_invoices_totals(copy.deepcopy(results["items"]), None)
+
+
 def test_statement_transaction_dto_from_orm(session):
     """Test StatementTransactionDTO.from_orm creates correct DTO."""
     payment_account = factory_payment_account()
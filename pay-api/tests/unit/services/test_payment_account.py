@@ -392,6 +392,30 @@ def test_payment_account_service_with_cfs_account(session):
     assert payment_account_service.bank_branch_number == bank_branch_number
     assert payment_account_service.bank_account_number == bank_account_number
 
+    assert payment_account_service.cfs_account_id is not None
+    assert payment_account_service.cfs_account_status == CfsAccountStatus.PENDING.value
+
+
+def test_find_account_cfs_details(session):
+    """Assert that CFS details are resolved on first access, or loaded with the account when asked for."""
+    payment_account = factory_payment_account(payment_method_code=PaymentMethod.PAD.value, account_number="4102")
+    cfs_account = CfsAccountModel.find_effective_by_payment_method(payment_account.id, PaymentMethod.PAD.value)
+
+    lazy_account = PaymentAccountService.find_account(get_auth_basic_user())
+    assert "cfs_account_id" not in lazy_account.__dict__
+    assert lazy_account.cfs_account_id == cfs_account.id
+    assert lazy_account.cfs_account == "4102"
+
+    eager_account = PaymentAccountService.find_account(get_auth_basic_user(), with_cfs_account=True)
+    assert eager_account.__dict__["cfs_account_id"] == cfs_account.id
+    assert eager_account.cfs_account_status == CfsAccountStatus.ACTIVE.value
+
+    cfs_account.status = CfsAccountStatus.INACTIVE.value
+    cfs_account.save()
+    eager_account = PaymentAccountService.find_account(get_auth_basic_user(), with_cfs_account=True)
+    assert eager_account.id == payment_account.id
+    assert eager_account.cfs_account_id is None
+
 
 def test_update_pad_bank_info_raises_when_cfs_setup_pending(session):
     """Assert that updating PAD bank details while CFS account is still being set up raises BusinessException."""
@@ -24,8 +24,9 @@ import pytest
 from requests.exceptions import ConnectionError, ConnectTimeout, HTTPError
 
 from pay_api.exceptions import BusinessException, ServiceUnavailableException
-from pay_api.models import CfsAccount, FeeSchedule, Invoice, Payment, PaymentAccount
+from pay_api.models import CfsAccount, DistributionCode, FeeSchedule, Invoice, Payment, PaymentAccount
 from pay_api.models import FeeCode as FeeCodeModel
+from pay_api.models import PaymentRequestKey as PaymentRequestKeyModel
 from pay_api.models import RoutingSlip as RoutingSlipModel
 from pay_api.services import CFSService
 from pay_api.services.fee_schedule import FeeSchedule as FeeScheduleService
@@ -76,6 +77,78 @@ def test_create_payment_record(session, public_user_mock):
     assert account_id == account_model.id
 
 
+def test_create_payment_record_idempotency_key(session, public_user_mock):
+    """Assert a retried request with the same idempotency key returns the invoice it already created."""
+    payment_response = PaymentService.create_invoice(
+        get_payment_request(), get_auth_basic_user(), idempotency_key="retry-key"
+    )
+    retry_response = PaymentService.create_invoice(
+        get_payment_request(), get_auth_basic_user(), idempotency_key="retry-key"
+    )
+    assert retry_response.get("id") == payment_response.get("id")
+
+    other_response = PaymentService.create_invoice(
+        get_payment_request(), get_auth_basic_user(), idempotency_key="other-key"
+    )
+    assert other_response.get("id") != payment_response.get("id")
+
+
+def test_create_payment_record_idempotency_key_mismatch(session, public_user_mock):
+    """Assert a live idempotency key reused for a different request is rejected."""
+    PaymentService.create_invoice(get_payment_request(), get_auth_basic_user(), idempotency_key="reused-key")
+    with pytest.raises(BusinessException) as excinfo:
+        PaymentService.create_invoice(
+            get_payment_request(business_identifier="CP0001235"), get_auth_basic_user(), idempotency_key="reused-key"
+        )
+    assert excinfo.value.code == Error.PAYMENT_REQUEST_KEY_MISMATCH.code
+
+
+def test_create_payment_record_idempotency_key_conflict(session, public_user_mock):
+    """Assert an attempt losing the key to a concurrent attempt rolls back and returns the first invoice."""
+    payment_response = PaymentService.create_invoice(
+        get_payment_request(), get_auth_basic_user(), idempotency_key="race-key"
+    )
+    request_key = PaymentRequestKeyModel.query.filter_by(invoice_id=payment_response.get("id")).one()
+    invoice_count = Invoice.query.count()
+
+    # The first lookup misses, as if the other attempt had not committed yet when this one started.
+    with patch.object(PaymentRequestKeyModel, "find_live", side_effect=[None, request_key]):
+        retry_response = PaymentService.create_invoice(
+            get_payment_request(), get_auth_basic_user(), idempotency_key="race-key"
+        )
+
+    assert retry_response.get("id") == payment_response.get("id")
+    assert Invoice.query.count() == invoice_count
+
+
+def test_create_payment_record_idempotency_key_in_progress(session, public_user_mock):
+    """Assert an attempt losing the key without a live invoice to return is told the request is in progress."""
+    invoice_count = Invoice.query.count()
+    with (
+        patch.object(PaymentRequestKeyModel, "claim", return_value=False),
+        pytest.raises(BusinessException) as excinfo,
+    ):
+        PaymentService.create_invoice(get_payment_request(), get_auth_basic_user(), idempotency_key="busy-key")
+
+    assert excinfo.value.code == Error.PAYMENT_REQUEST_IN_PROGRESS.code
+    assert Invoice.query.count() == invoice_count
+
+
+def test_create_payment_record_line_items(session, public_user_mock):
+    """Assert that the invoice and its line items are created together and returned without a reload."""
+    payment_response = PaymentService.create_invoice(get_payment_request(), get_auth_basic_user())
+    line_items = payment_response.get("line_items")
+    assert len(line_items) == 2
+    invoice = Invoice.find_by_id(payment_response.get("id"))
+    assert {line_item.id for line_item in invoice.payment_line_items} == {line_item["id"] for line_item in line_items}
+    for line_item in invoice.payment_line_items:
+        assert line_item.invoice_id == invoice.id
+        if line_item.total > 0 or line_item.service_fees > 0:
+            distribution_code = DistributionCode.find_by_active_for_fee_schedule(line_item.fee_schedule_id)
+            assert line_item.fee_distribution_id == distribution_code.distribution_code_id
+    assert payment_response.get("total") == float(invoice.total)
+
+
 def test_create_payment_record_with_direct_pay(session, public_user_mock):
     """Assert that the payment records are created."""
     payment_response = PaymentService.create_invoice(
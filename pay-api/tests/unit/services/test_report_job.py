@@ -0,0 +1,128 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to assure the Report Job Service.
+
+Test-Suite to ensure that the Report Job Service is working as expected.
+"""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from pay_api.exceptions import BusinessException
+from pay_api.models import ReportJob as ReportJobModel
+from pay_api.services import report_job
+from pay_api.services.report_job import REPORT_JOB_ERROR_MESSAGE, ReportJobService
+from pay_api.utils.enums import ContentType, ReportJobStatus, ReportJobType
+
+
+@pytest.fixture
+def report_job_user(monkeypatch, app):
+    """Mock the user context and keep rendered reports on the job row."""
+
+    def token_info():  # pylint: disable=unused-argument; mocks of library methods
+        return {
+            "username": "service account",
+            "realm_access": {"roles": ["system", "fas_reports"]},
+        }
+
+    monkeypatch.setattr("pay_api.utils.user_context._get_token", lambda: "test")
+    monkeypatch.setattr("pay_api.utils.user_context._get_token_info", token_info)
+    monkeypatch.setitem(app.config, "REPORT_JOB_BUCKET_NAME", "")
+    executor = MagicMock()
+    monkeypatch.setattr(report_job, "_executor", executor)
+    return executor
+
+
+def _submit(render):
+    return ReportJobService.submit(
+        report_type=ReportJobType.ROUTING_SLIP_DAILY.value,
+        file_name="Routing-Slip-Daily-Report-2026-10-18.pdf",
+        content_type=ContentType.PDF.value,
+        params={"date": "2026-10-18"},
+        render=render,
+    )
+
+
+def test_submit_dedupes_in_flight_jobs(session, report_job_user):
+    """Assert identical requests share the in-flight job and only one render is scheduled."""
+    first = _submit(lambda: b"pdf")
+    second = _submit(lambda: b"pdf")
+
+    assert first["id"] == second["id"]
+    assert first["status"] == ReportJobStatus.PENDING.value
+    assert report_job_user.submit.call_count == 1
+
+
+def test_run_job_stores_content(session, report_job_user):
+    """Assert a completed job stores the rendered report and a new request creates a new job."""
+    job = _submit(lambda: iter([b"p", b"df"]))
+    ReportJobService.run_job(job["id"], lambda: iter([b"p", b"df"]))
+
+    job_model = ReportJobService.find_by_id(job["id"])
+    assert job_model.status_code == ReportJobStatus.COMPLETED.value
+    assert job_model.storage_path is None
+    assert ReportJobService.get_content(job_model) == b"pdf"
+    assert _submit(lambda: b"pdf")["id"] != job["id"]
+
+
+def test_run_job_failure(session, report_job_user):
+    """Assert a failed render marks the job as failed without exposing the error."""
+
+    def _render():
+        raise ValueError("report-api unavailable")
+
+    job = _submit(_render)
+    ReportJobService.run_job(job["id"], _render)
+
+    job_model = ReportJobModel.find_by_id(job["id"])
+    assert job_model.status_code == ReportJobStatus.FAILED.value
+    assert job_model.error_message == REPORT_JOB_ERROR_MESSAGE
+    with pytest.raises(BusinessException):
+        ReportJobService.get_content(job_model)
+
+
+def test_submit_reclaims_lost_job(session, report_job_user):
+    """Assert an in flight job without a recent heartbeat is failed and a new job is submitted."""
+    lost = _submit(lambda: b"pdf")
+    job_model = ReportJobModel.find_by_id(lost["id"])
+    job_model.status_code = ReportJobStatus.IN_PROGRESS.value
+    job_model.heartbeat_on = datetime.now(tz=UTC) - timedelta(hours=1)
+    job_model.save()
+
+    job = _submit(lambda: b"pdf")
+
+    assert job["id"] != lost["id"]
+    assert ReportJobModel.find_by_id(lost["id"]).status_code == ReportJobStatus.FAILED.value
+    assert report_job_user.submit.call_count == 2
+    ReportJobService.run_job(lost["id"], lambda: b"pdf")
+    assert ReportJobModel.find_by_id(lost["id"]).status_code == ReportJobStatus.FAILED.value
+
+
+def test_run_job_reclaimed_while_rendering(session, report_job_user):
+    """Assert a job reclaimed while it rendered keeps its failed status and the output is discarded."""
+    job = _submit(lambda: b"pdf")
+
+    def _render():
+        ReportJobModel.fail_if_lease_expired(job["id"], datetime.now(tz=UTC) + timedelta(hours=1), "reclaimed")
+        session.commit()
+        return b"pdf"
+
+    ReportJobService.run_job(job["id"], _render)
+
+    job_model = ReportJobModel.find_by_id(job["id"])
+    assert job_model.status_code == ReportJobStatus.FAILED.value
+    assert job_model.error_message == "reclaimed"
+    assert job_model.content is None
@@ -135,6 +135,10 @@ class _Config:  # pylint: disable=too-few-public-methods,protected-access
     STRR_PAY_TOPIC = os.getenv("STRR_PAY_TOPIC", BUSINESS_PAY_TOPIC)
     ASSETS_PAY_TOPIC = os.getenv("ASSETS_PAY_TOPIC", "assets-pay-notification-dev")
 
+    # Queue publishing: sync (publish in the caller), async (batched per topic on a background pool) or
+    # outbox (written to the queue outbox table, published by the payment-jobs QUEUE_OUTBOX_RELAY job).
+    QUEUE_PUBLISH_MODE = os.getenv("QUEUE_PUBLISH_MODE", "sync").lower()
+
     # If blank in PUBSUB, this should match the https endpoint the subscription is pushing to.
     PAY_AUDIENCE_SUB = os.getenv("PAY_AUDIENCE_SUB", None)
     VERIFY_PUBSUB_EMAILS = f"{os.getenv('AUTHPAY_SERVICE_ACCOUNT')},{os.getenv('BUSINESS_SERVICE_ACCOUNT')}".split(",")